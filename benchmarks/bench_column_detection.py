@@ -0,0 +1,204 @@
+"""
+Benchmark: vectorized vs. loop-based column detection for split-table validation.
+
+Times ``SplitTableDetector._detect_columns``, ``_cluster_values`` and
+``_check_column_alignment`` against the previous pure-Python loop
+implementations on synthetic ruled-table images, and asserts that both
+make bit-identical decisions: the same column positions, the same
+alignment scores and the same merge verdicts and confidences.
+
+Dense tables (many ruling lines plus cell-text noise) make LSD return
+thousands of segments, which is where the per-line loop used to dominate.
+
+Usage::
+
+    python benchmarks/bench_column_detection.py
+    python benchmarks/bench_column_detection.py --tables 200 --max-cols 18 --dense
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from doctra.parsers.split_table_detector import SplitTableDetector, TableSegment  # noqa: E402
+
+
+class LoopSplitTableDetector(SplitTableDetector):
+    """The pre-vectorization implementations, kept verbatim as the reference."""
+
+    def _detect_columns(self, img):
+        import cv2
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if len(img.shape) == 3 else img
+        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        enhanced = clahe.apply(gray)
+        _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 5))
+        morph = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+        lsd = cv2.createLineSegmentDetector(cv2.LSD_REFINE_STD)
+        lines, _, _, _ = lsd.detect(morph)
+        if lines is None or len(lines) == 0:
+            return []
+        x_coords = []
+        for line in lines:
+            x1, y1, x2, y2 = line.reshape(-1)
+            angle = np.abs(np.arctan2(y2 - y1, x2 - x1) * 180 / np.pi)
+            if 75 <= angle <= 105:
+                x_coords.extend([x1, x2])
+        if not x_coords:
+            return []
+        x_coords = sorted(set(x_coords))
+        img_width = img.shape[1]
+        clustered = self._cluster_values(x_coords, threshold=max(5, img_width * 0.01))
+        if len(clustered) > 2:
+            edge_margin = img_width * 0.02
+            clustered = [c for c in clustered if edge_margin <= c <= (img_width - edge_margin)]
+        if len(clustered) > 20:
+            return []
+        return clustered
+
+    def _cluster_values(self, values, threshold):
+        if not values:
+            return []
+        sorted_vals = sorted(values)
+        clusters = [[sorted_vals[0]]]
+        for val in sorted_vals[1:]:
+            if val - clusters[-1][-1] <= threshold:
+                clusters[-1].append(val)
+            else:
+                clusters.append([val])
+        return [np.mean(cluster) for cluster in clusters]
+
+    def _check_column_alignment(self, cols1, cols2, seg1, seg2):
+        width1 = seg1.x2 - seg1.x1
+        width2 = seg2.x2 - seg2.x1
+        if width1 == 0 or width2 == 0:
+            return 0.0
+        norm_cols1 = [c / width1 for c in cols1]
+        norm_cols2 = [c / width2 for c in cols2]
+        matches = 0
+        total = max(len(norm_cols1), len(norm_cols2))
+        if total == 0:
+            return 0.0
+        used_cols2 = set()
+        for c1 in norm_cols1:
+            best_match, best_diff = None, float('inf')
+            for i, c2 in enumerate(norm_cols2):
+                if i in used_cols2:
+                    continue
+                diff = abs(c1 - c2)
+                if diff < 0.05 and diff < best_diff:
+                    best_match, best_diff = i, diff
+            if best_match is not None:
+                matches += 1
+                used_cols2.add(best_match)
+        return matches / total if total > 0 else 0.0
+
+
+def ruled_table(rng: np.random.Generator, max_cols: int, dense: bool) -> Tuple[Image.Image, List[int]]:
+    """Draw a ruled table and return it with its column boundary x positions."""
+    w = int(rng.integers(500, 1400))
+    h = int(rng.integers(200, 900))
+    n_cols = int(rng.integers(2, max_cols + 1))
+    cuts = np.sort(rng.choice(np.arange(40, w - 40), size=n_cols - 1, replace=False))
+    xs = [5] + [int(c) for c in cuts] + [w - 6]
+    im = Image.new("RGB", (w, h), "white")
+    draw = ImageDraw.Draw(im)
+    row_h = int(rng.integers(14, 40))
+    width = int(rng.integers(1, 4))
+    for y in range(5, h - 5, row_h):
+        draw.line((5, y, w - 6, y), fill="black", width=1)
+        if dense:
+            for left, right in zip(xs[:-1], xs[1:]):
+                x = left + 4
+                while x < right - 12:
+                    word = int(rng.integers(4, 30))
+                    draw.rectangle((x, y + 4, min(x + word, right - 6), y + row_h - 5), fill=(40, 40, 40))
+                    x += word + 6
+    for x in xs:
+        jitter = int(rng.integers(-1, 2))
+        draw.line((x + jitter, 5, x + jitter, h - 5), fill="black", width=width)
+    return im, xs
+
+
+def segment(im: Image.Image, page: int) -> TableSegment:
+    seg = TableSegment(page_index=page, box_index=0, x1=0.0, y1=0.0, x2=float(im.width), y2=float(im.height),
+                       page_width=im.width, page_height=im.height * 4, page_image=im, confidence=0.9)
+    seg.image
+    return seg
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--max-cols", type=int, default=14)
+    parser.add_argument("--dense", action="store_true", help="Fill cells with text-like blocks (many LSD segments)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    images = [ruled_table(rng, args.max_cols, args.dense)[0] for _ in range(args.tables)]
+    fast, slow = SplitTableDetector(), LoopSplitTableDetector()
+    cv_images = [fast._pil_to_cv2(im) for im in images]
+
+    t0 = time.perf_counter()
+    slow_cols = [slow._detect_columns(img) for img in cv_images]
+    t_slow = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    fast_cols = [fast._detect_columns(img) for img in cv_images]
+    t_fast = time.perf_counter() - t0
+    assert all(list(map(float, a)) == list(map(float, b)) for a, b in zip(slow_cols, fast_cols)), \
+        "column positions differ"
+
+    values = [np.sort(rng.uniform(0, 2000, size=n)).astype(np.float32) for n in rng.integers(10, 5000, size=200)]
+    t0 = time.perf_counter()
+    slow_clusters = [slow._cluster_values(list(v), threshold=8.0) for v in values]
+    t_slow_cluster = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    fast_clusters = [fast._cluster_values(v, threshold=8.0) for v in values]
+    t_fast_cluster = time.perf_counter() - t0
+    assert all(list(map(float, a)) == list(map(float, b)) for a, b in zip(slow_clusters, fast_clusters)), \
+        "cluster centers differ"
+
+    # Pair every table with the next one (same or different structure) and validate
+    segments = [segment(im, i + 1) for i, im in enumerate(images)]
+    pairs = list(zip(segments[:-1], segments[1:])) + [(s, segment(s.image.copy(), s.page_index + 1)) for s in segments]
+    cols = [(fast._segment_columns(a), fast._segment_columns(b)) for a, b in pairs]
+    t0 = time.perf_counter()
+    slow_scores = [slow._check_column_alignment(c1, c2, a, b) for (c1, c2), (a, b) in zip(cols, pairs)]
+    t_slow_align = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    fast_scores = [fast._check_column_alignment(c1, c2, a, b) for (c1, c2), (a, b) in zip(cols, pairs)]
+    t_fast_align = time.perf_counter() - t0
+    assert slow_scores == fast_scores, "alignment scores differ"
+
+    def verdicts(detector, pairs):
+        out = []
+        for a, b in pairs:
+            a._columns = b._columns = None
+            match = detector._validate_split_table(a, b)
+            out.append(None if match is None else (match.confidence, match.column_count1, match.column_count2))
+        return out
+
+    assert verdicts(slow, pairs) == verdicts(fast, pairs), "merge decisions differ"
+    merges = sum(v is not None for v in verdicts(fast, pairs))
+
+    n_lines = sum(len(c) for c in fast_cols)
+    print(f"{len(images)} tables ({'dense' if args.dense else 'sparse'}), {n_lines} detected columns, "
+          f"{len(pairs)} pairs ({merges} merged)")
+    print(f"_detect_columns         : {1000 * t_slow / len(images):8.2f} -> {1000 * t_fast / len(images):8.2f} ms/table")
+    print(f"_cluster_values         : {1000 * t_slow_cluster:8.2f} -> {1000 * t_fast_cluster:8.2f} ms total")
+    print(f"_check_column_alignment : {1000 * t_slow_align:8.2f} -> {1000 * t_fast_align:8.2f} ms total")
+    print("decisions identical     : yes")
+
+
+if __name__ == "__main__":
+    main()
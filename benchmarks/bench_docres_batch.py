@@ -0,0 +1,82 @@
+"""
+Benchmark: DocRes throughput per task with batched forward passes.
+
+Restores the same set of pages with ``DocResEngine.batch_restore`` at
+several batch sizes and reports pages per second for each task. Batch
+size 1 is the page-at-a-time path; larger batches run same-size pages
+through the Restormer together.
+
+Requires torch, OpenCV and the DocRes weights (downloaded from the
+Hugging Face Hub on first use).
+
+Usage::
+
+    python benchmarks/bench_docres_batch.py
+    python benchmarks/bench_docres_batch.py --pages 8 --batch-sizes 1 2 4 8 --tasks appearance deshadowing
+    python benchmarks/bench_docres_batch.py --image page.jpg --device cuda --max-batch-pixels 8000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from bench_docres_warm import synthetic_page  # noqa: E402
+
+TASKS = ["dewarping", "deshadowing", "appearance", "deblurring", "binarization", "end2end"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--image", help="Page image to restore (default: a synthetic text page)")
+    parser.add_argument("--pages", type=int, default=8, help="Pages restored per run (default: 8)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4],
+                        help="Batch sizes to compare (default: 1 2 4)")
+    parser.add_argument("--tasks", nargs="+", choices=TASKS, default=["appearance", "deshadowing", "deblurring"],
+                        help="Tasks to time (default: appearance deshadowing deblurring)")
+    parser.add_argument("--device", choices=["cuda", "cpu"], help="Device (default: auto-detect)")
+    parser.add_argument("--max-batch-pixels", type=int, help="Cap on input pixels per forward pass")
+    args = parser.parse_args()
+
+    import cv2
+    import torch
+    from doctra.engines.image_restoration.docres_engine import DocResEngine
+
+    image = cv2.imread(args.image) if args.image else synthetic_page()
+    pages = [image] * args.pages
+    engine = DocResEngine(device=args.device)
+    print(f"device: {engine.device}, page: {image.shape[1]}x{image.shape[0]}, pages: {args.pages}\n")
+
+    def sync():
+        if engine.device.type == "cuda":
+            torch.cuda.synchronize()
+
+    header = f"{'task':<14}" + "".join(f"{f'batch {b}':>12}" for b in args.batch_sizes)
+    print(header + "   (pages/s)")
+    any_failed = False
+    for task in args.tasks:
+        # warm-up: builds the fp16 model copy, loads MBD, primes kernels
+        engine.batch_restore(pages[:1], task)
+        row = f"{task:<14}"
+        for batch_size in args.batch_sizes:
+            sync()
+            start = time.perf_counter()
+            results = engine.batch_restore(pages, task, batch_size=batch_size,
+                                           max_batch_pixels=args.max_batch_pixels)
+            sync()
+            seconds = time.perf_counter() - start
+            failed = any(restored is None for restored, _ in results)
+            any_failed |= failed
+            row += f"{args.pages / seconds:>11.2f}" + ("!" if failed else " ")
+        print(row)
+    if any_failed:
+        print("\n! = some pages failed to restore")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: DocRes pages per second on CPU by precision and runtime.
+
+Restores the same pages with one ``DocResEngine`` per configuration and
+reports the one-time warm-up (fp16 copy, TorchScript trace or
+torch.compile) separately from the steady-state throughput. fp16 is
+what the engine used on CPU before precision was chosen per device.
+
+Requires torch, OpenCV and the DocRes weights (downloaded from the
+Hugging Face Hub on first use).
+
+Usage::
+
+    python benchmarks/bench_docres_cpu.py
+    python benchmarks/bench_docres_cpu.py --task deshadowing --pages 4 --threads 8
+    python benchmarks/bench_docres_cpu.py --configs fp32/eager bf16/eager fp32/jit --image page.jpg
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from bench_docres_warm import synthetic_page  # noqa: E402
+
+CONFIGS = ["fp16/eager", "fp32/eager", "bf16/eager", "fp32/jit", "bf16/jit", "fp32/compile"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--image", help="Page image to restore (default: a synthetic text page)")
+    parser.add_argument("--pages", type=int, default=4, help="Pages restored per configuration (default: 4)")
+    parser.add_argument("--task", default="appearance",
+                        choices=["deshadowing", "appearance", "deblurring", "binarization"],
+                        help="Restoration task (default: appearance)")
+    parser.add_argument("--configs", nargs="+", choices=CONFIGS, default=CONFIGS,
+                        help="precision/runtime pairs to compare (default: all)")
+    parser.add_argument("--batch-size", type=int, default=1, help="Pages per forward pass (default: 1)")
+    parser.add_argument("--threads", type=int, help="torch intra-op threads (default: torch's choice)")
+    args = parser.parse_args()
+
+    import cv2
+    import torch
+    from doctra.engines.image_restoration.docres_engine import DocResEngine
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    image = cv2.imread(args.image) if args.image else synthetic_page()
+    pages = [image] * args.pages
+    print(f"task: {args.task}, page: {image.shape[1]}x{image.shape[0]}, pages: {args.pages}, "
+          f"threads: {torch.get_num_threads()}\n")
+
+    print(f"{'config':<14} {'warm-up':>10} {'pages/s':>10}")
+    for config in args.configs:
+        precision, runtime = config.split("/")
+        try:
+            engine = DocResEngine(device="cpu", precision=precision, runtime=runtime, batch_size=args.batch_size)
+            start = time.perf_counter()
+            engine.restore_image(image, args.task)
+            warm_up = time.perf_counter() - start
+            start = time.perf_counter()
+            results = engine.batch_restore(pages, args.task)
+            seconds = time.perf_counter() - start
+        except Exception as e:
+            print(f"{config:<14} failed: {e}")
+            continue
+        failed = sum(restored is None for restored, _ in results)
+        note = f"  ({failed} pages failed)" if failed else ""
+        print(f"{config:<14} {warm_up:>9.2f}s {args.pages / seconds:>10.3f}{note}")
+
+
+if __name__ == "__main__":
+    main()
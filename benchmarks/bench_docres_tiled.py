@@ -0,0 +1,97 @@
+"""
+Benchmark: whole-page vs tiled DocRes restoration of a high-resolution page.
+
+Restores one large page (by default a synthetic A3 page at 200 DPI) with
+the whole-page path and with tiles of each requested size, each variant
+in a fresh process so its peak memory can be measured: peak RSS on CPU,
+peak allocated CUDA memory on GPU. The mean absolute difference to the
+whole-page output is shown for reference; note that whole pages above
+1600 px are downscaled by the model path, so the tiled output is
+expected to be sharper rather than identical.
+
+Requires torch, OpenCV and the DocRes weights (downloaded from the
+Hugging Face Hub on first use).
+
+Usage::
+
+    python benchmarks/bench_docres_tiled.py
+    python benchmarks/bench_docres_tiled.py --task deshadowing --tile-sizes 512 768 --device cuda
+    python benchmarks/bench_docres_tiled.py --image scan.png --overlap 128
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from bench_docres_warm import synthetic_page  # noqa: E402
+
+
+def run_variant(image, task, device, tile_size, overlap):
+    """Restore ``image`` once in this process; returns (seconds, peak bytes, restored)."""
+    sys.path.insert(0, REPO_ROOT)
+    import torch
+    from doctra.engines.image_restoration.docres_engine import DocResEngine
+
+    engine = DocResEngine(device=device, tile_size=tile_size, tile_overlap=overlap)
+    cuda = engine.device.type == "cuda"
+    if cuda:
+        torch.cuda.reset_peak_memory_stats()
+    start = time.perf_counter()
+    restored, _ = engine.restore_image(image, task)
+    if cuda:
+        torch.cuda.synchronize()
+    seconds = time.perf_counter() - start
+    if cuda:
+        peak = torch.cuda.max_memory_allocated()
+    else:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return seconds, peak, restored
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--image", help="Page image to restore (default: a synthetic A3 page at 200 DPI)")
+    parser.add_argument("--task", default="appearance",
+                        choices=["deshadowing", "appearance", "deblurring", "binarization"],
+                        help="Restoration task (default: appearance)")
+    parser.add_argument("--tile-sizes", type=int, nargs="+", default=[512, 1024],
+                        help="Tile sizes to compare (default: 512 1024)")
+    parser.add_argument("--overlap", type=int, help="Minimum tile overlap (default: 64, or half a smaller tile)")
+    parser.add_argument("--device", choices=["cuda", "cpu"], help="Device (default: auto-detect)")
+    args = parser.parse_args()
+
+    import cv2
+    import numpy as np
+
+    image = cv2.imread(args.image) if args.image else synthetic_page(width=3307, height=4677)
+    print(f"task: {args.task}, page: {image.shape[1]}x{image.shape[0]}\n")
+    print(f"{'variant':<14} {'seconds':>9} {'peak':>12} {'vs whole':>10}")
+
+    ctx = multiprocessing.get_context("spawn")
+    reference = None
+    for tile_size in [None] + args.tile_sizes:
+        name = "whole page" if tile_size is None else f"tiles {tile_size}"
+        with ctx.Pool(1) as pool:
+            try:
+                seconds, peak, restored = pool.apply(run_variant, (image, args.task, args.device,
+                                                                  tile_size, args.overlap))
+            except Exception as e:
+                print(f"{name:<14} failed: {e}")
+                continue
+        if reference is None and tile_size is None:
+            reference = restored
+        diff = "" if reference is None or tile_size is None else \
+            f"{np.abs(restored.astype(float) - reference.astype(float)).mean():>10.2f}"
+        print(f"{name:<14} {seconds:>9.2f} {peak / 2**20:>9.0f} MB {diff}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: warm-path DocRes dewarping with the MBD model loaded once.
+
+Compares, per page, the old mask step (``net1_net2_infer_single_im``
+rebuilding DeepLab and reloading ``mbd.pkl`` for every image) with
+``predict_mask`` on the model ``DocResEngine`` keeps, then times complete
+``restore_image`` calls: the first one pays for loading MBD, the rest are
+the warm path.
+
+Requires torch, OpenCV and the DocRes weights (downloaded from the
+Hugging Face Hub on first use).
+
+Usage::
+
+    python benchmarks/bench_docres_warm.py
+    python benchmarks/bench_docres_warm.py --image page.jpg --pages 10 --device cpu --task end2end
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+
+
+def synthetic_page(width: int = 1240, height: int = 1754):
+    """A white page with lines of text, as a BGR array."""
+    import cv2
+    import numpy as np
+
+    page = np.full((height, width, 3), 255, dtype=np.uint8)
+    for y in range(120, height - 120, 48):
+        cv2.putText(page, "The quick brown fox jumps over the lazy dog 0123456789", (100, y),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, (20, 20, 20), 2)
+    return page
+
+
+def timed(fn, repeat: int) -> list:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--image", help="Page image to restore (default: a synthetic text page)")
+    parser.add_argument("--pages", type=int, default=5, help="Pages timed per variant (default: 5)")
+    parser.add_argument("--device", choices=["cuda", "cpu"], help="Device (default: auto-detect)")
+    parser.add_argument("--task", choices=["dewarping", "end2end"], default="dewarping",
+                        help="Restoration task timed end to end (default: dewarping)")
+    args = parser.parse_args()
+
+    import cv2
+    from doctra.engines.image_restoration.docres_engine import DocResEngine
+    from data.MBD.infer import net1_net2_infer_single_im, predict_mask
+
+    image = cv2.imread(args.image) if args.image else synthetic_page()
+    engine = DocResEngine(device=args.device)
+    print(f"device: {engine.device}, page: {image.shape[1]}x{image.shape[0]}, pages: {args.pages}\n")
+
+    reload_times = timed(lambda: net1_net2_infer_single_im(image, engine.mbd_path), args.pages)
+    load_start = time.perf_counter()
+    seg_model = engine._ensure_seg_model()
+    load_seconds = time.perf_counter() - load_start
+    warm_times = timed(lambda: predict_mask(seg_model, image), args.pages)
+    print(f"{'MBD mask, reload per page':<32} {statistics.median(reload_times) * 1000:>9.1f} ms/page")
+    print(f"{'MBD mask, loaded once':<32} {statistics.median(warm_times) * 1000:>9.1f} ms/page"
+          f"  (one-time load {load_seconds * 1000:.0f} ms)")
+
+    engine._seg_model = None
+    restore_times = timed(lambda: engine.restore_image(image, task=args.task), args.pages + 1)
+    print(f"{'restore_image, first page':<32} {restore_times[0] * 1000:>9.1f} ms")
+    print(f"{'restore_image, warm median':<32} {statistics.median(restore_times[1:]) * 1000:>9.1f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: cold-start import time of the package, the parsers and the CLI.
+
+Imports each module in a fresh interpreter ``--repeat`` times and reports
+the median wall time, plus which heavy dependencies (torch, Paddle,
+gradio, VLM SDKs, ...) the import pulled in. With lazy imports none of
+them should be loaded until a parser or engine is actually used; the
+``parser`` row shows the cost that is now deferred to first use.
+
+Usage::
+
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --repeat 10 --importtime
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+HEAVY_MODULES = (
+    "torch", "cv2", "gradio", "paddle", "paddleocr", "pandas", "openpyxl",
+    "outlines", "openai", "anthropic", "google.genai", "ollama",
+)
+
+TARGETS = {
+    "doctra": "import doctra",
+    "doctra.parsers": "import doctra.parsers",
+    "cli": "import doctra.cli.main",
+    "parser": "from doctra.parsers.structured_pdf_parser import StructuredPDFParser",
+}
+
+
+def probe(statement: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "seconds = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'seconds': seconds, 'heavy': heavy}))\n"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (REPO_ROOT, env.get("PYTHONPATH")) if p)
+    proc = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def importtime_top(statement: str, top: int) -> list:
+    """Return the ``top`` slowest modules (cumulative microseconds) from ``python -X importtime``."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (REPO_ROOT, env.get("PYTHONPATH")) if p)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=REPO_ROOT, env=env,
+                          capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  <self us> | <cumulative us> | <indented module name>"
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target (default: 5)")
+    parser.add_argument("--importtime", action="store_true", help="Also list the slowest modules per target")
+    parser.add_argument("--top", type=int, default=8, help="Modules listed with --importtime (default: 8)")
+    args = parser.parse_args()
+
+    print(f"{'target':<16} {'median ms':>10} {'min ms':>8}  heavy modules loaded")
+    for label, statement in TARGETS.items():
+        results = [probe(statement) for _ in range(args.repeat)]
+        errors = [r["error"] for r in results if "error" in r]
+        if errors:
+            print(f"{label:<16} {'-':>10} {'-':>8}  ({errors[0]})")
+            continue
+        times = [r["seconds"] * 1000 for r in results]
+        heavy = ", ".join(results[0]["heavy"]) or "none"
+        print(f"{label:<16} {statistics.median(times):>10.1f} {min(times):>8.1f}  {heavy}")
+        if args.importtime:
+            for cumulative_us, name in importtime_top(statement, args.top):
+                print(f"{'':<16} {cumulative_us / 1000:>10.1f}    {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: LayoutPage/LayoutBox objects vs. the columnar LayoutBatch.
+
+Builds a synthetic corpus of detections (no model needed) and compares
+building, memory held, filtering by label and score, and JSONL export for
+the dataclass representation and for ``LayoutBatch``.
+
+Usage::
+
+    python benchmarks/bench_layout_batch.py
+    python benchmarks/bench_layout_batch.py --pages 20000 --boxes-per-page 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from doctra.engines.layout.cache import build_page  # noqa: E402
+from doctra.engines.layout.layout_batch import LayoutBatch  # noqa: E402
+from doctra.engines.layout.paddle_layout import PaddleLayoutEngine  # noqa: E402
+
+LABELS = ("text", "paragraph_title", "table", "chart", "figure", "formula", "header", "footer")
+
+
+def synthetic_records(pages: int, boxes_per_page: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    records = []
+    for page_index in range(1, pages + 1):
+        detections = []
+        for _ in range(boxes_per_page):
+            x1, y1 = rng.uniform(0, 1500), rng.uniform(0, 2000)
+            detections.append((rng.choice(LABELS), rng.random(),
+                               [x1, y1, x1 + rng.uniform(10, 200), y1 + rng.uniform(10, 200)]))
+        records.append((page_index, 1700, 2200, detections))
+    return records
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def held_bytes(fn) -> int:
+    """Memory still allocated by the object ``fn`` builds."""
+    tracemalloc.start()
+    result = fn()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=5000, help="Synthetic pages (default: 5000)")
+    parser.add_argument("--boxes-per-page", type=int, default=30, help="Detections per page (default: 30)")
+    parser.add_argument("--min-score", type=float, default=0.5, help="Score threshold for the filter step")
+    args = parser.parse_args()
+
+    records = synthetic_records(args.pages, args.boxes_per_page)
+    engine = PaddleLayoutEngine()
+    print(f"{args.pages} pages x {args.boxes_per_page} boxes = {args.pages * args.boxes_per_page} detections\n")
+    print(f"{'step':<22} {'LayoutPage s':>13} {'LayoutBatch s':>14}")
+
+    build_pages = lambda: [build_page(i, w, h, d) for i, w, h, d in records]  # noqa: E731
+    build_batch = lambda: LayoutBatch.from_records(records)  # noqa: E731
+    pages, t_pages = timed(build_pages)
+    batch, t_batch = timed(build_batch)
+    print(f"{'build':<22} {t_pages:>13.3f} {t_batch:>14.3f}")
+
+    _, t_pages_f = timed(lambda: [[b for b in p.boxes if b.label in ("table", "chart") and b.score >= args.min_score]
+                                 for p in pages])
+    _, t_batch_f = timed(lambda: batch.filter(labels=("table", "chart"), min_score=args.min_score))
+    print(f"{'filter label+score':<22} {t_pages_f:>13.3f} {t_batch_f:>14.3f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _, t_pages_j = timed(lambda: engine.save_jsonl(pages, os.path.join(tmp, "pages.jsonl")))
+        _, t_batch_j = timed(lambda: engine.save_jsonl(batch, os.path.join(tmp, "batch.jsonl")))
+    print(f"{'save_jsonl':<22} {t_pages_j:>13.3f} {t_batch_j:>14.3f}")
+
+    _, t_nms = timed(lambda: batch.nms(iou_threshold=0.5))
+    print(f"{'nms (batch only)':<22} {'-':>13} {t_nms:>14.3f}")
+    mem_pages, mem_batch = held_bytes(build_pages), held_bytes(build_batch)
+    print(f"\nmemory held: LayoutPage {mem_pages / 2**20:.1f} MiB, LayoutBatch {mem_batch / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
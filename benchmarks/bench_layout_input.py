@@ -0,0 +1,128 @@
+"""
+Benchmark: in-memory ndarray input vs. JPEG temp files for layout detection.
+
+Measures the per-page cost of handing rendered pages to PaddleOCR's
+``LayoutDetection`` as numpy arrays (current path) versus writing each page
+as a quality-95 JPEG to a temp directory and passing the file path (old
+path). By default only the input-preparation overhead is timed (encode +
+write + read + decode vs. array conversion); pass ``--with-model`` to time
+full ``predict`` calls as well.
+
+Usage::
+
+    python benchmarks/bench_layout_input.py                  # 100 synthetic pages
+    python benchmarks/bench_layout_input.py --pdf doc.pdf    # first 100 pages of a PDF
+    python benchmarks/bench_layout_input.py --with-model     # include layout inference
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def synthetic_pages(n: int, dpi: int) -> List[Image.Image]:
+    """Build ``n`` A4-sized pages with some text-like content."""
+    w, h = int(8.27 * dpi), int(11.69 * dpi)
+    rng = np.random.default_rng(0)
+    pages: List[Image.Image] = []
+    for i in range(n):
+        im = Image.new("RGB", (w, h), "white")
+        draw = ImageDraw.Draw(im)
+        y = 80
+        while y < h - 80:
+            x = 80
+            while x < w - 200:
+                word = int(rng.integers(20, 120))
+                draw.rectangle((x, y, x + word, y + 14), fill=(30, 30, 30))
+                x += word + 12
+            y += 28
+        draw.text((w // 2, h - 40), f"page {i + 1}", fill="black")
+        pages.append(im)
+    return pages
+
+
+def pdf_pages(pdf_path: str, n: int, dpi: int) -> List[Image.Image]:
+    from doctra.utils.pdf_io import render_pdf_to_images
+    return [im for (im, _, _) in render_pdf_to_images(pdf_path, dpi=dpi, first_page=1, last_page=n)]
+
+
+def prepare_temp_files(pages: List[Image.Image], tmpdir: str) -> List[str]:
+    """Old path: encode to JPEG on disk (the predictor then reads + decodes)."""
+    paths = []
+    for i, im in enumerate(pages, start=1):
+        p = os.path.join(tmpdir, f"page_{i:04d}.jpg")
+        im.save(p, format="JPEG", quality=95)
+        paths.append(p)
+    return paths
+
+
+def read_back(paths: List[str]) -> None:
+    """What the predictor does with a path: read and decode it."""
+    try:
+        import cv2
+        for p in paths:
+            cv2.imread(p)
+    except ImportError:
+        for p in paths:
+            np.asarray(Image.open(p).convert("RGB"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", help="PDF to render (default: synthetic pages)")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--dpi", type=int, default=200)
+    parser.add_argument("--with-model", action="store_true", help="Also time LayoutDetection.predict")
+    parser.add_argument("--model", default="PP-DocLayout_plus-L")
+    args = parser.parse_args()
+
+    pages = pdf_pages(args.pdf, args.pages, args.dpi) if args.pdf else synthetic_pages(args.pages, args.dpi)
+    n = len(pages)
+    print(f"{n} pages at {pages[0].size[0]}x{pages[0].size[1]}")
+
+    from doctra.utils.io_utils import pil_to_bgr
+
+    with tempfile.TemporaryDirectory(prefix="doctra_bench_") as tmpdir:
+        t0 = time.perf_counter()
+        paths = prepare_temp_files(pages, tmpdir)
+        read_back(paths)
+        t_files = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        arrays = [pil_to_bgr(im) for im in pages]
+        t_arrays = time.perf_counter() - t0
+
+        print(f"input prep, temp JPEG files : {1000 * t_files / n:8.2f} ms/page")
+        print(f"input prep, in-memory arrays: {1000 * t_arrays / n:8.2f} ms/page")
+        print(f"saved per page              : {1000 * (t_files - t_arrays) / n:8.2f} ms")
+
+        if args.with_model:
+            from doctra.engines.layout.paddle_layout import PaddleLayoutEngine
+            engine = PaddleLayoutEngine(model_name=args.model)
+            engine._ensure_model()
+            engine.model.predict(arrays[:1], batch_size=1, layout_nms=True)  # warm-up
+
+            t0 = time.perf_counter()
+            engine.model.predict(prepare_temp_files(pages, tmpdir), batch_size=1, layout_nms=True)
+            t_files_model = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            engine.predict_images(pages)
+            t_arrays_model = time.perf_counter() - t0
+
+            print(f"end to end, temp JPEG files : {1000 * t_files_model / n:8.2f} ms/page")
+            print(f"end to end, in-memory arrays: {1000 * t_arrays_model / n:8.2f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
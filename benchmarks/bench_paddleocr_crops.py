@@ -0,0 +1,108 @@
+"""
+Benchmark: PaddleOCREngine crops per second, PNG temp files vs. in-memory batches.
+
+Compares the old per-crop path (write a ``NamedTemporaryFile`` PNG, call
+``PaddleOCR.predict(path)`` inside ``silence()``, unlink) against the
+current ``recognize_batch`` path (numpy arrays, one ``silence()`` per call,
+batched ``predict``). Crops are synthetic text blocks unless ``--image`` is
+given, in which case random crops are taken from that image.
+
+Usage::
+
+    python benchmarks/bench_paddleocr_crops.py
+    python benchmarks/bench_paddleocr_crops.py --crops 200 --batch-size 16 --device cpu
+    python benchmarks/bench_paddleocr_crops.py --image page.png
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import warnings
+from typing import List
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def synthetic_crops(n: int) -> List[Image.Image]:
+    """Text-block-sized crops with a few lines of text each."""
+    rng = np.random.default_rng(0)
+    crops = []
+    for i in range(n):
+        w, h = int(rng.integers(600, 1400)), int(rng.integers(60, 260))
+        im = Image.new("RGB", (w, h), "white")
+        draw = ImageDraw.Draw(im)
+        for line, y in enumerate(range(10, h - 20, 24)):
+            draw.text((10, y), f"Block {i} line {line}: the quick brown fox jumps over the lazy dog", fill="black")
+        crops.append(im)
+    return crops
+
+
+def image_crops(path: str, n: int) -> List[Image.Image]:
+    page = Image.open(path).convert("RGB")
+    rng = np.random.default_rng(0)
+    w, h = page.size
+    crops = []
+    for _ in range(n):
+        cw, ch = int(rng.integers(w // 4, w // 2)), int(rng.integers(h // 30, h // 8))
+        x, y = int(rng.integers(0, w - cw)), int(rng.integers(0, h - ch))
+        crops.append(page.crop((x, y, x + cw, y + ch)))
+    return crops
+
+
+def recognize_via_png(engine, image: Image.Image) -> str:
+    """The pre-batching implementation of PaddleOCREngine.recognize."""
+    from doctra.utils.quiet import silence
+
+    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+        tmp_path = tmp_file.name
+        image.save(tmp_path, format="PNG")
+    try:
+        with silence():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                result = engine.ocr.predict(tmp_path)
+        return engine._result_text(result[0]) if result else ""
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crops", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--device", default="cpu", choices=["cpu", "gpu"])
+    parser.add_argument("--image", help="Take crops from this page image instead of synthetic ones")
+    args = parser.parse_args()
+
+    from doctra.engines.ocr import PaddleOCREngine
+
+    crops = image_crops(args.image, args.crops) if args.image else synthetic_crops(args.crops)
+    engine = PaddleOCREngine(device=args.device, batch_size=args.batch_size)
+    engine.recognize_batch(crops[:2])  # warm-up
+
+    t0 = time.perf_counter()
+    before = [recognize_via_png(engine, crop) for crop in crops]
+    t_before = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    after = engine.recognize_batch(crops)
+    t_after = time.perf_counter() - t0
+
+    same = sum(a == b for a, b in zip(before, after))
+    print(f"{len(crops)} crops, batch size {args.batch_size}, device {args.device}")
+    print(f"PNG temp file per crop : {len(crops) / t_before:8.2f} crops/s")
+    print(f"in-memory batches      : {len(crops) / t_after:8.2f} crops/s")
+    print(f"speed-up               : {t_before / t_after:8.2f}x")
+    print(f"identical texts        : {same}/{len(crops)} (PNG vs. lossless array input)")
+
+
+if __name__ == "__main__":
+    main()
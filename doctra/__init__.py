@@ -3,37 +3,50 @@ Doctra - Document Parsing Library
 Parse, extract, and analyze documents with ease
 """
 
-from .parsers.structured_pdf_parser import StructuredPDFParser
-from .parsers.enhanced_pdf_parser import EnhancedPDFParser
-from .parsers.table_chart_extractor import ChartTablePDFParser
-from .engines.image_restoration import DocResEngine
+import importlib
+
 from .version import __version__
-from .ui import build_demo, launch_ui
-
-try:
-    from .parsers.paddleocr_vl_parser import PaddleOCRVLPDFParser
-    __all__ = [
-        'StructuredPDFParser',
-        'EnhancedPDFParser',
-        'ChartTablePDFParser',
-        'PaddleOCRVLPDFParser',
-        'DocResEngine',
-        'build_demo',
-        'launch_ui',
-        '__version__'
-    ]
-except ImportError:
-    __all__ = [
-        'StructuredPDFParser',
-        'EnhancedPDFParser',
-        'ChartTablePDFParser',
-        'DocResEngine',
-        'build_demo',
-        'launch_ui',
-        '__version__'
-    ]
+
+# Public names are imported on first access (PEP 562), so `import doctra`
+# does not load torch, Paddle, gradio or the VLM SDKs up front.
+_LAZY_ATTRS = {
+    'StructuredPDFParser': '.parsers.structured_pdf_parser',
+    'EnhancedPDFParser': '.parsers.enhanced_pdf_parser',
+    'ChartTablePDFParser': '.parsers.table_chart_extractor',
+    'PaddleOCRVLPDFParser': '.parsers.paddleocr_vl_parser',
+    'BatchRunner': '.parsers.batch_runner',
+    'DocResEngine': '.engines.image_restoration',
+    'build_demo': '.ui',
+    'launch_ui': '.ui',
+}
+
+__all__ = [
+    'StructuredPDFParser',
+    'EnhancedPDFParser',
+    'ChartTablePDFParser',
+    'PaddleOCRVLPDFParser',
+    'BatchRunner',
+    'DocResEngine',
+    'build_demo',
+    'launch_ui',
+    '__version__'
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # cache, so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 # Package metadata
 __author__ = 'Adem Boukhris'
 __email__ = 'boukhrisadam98@gmail.com'  # Replace with your email
-__description__ = 'Parse, extract, and analyze documents with ease'
\ No newline at end of file
+__description__ = 'Parse, extract, and analyze documents with ease'
@@ -13,25 +13,10 @@ import traceback
 from pathlib import Path
 from typing import Optional
 
-# Import parsers
-try:
-    from doctra.parsers.structured_pdf_parser_enhancer import StructuredPDFParser
-    from doctra.parsers.enhanced_pdf_parser import EnhancedPDFParser
-    from doctra.parsers.chart_table_pdf_parser import ChartTablePDFParser
-except ImportError:
-    # Fallback for development/testing
-    project_root = Path(__file__).parent.parent.parent
-    sys.path.insert(0, str(project_root))
-    from doctra.parsers.structured_pdf_parser import StructuredPDFParser
-    from doctra.parsers.enhanced_pdf_parser import EnhancedPDFParser
-    from doctra.parsers.table_chart_extractor import ChartTablePDFParser
-
-# Import additional modules
-from doctra.engines.layout.paddle_layout import PaddleLayoutEngine
-from doctra.cli.utils import validate_vlm_config, handle_keyboard_interrupt
-from doctra.engines.image_restoration import DocResEngine
-from doctra.engines.ocr import PytesseractOCREngine, PaddleOCREngine
-from doctra.engines.vlm.service import VLMStructuredExtractor
+from doctra.cli.utils import validate_vlm_config, handle_keyboard_interrupt, report_vlm_cache, report_layout_cache
+
+# Parsers and engines are imported inside the commands that use them, so
+# `doctra --help` and light commands do not load torch, Paddle or VLM SDKs.
 
 
 @click.group(invoke_without_command=True)
@@ -52,6 +37,9 @@ def cli(ctx):
       extract    Extract only charts and/or tables from documents
       visualize  Visualize layout detection results
       analyze    Quick document analysis without processing
+      batch      Process many documents with a pool of workers
+      serve      Run a local parse server with the models kept loaded
+      cache      Inspect or clear layout/VLM caches
       info       Show system information and dependencies
 
     \b
@@ -63,6 +51,8 @@ def cli(ctx):
       doctra extract both document.pdf --use-vlm  # Extract charts & tables with VLM
       doctra visualize document.pdf               # Visualize layout detection
       doctra analyze document.pdf                 # Quick document analysis
+      doctra batch scans/ --workers 4             # Parse a folder of PDFs
+      doctra serve --port 8765                    # Parse server with warm models
       doctra info                                 # System information
 
     For more help on any command, use: doctra COMMAND --help
@@ -84,6 +74,10 @@ def vlm_options(func):
     - --vlm-provider: Choose between 'gemini' or 'openai'
     - --vlm-model: Model name to use (defaults to provider-specific defaults)
     - --vlm-api-key: API key for VLM provider
+    - --vlm-cache-dir: Directory of the on-disk VLM result cache
+    - --no-vlm-cache: Always call the VLM, bypassing the result cache
+    - --vlm-max-concurrency: Maximum number of VLM requests in flight
+    - --vlm-requests-per-minute: Rate limit for VLM requests
 
     :param func: The Click command function to decorate
     :return: Decorated function with VLM options
@@ -96,6 +90,14 @@ def vlm_options(func):
                         help='Model name to use (defaults to provider-specific defaults)')(func)
     func = click.option('--vlm-api-key', type=str, envvar='VLM_API_KEY',
                         help='API key for VLM provider (or set VLM_API_KEY env var)')(func)
+    func = click.option('--vlm-cache-dir', type=click.Path(file_okay=False, path_type=Path), default=None,
+                        help='Directory of the VLM result cache (default: ~/.cache/doctra/vlm or $DOCTRA_CACHE_DIR/vlm)')(func)
+    func = click.option('--no-vlm-cache', is_flag=True, default=False,
+                        help='Do not read or write the VLM result cache')(func)
+    func = click.option('--vlm-max-concurrency', type=click.IntRange(min=1), default=4,
+                        help='Maximum number of VLM requests in flight (default: 4)')(func)
+    func = click.option('--vlm-requests-per-minute', type=click.FloatRange(min=0, min_open=True), default=None,
+                        help='Rate limit for VLM requests to the provider (default: no limit)')(func)
     return func
 
 
@@ -108,6 +110,8 @@ def layout_options(func):
     - --layout-model: Layout detection model name
     - --dpi: DPI for PDF rendering
     - --min-score: Minimum confidence score for layout detection
+    - --layout-cache-dir: Directory of the layout detection cache
+    - --no-layout-cache: Disable the layout detection cache
 
     :param func: The Click command function to decorate
     :return: Decorated function with layout options
@@ -118,6 +122,10 @@ def layout_options(func):
                         help='DPI for PDF rendering (default: 200)')(func)
     func = click.option('--min-score', type=float, default=0.0,
                         help='Minimum confidence score for layout detection (default: 0.0)')(func)
+    func = click.option('--layout-cache-dir', type=click.Path(file_okay=False, path_type=Path), default=None,
+                        help='Directory of the layout detection cache (default: ~/.cache/doctra/layout or $DOCTRA_CACHE_DIR/layout)')(func)
+    func = click.option('--no-layout-cache', is_flag=True, default=False,
+                        help='Do not read or write the layout detection cache')(func)
     return func
 
 
@@ -132,10 +140,12 @@ def ocr_options(func):
     - --ocr-psm: Tesseract page segmentation mode (for PyTesseract)
     - --ocr-oem: Tesseract OCR engine mode (for PyTesseract)
     - --ocr-config: Additional Tesseract configuration (for PyTesseract)
+    - --ocr-workers: Number of text boxes OCR'd concurrently per page (for PyTesseract, default: CPU count)
     - --paddleocr-device: Device for PaddleOCR ("cpu" or "gpu", default: "gpu")
     - --paddleocr-use-doc-orientation-classify: Enable document orientation classification for PaddleOCR
     - --paddleocr-use-doc-unwarping: Enable text image rectification for PaddleOCR
     - --paddleocr-use-textline-orientation: Enable text line orientation classification for PaddleOCR
+    - --paddleocr-batch-size: Number of text crops per PaddleOCR predict call (default: 8)
 
     :param func: The Click command function to decorate
     :return: Decorated function with OCR options
@@ -150,6 +160,8 @@ def ocr_options(func):
                         help='Tesseract OCR engine mode for PyTesseract (default: 3)')(func)
     func = click.option('--ocr-config', default='',
                         help='Additional Tesseract configuration string for PyTesseract')(func)
+    func = click.option('--ocr-workers', type=click.IntRange(min=1), default=None,
+                        help='Number of text boxes OCR\'d concurrently per page for PyTesseract (default: CPU count)')(func)
     func = click.option('--paddleocr-device', type=click.Choice(['cpu', 'gpu']), default='gpu',
                         help='Device for PaddleOCR (default: gpu)')(func)
     func = click.option('--paddleocr-use-doc-orientation-classify', is_flag=True, default=False,
@@ -158,6 +170,8 @@ def ocr_options(func):
                         help='Enable text image rectification for PaddleOCR')(func)
     func = click.option('--paddleocr-use-textline-orientation', is_flag=True, default=False,
                         help='Enable text line orientation classification for PaddleOCR')(func)
+    func = click.option('--paddleocr-batch-size', type=click.IntRange(min=1), default=8,
+                        help='Number of text crops per PaddleOCR predict call (default: 8)')(func)
     return func
 
 
@@ -172,15 +186,22 @@ def ocr_options(func):
 @ocr_options
 @click.option('--box-separator', default='\n',
               help='Separator between text boxes in output (default: newline)')
+@click.option('--resume', is_flag=True, default=False,
+              help='Skip pages already parsed by an interrupted run (from its checkpoint journal)')
 @click.option('--verbose', '-v', is_flag=True,
               help='Enable verbose output')
 def parse(pdf_path: Path, output_dir: Optional[Path], use_vlm: bool,
           vlm_provider: str, vlm_model: Optional[str], vlm_api_key: Optional[str],
+          vlm_cache_dir: Optional[Path], no_vlm_cache: bool,
+          vlm_max_concurrency: int, vlm_requests_per_minute: Optional[float],
           layout_model: str, dpi: int, min_score: float,
+          layout_cache_dir: Optional[Path], no_layout_cache: bool,
           ocr_engine: str, ocr_lang: str, ocr_psm: int, ocr_oem: int, ocr_config: str,
+          ocr_workers: Optional[int],
           paddleocr_device: str, paddleocr_use_doc_orientation_classify: bool,
           paddleocr_use_doc_unwarping: bool, paddleocr_use_textline_orientation: bool,
-          box_separator: str, verbose: bool):
+          paddleocr_batch_size: int,
+          box_separator: str, resume: bool, verbose: bool):
     """
     Parse a PDF document and extract all structured content.
 
@@ -194,6 +215,7 @@ def parse(pdf_path: Path, output_dir: Optional[Path], use_vlm: bool,
       doctra parse document.pdf --use-vlm --vlm-api-key your_key
       doctra parse document.pdf -o ./results --dpi 300
       doctra parse document.pdf --vlm-provider openai --use-vlm
+      doctra parse document.pdf --resume
 
     \b
     VLM Setup:
@@ -206,14 +228,23 @@ def parse(pdf_path: Path, output_dir: Optional[Path], use_vlm: bool,
     :param vlm_provider: VLM provider ('gemini' or 'openai')
     :param vlm_model: Model name to use (defaults to provider-specific defaults)
     :param vlm_api_key: API key for VLM provider
+    :param vlm_cache_dir: Directory of the VLM result cache
+    :param no_vlm_cache: Bypass the VLM result cache
+    :param vlm_max_concurrency: Maximum number of VLM requests in flight
+    :param vlm_requests_per_minute: Rate limit for VLM requests (None for no limit)
     :param layout_model: Layout detection model name
     :param dpi: DPI for PDF rendering
     :param min_score: Minimum confidence score for layout detection
+    :param layout_cache_dir: Directory of the layout detection cache
+    :param no_layout_cache: Whether to bypass the layout detection cache
     :param ocr_lang: OCR language code
     :param ocr_psm: Tesseract page segmentation mode
     :param ocr_oem: Tesseract OCR engine mode
     :param ocr_config: Additional Tesseract configuration
+    :param ocr_workers: Number of text boxes OCR'd concurrently per page
+    :param paddleocr_batch_size: Number of text crops per PaddleOCR predict call
     :param box_separator: Separator between text boxes in output
+    :param resume: Whether to skip pages already parsed by an interrupted run
     :param verbose: Whether to enable verbose output
     :return: None
     """
@@ -227,6 +258,10 @@ def parse(pdf_path: Path, output_dir: Optional[Path], use_vlm: bool,
 
     # Create parser instance
     try:
+        from doctra.engines.ocr import PytesseractOCREngine, PaddleOCREngine
+        from doctra.engines.vlm.service import VLMStructuredExtractor
+        from doctra.parsers.structured_pdf_parser import StructuredPDFParser
+
         if verbose:
             click.echo(f"🔧 Initializing full parser...")
             if use_vlm:
@@ -248,7 +283,8 @@ def parse(pdf_path: Path, output_dir: Optional[Path], use_vlm: bool,
                 use_doc_orientation_classify=paddleocr_use_doc_orientation_classify,
                 use_doc_unwarping=paddleocr_use_doc_unwarping,
                 use_textline_orientation=paddleocr_use_textline_orientation,
-                device=paddleocr_device
+                device=paddleocr_device,
+                batch_size=paddleocr_batch_size
             )
         else:  # pytesseract
             ocr_engine_instance = PytesseractOCREngine(
@@ -263,6 +299,10 @@ def parse(pdf_path: Path, output_dir: Optional[Path], use_vlm: bool,
                     vlm_provider=vlm_provider,
                     vlm_model=vlm_model,
                     api_key=vlm_api_key,
+                    use_cache=not no_vlm_cache,
+                    cache_dir=str(vlm_cache_dir) if vlm_cache_dir else None,
+                    max_concurrency=vlm_max_concurrency,
+                    requests_per_minute=vlm_requests_per_minute,
                 )
             except Exception as e:
                 click.echo(f"⚠️  Warning: VLM initialization failed: {e}", err=True)
@@ -272,10 +312,13 @@ def parse(pdf_path: Path, output_dir: Optional[Path], use_vlm: bool,
         parser = StructuredPDFParser(
             vlm=vlm_engine,
             layout_model_name=layout_model,
+            use_layout_cache=not no_layout_cache,
+            layout_cache_dir=str(layout_cache_dir) if layout_cache_dir else None,
             dpi=dpi,
             min_score=min_score,
             ocr_engine=ocr_engine_instance,
-            box_separator=box_separator
+            box_separator=box_separator,
+            ocr_workers=ocr_workers
         )
     except Exception as e:
         click.echo(f"❌ Error initializing parser: {e}", err=True)
@@ -293,7 +336,9 @@ def parse(pdf_path: Path, output_dir: Optional[Path], use_vlm: bool,
     try:
         # Parse the document
         click.echo(f"📄 Processing: {pdf_path.name}")
-        parser.parse(str(pdf_path.absolute()))
+        parser.parse(str(pdf_path.absolute()), resume=resume)
+        report_vlm_cache(vlm_engine)
+        report_layout_cache(parser.layout_engine)
         click.echo("✅ Full document processing completed successfully!")
         click.echo(f"📁 Output directory: {output_dir.absolute() if output_dir else 'outputs/'}")
 
@@ -327,6 +372,8 @@ def parse(pdf_path: Path, output_dir: Optional[Path], use_vlm: bool,
               help='Enable verbose output')
 def parse_docx(docx_path: Path, output_dir: Optional[Path], use_vlm: bool,
                vlm_provider: str, vlm_model: Optional[str], vlm_api_key: Optional[str],
+               vlm_cache_dir: Optional[Path], no_vlm_cache: bool,
+               vlm_max_concurrency: int, vlm_requests_per_minute: Optional[float],
                extract_images: bool, preserve_formatting: bool, table_detection: bool,
                export_excel: bool, verbose: bool):
     """
@@ -354,6 +401,10 @@ def parse_docx(docx_path: Path, output_dir: Optional[Path], use_vlm: bool,
     :param vlm_provider: VLM provider ('gemini' or 'openai')
     :param vlm_model: Model name to use (defaults to provider-specific defaults)
     :param vlm_api_key: API key for VLM provider
+    :param vlm_cache_dir: Directory of the VLM result cache
+    :param no_vlm_cache: Bypass the VLM result cache
+    :param vlm_max_concurrency: Maximum number of VLM requests in flight
+    :param vlm_requests_per_minute: Rate limit for VLM requests (None for no limit)
     :param extract_images: Whether to extract embedded images
     :param preserve_formatting: Whether to preserve text formatting
     :param table_detection: Whether to detect and extract tables
@@ -380,6 +431,7 @@ def parse_docx(docx_path: Path, output_dir: Optional[Path], use_vlm: bool,
 
     # Create parser instance
     try:
+        from doctra.engines.vlm.service import VLMStructuredExtractor
         from doctra.parsers.structured_docx_parser import StructuredDOCXParser
         
         # Create VLM engine instance if needed
@@ -390,6 +442,10 @@ def parse_docx(docx_path: Path, output_dir: Optional[Path], use_vlm: bool,
                     vlm_provider=vlm_provider,
                     vlm_model=vlm_model,
                     api_key=vlm_api_key,
+                    use_cache=not no_vlm_cache,
+                    cache_dir=str(vlm_cache_dir) if vlm_cache_dir else None,
+                    max_concurrency=vlm_max_concurrency,
+                    requests_per_minute=vlm_requests_per_minute,
                 )
             except Exception as e:
                 click.echo(f"⚠️  Warning: VLM initialization failed: {e}", err=True)
@@ -424,6 +480,7 @@ def parse_docx(docx_path: Path, output_dir: Optional[Path], use_vlm: bool,
         # Parse the document
         click.echo(f"📄 Processing: {docx_path.name}")
         parser.parse(str(docx_path.absolute()))
+        report_vlm_cache(vlm_engine)
         click.echo("✅ DOCX parsing completed successfully!")
         click.echo(f"📁 Output directory: {output_dir.absolute() if output_dir else 'outputs/'}")
 
@@ -450,6 +507,16 @@ def parse_docx(docx_path: Path, output_dir: Optional[Path], use_vlm: bool,
               help='Device for DocRes processing (default: auto-detect)')
 @click.option('--restoration-dpi', type=int, default=200,
               help='DPI for restoration processing (default: 200)')
+@click.option('--restoration-batch-size', type=click.IntRange(min=1), default=4,
+              help='Pages restored together in one DocRes forward pass (default: 4)')
+@click.option('--restoration-precision', type=click.Choice(['auto', 'fp32', 'fp16', 'bf16']), default='auto',
+              help='DocRes precision; auto is fp16 on CUDA and fp32 on CPU (default: auto)')
+@click.option('--restoration-runtime', type=click.Choice(['eager', 'jit', 'compile']), default='eager',
+              help='Run the DocRes model eagerly, through TorchScript traces or torch.compile (default: eager)')
+@click.option('--restoration-tile-size', type=click.IntRange(min=8), default=None,
+              help='Restore pages larger than this in overlapping tiles of this size, a multiple of 8 (default: whole pages)')
+@click.option('--restoration-tile-overlap', type=click.IntRange(min=0), default=None,
+              help='Minimum overlap between restoration tiles (default: 64, or half a smaller tile)')
 @vlm_options
 @layout_options
 @ocr_options
@@ -458,12 +525,19 @@ def parse_docx(docx_path: Path, output_dir: Optional[Path], use_vlm: bool,
 @click.option('--verbose', '-v', is_flag=True,
               help='Enable verbose output')
 def enhance(pdf_path: Path, output_dir: Optional[Path], restoration_task: str,
-           restoration_device: Optional[str], restoration_dpi: int,
+           restoration_device: Optional[str], restoration_dpi: int, restoration_batch_size: int,
+           restoration_precision: str, restoration_runtime: str,
+           restoration_tile_size: Optional[int], restoration_tile_overlap: Optional[int],
            use_vlm: bool, vlm_provider: str, vlm_model: Optional[str], vlm_api_key: Optional[str],
+           vlm_cache_dir: Optional[Path], no_vlm_cache: bool,
+           vlm_max_concurrency: int, vlm_requests_per_minute: Optional[float],
            layout_model: str, dpi: int, min_score: float,
+           layout_cache_dir: Optional[Path], no_layout_cache: bool,
            ocr_engine: str, ocr_lang: str, ocr_psm: int, ocr_oem: int, ocr_config: str,
+           ocr_workers: Optional[int],
            paddleocr_device: str, paddleocr_use_doc_orientation_classify: bool,
            paddleocr_use_doc_unwarping: bool, paddleocr_use_textline_orientation: bool,
+           paddleocr_batch_size: int,
            box_separator: str, verbose: bool):
     """
     Enhanced PDF parsing with DocRes image restoration.
@@ -495,17 +569,30 @@ def enhance(pdf_path: Path, output_dir: Optional[Path], restoration_task: str,
     :param restoration_task: DocRes restoration task to perform
     :param restoration_device: Device for DocRes processing
     :param restoration_dpi: DPI for restoration processing
+    :param restoration_batch_size: Pages restored together in one DocRes forward pass
+    :param restoration_precision: DocRes precision ("auto", "fp32", "fp16" or "bf16")
+    :param restoration_runtime: DocRes model runtime ("eager", "jit" or "compile")
+    :param restoration_tile_size: Tile size for restoring large pages in tiles
+    :param restoration_tile_overlap: Overlap between restoration tiles
     :param use_vlm: Whether to use VLM for enhanced extraction
     :param vlm_provider: VLM provider ('gemini' or 'openai')
     :param vlm_model: Model name to use (defaults to provider-specific defaults)
     :param vlm_api_key: API key for VLM provider
+    :param vlm_cache_dir: Directory of the VLM result cache
+    :param no_vlm_cache: Bypass the VLM result cache
+    :param vlm_max_concurrency: Maximum number of VLM requests in flight
+    :param vlm_requests_per_minute: Rate limit for VLM requests (None for no limit)
     :param layout_model: Layout detection model name
     :param dpi: DPI for PDF rendering
     :param min_score: Minimum confidence score for layout detection
+    :param layout_cache_dir: Directory of the layout detection cache
+    :param no_layout_cache: Whether to bypass the layout detection cache
     :param ocr_lang: OCR language code
     :param ocr_psm: Tesseract page segmentation mode
     :param ocr_oem: Tesseract OCR engine mode
     :param ocr_config: Additional Tesseract configuration
+    :param ocr_workers: Number of text boxes OCR'd concurrently per page
+    :param paddleocr_batch_size: Number of text crops per PaddleOCR predict call
     :param box_separator: Separator between text boxes in output
     :param verbose: Whether to enable verbose output
     :return: None
@@ -518,11 +605,19 @@ def enhance(pdf_path: Path, output_dir: Optional[Path], restoration_task: str,
         click.echo(f"   Restoration task: {restoration_task}")
         click.echo(f"   Restoration device: {restoration_device or 'auto-detect'}")
         click.echo(f"   Restoration DPI: {restoration_dpi}")
+        click.echo(f"   Restoration batch size: {restoration_batch_size}")
+        click.echo(f"   Restoration precision: {restoration_precision} ({restoration_runtime})")
+        if restoration_tile_size:
+            click.echo(f"   Restoration tiles: {restoration_tile_size}px")
         if output_dir:
             click.echo(f"   Output: {output_dir}")
 
     # Create enhanced parser instance
     try:
+        from doctra.engines.ocr import PytesseractOCREngine, PaddleOCREngine
+        from doctra.engines.vlm.service import VLMStructuredExtractor
+        from doctra.parsers.enhanced_pdf_parser import EnhancedPDFParser
+
         if verbose:
             click.echo(f"🔧 Initializing enhanced parser with DocRes...")
             if use_vlm:
@@ -544,7 +639,8 @@ def enhance(pdf_path: Path, output_dir: Optional[Path], restoration_task: str,
                 use_doc_orientation_classify=paddleocr_use_doc_orientation_classify,
                 use_doc_unwarping=paddleocr_use_doc_unwarping,
                 use_textline_orientation=paddleocr_use_textline_orientation,
-                device=paddleocr_device
+                device=paddleocr_device,
+                batch_size=paddleocr_batch_size
             )
         else:  # pytesseract
             ocr_engine_instance = PytesseractOCREngine(
@@ -559,6 +655,10 @@ def enhance(pdf_path: Path, output_dir: Optional[Path], restoration_task: str,
                     vlm_provider=vlm_provider,
                     vlm_model=vlm_model,
                     api_key=vlm_api_key,
+                    use_cache=not no_vlm_cache,
+                    cache_dir=str(vlm_cache_dir) if vlm_cache_dir else None,
+                    max_concurrency=vlm_max_concurrency,
+                    requests_per_minute=vlm_requests_per_minute,
                 )
             except Exception as e:
                 click.echo(f"⚠️  Warning: VLM initialization failed: {e}", err=True)
@@ -570,12 +670,20 @@ def enhance(pdf_path: Path, output_dir: Optional[Path], restoration_task: str,
             restoration_task=restoration_task,
             restoration_device=restoration_device,
             restoration_dpi=restoration_dpi,
+            restoration_batch_size=restoration_batch_size,
+            restoration_precision=restoration_precision,
+            restoration_runtime=restoration_runtime,
+            restoration_tile_size=restoration_tile_size,
+            restoration_tile_overlap=restoration_tile_overlap,
             vlm=vlm_engine,
             layout_model_name=layout_model,
+            use_layout_cache=not no_layout_cache,
+            layout_cache_dir=str(layout_cache_dir) if layout_cache_dir else None,
             dpi=dpi,
             min_score=min_score,
             ocr_engine=ocr_engine_instance,
-            box_separator=box_separator
+            box_separator=box_separator,
+            ocr_workers=ocr_workers
         )
     except Exception as e:
         click.echo(f"❌ Error initializing enhanced parser: {e}", err=True)
@@ -594,6 +702,8 @@ def enhance(pdf_path: Path, output_dir: Optional[Path], restoration_task: str,
         # Parse the document with enhancement
         click.echo(f"📄 Processing with enhancement: {pdf_path.name}")
         parser.parse(str(pdf_path.absolute()), str(output_dir) if output_dir else None)
+        report_vlm_cache(vlm_engine)
+        report_layout_cache(parser.layout_engine)
         click.echo("✅ Enhanced document processing completed successfully!")
         click.echo(f"📁 Output directory: {output_dir.absolute() if output_dir else 'outputs/'}")
 
@@ -647,7 +757,10 @@ def extract(ctx):
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
 def charts(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
            vlm_model: Optional[str], vlm_api_key: Optional[str],
-           layout_model: str, dpi: int, min_score: float, verbose: bool):
+           vlm_cache_dir: Optional[Path], no_vlm_cache: bool,
+           vlm_max_concurrency: int, vlm_requests_per_minute: Optional[float],
+           layout_model: str, dpi: int, min_score: float,
+           layout_cache_dir: Optional[Path], no_layout_cache: bool, verbose: bool):
     """
     Extract only charts from a PDF document.
 
@@ -665,9 +778,15 @@ def charts(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
     :param vlm_provider: VLM provider ('gemini' or 'openai')
     :param vlm_model: Model name to use (defaults to provider-specific defaults)
     :param vlm_api_key: API key for VLM provider
+    :param vlm_cache_dir: Directory of the VLM result cache
+    :param no_vlm_cache: Bypass the VLM result cache
+    :param vlm_max_concurrency: Maximum number of VLM requests in flight
+    :param vlm_requests_per_minute: Rate limit for VLM requests (None for no limit)
     :param layout_model: Layout detection model name
     :param dpi: DPI for PDF rendering
     :param min_score: Minimum confidence score for layout detection
+    :param layout_cache_dir: Directory of the layout detection cache
+    :param no_layout_cache: Whether to bypass the layout detection cache
     :param verbose: Whether to enable verbose output
     :return: None
     """
@@ -679,6 +798,9 @@ def charts(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
         click.echo(f"   Output base: {output_dir}")
 
     try:
+        from doctra.engines.vlm.service import VLMStructuredExtractor
+        from doctra.parsers.table_chart_extractor import ChartTablePDFParser
+
         if verbose:
             click.echo(f"🔧 Initializing chart extractor...")
             if use_vlm:
@@ -696,6 +818,10 @@ def charts(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
                     vlm_provider=vlm_provider,
                     vlm_model=vlm_model,
                     api_key=vlm_api_key,
+                    use_cache=not no_vlm_cache,
+                    cache_dir=str(vlm_cache_dir) if vlm_cache_dir else None,
+                    max_concurrency=vlm_max_concurrency,
+                    requests_per_minute=vlm_requests_per_minute,
                 )
             except Exception as e:
                 click.echo(f"⚠️  Warning: VLM initialization failed: {e}", err=True)
@@ -707,12 +833,16 @@ def charts(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
             extract_tables=False,
             vlm=vlm_engine,
             layout_model_name=layout_model,
+            use_layout_cache=not no_layout_cache,
+            layout_cache_dir=str(layout_cache_dir) if layout_cache_dir else None,
             dpi=dpi,
             min_score=min_score
         )
 
         click.echo(f"📄 Processing: {pdf_path.name}")
         parser.parse(str(pdf_path), str(output_dir))
+        report_vlm_cache(vlm_engine)
+        report_layout_cache(parser.layout_engine)
         click.echo("✅ Chart extraction completed successfully!")
 
     except KeyboardInterrupt:
@@ -734,7 +864,10 @@ def charts(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
 def tables(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
            vlm_model: Optional[str], vlm_api_key: Optional[str],
-           layout_model: str, dpi: int, min_score: float, verbose: bool):
+           vlm_cache_dir: Optional[Path], no_vlm_cache: bool,
+           vlm_max_concurrency: int, vlm_requests_per_minute: Optional[float],
+           layout_model: str, dpi: int, min_score: float,
+           layout_cache_dir: Optional[Path], no_layout_cache: bool, verbose: bool):
     """
     Extract only tables from a PDF document.
 
@@ -752,9 +885,15 @@ def tables(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
     :param vlm_provider: VLM provider ('gemini' or 'openai')
     :param vlm_model: Model name to use (defaults to provider-specific defaults)
     :param vlm_api_key: API key for VLM provider
+    :param vlm_cache_dir: Directory of the VLM result cache
+    :param no_vlm_cache: Bypass the VLM result cache
+    :param vlm_max_concurrency: Maximum number of VLM requests in flight
+    :param vlm_requests_per_minute: Rate limit for VLM requests (None for no limit)
     :param layout_model: Layout detection model name
     :param dpi: DPI for PDF rendering
     :param min_score: Minimum confidence score for layout detection
+    :param layout_cache_dir: Directory of the layout detection cache
+    :param no_layout_cache: Whether to bypass the layout detection cache
     :param verbose: Whether to enable verbose output
     :return: None
     """
@@ -766,6 +905,9 @@ def tables(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
         click.echo(f"   Output base: {output_dir}")
 
     try:
+        from doctra.engines.vlm.service import VLMStructuredExtractor
+        from doctra.parsers.table_chart_extractor import ChartTablePDFParser
+
         if verbose:
             click.echo(f"🔧 Initializing table extractor...")
             if use_vlm:
@@ -783,6 +925,10 @@ def tables(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
                     vlm_provider=vlm_provider,
                     vlm_model=vlm_model,
                     api_key=vlm_api_key,
+                    use_cache=not no_vlm_cache,
+                    cache_dir=str(vlm_cache_dir) if vlm_cache_dir else None,
+                    max_concurrency=vlm_max_concurrency,
+                    requests_per_minute=vlm_requests_per_minute,
                 )
             except Exception as e:
                 click.echo(f"⚠️  Warning: VLM initialization failed: {e}", err=True)
@@ -794,12 +940,16 @@ def tables(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
             extract_tables=True,
             vlm=vlm_engine,
             layout_model_name=layout_model,
+            use_layout_cache=not no_layout_cache,
+            layout_cache_dir=str(layout_cache_dir) if layout_cache_dir else None,
             dpi=dpi,
             min_score=min_score
         )
 
         click.echo(f"📄 Processing: {pdf_path.name}")
         parser.parse(str(pdf_path), str(output_dir))
+        report_vlm_cache(vlm_engine)
+        report_layout_cache(parser.layout_engine)
         click.echo("✅ Table extraction completed successfully!")
         click.echo(f"📁 Output directory: {output_dir.absolute()}")
 
@@ -822,7 +972,10 @@ def tables(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
 def both(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
          vlm_model: Optional[str], vlm_api_key: Optional[str],
-         layout_model: str, dpi: int, min_score: float, verbose: bool):
+         vlm_cache_dir: Optional[Path], no_vlm_cache: bool,
+         vlm_max_concurrency: int, vlm_requests_per_minute: Optional[float],
+         layout_model: str, dpi: int, min_score: float,
+         layout_cache_dir: Optional[Path], no_layout_cache: bool, verbose: bool):
     """
     Extract both charts and tables from a PDF document.
 
@@ -841,9 +994,15 @@ def both(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
     :param vlm_provider: VLM provider ('gemini' or 'openai')
     :param vlm_model: Model name to use (defaults to provider-specific defaults)
     :param vlm_api_key: API key for VLM provider
+    :param vlm_cache_dir: Directory of the VLM result cache
+    :param no_vlm_cache: Bypass the VLM result cache
+    :param vlm_max_concurrency: Maximum number of VLM requests in flight
+    :param vlm_requests_per_minute: Rate limit for VLM requests (None for no limit)
     :param layout_model: Layout detection model name
     :param dpi: DPI for PDF rendering
     :param min_score: Minimum confidence score for layout detection
+    :param layout_cache_dir: Directory of the layout detection cache
+    :param no_layout_cache: Whether to bypass the layout detection cache
     :param verbose: Whether to enable verbose output
     :return: None
     """
@@ -855,6 +1014,9 @@ def both(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
         click.echo(f"   Output base: {output_dir}")
 
     try:
+        from doctra.engines.vlm.service import VLMStructuredExtractor
+        from doctra.parsers.table_chart_extractor import ChartTablePDFParser
+
         if verbose:
             click.echo(f"🔧 Initializing chart/table extractor...")
             if use_vlm:
@@ -872,6 +1034,10 @@ def both(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
                     vlm_provider=vlm_provider,
                     vlm_model=vlm_model,
                     api_key=vlm_api_key,
+                    use_cache=not no_vlm_cache,
+                    cache_dir=str(vlm_cache_dir) if vlm_cache_dir else None,
+                    max_concurrency=vlm_max_concurrency,
+                    requests_per_minute=vlm_requests_per_minute,
                 )
             except Exception as e:
                 click.echo(f"⚠️  Warning: VLM initialization failed: {e}", err=True)
@@ -883,12 +1049,16 @@ def both(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
             extract_tables=True,
             vlm=vlm_engine,
             layout_model_name=layout_model,
+            use_layout_cache=not no_layout_cache,
+            layout_cache_dir=str(layout_cache_dir) if layout_cache_dir else None,
             dpi=dpi,
             min_score=min_score
         )
 
         click.echo(f"📄 Processing: {pdf_path.name}")
         parser.parse(str(pdf_path), str(output_dir))
+        report_vlm_cache(vlm_engine)
+        report_layout_cache(parser.layout_engine)
         click.echo("✅ Chart and table extraction completed successfully!")
         click.echo(f"📁 Output directory: {output_dir.absolute()}")
 
@@ -918,7 +1088,7 @@ def both(pdf_path: Path, output_dir: Path, use_vlm: bool, vlm_provider: str,
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
 def visualize(pdf_path: Path, pages: int, columns: int, width: int,
               spacing: int, output: Optional[Path], dpi: int, min_score: float,
-              layout_model: str, verbose: bool):
+              layout_model: str, layout_cache_dir: Optional[Path], no_layout_cache: bool, verbose: bool):
     """
     Visualize layout detection results for a PDF.
 
@@ -940,10 +1110,14 @@ def visualize(pdf_path: Path, pages: int, columns: int, width: int,
     :param dpi: DPI for PDF rendering
     :param min_score: Minimum confidence score for layout detection
     :param layout_model: Layout detection model name
+    :param layout_cache_dir: Directory of the layout detection cache
+    :param no_layout_cache: Whether to bypass the layout detection cache
     :param verbose: Whether to enable verbose output
     :return: None
     """
     try:
+        from doctra.parsers.structured_pdf_parser import StructuredPDFParser
+
         if verbose:
             click.echo(f"🎨 Creating layout visualization...")
             click.echo(f"   Input: {pdf_path}")
@@ -956,6 +1130,8 @@ def visualize(pdf_path: Path, pages: int, columns: int, width: int,
         # Create parser instance (no VLM needed for visualization)
         parser = StructuredPDFParser(
             layout_model_name=layout_model,
+            use_layout_cache=not no_layout_cache,
+            layout_cache_dir=str(layout_cache_dir) if layout_cache_dir else None,
             dpi=dpi,
             min_score=min_score
         )
@@ -993,28 +1169,48 @@ def visualize(pdf_path: Path, pages: int, columns: int, width: int,
 @cli.command()
 @click.argument('pdf_path', type=click.Path(exists=True, path_type=Path))
 @layout_options
+@click.option('--save-layout', type=click.Path(file_okay=False, path_type=Path),
+              help='Append the detections to this layout store for later corpus analysis')
 @click.option('--verbose', '-v', is_flag=True, help='Show detailed per-page breakdown')
-def analyze(pdf_path: Path, dpi: int, min_score: float, layout_model: str, verbose: bool):
+def analyze(pdf_path: Path, dpi: int, min_score: float, layout_model: str,
+            layout_cache_dir: Optional[Path], no_layout_cache: bool, save_layout: Optional[Path], verbose: bool):
     """
     Analyze a PDF and show statistics without processing.
 
     Quick analysis to understand document structure before full processing.
     Shows total pages, element counts, and distribution statistics.
 
+    PDF_PATH may also be a layout store written with --save-layout; the
+    statistics are then computed over every document in it, reading the
+    memory-mapped store in chunks instead of loading it.
+
     \b
     Examples:
       doctra analyze document.pdf
       doctra analyze document.pdf --verbose
       doctra analyze document.pdf --min-score 0.5
+      doctra analyze document.pdf --save-layout corpus.layout
+      doctra analyze corpus.layout
 
-    :param pdf_path: Path to the input PDF file
+    :param pdf_path: Path to the input PDF file, or to a layout store
     :param dpi: DPI for PDF rendering
     :param min_score: Minimum confidence score for layout detection
     :param layout_model: Layout detection model name
+    :param layout_cache_dir: Directory of the layout detection cache
+    :param no_layout_cache: Whether to bypass the layout detection cache
+    :param save_layout: Layout store to append the detections to
     :param verbose: Whether to show detailed per-page breakdown
     :return: None
     """
     try:
+        from doctra.engines.layout.layout_store import is_layout_store
+
+        if is_layout_store(str(pdf_path)):
+            _analyze_store(pdf_path, min_score, verbose)
+            return
+
+        from doctra.engines.layout.paddle_layout import PaddleLayoutEngine
+
         click.echo(f"🔍 Analyzing: {pdf_path.name}")
 
         # Create layout engine for analysis only
@@ -1023,8 +1219,16 @@ def analyze(pdf_path: Path, dpi: int, min_score: float, layout_model: str, verbo
             click.echo(f"   Using model: {layout_model}")
             click.echo(f"   DPI: {dpi}, Min score: {min_score}")
 
-        layout_engine = PaddleLayoutEngine(model_name=layout_model)
+        layout_engine = PaddleLayoutEngine(
+            model_name=layout_model,
+            use_cache=not no_layout_cache,
+            cache_dir=str(layout_cache_dir) if layout_cache_dir else None,
+        )
         pages = layout_engine.predict_pdf(str(pdf_path), dpi=dpi, min_score=min_score)
+        report_layout_cache(layout_engine)
+        if save_layout:
+            layout_engine.save_store(pages, str(save_layout), document=str(pdf_path))
+            click.echo(f"💾 Layout saved to store: {save_layout}")
 
         click.echo(f"\n📊 Document Analysis Results:")
         click.echo(f"   Total pages: {len(pages)}")
@@ -1049,10 +1253,7 @@ def analyze(pdf_path: Path, dpi: int, min_score: float, layout_model: str, verbo
             avg_elements = total_elements / len(pages)
             click.echo(f"   Average per page: {avg_elements:.1f}")
 
-            click.echo(f"\n   📋 Elements by type:")
-            for element_type, count in sorted(element_counts.items(), key=lambda x: x[1], reverse=True):
-                percentage = (count / total_elements) * 100
-                click.echo(f"     • {element_type.ljust(10)}: {str(count).rjust(3)} ({percentage:4.1f}%)")
+            _echo_element_counts(element_counts, total_elements)
 
             # Chart and table specific analysis
             charts = element_counts.get('chart', 0)
@@ -1119,6 +1320,525 @@ def analyze(pdf_path: Path, dpi: int, min_score: float, layout_model: str, verbo
         sys.exit(1)
 
 
+def _echo_element_counts(element_counts: dict, total_elements: int) -> None:
+    """
+    Print the per-label element counts of an analysis, most frequent first.
+
+    :param element_counts: Mapping of label to number of elements
+    :param total_elements: Total number of elements
+    :return: None
+    """
+    click.echo(f"\n   📋 Elements by type:")
+    for element_type, count in sorted(element_counts.items(), key=lambda x: x[1], reverse=True):
+        percentage = (count / total_elements) * 100
+        click.echo(f"     • {element_type.ljust(10)}: {str(count).rjust(3)} ({percentage:4.1f}%)")
+
+
+def _analyze_store(store_path: Path, min_score: float, verbose: bool) -> None:
+    """
+    Print corpus statistics for a layout store.
+
+    :param store_path: Layout store directory
+    :param min_score: Only count elements scoring at least this much
+    :param verbose: Whether to show a per-document breakdown
+    :return: None
+    """
+    import numpy as np
+    from doctra.engines.layout.layout_store import LayoutStore
+
+    store = LayoutStore(str(store_path))
+    click.echo(f"🔍 Analyzing layout store: {store_path}")
+    stats = store.stats(min_score=min_score)
+
+    click.echo(f"\n📊 Corpus Analysis Results:")
+    click.echo(f"   Documents: {stats['documents']}")
+    click.echo(f"   Total pages: {stats['pages']}")
+    click.echo(f"   Total elements: {stats['boxes']}")
+    if stats["boxes"] == 0:
+        click.echo("   ⚠️  No elements in the store (try lowering --min-score)")
+        return
+
+    per_page = stats["boxes_per_page"]
+    click.echo(f"   Average per page: {stats['boxes'] / stats['pages']:.1f}")
+    _echo_element_counts(stats["label_counts"], stats["boxes"])
+
+    click.echo(f"\n   📄 Page summary:")
+    click.echo(f"     Range: {per_page.min()} - {per_page.max()} elements per page")
+    busiest = store.pages[int(per_page.argmax())]
+    click.echo(f"     Most elements: {store.documents[busiest['document']]} page {busiest['page_index']} "
+               f"({per_page.max()} elements)")
+
+    if verbose:
+        click.echo(f"\n   📚 Document breakdown:")
+        page_docs = np.asarray(store.pages["document"])
+        doc_pages = np.bincount(page_docs, minlength=store.num_documents)
+        doc_elements = np.bincount(page_docs, weights=per_page, minlength=store.num_documents)
+        for doc_id, name in enumerate(store.documents[:20]):
+            click.echo(f"     {name}: {doc_pages[doc_id]} pages, {int(doc_elements[doc_id])} elements")
+        if store.num_documents > 20:
+            click.echo(f"     ... and {store.num_documents - 20} more documents")
+
+
+def _worker_parser_config(mode: str, options: dict):
+    """
+    Translate the parser, VLM, layout and OCR options of a command into the
+    picklable kwargs used to build a parser in a batch worker or the server.
+
+    :param mode: "parse", "enhance", "charts", "tables" or "both"
+    :param options: The command's option values (``click.Context.params``)
+    :return: Tuple of (parser_kwargs, vlm_kwargs or None, ocr_kwargs or None)
+    """
+    o = options
+    parser_kwargs = {
+        "layout_model_name": o["layout_model"],
+        "dpi": o["dpi"],
+        "min_score": o["min_score"],
+        "use_layout_cache": not o["no_layout_cache"],
+        "layout_cache_dir": str(o["layout_cache_dir"]) if o["layout_cache_dir"] else None,
+    }
+    if mode in ("parse", "enhance"):
+        parser_kwargs.update(box_separator=o["box_separator"], ocr_workers=o["ocr_workers"])
+    if mode == "enhance":
+        parser_kwargs.update(use_image_restoration=True, restoration_task=o["restoration_task"],
+                             restoration_device=o["restoration_device"], restoration_dpi=o["restoration_dpi"],
+                             restoration_batch_size=o["restoration_batch_size"],
+                             restoration_precision=o["restoration_precision"],
+                             restoration_runtime=o["restoration_runtime"],
+                             restoration_tile_size=o["restoration_tile_size"],
+                             restoration_tile_overlap=o["restoration_tile_overlap"])
+
+    vlm_kwargs = None
+    if o["use_vlm"]:
+        vlm_kwargs = {
+            "vlm_provider": o["vlm_provider"],
+            "vlm_model": o["vlm_model"],
+            "api_key": o["vlm_api_key"],
+            "use_cache": not o["no_vlm_cache"],
+            "cache_dir": str(o["vlm_cache_dir"]) if o["vlm_cache_dir"] else None,
+            "max_concurrency": o["vlm_max_concurrency"],
+            "requests_per_minute": o["vlm_requests_per_minute"],
+        }
+
+    if mode not in ("parse", "enhance"):
+        ocr_kwargs = None
+    elif o["ocr_engine"] == "paddleocr":
+        ocr_kwargs = {
+            "engine": "paddleocr",
+            "use_doc_orientation_classify": o["paddleocr_use_doc_orientation_classify"],
+            "use_doc_unwarping": o["paddleocr_use_doc_unwarping"],
+            "use_textline_orientation": o["paddleocr_use_textline_orientation"],
+            "device": o["paddleocr_device"],
+            "batch_size": o["paddleocr_batch_size"],
+        }
+    else:
+        ocr_kwargs = {"engine": "pytesseract", "lang": o["ocr_lang"], "psm": o["ocr_psm"], "oem": o["ocr_oem"],
+                      "extra_config": o["ocr_config"]}
+    return parser_kwargs, vlm_kwargs, ocr_kwargs
+
+
+@cli.command()
+@click.argument('sources', nargs=-1, required=True)
+@click.option('--output-dir', '-o', type=click.Path(file_okay=False, path_type=Path), default=Path("outputs/batch"),
+              help='Root output directory (default: outputs/batch)')
+@click.option('--mode', type=click.Choice(['parse', 'enhance', 'charts', 'tables', 'both']), default='parse',
+              help='What to run on each document (default: parse)')
+@click.option('--workers', '-j', type=click.IntRange(min=1), default=1,
+              help='Number of worker processes, each with its own models loaded (default: 1)')
+@click.option('--max-pages-per-worker-before-restart', type=click.IntRange(min=1), default=None,
+              help='Restart a worker after it parsed this many pages (default: never)')
+@click.option('--restoration-task', type=click.Choice(['dewarping', 'deshadowing', 'appearance', 'deblurring', 'binarization', 'end2end']),
+              default='appearance', help='DocRes restoration task for --mode enhance (default: appearance)')
+@click.option('--restoration-device', type=click.Choice(['cuda', 'cpu']),
+              help='Device for DocRes processing in --mode enhance (default: auto-detect)')
+@click.option('--restoration-dpi', type=int, default=200,
+              help='DPI for restoration processing in --mode enhance (default: 200)')
+@click.option('--restoration-batch-size', type=click.IntRange(min=1), default=4,
+              help='Pages restored together in one DocRes forward pass in --mode enhance (default: 4)')
+@click.option('--restoration-precision', type=click.Choice(['auto', 'fp32', 'fp16', 'bf16']), default='auto',
+              help='DocRes precision in --mode enhance; auto is fp16 on CUDA and fp32 on CPU (default: auto)')
+@click.option('--restoration-runtime', type=click.Choice(['eager', 'jit', 'compile']), default='eager',
+              help='DocRes model runtime in --mode enhance (default: eager)')
+@click.option('--restoration-tile-size', type=click.IntRange(min=8), default=None,
+              help='Restore pages larger than this in tiles of this size in --mode enhance (default: whole pages)')
+@click.option('--restoration-tile-overlap', type=click.IntRange(min=0), default=None,
+              help='Minimum overlap between restoration tiles in --mode enhance (default: 64, or half a smaller tile)')
+@vlm_options
+@layout_options
+@ocr_options
+@click.option('--box-separator', default='\n',
+              help='Separator between text boxes in output (default: newline)')
+@click.option('--verbose', '-v', is_flag=True,
+              help='Enable verbose output')
+def batch(sources, output_dir: Path, mode: str, workers: int,
+          max_pages_per_worker_before_restart: Optional[int],
+          restoration_task: str, restoration_device: Optional[str], restoration_dpi: int,
+          restoration_batch_size: int, restoration_precision: str, restoration_runtime: str,
+          restoration_tile_size: Optional[int], restoration_tile_overlap: Optional[int],
+          use_vlm: bool, vlm_provider: str, vlm_model: Optional[str], vlm_api_key: Optional[str],
+          vlm_cache_dir: Optional[Path], no_vlm_cache: bool,
+          vlm_max_concurrency: int, vlm_requests_per_minute: Optional[float],
+          layout_model: str, dpi: int, min_score: float,
+          layout_cache_dir: Optional[Path], no_layout_cache: bool,
+          ocr_engine: str, ocr_lang: str, ocr_psm: int, ocr_oem: int, ocr_config: str,
+          ocr_workers: Optional[int],
+          paddleocr_device: str, paddleocr_use_doc_orientation_classify: bool,
+          paddleocr_use_doc_unwarping: bool, paddleocr_use_textline_orientation: bool,
+          paddleocr_batch_size: int,
+          box_separator: str, verbose: bool):
+    """
+    Process many PDFs with a pool of worker processes.
+
+    SOURCES can be directories (searched recursively for PDFs), glob
+    patterns, PDF files, or manifest files listing one PDF per line.
+    Each worker loads the layout model, OCR engine and (for --mode enhance)
+    the DocRes weights once and reuses them for every document it parses.
+    Outputs mirror the input directory layout under the output directory,
+    next to a manifest.jsonl of per-document results and a summary.json.
+
+    \b
+    Examples:
+      doctra batch scans/ -o outputs/scans --workers 4
+      doctra batch "reports/**/*.pdf" --mode tables --use-vlm
+      doctra batch files.txt --mode enhance --max-pages-per-worker-before-restart 500
+
+    :param sources: Directories, glob patterns, PDF files or manifest files
+    :param output_dir: Root output directory of the batch
+    :param mode: What to run on each document
+    :param workers: Number of worker processes
+    :param max_pages_per_worker_before_restart: Restart a worker after this many pages
+    :param restoration_task: DocRes restoration task (enhance mode)
+    :param restoration_device: Device for DocRes processing (enhance mode)
+    :param restoration_dpi: DPI for restoration processing (enhance mode)
+    :param restoration_batch_size: Pages restored per DocRes forward pass (enhance mode)
+    :param restoration_precision: DocRes precision (enhance mode)
+    :param restoration_runtime: DocRes model runtime (enhance mode)
+    :param restoration_tile_size: Tile size for restoring large pages in tiles (enhance mode)
+    :param restoration_tile_overlap: Overlap between restoration tiles (enhance mode)
+    :param use_vlm: Whether to use VLM for enhanced extraction
+    :param vlm_provider: VLM provider
+    :param vlm_model: Model name to use (defaults to provider-specific defaults)
+    :param vlm_api_key: API key for VLM provider
+    :param vlm_cache_dir: Directory of the VLM result cache
+    :param no_vlm_cache: Bypass the VLM result cache
+    :param vlm_max_concurrency: Maximum number of VLM requests in flight
+    :param vlm_requests_per_minute: Rate limit for VLM requests (None for no limit)
+    :param layout_model: Layout detection model name
+    :param dpi: DPI for PDF rendering
+    :param min_score: Minimum confidence score for layout detection
+    :param layout_cache_dir: Directory of the layout detection cache
+    :param no_layout_cache: Whether to bypass the layout detection cache
+    :param ocr_lang: OCR language code
+    :param ocr_psm: Tesseract page segmentation mode
+    :param ocr_oem: Tesseract OCR engine mode
+    :param ocr_config: Additional Tesseract configuration
+    :param ocr_workers: Number of text boxes OCR'd concurrently per page
+    :param paddleocr_batch_size: Number of text crops per PaddleOCR predict call
+    :param box_separator: Separator between text boxes in output
+    :param verbose: Whether to enable verbose output
+    :return: None
+    """
+    from doctra.parsers.batch_runner import BatchRunner, resolve_inputs
+
+    validate_vlm_config(use_vlm, vlm_api_key, vlm_provider)
+
+    pdfs = resolve_inputs(list(sources))
+    if not pdfs:
+        click.echo("❌ No PDF files found in the given sources", err=True)
+        sys.exit(1)
+
+    parser_kwargs, vlm_kwargs, ocr_kwargs = _worker_parser_config(mode, click.get_current_context().params)
+
+    click.echo(f"📚 Batch {mode}: {len(pdfs)} documents, {workers} worker(s)")
+    if verbose:
+        click.echo(f"   Layout Model: {layout_model}")
+        click.echo(f"   DPI: {dpi}")
+        if mode in ("parse", "enhance"):
+            click.echo(f"   OCR Engine: {ocr_engine}")
+        if use_vlm:
+            click.echo(f"   VLM Provider: {vlm_provider}")
+        if max_pages_per_worker_before_restart:
+            click.echo(f"   Worker restart after: {max_pages_per_worker_before_restart} pages")
+    click.echo(f"📁 Output directory: {output_dir.absolute()}")
+
+    done = [0]
+
+    def on_document(doc):
+        done[0] += 1
+        name = os.path.relpath(doc.path)
+        if doc.status == "ok":
+            click.echo(f"  ✅ [{done[0]}/{len(pdfs)}] {name} ({doc.pages} pages, {doc.seconds:.1f}s)")
+        else:
+            click.echo(f"  ❌ [{done[0]}/{len(pdfs)}] {name}: {doc.error}", err=True)
+
+    runner = BatchRunner(
+        mode,
+        workers=workers,
+        max_pages_per_worker_before_restart=max_pages_per_worker_before_restart,
+        parser_kwargs=parser_kwargs,
+        vlm_kwargs=vlm_kwargs,
+        ocr_kwargs=ocr_kwargs,
+    )
+    try:
+        summary = runner.run(pdfs, str(output_dir), on_document=on_document)
+    except KeyboardInterrupt:
+        click.echo("\n⚠️  Batch interrupted by user", err=True)
+        sys.exit(130)
+    except Exception as e:
+        click.echo(f"❌ Error during batch processing: {e}", err=True)
+        if verbose:
+            click.echo(traceback.format_exc(), err=True)
+        sys.exit(1)
+
+    rate = summary.pages / summary.seconds if summary.seconds else 0.0
+    click.echo(f"📊 {summary.succeeded} succeeded, {summary.failed} failed, "
+               f"{summary.pages} pages in {summary.seconds:.1f}s ({rate:.2f} pages/s)")
+    click.echo(f"📋 Manifest: {output_dir.absolute() / 'manifest.jsonl'}")
+    if summary.failed:
+        sys.exit(1)
+
+
+@cli.command()
+@click.option('--host', default='127.0.0.1', help='Interface to listen on (default: 127.0.0.1)')
+@click.option('--port', type=click.IntRange(min=0, max=65535), default=8765, help='TCP port (default: 8765)')
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help='Listen on this Unix domain socket instead of TCP')
+@click.option('--mode', type=click.Choice(['parse', 'enhance']), default='parse',
+              help='Parser kept resident: full parse, or parse with DocRes restoration (default: parse)')
+@click.option('--max-queue', type=click.IntRange(min=1), default=8,
+              help='Maximum number of jobs waiting to run; further requests get HTTP 503 (default: 8)')
+@click.option('--output-dir', '-o', type=click.Path(file_okay=False, path_type=Path), default=Path("outputs/server"),
+              help='Where jobs write their outputs unless a request names a directory (default: outputs/server)')
+@click.option('--restoration-task', type=click.Choice(['dewarping', 'deshadowing', 'appearance', 'deblurring', 'binarization', 'end2end']),
+              default='appearance', help='DocRes restoration task for --mode enhance (default: appearance)')
+@click.option('--restoration-device', type=click.Choice(['cuda', 'cpu']),
+              help='Device for DocRes processing in --mode enhance (default: auto-detect)')
+@click.option('--restoration-dpi', type=int, default=200,
+              help='DPI for restoration processing in --mode enhance (default: 200)')
+@click.option('--restoration-batch-size', type=click.IntRange(min=1), default=4,
+              help='Pages restored together in one DocRes forward pass in --mode enhance (default: 4)')
+@click.option('--restoration-precision', type=click.Choice(['auto', 'fp32', 'fp16', 'bf16']), default='auto',
+              help='DocRes precision in --mode enhance; auto is fp16 on CUDA and fp32 on CPU (default: auto)')
+@click.option('--restoration-runtime', type=click.Choice(['eager', 'jit', 'compile']), default='eager',
+              help='DocRes model runtime in --mode enhance (default: eager)')
+@click.option('--restoration-tile-size', type=click.IntRange(min=8), default=None,
+              help='Restore pages larger than this in tiles of this size in --mode enhance (default: whole pages)')
+@click.option('--restoration-tile-overlap', type=click.IntRange(min=0), default=None,
+              help='Minimum overlap between restoration tiles in --mode enhance (default: 64, or half a smaller tile)')
+@vlm_options
+@layout_options
+@ocr_options
+@click.option('--box-separator', default='\n',
+              help='Separator between text boxes in output (default: newline)')
+@click.option('--verbose', '-v', is_flag=True,
+              help='Enable verbose output')
+def serve(host: str, port: int, socket_path: Optional[Path], mode: str, max_queue: int, output_dir: Path,
+          restoration_task: str, restoration_device: Optional[str], restoration_dpi: int,
+          restoration_batch_size: int, restoration_precision: str, restoration_runtime: str,
+          restoration_tile_size: Optional[int], restoration_tile_overlap: Optional[int],
+          use_vlm: bool, vlm_provider: str, vlm_model: Optional[str], vlm_api_key: Optional[str],
+          vlm_cache_dir: Optional[Path], no_vlm_cache: bool,
+          vlm_max_concurrency: int, vlm_requests_per_minute: Optional[float],
+          layout_model: str, dpi: int, min_score: float,
+          layout_cache_dir: Optional[Path], no_layout_cache: bool,
+          ocr_engine: str, ocr_lang: str, ocr_psm: int, ocr_oem: int, ocr_config: str,
+          ocr_workers: Optional[int],
+          paddleocr_device: str, paddleocr_use_doc_orientation_classify: bool,
+          paddleocr_use_doc_unwarping: bool, paddleocr_use_textline_orientation: bool,
+          paddleocr_batch_size: int,
+          box_separator: str, verbose: bool):
+    """
+    Run a local parse server that keeps the models loaded.
+
+    The layout model, OCR engine and (for --mode enhance) DocRes weights are
+    loaded once at startup, so requests skip model loading entirely. Jobs
+    run one at a time from a bounded queue, and each page's markdown and
+    structured items are streamed back as newline-delimited JSON as soon as
+    the page is parsed.
+
+    \b
+    API:
+      GET  /health   Server state (queue length, running job, counters)
+      POST /parse    Body {"pdf_path": ..., "output_dir": ..., "resume": false},
+                     or the PDF bytes with Content-Type: application/pdf
+
+    \b
+    Examples:
+      doctra serve --port 8765
+      doctra serve --socket /tmp/doctra.sock --mode enhance
+      curl -N localhost:8765/parse -d '{"pdf_path": "/data/report.pdf"}'
+      curl -N --unix-socket /tmp/doctra.sock localhost/parse \\
+           -H 'Content-Type: application/pdf' --data-binary @report.pdf
+
+    :param host: Interface to listen on
+    :param port: TCP port
+    :param socket_path: Unix domain socket to listen on instead of TCP
+    :param mode: Parser kept resident ("parse" or "enhance")
+    :param max_queue: Maximum number of waiting jobs
+    :param output_dir: Default root directory for job outputs
+    :param restoration_task: DocRes restoration task (enhance mode)
+    :param restoration_device: Device for DocRes processing (enhance mode)
+    :param restoration_dpi: DPI for restoration processing (enhance mode)
+    :param restoration_batch_size: Pages restored per DocRes forward pass (enhance mode)
+    :param restoration_precision: DocRes precision (enhance mode)
+    :param restoration_runtime: DocRes model runtime (enhance mode)
+    :param restoration_tile_size: Tile size for restoring large pages in tiles (enhance mode)
+    :param restoration_tile_overlap: Overlap between restoration tiles (enhance mode)
+    :param use_vlm: Whether to use VLM for enhanced extraction
+    :param vlm_provider: VLM provider
+    :param vlm_model: Model name to use (defaults to provider-specific defaults)
+    :param vlm_api_key: API key for VLM provider
+    :param vlm_cache_dir: Directory of the VLM result cache
+    :param no_vlm_cache: Bypass the VLM result cache
+    :param vlm_max_concurrency: Maximum number of VLM requests in flight
+    :param vlm_requests_per_minute: Rate limit for VLM requests (None for no limit)
+    :param layout_model: Layout detection model name
+    :param dpi: DPI for PDF rendering
+    :param min_score: Minimum confidence score for layout detection
+    :param layout_cache_dir: Directory of the layout detection cache
+    :param no_layout_cache: Whether to bypass the layout detection cache
+    :param ocr_lang: OCR language code
+    :param ocr_psm: Tesseract page segmentation mode
+    :param ocr_oem: Tesseract OCR engine mode
+    :param ocr_config: Additional Tesseract configuration
+    :param ocr_workers: Number of text boxes OCR'd concurrently per page
+    :param paddleocr_batch_size: Number of text crops per PaddleOCR predict call
+    :param box_separator: Separator between text boxes in output
+    :param verbose: Whether to enable verbose output
+    :return: None
+    """
+    from doctra.server import ParseService, serve as run_server
+
+    validate_vlm_config(use_vlm, vlm_api_key, vlm_provider)
+    parser_kwargs, vlm_kwargs, ocr_kwargs = _worker_parser_config(mode, click.get_current_context().params)
+
+    click.echo(f"🔧 Loading {mode} models...")
+    if verbose:
+        click.echo(f"   Layout Model: {layout_model}")
+        click.echo(f"   DPI: {dpi}")
+        click.echo(f"   OCR Engine: {ocr_engine}")
+        if use_vlm:
+            click.echo(f"   VLM Provider: {vlm_provider}")
+        click.echo(f"   Max queued jobs: {max_queue}")
+    service = ParseService(mode, parser_kwargs=parser_kwargs, vlm_kwargs=vlm_kwargs, ocr_kwargs=ocr_kwargs,
+                           output_root=str(output_dir), max_queue=max_queue)
+    try:
+        service.start()
+        click.echo(f"📁 Default output directory: {output_dir.absolute()}")
+        run_server(service, host=host, port=port, socket_path=str(socket_path) if socket_path else None)
+    except KeyboardInterrupt:
+        click.echo("\n👋 Server stopped")
+    except Exception as e:
+        click.echo(f"❌ Server error: {e}", err=True)
+        if verbose:
+            click.echo(traceback.format_exc(), err=True)
+        sys.exit(1)
+
+
+@cli.group(invoke_without_command=True)
+@click.pass_context
+def cache(ctx):
+    """
+    Inspect or clear Doctra's on-disk caches.
+
+    Layout detections and VLM results are cached under ~/.cache/doctra
+    (or $DOCTRA_CACHE_DIR) so re-parsing a document skips work already done.
+
+    \b
+    Subcommands:
+      info      Show entries and size of each cache
+      clear     Remove cached results
+
+    \b
+    Examples:
+      doctra cache info
+      doctra cache clear --layout --model PP-DocLayout_plus-L
+      doctra cache clear --layout --pdf document.pdf
+
+    :param ctx: Click context object containing command information
+    :return: None
+    """
+    if ctx.invoked_subcommand is None:
+        click.echo(ctx.get_help())
+
+
+def _open_caches(layout: bool, vlm: bool, layout_cache_dir: Optional[Path], vlm_cache_dir: Optional[Path]):
+    """Open the selected caches (both when neither flag is given) as (title, cache) pairs."""
+    from doctra.engines.layout.cache import LayoutCache
+    from doctra.engines.vlm.cache import VLMCache
+
+    if not layout and not vlm:
+        layout = vlm = True
+    caches = []
+    if layout:
+        caches.append(("Layout cache", LayoutCache(str(layout_cache_dir) if layout_cache_dir else None)))
+    if vlm:
+        caches.append(("VLM cache", VLMCache(str(vlm_cache_dir) if vlm_cache_dir else None)))
+    return caches
+
+
+@cache.command(name='info')
+@click.option('--layout', is_flag=True, help='Only the layout detection cache')
+@click.option('--vlm', is_flag=True, help='Only the VLM result cache')
+@click.option('--layout-cache-dir', type=click.Path(file_okay=False, path_type=Path), default=None,
+              help='Directory of the layout detection cache')
+@click.option('--vlm-cache-dir', type=click.Path(file_okay=False, path_type=Path), default=None,
+              help='Directory of the VLM result cache')
+def cache_info(layout: bool, vlm: bool, layout_cache_dir: Optional[Path], vlm_cache_dir: Optional[Path]):
+    """
+    Show the number of entries and the size of each cache.
+
+    :param layout: Whether to show only the layout detection cache
+    :param vlm: Whether to show only the VLM result cache
+    :param layout_cache_dir: Directory of the layout detection cache
+    :param vlm_cache_dir: Directory of the VLM result cache
+    :return: None
+    """
+    from doctra.cli.utils import format_file_size
+
+    for title, store in _open_caches(layout, vlm, layout_cache_dir, vlm_cache_dir):
+        stats = store.stats()
+        click.echo(f"💾 {title}: {stats['entries']} entries, {format_file_size(stats['size_bytes'])} in {stats['path']}")
+        store.close()
+
+
+@cache.command(name='clear')
+@click.option('--layout', is_flag=True, help='Only the layout detection cache')
+@click.option('--vlm', is_flag=True, help='Only the VLM result cache')
+@click.option('--model', default=None, help='Layout cache: only remove results of this layout model')
+@click.option('--pdf', 'pdf_path', type=click.Path(exists=True, dir_okay=False, path_type=Path), default=None,
+              help='Layout cache: only remove results cached for this PDF')
+@click.option('--layout-cache-dir', type=click.Path(file_okay=False, path_type=Path), default=None,
+              help='Directory of the layout detection cache')
+@click.option('--vlm-cache-dir', type=click.Path(file_okay=False, path_type=Path), default=None,
+              help='Directory of the VLM result cache')
+def cache_clear(layout: bool, vlm: bool, model: Optional[str], pdf_path: Optional[Path],
+                layout_cache_dir: Optional[Path], vlm_cache_dir: Optional[Path]):
+    """
+    Remove cached results.
+
+    Without --layout/--vlm both caches are cleared. --model and --pdf
+    narrow what is removed from the layout cache.
+
+    :param layout: Whether to clear only the layout detection cache
+    :param vlm: Whether to clear only the VLM result cache
+    :param model: Only remove layout results produced by this model
+    :param pdf_path: Only remove layout results cached for this PDF
+    :param layout_cache_dir: Directory of the layout detection cache
+    :param vlm_cache_dir: Directory of the VLM result cache
+    :return: None
+    """
+    if (model or pdf_path) and not vlm:
+        layout = True
+    for title, store in _open_caches(layout, vlm, layout_cache_dir, vlm_cache_dir):
+        if title == "Layout cache" and (model or pdf_path):
+            removed = store.invalidate(model_name=model, pdf_path=str(pdf_path) if pdf_path else None)
+            click.echo(f"🧹 {title}: removed {removed} entries")
+        else:
+            store.clear()
+            click.echo(f"🧹 {title}: cleared")
+        store.close()
+
+
 @cli.command()
 def info():
     """
@@ -1182,6 +1902,9 @@ def info():
     click.echo("    └─ both     - Extract charts and tables")
     click.echo("  🎨 visualize  - Layout detection visualization")
     click.echo("  🔍 analyze    - Document structure analysis")
+    click.echo("  📚 batch      - Process many documents with a pool of workers")
+    click.echo("  🚀 serve      - Local parse server with the models kept loaded")
+    click.echo("  💾 cache      - Inspect or clear layout/VLM caches")
     click.echo("  ℹ️  info      - System information (this command)")
 
     # VLM providers
@@ -1216,6 +1939,7 @@ def info():
     # DocRes information
     click.echo("\nDocRes Image Restoration:")
     try:
+        from doctra.engines.image_restoration import DocResEngine
         docres = DocResEngine()
         click.echo(f"  ✅ DocRes available - {len(docres.get_supported_tasks())} restoration tasks")
         click.echo("  Tasks: dewarping, deshadowing, appearance, deblurring, binarization, end2end")
@@ -33,6 +33,43 @@ def validate_vlm_config(use_vlm: bool, vlm_api_key: Optional[str], vlm_provider:
         sys.exit(1)
 
 
+def _report_cache(title: str, cache) -> None:
+    """Echo one cache's hit/miss counters, if it was used."""
+    if cache is None:
+        return
+    stats = cache.stats()
+    if stats["hits"] + stats["misses"] == 0:
+        return
+    click.echo(
+        f"💾 {title}: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.0%} hit rate, {format_file_size(stats['size_bytes'])} in {stats['path']})"
+    )
+
+
+def report_vlm_cache(vlm_engine) -> None:
+    """
+    Print the VLM result cache hit/miss counters after a run.
+
+    Does nothing when VLM is disabled or the extractor has no cache.
+
+    :param vlm_engine: VLMStructuredExtractor instance, or None
+    :return: None
+    """
+    _report_cache("VLM cache", getattr(vlm_engine, "cache", None))
+
+
+def report_layout_cache(layout_engine) -> None:
+    """
+    Print the layout detection cache hit/miss counters after a run.
+
+    Does nothing when the engine has no cache.
+
+    :param layout_engine: PaddleLayoutEngine instance, or None
+    :return: None
+    """
+    _report_cache("Layout cache", getattr(layout_engine, "cache", None))
+
+
 def handle_keyboard_interrupt() -> None:
     """
     Handle keyboard interrupt (Ctrl+C) gracefully.
@@ -13,13 +13,14 @@ DocRes supports 5 restoration tasks:
 - end2end: Pipeline combining dewarping → deshadowing → appearance
 """
 
+import copy
 import os
 import sys
+import threading
+from collections import OrderedDict
 import cv2
 import numpy as np
 import torch
-import tempfile
-import time
 from pathlib import Path
 from typing import Union, List, Tuple, Optional, Dict, Any
 
@@ -36,35 +37,21 @@ except ImportError:
 # Progress bar imports
 from doctra.utils.progress import create_beautiful_progress_bar, create_notebook_friendly_bar
 
-# Add DocRes to path and change to DocRes directory for relative imports
+# Add DocRes to path; its modules import each other as top-level modules
 current_dir = Path(__file__).parent
 docres_dir = current_dir.parent.parent / "third_party" / "docres"
 sys.path.insert(0, str(docres_dir))
 
-# Store original working directory
-original_cwd = os.getcwd()
-
 try:
-    # Change to DocRes directory for relative imports to work
-    os.chdir(str(docres_dir))
-    
-    # Now import DocRes modules (they use relative imports)
-    from inference import (
-        model_init, inference_one_im, dewarping, deshadowing, 
-        appearance, deblurring, binarization
-    )
+    from inference import run_task_batch, run_task_tiled, tile_stride, TILED_TASKS, DEFAULT_TILE_OVERLAP
     from utils import convert_state_dict
     from models import restormer_arch
-    from data.preprocess.crop_merge_image import stride_integral
-    from data.MBD.infer import net1_net2_infer_single_im
+    from data.MBD.infer import load_seg_model
     
     DOCRES_AVAILABLE = True
 except ImportError as e:
     DOCRES_AVAILABLE = False
     # Don't print warning here, let the user handle it when they try to use it
-finally:
-    # Always restore original working directory
-    os.chdir(original_cwd)
 
 
 def load_docres_weights_from_hf():
@@ -154,12 +141,96 @@ def get_model_paths(use_huggingface: bool = True, model_path: Optional[str] = No
     raise RuntimeError("Cannot load models: Hugging Face Hub not available and no local paths provided")
 
 
+PRECISIONS = ['auto', 'fp32', 'fp16', 'bf16']
+RUNTIMES = ['eager', 'jit', 'compile']
+
+
+def resolve_precision(precision: str, device: torch.device, use_half_precision: bool = True) -> str:
+    """
+    Resolve the precision the restoration tasks run in on a device.
+    
+    'auto' means fp16 on CUDA (unless use_half_precision is False) and fp32
+    on CPU, where fp16 kernels are missing or far slower. 'bf16' runs the
+    fp32 model under bfloat16 autocast, which pays off on CPUs with native
+    bf16 support (AVX-512 BF16, AMX). Dewarping always runs in fp32.
+    
+    Args:
+        precision: One of PRECISIONS
+        device: Device the model runs on
+        use_half_precision: Whether 'auto' may pick fp16
+        
+    Returns:
+        'fp32', 'fp16' or 'bf16'
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unsupported precision: {precision}. Supported precisions: {PRECISIONS}")
+    if precision != 'auto':
+        return precision
+    return 'fp16' if use_half_precision and device.type == 'cuda' else 'fp32'
+
+
+class _TracedModel(torch.nn.Module):
+    """
+    Run a model through frozen TorchScript traces, one per input shape.
+    
+    Restormer reshapes by the input size, so a trace is only valid for the
+    shape it was recorded with; pages of one document share a shape, so a
+    few cached traces cover a whole run.
+    """
+    
+    def __init__(self, model: torch.nn.Module, max_traces: int = 4):
+        super().__init__()
+        self.model = model
+        self.max_traces = max_traces
+        self._traces = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        key = (tuple(x.shape), x.dtype, x.device)
+        with self._lock:
+            traced = self._traces.get(key)
+            if traced is None:
+                with warnings.catch_warnings(), torch.no_grad():
+                    warnings.simplefilter("ignore")
+                    traced = torch.jit.freeze(torch.jit.trace(self.model, x, check_trace=False))
+                self._traces[key] = traced
+                if len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            else:
+                self._traces.move_to_end(key)
+        return traced(x)
+
+
+def _apply_runtime(model: torch.nn.Module, runtime: str) -> torch.nn.Module:
+    """Wrap a model for the 'jit' or 'compile' runtime; 'eager' returns it unchanged"""
+    if runtime == 'jit':
+        return _TracedModel(model)
+    if runtime == 'compile':
+        if not hasattr(torch, 'compile'):
+            raise RuntimeError("The 'compile' runtime requires PyTorch 2.0 or newer")
+        # dynamic shapes: pages of different sizes must not trigger a recompile each
+        return torch.compile(model, dynamic=True)
+    return model
+
+
 class DocResEngine:
     """
     DocRes Image Restoration Engine
     
     A wrapper around DocRes inference functionality for easy integration
     with Doctra's document processing pipeline.
+    
+    Images are restored in memory and the loaded models are never modified
+    during inference, so one engine can restore images from several
+    threads at once.
+    
+    The precision is chosen per device: fp16 on CUDA, fp32 on CPU (or bf16
+    autocast when requested). On CPU, the 'jit' and 'compile' runtimes
+    run the Restormer through TorchScript traces or torch.compile.
+    
+    With ``tile_size`` set, pages larger than a tile are restored at full
+    resolution in overlapping tiles that are blended back together, so
+    model memory depends on the tile size only.
     """
     
     SUPPORTED_TASKS = [
@@ -172,16 +243,31 @@ class DocResEngine:
         device: Optional[str] = None,
         use_half_precision: bool = True,
         model_path: Optional[str] = None,
-        mbd_path: Optional[str] = None
+        mbd_path: Optional[str] = None,
+        batch_size: int = 4,
+        max_batch_pixels: Optional[int] = None,
+        precision: str = "auto",
+        runtime: str = "eager",
+        tile_size: Optional[int] = None,
+        tile_overlap: Optional[int] = None
     ):
         """
         Initialize DocRes Engine
         
         Args:
             device: Device to run on ('cuda', 'cpu', or None for auto-detect)
-            use_half_precision: Whether to use half precision for inference
+            use_half_precision: Whether to use half precision for inference on CUDA
             model_path: Path to DocRes model checkpoint (optional, defaults to Hugging Face Hub)
             mbd_path: Path to MBD model checkpoint (optional, defaults to Hugging Face Hub)
+            batch_size: Same-size pages restored per forward pass by batch_restore and restore_pdf
+            max_batch_pixels: Cap on the input pixels (height x width x pages) of one forward pass,
+                to bound GPU memory (optional, no cap by default)
+            precision: 'auto' (fp16 on CUDA, fp32 on CPU), 'fp32', 'fp16' or 'bf16' (bfloat16 autocast)
+            runtime: 'eager', 'jit' (TorchScript traces per input shape) or 'compile' (torch.compile)
+            tile_size: Restore pages larger than this many pixels (height or width) in tiles of this
+                size; a multiple of 8 (optional, whole pages by default)
+            tile_overlap: Minimum overlap between neighbouring tiles, smaller than tile_size
+                (optional, defaults to 64 pixels or half a smaller tile)
         """
         if not DOCRES_AVAILABLE:
             raise ImportError(
@@ -204,6 +290,18 @@ class DocResEngine:
                 self.device = requested_device
         
         self.use_half_precision = use_half_precision
+        self.precision = resolve_precision(precision, self.device, use_half_precision)
+        if runtime not in RUNTIMES:
+            raise ValueError(f"Unsupported runtime: {runtime}. Supported runtimes: {RUNTIMES}")
+        self.runtime = runtime
+        if tile_size is not None:
+            if tile_overlap is None:
+                tile_overlap = min(DEFAULT_TILE_OVERLAP, tile_size // 2)
+            tile_stride(tile_size, tile_overlap)
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        self.batch_size = max(1, batch_size)
+        self.max_batch_pixels = max_batch_pixels
         
         # Get model paths (always from Hugging Face Hub)
         try:
@@ -232,6 +330,12 @@ class DocResEngine:
         
         # Initialize model
         self._model = None
+        # Models the tasks run with, keyed by precision: the fp16 copy and the
+        # jit/compile wrappers. Dewarping always uses fp32. Built on first use and kept.
+        self._task_models = {}
+        # MBD page-mask model for dewarping; loaded on first use and kept
+        self._seg_model = None
+        self._lazy_lock = threading.Lock()
         self._initialize_model()
     
     def _initialize_model(self):
@@ -261,6 +365,34 @@ class DocResEngine:
         except Exception as e:
             raise RuntimeError(f"Failed to initialize DocRes model: {e}")
     
+    def _ensure_seg_model(self):
+        """Load the MBD segmentation model used by dewarping once, on the engine's device"""
+        with self._lazy_lock:
+            if self._seg_model is None:
+                try:
+                    self._seg_model = load_seg_model(self.mbd_path, self.device)
+                except Exception as e:
+                    raise RuntimeError(f"Failed to initialize MBD model: {e}")
+            return self._seg_model
+    
+    def _model_for(self, task: str):
+        """Return the model ``task`` runs with, in its precision and runtime, without changing the shared fp32 model"""
+        precision = "fp32" if task == "dewarping" else self.precision
+        # bf16 runs the fp32 weights under autocast
+        if precision != "fp16" and self.runtime == "eager":
+            return self._model
+        with self._lazy_lock:
+            if precision not in self._task_models:
+                model = copy.deepcopy(self._model).half() if precision == "fp16" else self._model
+                self._task_models[precision] = _apply_runtime(model, self.runtime)
+            return self._task_models[precision]
+    
+    def _autocast_dtype(self, task: str) -> Optional[torch.dtype]:
+        """Return the autocast dtype ``task`` runs under, if any"""
+        if self.precision == "bf16" and task != "dewarping":
+            return torch.bfloat16
+        return None
+    
     def restore_image(
         self, 
         image: Union[str, np.ndarray], 
@@ -281,6 +413,24 @@ class DocResEngine:
         if task not in self.SUPPORTED_TASKS:
             raise ValueError(f"Unsupported task: {task}. Supported tasks: {self.SUPPORTED_TASKS}")
         
+        img_array, original_shape = self._load_image(image)
+        
+        try:
+            [(restored_img, metadata)] = self._restore_arrays([img_array], task, save_prompts)
+        except Exception as e:
+            raise RuntimeError(f"Image restoration failed: {e}")
+        
+        metadata.update({
+            'original_shape': original_shape,
+            'restored_shape': restored_img.shape,
+            'task': task,
+            'device': str(self.device)
+        })
+        
+        return restored_img, metadata
+    
+    def _load_image(self, image: Union[str, np.ndarray]) -> Tuple[np.ndarray, Tuple[int, ...]]:
+        """Load an image as a 3-channel uint8 BGR array the caller does not share; also returns its original shape"""
         # Load image if path provided
         if isinstance(image, str):
             if not os.path.exists(image):
@@ -289,59 +439,102 @@ class DocResEngine:
             if img_array is None:
                 raise ValueError(f"Could not load image: {image}")
         else:
-            img_array = image.copy()
+            img_array = image
         
         original_shape = img_array.shape
         
-        try:
-            # Handle end2end pipeline
-            if task == "end2end":
-                return self._run_end2end_pipeline(img_array, save_prompts)
-            
-            # Run single task
-            restored_img, metadata = self._run_single_task(img_array, task, save_prompts)
-            
-            metadata.update({
-                'original_shape': original_shape,
-                'restored_shape': restored_img.shape,
-                'task': task,
-                'device': str(self.device)
-            })
-            
-            return restored_img, metadata
-            
-        except Exception as e:
-            raise RuntimeError(f"Image restoration failed: {e}")
+        # The task functions expect 3-channel uint8 images and must not
+        # modify the caller's array
+        if img_array.ndim == 2:
+            img_array = cv2.cvtColor(img_array, cv2.COLOR_GRAY2BGR)
+        elif img_array.shape[2] == 4:
+            img_array = cv2.cvtColor(img_array, cv2.COLOR_BGRA2BGR)
+        else:
+            img_array = img_array.copy()
+        
+        return img_array, original_shape
     
-    def _run_single_task(self, img_array: np.ndarray, task: str, save_prompts: bool) -> Tuple[np.ndarray, Dict]:
-        """Run a single restoration task"""
+    def _run_task(
+        self,
+        img_arrays: List[np.ndarray],
+        task: str,
+        batch_size: int = 1,
+        max_batch_pixels: Optional[int] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Run one task on in-memory images, batching pages of the same size and tiling large ones; returns (prompt1, prompt2, prompt3, restored) per image"""
+        model = self._model_for(task)
+        autocast_dtype = self._autocast_dtype(task)
+        results = [None] * len(img_arrays)
         
-        # Create temporary file for inference
-        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-            cv2.imwrite(tmp_path, img_array)
+        tiled = [i for i, img in enumerate(img_arrays) if self._use_tiles(img, task)]
+        whole = sorted(set(range(len(img_arrays))) - set(tiled))
         
-        try:
-            # Change to DocRes directory for inference to work properly
-            original_cwd = os.getcwd()
-            os.chdir(str(docres_dir))
-            
-            # Set global DEVICE variable that DocRes inference expects
-            import inference  # Import the inference module to set its global DEVICE
-            inference.DEVICE = self.device
-            
-            try:
-                # Run inference
-                prompt1, prompt2, prompt3, restored = inference_one_im(self._model, tmp_path, task)
-            finally:
-                # Always restore original working directory
-                os.chdir(original_cwd)
-            
+        if whole:
+            seg_model = self._ensure_seg_model() if task == "dewarping" else None
+            outputs = run_task_batch(
+                model, [img_arrays[i] for i in whole], task, self.device,
+                seg_model=seg_model,
+                batch_size=batch_size,
+                max_batch_pixels=max_batch_pixels,
+                autocast_dtype=autocast_dtype
+            )
+            for i, output in zip(whole, outputs):
+                results[i] = output
+        
+        for i in tiled:
+            results[i] = run_task_tiled(
+                model, img_arrays[i], task, self.device,
+                tile_size=self.tile_size,
+                overlap=self.tile_overlap,
+                batch_size=batch_size,
+                autocast_dtype=autocast_dtype
+            )
+        
+        return results
+    
+    def _use_tiles(self, img_array: np.ndarray, task: str) -> bool:
+        """Whether ``img_array`` is restored in tiles for ``task``"""
+        return (
+            self.tile_size is not None
+            and task in TILED_TASKS
+            and max(img_array.shape[:2]) > self.tile_size
+        )
+    
+    def _restore_arrays(
+        self,
+        img_arrays: List[np.ndarray],
+        task: str,
+        save_prompts: bool,
+        batch_size: int = 1,
+        max_batch_pixels: Optional[int] = None
+    ) -> List[Tuple[np.ndarray, Dict]]:
+        """Run a task, or the end2end pipeline (dewarping → deshadowing → appearance), on a list of images"""
+        steps = ["dewarping", "deshadowing", "appearance"] if task == "end2end" else [task]
+        intermediate_steps = [{} for _ in img_arrays]
+        
+        # Each step runs over all images before the next one starts, so
+        # every step gets full batches
+        current = img_arrays
+        for step in steps:
+            outputs = self._run_task(current, step, batch_size, max_batch_pixels)
+            current = [restored for (_, _, _, restored) in outputs]
+            if step == "dewarping" and task == "end2end":
+                for steps_dict, dewarped in zip(intermediate_steps, current):
+                    steps_dict['dewarped'] = dewarped
+            elif step == "deshadowing" and task == "end2end":
+                for steps_dict, deshadowed in zip(intermediate_steps, current):
+                    steps_dict['deshadowed'] = deshadowed
+        
+        results = []
+        for (prompt1, prompt2, prompt3, restored), steps_dict in zip(outputs, intermediate_steps):
             metadata = {
                 'task': task,
                 'device': str(self.device)
             }
             
+            if task == "end2end":
+                metadata['intermediate_steps'] = steps_dict
+            
             if save_prompts:
                 metadata['prompts'] = {
                     'prompt1': prompt1,
@@ -349,99 +542,73 @@ class DocResEngine:
                     'prompt3': prompt3
                 }
             
-            return restored, metadata
-            
-        finally:
-            # Clean up temporary file with retry for Windows
-            try:
-                # Wait a bit for file handles to be released
-                time.sleep(0.1)
-                os.unlink(tmp_path)
-            except PermissionError:
-                # If still locked, try again after a longer wait
-                time.sleep(1)
-                try:
-                    os.unlink(tmp_path)
-                except PermissionError:
-                    # If still failing, just leave it - it will be cleaned up by the OS
-                    pass
-    
-    def _run_end2end_pipeline(self, img_array: np.ndarray, save_prompts: bool) -> Tuple[np.ndarray, Dict]:
-        """Run the end2end pipeline: dewarping → deshadowing → appearance"""
-        
-        intermediate_steps = {}
+            results.append((restored, metadata))
         
-        # Change to DocRes directory for inference to work properly
-        original_cwd = os.getcwd()
-        os.chdir(str(docres_dir))
-        
-        # Set global DEVICE variable that DocRes inference expects
-        import inference  # Import the inference module to set its global DEVICE
-        inference.DEVICE = self.device
-        
-        try:
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                # Step 1: Dewarping
-                step1_path = os.path.join(tmp_dir, "step1.jpg")
-                cv2.imwrite(step1_path, img_array)
-                
-                prompt1, prompt2, prompt3, dewarped = inference_one_im(self._model, step1_path, "dewarping")
-                intermediate_steps['dewarped'] = dewarped
-                
-                # Step 2: Deshadowing
-                step2_path = os.path.join(tmp_dir, "step2.jpg")
-                cv2.imwrite(step2_path, dewarped)
-                
-                prompt1, prompt2, prompt3, deshadowed = inference_one_im(self._model, step2_path, "deshadowing")
-                intermediate_steps['deshadowed'] = deshadowed
-                
-                # Step 3: Appearance
-                step3_path = os.path.join(tmp_dir, "step3.jpg")
-                cv2.imwrite(step3_path, deshadowed)
-                
-                prompt1, prompt2, prompt3, final = inference_one_im(self._model, step3_path, "appearance")
-                
-                metadata = {
-                    'task': 'end2end',
-                    'device': str(self.device),
-                    'intermediate_steps': intermediate_steps
-                }
-                
-                if save_prompts:
-                    metadata['prompts'] = {
-                        'prompt1': prompt1,
-                        'prompt2': prompt2,
-                        'prompt3': prompt3
-                    }
-                
-                return final, metadata
-        finally:
-            # Always restore original working directory
-            os.chdir(original_cwd)
+        return results
     
     def batch_restore(
         self, 
         images: List[Union[str, np.ndarray]], 
         task: str = "appearance",
-        save_prompts: bool = False
+        save_prompts: bool = False,
+        batch_size: Optional[int] = None,
+        max_batch_pixels: Optional[int] = None
     ) -> List[Tuple[Optional[np.ndarray], Dict[str, Any]]]:
         """
         Restore multiple images in batch
         
+        Images whose model inputs have the same size (e.g. the pages of one
+        PDF) go through the model together, ``batch_size`` at a time. If a
+        batch fails, its images are retried one by one so a single bad image
+        only fails itself.
+        
         Args:
             images: List of image paths or numpy arrays
             task: Restoration task to perform
             save_prompts: Whether to save intermediate prompts
+            batch_size: Images per forward pass (defaults to the engine's batch_size)
+            max_batch_pixels: Cap on the input pixels of one forward pass (defaults to the engine's max_batch_pixels)
             
         Returns:
             List of (restored_image, metadata) tuples
         """
-        results = []
+        batch_size = batch_size or self.batch_size
+        if max_batch_pixels is None:
+            max_batch_pixels = self.max_batch_pixels
+        
+        results: List[Optional[Tuple[Optional[np.ndarray], Dict[str, Any]]]] = [None] * len(images)
+        
+        if task in self.SUPPORTED_TASKS:
+            loaded = []
+            for i, image in enumerate(images):
+                try:
+                    img_array, original_shape = self._load_image(image)
+                    loaded.append((i, img_array, original_shape))
+                except Exception:
+                    # reported by the per-image pass below
+                    pass
+            
+            if loaded:
+                try:
+                    restored = self._restore_arrays(
+                        [img_array for (_, img_array, _) in loaded],
+                        task, save_prompts, batch_size, max_batch_pixels
+                    )
+                    for (i, _, original_shape), (restored_img, metadata) in zip(loaded, restored):
+                        metadata.update({
+                            'original_shape': original_shape,
+                            'restored_shape': restored_img.shape
+                        })
+                        results[i] = (restored_img, metadata)
+                except Exception:
+                    # retried one image at a time below
+                    results = [None] * len(images)
         
         for i, image in enumerate(images):
+            if results[i] is not None:
+                continue
             try:
-                restored_img, metadata = self.restore_image(image, task, save_prompts)
-                results.append((restored_img, metadata))
+                results[i] = self.restore_image(image, task, save_prompts)
             except Exception as e:
                 # Return None for failed images with error metadata
                 error_metadata = {
@@ -450,7 +617,7 @@ class DocResEngine:
                     'device': str(self.device),
                     'image_index': i
                 }
-                results.append((None, error_metadata))
+                results[i] = (None, error_metadata)
         
         return results
     
@@ -483,7 +650,7 @@ class DocResEngine:
         """
         try:
             from PIL import Image
-            from doctra.utils.pdf_io import render_pdf_to_images
+            from doctra.utils.pdf_io import get_pdf_page_count, iter_pdf_pages
             
             # Generate output path if not provided
             if output_path is None:
@@ -493,64 +660,59 @@ class DocResEngine:
             
             print(f"🔄 Processing PDF with DocRes: {os.path.basename(pdf_path)}")
             
-            # Render all pages to images
-            pil_pages = [im for (im, _, _) in render_pdf_to_images(pdf_path, dpi=dpi)]
-            
-            if not pil_pages:
+            total_pages = get_pdf_page_count(pdf_path)
+            if not total_pages:
                 print("❌ No pages found in PDF")
                 return None
             
-            # Process each page with DocRes
-            enhanced_pages = []
-            
             # Detect environment for progress bar
             is_notebook = "ipykernel" in sys.modules or "jupyter" in sys.modules
             
             # Create progress bar for page processing
             if is_notebook:
                 progress_bar = create_notebook_friendly_bar(
-                    total=len(pil_pages), 
+                    total=total_pages, 
                     desc="Processing pages"
                 )
             else:
                 progress_bar = create_beautiful_progress_bar(
-                    total=len(pil_pages), 
+                    total=total_pages, 
                     desc="Processing pages",
                     leave=True
                 )
             
-            with progress_bar:
-                for i, page_img in enumerate(pil_pages):
-                    try:
-                        # Convert PIL to numpy array
-                        img_array = np.array(page_img)
-                        
-                        # Apply DocRes restoration
-                        restored_img, _ = self.restore_image(img_array, task)
-                        
+            # Pages are rendered one batch at a time and appended to the PDF as soon
+            # as they are restored, so only one batch is held in memory
+            pages_written = 0
+            
+            def restore_chunk(start: int, chunk: List[Image.Image]) -> None:
+                nonlocal pages_written
+                results = self.batch_restore([np.array(page_img) for page_img in chunk], task)
+                
+                for i, (page_img, (restored_img, metadata)) in enumerate(zip(chunk, results), start):
+                    if restored_img is not None:
                         # Convert back to PIL Image
                         enhanced_page = Image.fromarray(restored_img)
-                        enhanced_pages.append(enhanced_page)
-                        
-                        progress_bar.set_description(f"✅ Page {i+1}/{len(pil_pages)} processed")
-                        progress_bar.update(1)
-                        
-                    except Exception as e:
-                        print(f"  ⚠️ Page {i+1} processing failed: {e}, using original")
-                        enhanced_pages.append(page_img)
+                        progress_bar.set_description(f"✅ Page {i+1}/{total_pages} processed")
+                    else:
+                        print(f"  ⚠️ Page {i+1} processing failed: {metadata['error']}, using original")
+                        enhanced_page = page_img
                         progress_bar.set_description(f"⚠️ Page {i+1} failed, using original")
-                        progress_bar.update(1)
+                    enhanced_page.save(output_path, "PDF", resolution=100.0, append=pages_written > 0)
+                    pages_written += 1
+                    progress_bar.update(1)
             
-            # Create enhanced PDF
-            if enhanced_pages:
-                enhanced_pages[0].save(
-                    output_path,
-                    "PDF",
-                    resolution=100.0,
-                    save_all=True,
-                    append_images=enhanced_pages[1:] if len(enhanced_pages) > 1 else []
-                )
-                
+            with progress_bar:
+                start, chunk = 0, []
+                for i, (page_img, _, _) in enumerate(iter_pdf_pages(pdf_path, dpi=dpi, window=self.batch_size)):
+                    chunk.append(page_img)
+                    if len(chunk) == self.batch_size:
+                        restore_chunk(start, chunk)
+                        start, chunk = i + 1, []
+                if chunk:
+                    restore_chunk(start, chunk)
+            
+            if pages_written:
                 print(f"✅ Enhanced PDF saved: {output_path}")
                 return output_path
             else:
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from doctra.engines.layout.layout_models import LayoutBox, LayoutPage
+from doctra.utils.disk_cache import DiskCache, cache_root
+
+# Bumped whenever the key derivation or stored format changes
+_CACHE_FORMAT = "1"
+
+# One raw detection as returned by the model: (label, score, [x1, y1, x2, y2])
+Detection = Tuple[str, float, Sequence[float]]
+
+
+def default_cache_dir() -> str:
+    """
+    Return the default directory for the layout detection cache.
+
+    Uses ``$DOCTRA_CACHE_DIR/layout`` when set, otherwise ``~/.cache/doctra/layout``
+    (honouring ``$XDG_CACHE_HOME``).
+
+    :return: Absolute path of the cache directory
+    """
+    return os.path.join(cache_root(), "layout")
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Return the SHA-256 digest of a file's bytes.
+
+    :param path: Path of the file to hash
+    :param chunk_size: Read size in bytes (default: 1 MiB)
+    :return: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _key(*parts: str, data: bytes = b"") -> str:
+    digest = hashlib.sha256()
+    for part in (_CACHE_FORMAT,) + parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def image_key(image: Image.Image, model_name: str, layout_nms: bool) -> str:
+    """
+    Build the cache key for one page raster.
+
+    The key is an exact hash of the decoded pixels, so the same page rendered
+    at the same DPI hits no matter where the image came from.
+
+    :param image: Page image passed to the model
+    :param model_name: Layout model name
+    :param layout_nms: Whether layout NMS is applied
+    :return: Hex SHA-256 digest identifying the detection request
+    """
+    return _key("image", model_name, str(bool(layout_nms)), image.mode,
+                f"{image.size[0]}x{image.size[1]}", data=image.tobytes())
+
+
+def document_key(pdf_digest: str, page_index: int, dpi: int, model_name: str, layout_nms: bool) -> str:
+    """
+    Build the cache key for one page of a PDF, without rendering it.
+
+    :param pdf_digest: :func:`file_digest` of the PDF
+    :param page_index: 1-based page index
+    :param dpi: Rendering DPI
+    :param model_name: Layout model name
+    :param layout_nms: Whether layout NMS is applied
+    :return: Hex SHA-256 digest identifying the detection request
+    """
+    return _key("pdf", pdf_digest, str(page_index), str(dpi), model_name, str(bool(layout_nms)))
+
+
+def encode_detections(width: int, height: int, detections: Sequence[Detection]) -> bytes:
+    """
+    Serialize a page's raw detections compactly (zlib-compressed JSON rows).
+
+    :param width: Page image width in pixels
+    :param height: Page image height in pixels
+    :param detections: Raw (label, score, coordinate) detections, unfiltered
+    :return: Encoded bytes
+    """
+    rows = [[label, float(score), *(float(v) for v in coord)] for label, score, coord in detections]
+    return zlib.compress(json.dumps([width, height, rows], separators=(",", ":")).encode("utf-8"))
+
+
+def decode_detections(data: bytes) -> Tuple[int, int, List[Detection]]:
+    """
+    Inverse of :func:`encode_detections`.
+
+    :param data: Bytes produced by :func:`encode_detections`
+    :return: (width, height, detections)
+    """
+    width, height, rows = json.loads(zlib.decompress(data).decode("utf-8"))
+    return width, height, [(row[0], row[1], row[2:6]) for row in rows]
+
+
+def build_page(
+    page_index: int,
+    width: int,
+    height: int,
+    detections: Sequence[Detection],
+    min_score: float = 0.0,
+) -> LayoutPage:
+    """
+    Build a LayoutPage from raw detections, dropping those below ``min_score``.
+
+    :param page_index: 1-based page index
+    :param width: Page image width in pixels
+    :param height: Page image height in pixels
+    :param detections: Raw (label, score, coordinate) detections
+    :param min_score: Filter out detections below this confidence threshold (default: 0.0)
+    :return: LayoutPage with absolute and normalized box coordinates
+    """
+    boxes = [
+        LayoutBox.from_absolute(label=label, score=score, coord=coord, img_w=width, img_h=height)
+        for label, score, coord in detections
+        if score >= min_score
+    ]
+    return LayoutPage(page_index=page_index, width=width, height=height, boxes=boxes)
+
+
+class LayoutCache:
+    """
+    Persistent on-disk cache for layout detection results.
+
+    Detections are stored before ``min_score`` filtering, so one entry serves
+    every threshold. Entries are keyed either by page raster
+    (:func:`image_key`) or by PDF bytes and page index (:func:`document_key`);
+    the latter lets a fully cached document skip rendering as well as model
+    loading. Each entry is tagged with its model name and, for PDF-keyed
+    entries, the PDF digest, so both can be invalidated explicitly.
+
+    :param cache_dir: Directory holding ``cache.sqlite3`` (default: :func:`default_cache_dir`)
+    :param max_size_mb: Size cap for stored results in megabytes (default: 256)
+    :param ttl_days: Time-to-live of an entry in days, or None to never expire (default: None)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        *,
+        max_size_mb: float = 256,
+        ttl_days: Optional[float] = None,
+    ):
+        self.cache_dir = os.path.abspath(cache_dir) if cache_dir else default_cache_dir()
+        self._store = DiskCache(os.path.join(self.cache_dir, "cache.sqlite3"),
+                                max_size_mb=max_size_mb, ttl_days=ttl_days)
+        self.path = self._store.path
+
+    def get(self, key: str) -> Optional[Tuple[int, int, List[Detection]]]:
+        """
+        Look up the raw detections for one page.
+
+        :param key: Key from :func:`image_key` or :func:`document_key`
+        :return: (width, height, detections), or None on a miss
+        """
+        data = self._store.get(key)
+        if data is None:
+            return None
+        try:
+            return decode_detections(data)
+        except (ValueError, zlib.error):
+            self._store.reject(key)
+            return None
+
+    def put(
+        self,
+        key: str,
+        width: int,
+        height: int,
+        detections: Sequence[Detection],
+        *,
+        model_name: str,
+        pdf_digest: str = "",
+    ) -> None:
+        """
+        Store the raw detections for one page.
+
+        :param key: Key from :func:`image_key` or :func:`document_key`
+        :param width: Page image width in pixels
+        :param height: Page image height in pixels
+        :param detections: Raw (label, score, coordinate) detections, unfiltered
+        :param model_name: Layout model that produced them (used by :meth:`invalidate`)
+        :param pdf_digest: Digest of the source PDF for PDF-keyed entries (default: "")
+        :return: None
+        """
+        self._store.put(key, encode_detections(width, height, detections),
+                        namespace=model_name, source=pdf_digest)
+
+    def invalidate(self, *, model_name: Optional[str] = None, pdf_path: Optional[str] = None) -> int:
+        """
+        Remove cached results for a model and/or a document.
+
+        ``pdf_path`` removes the entries keyed by that PDF's bytes; pages
+        cached by raster hash are only removed by model or by :meth:`clear`.
+
+        :param model_name: Only remove entries produced by this model (default: any)
+        :param pdf_path: Only remove entries for this PDF (default: any)
+        :return: Number of entries removed
+        """
+        source = file_digest(pdf_path) if pdf_path else None
+        return self._store.invalidate(namespace=model_name, source=source)
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+
+        :return: None
+        """
+        self._store.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this instance and the size of the store.
+
+        :return: Dict with ``hits``, ``misses``, ``hit_rate``, ``entries``, ``size_bytes`` and ``path``
+        """
+        return self._store.stats()
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection.
+
+        :return: None
+        """
+        self._store.close()
@@ -0,0 +1,503 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from doctra.engines.layout.layout_models import LayoutBox, LayoutPage
+
+# One row per detected box. ``page`` is the row of the box's page in
+# ``LayoutBatch.pages`` and ``label`` an index into ``LayoutBatch.labels``.
+# Coordinates and scores are float32, the precision the model produces.
+BOX_DTYPE = np.dtype([
+    ("page", "<i4"), ("label", "<i2"), ("score", "<f4"),
+    ("x1", "<f4"), ("y1", "<f4"), ("x2", "<f4"), ("y2", "<f4"),
+])
+
+# One row per page; pages without boxes are kept.
+PAGE_DTYPE = np.dtype([("page_index", "<i4"), ("width", "<i4"), ("height", "<i4")])
+
+_COORDS = ["x1", "y1", "x2", "y2"]
+_BOX_FIELDS = ("label", "score", "x1", "y1", "x2", "y2", "nx1", "ny1", "nx2", "ny2")
+
+# (page_index, width, height, [(label, score, [x1, y1, x2, y2]), ...])
+PageRecord = Tuple[int, int, int, Sequence[Tuple[str, float, Sequence[float]]]]
+
+
+class LayoutBoxView:
+    """
+    Read-only view of one row of a :class:`LayoutBatch` that behaves like a :class:`LayoutBox`.
+
+    Attribute access reads straight from the batch's array, so creating a
+    view copies nothing. Views compare equal to a ``LayoutBox`` (or another
+    view) with the same field values.
+    """
+
+    __slots__ = ("_batch", "_row", "index")
+
+    def __init__(self, batch: "LayoutBatch", index: int):
+        self._batch = batch
+        self._row = batch.boxes[index]
+        self.index = index
+
+    @property
+    def label(self) -> str:
+        return self._batch.labels[self._row["label"]]
+
+    @property
+    def score(self) -> float:
+        return float(self._row["score"])
+
+    @property
+    def x1(self) -> float:
+        return float(self._row["x1"])
+
+    @property
+    def y1(self) -> float:
+        return float(self._row["y1"])
+
+    @property
+    def x2(self) -> float:
+        return float(self._row["x2"])
+
+    @property
+    def y2(self) -> float:
+        return float(self._row["y2"])
+
+    @property
+    def nx1(self) -> float:
+        return self.x1 / self._page_size()[0]
+
+    @property
+    def ny1(self) -> float:
+        return self.y1 / self._page_size()[1]
+
+    @property
+    def nx2(self) -> float:
+        return self.x2 / self._page_size()[0]
+
+    @property
+    def ny2(self) -> float:
+        return self.y2 / self._page_size()[1]
+
+    def _page_size(self) -> Tuple[int, int]:
+        page = self._batch.pages[self._row["page"]]
+        return int(page["width"]), int(page["height"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the box to the same dict as ``dataclasses.asdict(LayoutBox)``.
+
+        :return: Dict of label, score, absolute and normalized coordinates
+        """
+        return {name: getattr(self, name) for name in _BOX_FIELDS}
+
+    def to_box(self) -> LayoutBox:
+        """
+        Materialize the view as a standalone LayoutBox.
+
+        :return: LayoutBox with the same values
+        """
+        return LayoutBox(**self.to_dict())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (LayoutBox, LayoutBoxView)):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _BOX_FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"LayoutBoxView(label={self.label!r}, score={self.score:.4f}, "
+                f"x1={self.x1}, y1={self.y1}, x2={self.x2}, y2={self.y2})")
+
+
+class LayoutPageView:
+    """
+    View of one page of a :class:`LayoutBatch` that behaves like a :class:`LayoutPage`.
+
+    ``boxes`` is a list of :class:`LayoutBoxView` over the page's contiguous
+    slice of the batch.
+    """
+
+    __slots__ = ("_batch", "row")
+
+    def __init__(self, batch: "LayoutBatch", row: int):
+        self._batch = batch
+        self.row = row
+
+    @property
+    def page_index(self) -> int:
+        return int(self._batch.pages["page_index"][self.row])
+
+    @property
+    def width(self) -> int:
+        return int(self._batch.pages["width"][self.row])
+
+    @property
+    def height(self) -> int:
+        return int(self._batch.pages["height"][self.row])
+
+    @property
+    def boxes(self) -> List[LayoutBoxView]:
+        start, stop = self._batch.page_slice(self.row)
+        return [LayoutBoxView(self._batch, i) for i in range(start, stop)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the page to the same dict as ``LayoutPage.to_dict``.
+
+        :return: Dict with page_index, width, height and boxes
+        """
+        return {"page_index": self.page_index, "width": self.width, "height": self.height,
+                "boxes": [box.to_dict() for box in self.boxes]}
+
+    def to_page(self) -> LayoutPage:
+        """
+        Materialize the view as a standalone LayoutPage.
+
+        :return: LayoutPage with LayoutBox instances
+        """
+        return LayoutPage(page_index=self.page_index, width=self.width, height=self.height,
+                          boxes=[box.to_box() for box in self.boxes])
+
+
+class LayoutBatch:
+    """
+    Columnar storage for the layout detections of many pages.
+
+    Boxes are kept in one NumPy structured array (``BOX_DTYPE``, 28 bytes
+    per box) grouped by page, labels are int-coded against ``labels``, and
+    normalized coordinates are computed from the page sizes on demand
+    instead of being stored. Filters, NMS and normalization are vectorized
+    over the whole batch, and JSONL export converts whole columns at once.
+
+    Existing code written against ``LayoutPage``/``LayoutBox`` can use
+    :meth:`page_views` (or iterate the batch), whose views read from the
+    arrays without copying, or :meth:`to_pages` to materialize dataclasses.
+
+    :param boxes: Array of ``BOX_DTYPE`` rows, sorted by ``page``
+    :param pages: Array of ``PAGE_DTYPE`` rows
+    :param labels: Label names; a box's ``label`` field indexes into this
+    """
+
+    def __init__(self, boxes: np.ndarray, pages: np.ndarray, labels: Sequence[str]):
+        self.boxes = np.asarray(boxes, dtype=BOX_DTYPE)
+        self.pages = np.asarray(pages, dtype=PAGE_DTYPE)
+        self.labels: Tuple[str, ...] = tuple(labels)
+        self._offsets = np.searchsorted(self.boxes["page"], np.arange(len(self.pages) + 1))
+
+    # Construction
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[PageRecord],
+        min_score: float = 0.0,
+        labels: Sequence[str] = (),
+    ) -> "LayoutBatch":
+        """
+        Build a batch from raw per-page detections.
+
+        :param records: (page_index, width, height, detections) per page, in page order;
+                        detections are (label, score, [x1, y1, x2, y2]) as stored by the layout cache
+        :param min_score: Drop detections below this confidence threshold (default: 0.0)
+        :param labels: Label names to code first, e.g. to share codes between batches (default: ())
+        :return: LayoutBatch
+        """
+        vocab: Dict[str, int] = {label: code for code, label in enumerate(labels)}
+        page_rows: List[Tuple[int, int, int]] = []
+        box_pages: List[int] = []
+        codes: List[int] = []
+        scores: List[float] = []
+        coords: List[Sequence[float]] = []
+        for row, (page_index, width, height, detections) in enumerate(records):
+            page_rows.append((page_index, width, height))
+            for label, score, coord in detections:
+                if score < min_score:
+                    continue
+                code = vocab.get(label)
+                if code is None:
+                    code = vocab[label] = len(vocab)
+                box_pages.append(row)
+                codes.append(code)
+                scores.append(score)
+                coords.append(coord)
+
+        boxes = np.empty(len(codes), dtype=BOX_DTYPE)
+        boxes["page"] = box_pages
+        boxes["label"] = codes
+        boxes["score"] = scores
+        xy = np.asarray(coords, dtype=np.float32).reshape(-1, 4)
+        for column, name in enumerate(_COORDS):
+            boxes[name] = xy[:, column]
+        return cls(boxes, np.array(page_rows, dtype=PAGE_DTYPE), list(vocab))
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[LayoutPage], min_score: float = 0.0) -> "LayoutBatch":
+        """
+        Build a batch from LayoutPage objects (or LayoutPageViews).
+
+        :param pages: Pages in document order
+        :param min_score: Drop detections below this confidence threshold (default: 0.0)
+        :return: LayoutBatch
+        """
+        return cls.from_records(
+            ((p.page_index, p.width, p.height, [(b.label, b.score, (b.x1, b.y1, b.x2, b.y2)) for b in p.boxes])
+             for p in pages),
+            min_score=min_score,
+        )
+
+    @classmethod
+    def concatenate(cls, batches: Sequence["LayoutBatch"]) -> "LayoutBatch":
+        """
+        Stack several batches (e.g. one per document) into one.
+
+        Label codes are remapped onto a common label list.
+
+        :param batches: Batches to stack, in order
+        :return: LayoutBatch holding every page and box of ``batches``
+        """
+        labels: Dict[str, int] = {}
+        parts, page_parts, page_offset = [], [], 0
+        for batch in batches:
+            remap = np.array([labels.setdefault(label, len(labels)) for label in batch.labels] or [0],
+                             dtype=BOX_DTYPE["label"])
+            boxes = batch.boxes.copy()
+            boxes["label"] = remap[boxes["label"]]
+            boxes["page"] += page_offset
+            parts.append(boxes)
+            page_parts.append(batch.pages)
+            page_offset += len(batch.pages)
+        if not parts:
+            return cls(np.empty(0, BOX_DTYPE), np.empty(0, PAGE_DTYPE), ())
+        return cls(np.concatenate(parts), np.concatenate(page_parts), list(labels))
+
+    # Size and access
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    @property
+    def num_pages(self) -> int:
+        return len(self.pages)
+
+    def __getitem__(self, index: Union[int, slice, np.ndarray, Sequence[int]]) -> Union[LayoutBoxView, "LayoutBatch"]:
+        """
+        ``batch[i]`` returns a box view; a slice, mask or index array returns a sub-batch with every page.
+        """
+        if isinstance(index, (int, np.integer)):
+            n = len(self.boxes)
+            if not -n <= index < n:
+                raise IndexError(f"box index {index} out of range for {n} boxes")
+            return LayoutBoxView(self, int(index) % n)
+        return self.select(index)
+
+    def __iter__(self) -> Iterator[LayoutPageView]:
+        return iter(self.page_views())
+
+    def page_slice(self, row: int) -> Tuple[int, int]:
+        """
+        Return the [start, stop) range of box rows belonging to page ``row``.
+
+        :param row: Row of the page in ``pages``
+        :return: (start, stop)
+        """
+        return int(self._offsets[row]), int(self._offsets[row + 1])
+
+    def page_views(self) -> List[LayoutPageView]:
+        """
+        Return a LayoutPage-like view per page.
+
+        :return: List of LayoutPageView in page order
+        """
+        return [LayoutPageView(self, row) for row in range(len(self.pages))]
+
+    def to_pages(self) -> List[LayoutPage]:
+        """
+        Materialize every page as LayoutPage/LayoutBox dataclasses.
+
+        :return: List of LayoutPage in page order
+        """
+        return [view.to_page() for view in self.page_views()]
+
+    # Columns
+
+    def label_code(self, label: str) -> int:
+        """
+        Return the integer code of ``label``, or -1 if no box has ever used it.
+
+        :param label: Label name
+        :return: Code used in ``boxes["label"]``
+        """
+        try:
+            return self.labels.index(label)
+        except ValueError:
+            return -1
+
+    def label_names(self) -> np.ndarray:
+        """
+        Return the label name of every box.
+
+        :return: Object array of label strings
+        """
+        return np.asarray(self.labels + ("",), dtype=object)[self.boxes["label"]]
+
+    def page_indices(self) -> np.ndarray:
+        """
+        Return the 1-based page index of every box.
+
+        :return: int32 array
+        """
+        return self.pages["page_index"][self.boxes["page"]]
+
+    def coords(self) -> np.ndarray:
+        """
+        Return absolute box coordinates.
+
+        :return: (n, 4) float32 array of x1, y1, x2, y2
+        """
+        return np.stack([self.boxes[name] for name in _COORDS], axis=1)
+
+    def normalized(self) -> np.ndarray:
+        """
+        Return box coordinates normalized by their page's width and height.
+
+        :return: (n, 4) float64 array of nx1, ny1, nx2, ny2
+        """
+        page = self.pages[self.boxes["page"]]
+        size = np.stack([page["width"], page["height"], page["width"], page["height"]], axis=1)
+        return self.coords().astype(np.float64) / size
+
+    def areas(self) -> np.ndarray:
+        """
+        Return the area of every box in square pixels.
+
+        :return: float32 array
+        """
+        b = self.boxes
+        return np.clip(b["x2"] - b["x1"], 0, None) * np.clip(b["y2"] - b["y1"], 0, None)
+
+    def label_counts(self) -> Dict[str, int]:
+        """
+        Count boxes per label.
+
+        :return: Dict of label name to count, for labels that occur
+        """
+        counts = np.bincount(self.boxes["label"], minlength=len(self.labels))
+        return {label: int(n) for label, n in zip(self.labels, counts) if n}
+
+    # Vectorized operations
+
+    def select(self, index: Union[slice, np.ndarray, Sequence[int]]) -> "LayoutBatch":
+        """
+        Return a sub-batch of the boxes picked by a slice, boolean mask or index array.
+
+        Every page is kept (possibly without boxes) and label codes are unchanged.
+        Index arrays are applied in page order so the batch stays grouped by page.
+
+        :param index: Slice, boolean mask over boxes, or integer indices
+        :return: LayoutBatch
+        """
+        if isinstance(index, slice):
+            boxes = self.boxes[index]
+            if index.step not in (None, 1):
+                boxes = boxes[np.argsort(boxes["page"], kind="stable")]
+        else:
+            index = np.asarray(index)
+            if index.dtype != bool:
+                index = np.sort(index)
+            boxes = self.boxes[index]
+        return LayoutBatch(boxes, self.pages, self.labels)
+
+    def filter(
+        self,
+        labels: Optional[Iterable[str]] = None,
+        min_score: Optional[float] = None,
+        exclude: Optional[Iterable[str]] = None,
+    ) -> "LayoutBatch":
+        """
+        Keep boxes by label and confidence.
+
+        :param labels: Keep only these labels (default: all)
+        :param min_score: Keep only boxes scoring at least this much (default: no threshold)
+        :param exclude: Drop these labels (default: none)
+        :return: LayoutBatch with the matching boxes
+        """
+        mask = np.ones(len(self.boxes), dtype=bool)
+        codes = self.boxes["label"]
+        if labels is not None:
+            mask &= np.isin(codes, [self.label_code(label) for label in labels])
+        if exclude is not None:
+            mask &= ~np.isin(codes, [self.label_code(label) for label in exclude])
+        if min_score is not None:
+            mask &= self.boxes["score"] >= min_score
+        return self.select(mask)
+
+    def nms(self, iou_threshold: float = 0.5, class_agnostic: bool = False) -> "LayoutBatch":
+        """
+        Greedy non-maximum suppression, per page and (unless ``class_agnostic``) per label.
+
+        Boxes on different pages never suppress each other. The pairwise IoU
+        of each group is computed as one matrix, so the Python-level work is
+        a short loop per box rather than per pair.
+
+        :param iou_threshold: Suppress boxes overlapping a higher-scoring box by more than this IoU (default: 0.5)
+        :param class_agnostic: Let boxes of different labels suppress each other (default: False)
+        :return: LayoutBatch with the kept boxes
+        """
+        group = self.boxes["page"].astype(np.int64)
+        if not class_agnostic:
+            group = group * max(len(self.labels), 1) + self.boxes["label"]
+        # Highest score first within each group
+        order = np.lexsort((-self.boxes["score"], group))
+        xy = self.coords()[order].astype(np.float64)
+        areas = self.areas()[order].astype(np.float64)
+        bounds = np.flatnonzero(np.diff(group[order])) + 1
+
+        keep = np.zeros(len(self.boxes), dtype=bool)
+        for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(order)]):
+            g = xy[start:stop]
+            w = (np.minimum(g[:, None, 2], g[None, :, 2]) - np.maximum(g[:, None, 0], g[None, :, 0])).clip(0)
+            h = (np.minimum(g[:, None, 3], g[None, :, 3]) - np.maximum(g[:, None, 1], g[None, :, 1])).clip(0)
+            inter = w * h
+            union = areas[start:stop, None] + areas[None, start:stop] - inter
+            overlaps = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0) > iou_threshold
+            alive = np.ones(stop - start, dtype=bool)
+            for i in range(stop - start):
+                if alive[i]:
+                    alive[i + 1:] &= ~overlaps[i, i + 1:]
+            keep[order[start:stop]] = alive
+        return self.select(keep)
+
+    # Serialization
+
+    def iter_page_dicts(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield one ``LayoutPage.to_dict``-shaped dict per page.
+
+        Columns are converted to Python values once for the whole batch
+        rather than box by box.
+
+        :return: Iterator of page dicts in page order
+        """
+        names = self.label_names().tolist()
+        columns = [self.boxes["score"].tolist()] + [self.boxes[name].tolist() for name in _COORDS]
+        columns += self.normalized().T.tolist()
+        rows = list(zip(names, *columns))
+        for row, (page_index, width, height) in enumerate(self.pages.tolist()):
+            start, stop = self.page_slice(row)
+            yield {"page_index": page_index, "width": width, "height": height,
+                   "boxes": [dict(zip(_BOX_FIELDS, box)) for box in rows[start:stop]]}
+
+    def save_jsonl(self, out_path: str) -> None:
+        """
+        Save the batch as JSONL, one page per line (same format as ``PaddleLayoutEngine.save_jsonl``).
+
+        :param out_path: Output file path
+        :return: None
+        """
+        with open(out_path, "w", encoding="utf-8") as f:
+            for page in self.iter_page_dicts():
+                f.write(json.dumps(page, ensure_ascii=False) + "\n")
@@ -1,4 +1,4 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import List
 
 
@@ -86,5 +86,6 @@ class LayoutPage:
             "page_index": self.page_index,
             "width": self.width,
             "height": self.height,
-            "boxes": [asdict(b) for b in self.boxes],
+            # vars() gives the same dict as asdict() without its recursive deep copy
+            "boxes": [dict(vars(b)) for b in self.boxes],
         }
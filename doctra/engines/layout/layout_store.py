@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from doctra.engines.layout.layout_batch import BOX_DTYPE, PAGE_DTYPE, LayoutBatch, LayoutPageView
+from doctra.engines.layout.layout_models import LayoutPage
+
+# Bumped whenever the on-disk layout changes
+_STORE_FORMAT = 1
+
+META_FILE = "layout.json"
+BOXES_FILE = "boxes.bin"
+PAGES_FILE = "pages.bin"
+
+# One row per page of the corpus. ``box_start``/``box_count`` index the
+# page's contiguous run of rows in boxes.bin, whose ``page`` field is the
+# page's row here.
+STORE_PAGE_DTYPE = np.dtype([
+    ("document", "<i4"), ("page_index", "<i4"), ("width", "<i4"), ("height", "<i4"),
+    ("box_start", "<i8"), ("box_count", "<i4"),
+])
+
+
+def is_layout_store(path: str) -> bool:
+    """
+    Tell whether ``path`` is a layout store directory.
+
+    :param path: Path to check
+    :return: True if ``path`` is a directory holding a layout store index
+    """
+    return os.path.isfile(os.path.join(path, META_FILE))
+
+
+def _read_meta(path: str) -> Dict[str, Any]:
+    with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("format") != _STORE_FORMAT:
+        raise ValueError(f"Unsupported layout store format {meta.get('format')!r} in {path}")
+    return meta
+
+
+def _memmap(path: str, dtype: np.dtype, count: int) -> np.ndarray:
+    if count == 0:
+        # np.memmap refuses zero-length maps
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+class LayoutStoreWriter:
+    """
+    Append layout detections of many documents to an on-disk layout store.
+
+    A store is a directory of two flat binary files, ``boxes.bin``
+    (``BOX_DTYPE`` rows) and ``pages.bin`` (``STORE_PAGE_DTYPE`` rows), plus
+    a ``layout.json`` index holding the row counts, the label list and the
+    document names. Rows are only ever appended, and the index is rewritten
+    atomically by :meth:`flush`/:meth:`close`; rows written after the last
+    flush (e.g. by a crashed run) are ignored by readers and discarded when
+    the store is next opened for writing.
+
+    :param path: Store directory; created if missing
+    :param append: Keep the documents already in the store (default: True); False starts a new store
+    """
+
+    def __init__(self, path: str, append: bool = True):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        if append and is_layout_store(path):
+            meta = _read_meta(path)
+            self.labels: List[str] = list(meta["labels"])
+            self.documents: List[str] = list(meta["documents"])
+            self.num_pages = int(meta["num_pages"])
+            self.num_boxes = int(meta["num_boxes"])
+        else:
+            self.labels, self.documents, self.num_pages, self.num_boxes = [], [], 0, 0
+        self._codes = {label: code for code, label in enumerate(self.labels)}
+        self._boxes = self._open(BOXES_FILE, self.num_boxes * BOX_DTYPE.itemsize)
+        self._pages = self._open(PAGES_FILE, self.num_pages * STORE_PAGE_DTYPE.itemsize)
+
+    def _open(self, name: str, size: int):
+        f = open(os.path.join(self.path, name), "a+b")
+        f.truncate(size)
+        f.seek(size)
+        return f
+
+    def add(self, pages: Union[LayoutBatch, Sequence[LayoutPage]], document: str) -> int:
+        """
+        Append one document's detections.
+
+        :param pages: The document's pages, as a LayoutBatch or LayoutPage list
+        :param document: Document name (e.g. the PDF path) recorded in the index
+        :return: Document id, i.e. its position in ``documents``
+        """
+        batch = pages if isinstance(pages, LayoutBatch) else LayoutBatch.from_pages(pages)
+        remap = np.array([self._code(label) for label in batch.labels] or [0], dtype=BOX_DTYPE["label"])
+        boxes = batch.boxes.copy()
+        boxes["label"] = remap[boxes["label"]]
+        boxes["page"] += self.num_pages
+
+        doc_id = len(self.documents)
+        rows = np.empty(batch.num_pages, dtype=STORE_PAGE_DTYPE)
+        rows["document"] = doc_id
+        for name in ("page_index", "width", "height"):
+            rows[name] = batch.pages[name]
+        offsets = np.asarray(batch._offsets, dtype=np.int64)
+        rows["box_start"] = self.num_boxes + offsets[:-1]
+        rows["box_count"] = np.diff(offsets)
+
+        self._boxes.write(boxes.tobytes())
+        self._pages.write(rows.tobytes())
+        self.documents.append(str(document))
+        self.num_pages += batch.num_pages
+        self.num_boxes += len(boxes)
+        return doc_id
+
+    def _code(self, label: str) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def flush(self) -> None:
+        """
+        Make every document added so far visible to readers.
+
+        :return: None
+        """
+        for f in (self._boxes, self._pages):
+            f.flush()
+            os.fsync(f.fileno())
+        meta = {
+            "format": _STORE_FORMAT,
+            "box_dtype": BOX_DTYPE.descr,
+            "page_dtype": STORE_PAGE_DTYPE.descr,
+            "num_boxes": self.num_boxes,
+            "num_pages": self.num_pages,
+            "labels": self.labels,
+            "documents": self.documents,
+        }
+        meta_path = os.path.join(self.path, META_FILE)
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+    def close(self) -> None:
+        """
+        Flush the index and close the data files.
+
+        :return: None
+        """
+        if self._boxes.closed:
+            return
+        self.flush()
+        self._boxes.close()
+        self._pages.close()
+
+    def __enter__(self) -> "LayoutStoreWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class LayoutStore:
+    """
+    Memory-mapped, read-only access to a layout store written by :class:`LayoutStoreWriter`.
+
+    Opening a store only parses the small JSON index; ``boxes`` and ``pages``
+    are ``np.memmap`` arrays, so reading one page touches just that page's
+    rows and corpus statistics are computed chunk by chunk without loading
+    the corpus into memory.
+
+    :param path: Store directory
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        meta = _read_meta(path)
+        self.labels: Tuple[str, ...] = tuple(meta["labels"])
+        self.documents: List[str] = list(meta["documents"])
+        self.boxes = _memmap(os.path.join(path, BOXES_FILE), BOX_DTYPE, int(meta["num_boxes"]))
+        self.pages = _memmap(os.path.join(path, PAGES_FILE), STORE_PAGE_DTYPE, int(meta["num_pages"]))
+
+    @property
+    def num_pages(self) -> int:
+        return len(self.pages)
+
+    @property
+    def num_boxes(self) -> int:
+        return len(self.boxes)
+
+    @property
+    def num_documents(self) -> int:
+        return len(self.documents)
+
+    def page_boxes(self, row: int) -> np.ndarray:
+        """
+        Return the raw box rows of one page as a view into the memory map.
+
+        :param row: Page row in the store
+        :return: ``BOX_DTYPE`` array (no copy)
+        """
+        page = self.pages[row]
+        start = int(page["box_start"])
+        return self.boxes[start:start + int(page["box_count"])]
+
+    def read_pages(self, start: int, stop: int) -> LayoutBatch:
+        """
+        Load a contiguous range of pages into a LayoutBatch.
+
+        :param start: First page row
+        :param stop: Page row after the last one
+        :return: LayoutBatch holding only those pages and their boxes
+        """
+        pages = self.pages[start:stop]
+        if len(pages) == 0:
+            return LayoutBatch(np.empty(0, BOX_DTYPE), np.empty(0, PAGE_DTYPE), self.labels)
+        first = int(pages["box_start"][0])
+        last = int(pages["box_start"][-1]) + int(pages["box_count"][-1])
+        boxes = np.array(self.boxes[first:last])
+        boxes["page"] -= start
+        page_rows = np.empty(len(pages), dtype=PAGE_DTYPE)
+        for name in PAGE_DTYPE.names:
+            page_rows[name] = pages[name]
+        return LayoutBatch(boxes, page_rows, self.labels)
+
+    def page(self, row: int) -> LayoutPageView:
+        """
+        Load one page.
+
+        :param row: Page row in the store
+        :return: LayoutPage-like view
+        """
+        if not 0 <= row < self.num_pages:
+            raise IndexError(f"page row {row} out of range for {self.num_pages} pages")
+        return self.read_pages(row, row + 1).page_views()[0]
+
+    def document_rows(self, document: Union[int, str]) -> Tuple[int, int]:
+        """
+        Return the [start, stop) page rows of a document.
+
+        :param document: Document id or name
+        :return: (start, stop)
+        """
+        doc_id = self.documents.index(document) if isinstance(document, str) else int(document)
+        column = self.pages["document"]
+        return int(np.searchsorted(column, doc_id, "left")), int(np.searchsorted(column, doc_id, "right"))
+
+    def read_document(self, document: Union[int, str]) -> LayoutBatch:
+        """
+        Load every page of one document.
+
+        :param document: Document id or name
+        :return: LayoutBatch of the document
+        """
+        return self.read_pages(*self.document_rows(document))
+
+    def iter_batches(self, pages_per_batch: int = 10000) -> Iterator[LayoutBatch]:
+        """
+        Walk the corpus in LayoutBatch chunks of at most ``pages_per_batch`` pages.
+
+        :param pages_per_batch: Pages loaded per chunk (default: 10000)
+        :return: Iterator of LayoutBatch
+        """
+        for start in range(0, self.num_pages, pages_per_batch):
+            yield self.read_pages(start, min(start + pages_per_batch, self.num_pages))
+
+    def stats(self, min_score: float = 0.0, chunk_size: int = 1 << 20) -> Dict[str, Any]:
+        """
+        Compute corpus statistics, reading ``chunk_size`` boxes at a time.
+
+        :param min_score: Only count boxes scoring at least this much (default: 0.0)
+        :param chunk_size: Boxes read per chunk (default: 1M, about 28 MB)
+        :return: Dict with ``documents``, ``pages``, ``boxes``, ``label_counts``
+                 (label -> count) and ``boxes_per_page`` (int64 array per page row)
+        """
+        label_totals = np.zeros(len(self.labels), dtype=np.int64)
+        per_page = np.zeros(self.num_pages, dtype=np.int64)
+        for start in range(0, self.num_boxes, chunk_size):
+            chunk = self.boxes[start:start + chunk_size]
+            keep = chunk["score"] >= min_score
+            label_totals += np.bincount(chunk["label"][keep], minlength=len(self.labels))
+            per_page += np.bincount(chunk["page"][keep], minlength=self.num_pages)
+        return {
+            "documents": self.num_documents,
+            "pages": self.num_pages,
+            "boxes": int(per_page.sum()),
+            "label_counts": {label: int(n) for label, n in zip(self.labels, label_totals) if n},
+            "boxes_per_page": per_page,
+        }
@@ -3,85 +3,24 @@ from __future__ import annotations
 import os
 import sys
 import json
-import tempfile
-import contextlib
-import logging
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Sequence, Iterable, Iterator, Union
 
+import numpy as np
 from PIL import Image
-from paddleocr import LayoutDetection  # pip install paddleocr>=2.7.0.3
-from doctra.utils.pdf_io import render_pdf_to_images
+from doctra.utils.pdf_io import render_pdf_to_images, get_pdf_page_count
+from doctra.utils.io_utils import pil_to_bgr
 from doctra.engines.layout.layout_models import LayoutBox, LayoutPage
+from doctra.engines.layout.layout_batch import LayoutBatch
+from doctra.engines.layout.layout_store import LayoutStoreWriter
+from doctra.engines.layout.cache import (
+    Detection, LayoutCache, build_page, document_key, file_digest, image_key,
+)
 from doctra.utils.progress import create_loading_bar
+from doctra.utils.quiet import silence
 import warnings
 
 
-@contextlib.contextmanager
-def silence():
-    """Context manager to suppress stdout, stderr, and logging output."""
-    # Store original logging levels
-    original_levels = {}
-    loggers_to_suppress = [
-        'paddleocr', 'paddle', 'paddlex', 'paddlepaddle', 'ppocr',
-        'transformers', 'huggingface_hub', 'urllib3', 'requests'
-    ]
-    
-    # Suppress logging for various libraries
-    for logger_name in loggers_to_suppress:
-        logger = logging.getLogger(logger_name)
-        original_levels[logger_name] = logger.level
-        logger.setLevel(logging.CRITICAL)
-    
-    # Also suppress root logger
-    root_logger = logging.getLogger()
-    original_root_level = root_logger.level
-    root_logger.setLevel(logging.CRITICAL)
-    
-    # Set environment variables to suppress PaddleOCR output
-    original_env = {}
-    env_vars_to_set = {
-        'DISABLE_AUTO_LOGGING_CONFIG': '1',
-        'PADDLE_LOG_LEVEL': '3',  # Only show fatal errors
-        'GLOG_minloglevel': '3',  # Suppress glog output
-        'TF_CPP_MIN_LOG_LEVEL': '3'  # Suppress TensorFlow output
-    }
-    
-    for key, value in env_vars_to_set.items():
-        original_env[key] = os.environ.get(key)
-        os.environ[key] = value
-    
-    # Temporarily disable all logging handlers
-    original_handlers = {}
-    for logger_name in loggers_to_suppress + ['']:
-        logger = logging.getLogger(logger_name)
-        original_handlers[logger_name] = logger.handlers[:]
-        logger.handlers.clear()
-    
-    try:
-        with open(os.devnull, "w") as devnull, \
-             contextlib.redirect_stdout(devnull), \
-             contextlib.redirect_stderr(devnull):
-            yield
-    finally:
-        # Restore original logging levels
-        for logger_name, level in original_levels.items():
-            logging.getLogger(logger_name).setLevel(level)
-        root_logger.setLevel(original_root_level)
-        
-        # Restore original handlers
-        for logger_name, handlers in original_handlers.items():
-            logger = logging.getLogger(logger_name)
-            logger.handlers = handlers
-        
-        # Restore original environment variables
-        for key, value in original_env.items():
-            if value is None:
-                os.environ.pop(key, None)
-            else:
-                os.environ[key] = value
-
-
 class PaddleLayoutEngine:
     """
     Thin wrapper around PaddleOCR LayoutDetection to support:
@@ -94,18 +33,35 @@ class PaddleLayoutEngine:
     and multi-page PDF support.
     """
 
-    def __init__(self, model_name: str = "PP-DocLayout_plus-L"):
+    def __init__(
+            self,
+            model_name: str = "PP-DocLayout_plus-L",
+            use_cache: bool = True,
+            cache_dir: Optional[str] = None,
+    ):
         """
         Initialize the PaddleLayoutEngine with a specific model.
         
         The model is loaded lazily on first use to avoid unnecessary
-        initialization overhead.
+        initialization overhead. With the cache enabled, pages detected
+        before are served from disk and the model is only loaded when at
+        least one page misses.
 
         :param model_name: Name of the PaddleOCR layout detection model to use
                           (default: "PP-DocLayout_plus-L")
+        :param use_cache: Cache detections on disk, keyed by page content, model
+                          and NMS setting (default: True)
+        :param cache_dir: Directory of the detection cache (default: ~/.cache/doctra/layout,
+                          or $DOCTRA_CACHE_DIR/layout)
         """
         self.model_name = model_name
         self.model: Optional["LayoutDetection"] = None
+        self.cache: Optional[LayoutCache] = None
+        if use_cache:
+            try:
+                self.cache = LayoutCache(cache_dir)
+            except Exception as e:
+                print(f"⚠️ Layout cache disabled, could not open {cache_dir or 'default cache dir'}: {e}")
 
     def _ensure_model(self) -> None:
         """
@@ -119,6 +75,8 @@ class PaddleLayoutEngine:
         if self.model is not None:
             return
 
+        from paddleocr import LayoutDetection  # pip install paddleocr>=2.7.0.3; imported here as it loads Paddle
+
         # Beautiful loading progress bar (no logging suppression)
         with create_loading_bar(f'Loading PaddleOCR layout model: "{self.model_name}"') as bar:
             # Suppress all output during model loading
@@ -146,55 +104,260 @@ class PaddleLayoutEngine:
         returning structured results with both absolute and normalized coordinates
         for each detected layout element.
 
+        Callers that also need the rendered pages (for cropping, OCR, etc.)
+        should render once with ``render_pdf_to_images`` and call
+        ``predict_images`` instead, so the document is not rasterized twice.
+
+        With the cache enabled, pages are looked up by PDF bytes, page index,
+        DPI, model and NMS setting; if every page hits, the PDF is neither
+        rendered nor is the model loaded.
+
         :param pdf_path: Path to the input PDF file
         :param batch_size: Batch size for Paddle inference (default: 1)
         :param layout_nms: Whether to apply layout NMS in Paddle (default: True)
         :param dpi: Rendering DPI for pdf2image conversion (default: 200)
         :param min_score: Filter out detections below this confidence threshold (default: 0.0)
-        :param keep_temp_files: If True, keep the intermediate JPGs for debugging (default: False)
+        :param keep_temp_files: If True, also dump the rendered pages as JPGs next to the PDF
+                                for debugging; inference itself never touches disk. Forces rendering
+                                even when every page is cached (default: False)
         :return: List of LayoutPage objects in 1-based page_index order
         """
-        self._ensure_model()
+        records = self._pdf_records(pdf_path, batch_size, layout_nms, dpi, keep_temp_files)
+        return [build_page(i, *records[i], min_score=min_score) for i in range(1, len(records) + 1)]
+
+    def predict_pdf_batch(
+            self,
+            pdf_path: str,
+            batch_size: int = 1,
+            layout_nms: bool = True,
+            dpi: int = 200,
+            min_score: float = 0.0,
+            keep_temp_files: bool = False,
+    ) -> LayoutBatch:
+        """
+        Same as predict_pdf, but returns the detections as one columnar LayoutBatch.
+
+        The raw detections go straight into NumPy arrays without creating a
+        LayoutBox per detection, which is what corpus-scale analysis and
+        export want. ``batch.page_views()`` still gives LayoutPage-like views.
+
+        :param pdf_path: Path to the input PDF file
+        :param batch_size: Batch size for Paddle inference (default: 1)
+        :param layout_nms: Whether to apply layout NMS in Paddle (default: True)
+        :param dpi: Rendering DPI for pdf2image conversion (default: 200)
+        :param min_score: Filter out detections below this confidence threshold (default: 0.0)
+        :param keep_temp_files: See predict_pdf (default: False)
+        :return: LayoutBatch with one page row per PDF page
+        """
+        records = self._pdf_records(pdf_path, batch_size, layout_nms, dpi, keep_temp_files)
+        return LayoutBatch.from_records(
+            ((i, *records[i]) for i in range(1, len(records) + 1)), min_score=min_score
+        )
+
+    def _pdf_records(
+            self,
+            pdf_path: str,
+            batch_size: int,
+            layout_nms: bool,
+            dpi: int,
+            keep_temp_files: bool,
+    ) -> Dict[int, Tuple[int, int, List[Detection]]]:
+        """
+        Return the raw (width, height, detections) record of every page, keyed by 1-based page index.
+        """
+        # Look pages up by PDF bytes + page index first: a fully cached
+        # document is answered without rendering or loading the model.
+        pdf_digest = None
+        records: Dict[int, Tuple[int, int, List[Detection]]] = {}
+        if self.cache is not None:
+            pdf_digest = file_digest(pdf_path)
+            page_count = get_pdf_page_count(pdf_path)
+            for page_index in range(1, page_count + 1):
+                record = self.cache.get(document_key(pdf_digest, page_index, dpi, self.model_name, layout_nms))
+                if record is not None:
+                    records[page_index] = record
+            if len(records) == page_count and not keep_temp_files:
+                return records
+
         pil_pages: List[Tuple[Image.Image, int, int]] = render_pdf_to_images(pdf_path, dpi=dpi)
-        if not pil_pages:
+        images = [im for (im, _, _) in pil_pages]
+        missing = [i for i in range(1, len(images) + 1) if i not in records]
+        detected = self._detect([images[i - 1] for i in missing], batch_size=batch_size, layout_nms=layout_nms)
+        for page_index, record in zip(missing, detected):
+            records[page_index] = record
+            if self.cache is not None:
+                self.cache.put(
+                    document_key(pdf_digest, page_index, dpi, self.model_name, layout_nms), *record,
+                    model_name=self.model_name, pdf_digest=pdf_digest,
+                )
+
+        if keep_temp_files:
+            self._dump_pages(images, os.path.join(os.path.dirname(pdf_path), f"_doctra_layout_{os.getpid()}"))
+        return records
+
+    def predict_images(
+            self,
+            images: Sequence[Image.Image],
+            batch_size: int = 1,
+            layout_nms: bool = True,
+            min_score: float = 0.0,
+            start_index: int = 1,
+            debug_dir: Optional[str] = None,
+    ) -> List[LayoutPage]:
+        """
+        Run layout detection on already-rendered page images.
+
+        This is the entry point parsers use so that a PDF is rendered once and
+        the same page images are shared by layout detection, OCR, cropping and
+        split-table detection.
+
+        :param images: Page images in document order
+        :param batch_size: Batch size for Paddle inference (default: 1)
+        :param layout_nms: Whether to apply layout NMS in Paddle (default: True)
+        :param min_score: Filter out detections below this confidence threshold (default: 0.0)
+        :param start_index: 1-based page index assigned to the first image (default: 1)
+        :param debug_dir: If set, the page images are also dumped to this directory as JPGs (default: None)
+        :return: List of LayoutPage objects, one per input image
+        """
+        if not images:
             return []
+        records = self._detect(images, batch_size=batch_size, layout_nms=layout_nms)
+        pages = [
+            build_page(start_index + offset, *record, min_score=min_score)
+            for offset, record in enumerate(records)
+        ]
+        if debug_dir:
+            self._dump_pages(images, debug_dir, start_index=start_index)
+        return pages
 
-        # Write pages to a temp dir because LayoutDetection expects image paths.
-        with tempfile.TemporaryDirectory(prefix="doctra_layout_") as tmpdir:
-            img_paths: List[str] = []
-            sizes: List[Tuple[int, int]] = []
-            for i, (im, w, h) in enumerate(pil_pages, start=1):
-                out_path = os.path.join(tmpdir, f"page_{i:04d}.jpg")
-                im.save(out_path, format="JPEG", quality=95)
-                img_paths.append(out_path)
-                sizes.append((w, h))
-
-            # PaddleOCR allows list input; results align with img_paths order.
-            raw_outputs: List[Dict[str, Any]] = self.model.predict(
-                img_paths, batch_size=batch_size, layout_nms=layout_nms
-            )
+    def predict_images_batch(
+            self,
+            images: Sequence[Image.Image],
+            batch_size: int = 1,
+            layout_nms: bool = True,
+            min_score: float = 0.0,
+            start_index: int = 1,
+    ) -> LayoutBatch:
+        """
+        Same as predict_images, but returns the detections as one columnar LayoutBatch.
+
+        :param images: Page images in document order
+        :param batch_size: Batch size for Paddle inference (default: 1)
+        :param layout_nms: Whether to apply layout NMS in Paddle (default: True)
+        :param min_score: Filter out detections below this confidence threshold (default: 0.0)
+        :param start_index: 1-based page index assigned to the first image (default: 1)
+        :return: LayoutBatch with one page row per input image
+        """
+        records = self._detect(images, batch_size=batch_size, layout_nms=layout_nms) if images else []
+        return LayoutBatch.from_records(
+            ((start_index + offset, *record) for offset, record in enumerate(records)), min_score=min_score
+        )
+
+    def _detect(
+            self,
+            images: Sequence[Image.Image],
+            batch_size: int = 1,
+            layout_nms: bool = True,
+    ) -> List[Tuple[int, int, List[Detection]]]:
+        """
+        Return the raw, unfiltered detections for each image.
+
+        Pages found in the cache (by raster hash) are not sent to the model;
+        the model is loaded only if at least one page misses.
+
+        :param images: Page images
+        :param batch_size: Batch size for Paddle inference (default: 1)
+        :param layout_nms: Whether to apply layout NMS in Paddle (default: True)
+        :return: One (width, height, detections) record per image, in input order
+        """
+        records: List[Optional[Tuple[int, int, List[Detection]]]] = [None] * len(images)
+        keys: List[Optional[str]] = [None] * len(images)
+        if self.cache is not None:
+            for i, im in enumerate(images):
+                keys[i] = image_key(im, self.model_name, layout_nms)
+                records[i] = self.cache.get(keys[i])
+        todo = [i for i, record in enumerate(records) if record is None]
+        if not todo:
+            return records
+
+        self._ensure_model()
+        # LayoutDetection accepts ndarray input directly, so pages are handed
+        # over in memory (no JPEG encode/write/read/decode round trip).
+        arrays: List[np.ndarray] = [pil_to_bgr(images[i]) for i in todo]
 
-            pages: List[LayoutPage] = []
-            for idx, raw in enumerate(raw_outputs, start=1):
-                w, h = sizes[idx - 1]
-                boxes: List[LayoutBox] = []
-                for det in raw.get("boxes", []):
-                    score = float(det.get("score", 0.0))
-                    if score < min_score:
-                        continue
-                    label = str(det.get("label", "unknown"))
-                    coord = det.get("coordinate", [0, 0, 0, 0])
-                    boxes.append(LayoutBox.from_absolute(label=label, score=score, coord=coord, img_w=w, img_h=h))
-                pages.append(LayoutPage(page_index=idx, width=w, height=h, boxes=boxes))
-
-            # Optionally keep rendered images for inspection
-            if keep_temp_files:
-                debug_dir = os.path.join(os.path.dirname(pdf_path), f"_doctra_layout_{os.getpid()}")
-                os.makedirs(debug_dir, exist_ok=True)
-                for p in img_paths:
-                    os.replace(p, os.path.join(debug_dir, os.path.basename(p)))
-
-            return pages
+        # PaddleOCR allows list input; results align with input order.
+        raw_outputs: List[Dict[str, Any]] = self.model.predict(
+            arrays, batch_size=batch_size, layout_nms=layout_nms
+        )
+
+        for i, raw in zip(todo, raw_outputs):
+            w, h = images[i].size
+            detections: List[Detection] = [
+                (
+                    str(det.get("label", "unknown")),
+                    float(det.get("score", 0.0)),
+                    [float(v) for v in det.get("coordinate", [0, 0, 0, 0])],
+                )
+                for det in raw.get("boxes", [])
+            ]
+            records[i] = (w, h, detections)
+            if self.cache is not None:
+                self.cache.put(keys[i], w, h, detections, model_name=self.model_name)
+        return records
+
+    @staticmethod
+    def _dump_pages(images: Sequence[Image.Image], debug_dir: str, start_index: int = 1) -> None:
+        """Save page images as JPGs for inspection."""
+        os.makedirs(debug_dir, exist_ok=True)
+        for i, im in enumerate(images, start=start_index):
+            im.save(os.path.join(debug_dir, f"page_{i:04d}.jpg"), format="JPEG", quality=95)
+
+    def predict_image_stream(
+            self,
+            images: Iterable[Image.Image],
+            batch_size: int = 1,
+            layout_nms: bool = True,
+            min_score: float = 0.0,
+            window: int = 4,
+            start_index: int = 1,
+    ) -> Iterator[Tuple[LayoutPage, Image.Image]]:
+        """
+        Run layout detection over a stream of page images.
+
+        Pages are pulled from ``images`` ``window`` at a time, detected, and
+        yielded together with their image so the caller can crop/OCR them and
+        then let them go. At most one window of pages is held here.
+
+        :param images: Iterable of page images in document order (e.g. ``iter_pdf_pages``)
+        :param batch_size: Batch size for Paddle inference (default: 1)
+        :param layout_nms: Whether to apply layout NMS in Paddle (default: True)
+        :param min_score: Filter out detections below this confidence threshold (default: 0.0)
+        :param window: Number of pages detected per call (default: 4)
+        :param start_index: 1-based page index assigned to the first image (default: 1)
+        :return: Iterator of (LayoutPage, page image) tuples in page order
+        """
+        window = max(1, int(window))
+        next_index = start_index
+        chunk: List[Image.Image] = []
+        for im in images:
+            chunk.append(im)
+            if len(chunk) < window:
+                continue
+            pages = self.predict_images(
+                chunk, batch_size=batch_size, layout_nms=layout_nms,
+                min_score=min_score, start_index=next_index,
+            )
+            next_index += len(chunk)
+            for page, page_img in zip(pages, chunk):
+                yield page, page_img
+            chunk = []
+        if chunk:
+            pages = self.predict_images(
+                chunk, batch_size=batch_size, layout_nms=layout_nms,
+                min_score=min_score, start_index=next_index,
+            )
+            for page, page_img in zip(pages, chunk):
+                yield page, page_img
 
     # Convenience helpers
     def predict_pdf_as_dicts(self, pdf_path: str, **kwargs) -> List[Dict[str, Any]]:
@@ -210,17 +373,42 @@ class PaddleLayoutEngine:
         """
         return [p.to_dict() for p in self.predict_pdf(pdf_path, **kwargs)]
 
-    def save_jsonl(self, pages: List[LayoutPage], out_path: str) -> None:
+    def save_jsonl(self, pages: Union[List[LayoutPage], LayoutBatch], out_path: str) -> None:
         """
         Save detections to a JSONL file (one page per line).
         
         Writes each page as a separate JSON line, making it easy to process
         large documents incrementally.
 
-        :param pages: List of LayoutPage objects to save
+        :param pages: List of LayoutPage objects, or a LayoutBatch, to save
         :param out_path: Output file path for the JSONL file
         :return: None
         """
+        if isinstance(pages, LayoutBatch):
+            pages.save_jsonl(out_path)
+            return
         with open(out_path, "w", encoding="utf-8") as f:
             for p in pages:
-                f.write(json.dumps(p.to_dict(), ensure_ascii=False) + "\n")
\ No newline at end of file
+                f.write(json.dumps(p.to_dict(), ensure_ascii=False) + "\n")
+
+    def save_store(
+            self,
+            pages: Union[List[LayoutPage], LayoutBatch],
+            store_dir: str,
+            document: str,
+            append: bool = True,
+    ) -> int:
+        """
+        Append detections to a binary layout store (see ``LayoutStore``).
+
+        Unlike JSONL, the store is read back with memory-mapped arrays, so
+        corpus-wide statistics and random access to any page need no parsing.
+
+        :param pages: List of LayoutPage objects, or a LayoutBatch, of one document
+        :param store_dir: Store directory; created if missing
+        :param document: Document name recorded in the store (e.g. the PDF path)
+        :param append: Keep documents already in the store (default: True)
+        :return: Document id within the store
+        """
+        with LayoutStoreWriter(store_dir, append=append) as writer:
+            return writer.add(pages, document)
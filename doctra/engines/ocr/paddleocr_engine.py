@@ -1,78 +1,10 @@
 from __future__ import annotations
 
-import tempfile
-import os
-import contextlib
-import logging
 import warnings
-from typing import Optional
+from typing import List, Optional, Sequence
 from PIL import Image
-from paddleocr import PaddleOCR
-
-
-@contextlib.contextmanager
-def silence():
-    """Context manager to suppress stdout, stderr, and logging output."""
-    # Store original logging levels
-    original_levels = {}
-    loggers_to_suppress = [
-        'paddleocr', 'paddle', 'paddlex', 'paddlepaddle', 'ppocr',
-        'transformers', 'huggingface_hub', 'urllib3', 'requests'
-    ]
-    
-    # Suppress logging for various libraries
-    for logger_name in loggers_to_suppress:
-        logger = logging.getLogger(logger_name)
-        original_levels[logger_name] = logger.level
-        logger.setLevel(logging.CRITICAL)
-    
-    # Also suppress root logger
-    root_logger = logging.getLogger()
-    original_root_level = root_logger.level
-    root_logger.setLevel(logging.CRITICAL)
-    
-    # Set environment variables to suppress PaddleOCR output
-    original_env = {}
-    env_vars_to_set = {
-        'DISABLE_AUTO_LOGGING_CONFIG': '1',
-        'PADDLE_LOG_LEVEL': '3',  # Only show fatal errors
-        'GLOG_minloglevel': '3',  # Suppress glog output
-        'TF_CPP_MIN_LOG_LEVEL': '3'  # Suppress TensorFlow output
-    }
-    
-    for key, value in env_vars_to_set.items():
-        original_env[key] = os.environ.get(key)
-        os.environ[key] = value
-    
-    # Temporarily disable all logging handlers
-    original_handlers = {}
-    for logger_name in loggers_to_suppress + ['']:
-        logger = logging.getLogger(logger_name)
-        original_handlers[logger_name] = logger.handlers[:]
-        logger.handlers.clear()
-    
-    try:
-        with open(os.devnull, "w") as devnull, \
-             contextlib.redirect_stdout(devnull), \
-             contextlib.redirect_stderr(devnull):
-            yield
-    finally:
-        # Restore original logging levels
-        for logger_name, level in original_levels.items():
-            logging.getLogger(logger_name).setLevel(level)
-        root_logger.setLevel(original_root_level)
-        
-        # Restore original handlers
-        for logger_name, handlers in original_handlers.items():
-            logger = logging.getLogger(logger_name)
-            logger.handlers = handlers
-        
-        # Restore original environment variables
-        for key, value in original_env.items():
-            if value is None:
-                os.environ.pop(key, None)
-            else:
-                os.environ[key] = value
+from doctra.utils.io_utils import pil_to_bgr
+from doctra.utils.quiet import silence
 
 
 class PaddleOCREngine:
@@ -87,6 +19,7 @@ class PaddleOCREngine:
     :param use_doc_unwarping: Enable text image rectification (default: False)
     :param use_textline_orientation: Enable text line orientation classification (default: False)
     :param device: Device to use for OCR ("cpu" or "gpu", default: "gpu")
+    :param batch_size: Number of crops sent to PaddleOCR per predict call in ``recognize_batch`` (default: 8)
     """
 
     def __init__(
@@ -95,6 +28,7 @@ class PaddleOCREngine:
         use_doc_unwarping: bool = False,
         use_textline_orientation: bool = False,
         device: str = "gpu",
+        batch_size: int = 8,
     ):
         """
         Initialize the PaddleOCREngine with OCR configuration.
@@ -107,7 +41,12 @@ class PaddleOCREngine:
         :param use_doc_unwarping: Enable text image rectification (default: False)
         :param use_textline_orientation: Enable text line orientation classification (default: False)
         :param device: Device to use for OCR ("cpu" or "gpu", default: "gpu")
+        :param batch_size: Number of crops sent to PaddleOCR per predict call in ``recognize_batch`` (default: 8)
         """
+        from paddleocr import PaddleOCR  # imported here so importing the engine module does not load Paddle
+
+        self.batch_size = max(1, batch_size)
+
         # Suppress all output during PaddleOCR initialization
         with silence():
             with warnings.catch_warnings():
@@ -131,34 +70,44 @@ class PaddleOCREngine:
         :return: Extracted text string with lines joined by newlines
         :raises TypeError: If the input is not a PIL Image object
         """
-        if not isinstance(image, Image.Image):
-            raise TypeError("PaddleOCREngine expects a PIL.Image.Image as input.")
+        return self.recognize_batch([image])[0]
 
-        # Save PIL image to temporary file since PaddleOCR.predict() expects a file path
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-            image.save(tmp_path, format='PNG')
-        
-        try:
-            # Run OCR prediction with suppressed output
-            with silence():
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore")
-                    result = self.ocr.predict(tmp_path)
-            
-            # Extract rec_texts from the result
-            # The result is a list with one dictionary containing the OCR results
-            if result and len(result) > 0:
-                ocr_result = result[0]
-                rec_texts = ocr_result.get('rec_texts', [])
-                
-                # Join all text elements with newlines
-                text = '\n'.join(rec_texts) if rec_texts else ''
-                return text.strip()
-            
-            return ""
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+    def recognize_batch(self, images: Sequence[Image.Image], batch_size: Optional[int] = None) -> List[str]:
+        """
+        Run OCR on several cropped PIL images and return their texts.
+
+        Crops are handed to ``PaddleOCR.predict`` as in-memory arrays,
+        ``batch_size`` at a time, so PaddleOCR batches them internally and
+        nothing is written to disk. Library logging is quieted once when
+        the engine is constructed, so no per-call output redirection is
+        needed and the method can run alongside other threads.
+
+        :param images: PIL Image objects to perform OCR on
+        :param batch_size: Crops per predict call (default: the engine's ``batch_size``)
+        :return: One extracted text string per image, in input order
+        :raises TypeError: If any input is not a PIL Image object
+        """
+        for image in images:
+            if not isinstance(image, Image.Image):
+                raise TypeError("PaddleOCREngine expects a PIL.Image.Image as input.")
+        if not images:
+            return []
+
+        batch_size = max(1, batch_size or self.batch_size)
+        texts: List[str] = []
+        for start in range(0, len(images), batch_size):
+            chunk = [pil_to_bgr(image) for image in images[start:start + batch_size]]
+            results = list(self.ocr.predict(chunk) or [])
+
+            # Results align with the input order, one dictionary per crop
+            for offset in range(len(chunk)):
+                texts.append(self._result_text(results[offset]) if offset < len(results) else "")
+
+        return texts
 
+    @staticmethod
+    def _result_text(ocr_result) -> str:
+        """Join the recognized lines of one PaddleOCR result with newlines."""
+        rec_texts = ocr_result.get('rec_texts', [])
+        text = '\n'.join(rec_texts) if rec_texts else ''
+        return text.strip()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Optional
+from concurrent.futures import Executor
+from typing import List, Optional, Sequence
 from PIL import Image
 import pytesseract
 
@@ -67,10 +68,34 @@ class PytesseractOCREngine:
         if not isinstance(image, Image.Image):
             raise TypeError("PytesseractOCREngine expects a PIL.Image.Image as input.")
 
+        text = pytesseract.image_to_string(image, lang=self.lang, config=self._config())
+        return text.strip()
+
+    def recognize_batch(self, images: Sequence[Image.Image], executor: Optional[Executor] = None) -> List[str]:
+        """
+        Run OCR on several cropped PIL images and return their texts.
+
+        Every crop is its own ``tesseract`` invocation; when an executor is
+        given they are fanned out to its workers (Tesseract runs in a
+        subprocess, so threads are enough to keep several cores busy) and
+        the texts are gathered back in input order.
+
+        :param images: PIL Image objects to perform OCR on
+        :param executor: Optional executor used to run recognitions concurrently
+        :return: One extracted text string per image, in input order
+        :raises TypeError: If any input is not a PIL Image object
+        """
+        for image in images:
+            if not isinstance(image, Image.Image):
+                raise TypeError("PytesseractOCREngine expects a PIL.Image.Image as input.")
+
+        if executor is None or len(images) < 2:
+            return [self.recognize(image) for image in images]
+        return list(executor.map(self.recognize, images))
+
+    def _config(self) -> str:
+        """Build the Tesseract config string from the engine settings."""
         config_parts = [f"--psm {self.psm}", f"--oem {self.oem}"]
         if self.extra_config:
             config_parts.append(self.extra_config)
-        config = " ".join(config_parts)
-
-        text = pytesseract.image_to_string(image, lang=self.lang, config=config)
-        return text.strip()
+        return " ".join(config_parts)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Any, Dict, Optional, Type, Union
+
+from PIL import Image
+from pydantic import BaseModel
+
+from doctra.utils.disk_cache import DiskCache, cache_root
+
+# Bumped whenever the key derivation or stored format changes
+_CACHE_FORMAT = "1"
+
+
+def default_cache_dir() -> str:
+    """
+    Return the default directory for the VLM result cache.
+
+    Uses ``$DOCTRA_CACHE_DIR/vlm`` when set, otherwise ``~/.cache/doctra/vlm``
+    (honouring ``$XDG_CACHE_HOME``).
+
+    :return: Absolute path of the cache directory
+    """
+    return os.path.join(cache_root(), "vlm")
+
+
+def make_cache_key(
+    image: Image.Image,
+    prompt_text: str,
+    schema_name: str,
+    provider: str,
+    model: Optional[str],
+) -> str:
+    """
+    Build the content-addressed key for one VLM request.
+
+    The image part is an exact hash of the decoded pixels (mode, size and raw
+    bytes), so the same crop re-saved under another name or file format still
+    hits, while any pixel change misses.
+
+    :param image: Image sent to the model
+    :param prompt_text: Prompt text sent with the image
+    :param schema_name: Name of the output schema (e.g. "Table")
+    :param provider: VLM provider name
+    :param model: Resolved model name
+    :return: Hex SHA-256 digest identifying the request
+    """
+    digest = hashlib.sha256()
+    for part in (_CACHE_FORMAT, provider, model or "", schema_name, prompt_text,
+                 image.mode, f"{image.size[0]}x{image.size[1]}"):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class VLMCache:
+    """
+    Persistent on-disk cache for structured VLM results.
+
+    Results are stored as JSON under a key from :func:`make_cache_key` and
+    come back in the form the model returned them: a JSON string (Outlines
+    providers) or a schema instance (Ollama). Storage, TTL expiry and LRU
+    eviction are handled by :class:`~doctra.utils.disk_cache.DiskCache`.
+
+    :param cache_dir: Directory holding ``cache.sqlite3`` (default: :func:`default_cache_dir`)
+    :param max_size_mb: Size cap for stored results in megabytes (default: 512)
+    :param ttl_days: Time-to-live of an entry in days, or None to never expire (default: 30)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        *,
+        max_size_mb: float = 512,
+        ttl_days: Optional[float] = 30,
+    ):
+        self.cache_dir = os.path.abspath(cache_dir) if cache_dir else default_cache_dir()
+        self._store = DiskCache(os.path.join(self.cache_dir, "cache.sqlite3"),
+                                max_size_mb=max_size_mb, ttl_days=ttl_days)
+        self.path = self._store.path
+
+    @property
+    def hits(self) -> int:
+        return self._store.hits
+
+    @property
+    def misses(self) -> int:
+        return self._store.misses
+
+    def get(self, key: str, schema: Type[BaseModel]) -> Optional[Union[BaseModel, str]]:
+        """
+        Look up a cached result and count the hit or miss.
+
+        Expired entries and entries that no longer validate against
+        ``schema`` are deleted and reported as misses.
+
+        :param key: Cache key from :func:`make_cache_key`
+        :param schema: Pydantic schema class the stored JSON must validate against
+        :return: The cached result, or None on a miss
+        """
+        data = self._store.get(key)
+        if data is None:
+            return None
+        is_model, value = data[:1] == b"M", data[1:].decode("utf-8")
+        try:
+            model = schema.model_validate_json(value)
+        except ValueError:
+            self._store.reject(key)
+            return None
+        return model if is_model else value
+
+    def put(self, key: str, result: Union[BaseModel, str]) -> None:
+        """
+        Store a result, evicting least recently used entries over the size cap.
+
+        :param key: Cache key from :func:`make_cache_key`
+        :param result: Structured result returned by the model (schema instance or JSON string)
+        :return: None
+        """
+        is_model = isinstance(result, BaseModel)
+        value = result.model_dump_json() if is_model else str(result)
+        self._store.put(key, (b"M" if is_model else b"S") + value.encode("utf-8"))
+
+    def clear(self) -> None:
+        """
+        Remove every entry and reset the hit/miss counters.
+
+        :return: None
+        """
+        self._store.invalidate()
+        self._store.hits = self._store.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this instance and the size of the store.
+
+        :return: Dict with ``hits``, ``misses``, ``hit_rate``, ``entries``, ``size_bytes`` and ``path``
+        """
+        return self._store.stats()
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection.
+
+        :return: None
+        """
+        self._store.close()
@@ -5,13 +5,34 @@ import json
 import os
 import PIL
 import re
-import openai
-import outlines
 from pydantic import BaseModel
-from google.genai import Client
-from outlines.inputs import Image
-from anthropic import Anthropic
-import ollama
+
+# Provider SDKs (and Outlines) are imported inside make_model / the Ollama
+# wrapper, only for the provider actually in use.
+
+# Model used for each provider when none is given explicitly
+DEFAULT_MODELS = {
+    "gemini": "gemini-2.5-pro",
+    "openai": "gpt-5",
+    "anthropic": "claude-opus-4-1",
+    "openrouter": "x-ai/grok-4",
+    "qianfan": "ernie-4.5-turbo-vl-32k",
+    "ollama": "llava:latest",
+}
+
+
+def resolve_model_name(vlm_provider: str | None, vlm_model: str | None = None) -> str | None:
+    """
+    Return the model name that will be used for a provider.
+
+    :param vlm_provider: VLM provider name (default: "gemini")
+    :param vlm_model: Explicit model name, returned unchanged when given
+    :return: The explicit model name, or the provider's default (None for unknown providers)
+    """
+    if vlm_model:
+        return vlm_model
+    return DEFAULT_MODELS.get((vlm_provider or "gemini").lower())
+
 
 def make_model(
     vlm_provider: str | None = "gemini",
@@ -33,23 +54,13 @@ def make_model(
     """
     vlm_provider = (vlm_provider or "gemini").lower()
     
-    if vlm_model is None:
-        if vlm_provider == "gemini":
-            vlm_model = "gemini-2.5-pro"
-        elif vlm_provider == "openai":
-            vlm_model = "gpt-5"
-        elif vlm_provider == "anthropic":
-            vlm_model = "claude-opus-4-1"
-        elif vlm_provider == "openrouter":
-            vlm_model = "x-ai/grok-4"
-        elif vlm_provider == "qianfan":
-            vlm_model = "ernie-4.5-turbo-vl-32k"
-        elif vlm_provider == "ollama":
-            vlm_model = "llava:latest"
+    vlm_model = resolve_model_name(vlm_provider, vlm_model)
 
     if vlm_provider == "gemini":
         if not api_key:
             raise ValueError("Gemini provider requires api_key to be passed to make_model(...).")
+        import outlines
+        from google.genai import Client
         return outlines.from_gemini(
             Client(api_key=api_key),
             vlm_model,
@@ -58,6 +69,8 @@ def make_model(
     if vlm_provider == "openai":
         if not api_key:
             raise ValueError("OpenAI provider requires api_key to be passed to make_model(...).")
+        import openai
+        import outlines
         return outlines.from_openai(
             openai.OpenAI(api_key=api_key),
             vlm_model,
@@ -66,6 +79,8 @@ def make_model(
     if vlm_provider == "anthropic":
         if not api_key:
             raise ValueError("Anthropic provider requires api_key to be passed to make_model(...).")
+        import outlines
+        from anthropic import Anthropic
         client = Anthropic(api_key=api_key)
         return outlines.from_anthropic(
             client,
@@ -75,6 +90,8 @@ def make_model(
     if vlm_provider == "openrouter":
         if not api_key:
             raise ValueError("OpenRouter provider requires api_key to be passed to make_model(...).")
+        import openai
+        import outlines
         client = openai.OpenAI(
             base_url="https://openrouter.ai/api/v1",
             api_key=api_key,
@@ -87,6 +104,8 @@ def make_model(
     if vlm_provider == "qianfan":
         if not api_key:
             raise ValueError("Qianfan provider requires api_key to be passed to make_model(...).")
+        import openai
+        import outlines
         client = openai.OpenAI(
             base_url="https://qianfan.baidubce.com/v2",
             api_key=api_key,
@@ -170,6 +189,8 @@ class OllamaModelWrapper:
             tmp_path = tmp_file.name
         
         try:
+            import ollama
+
             # Call Ollama with the image and prompt
             response = ollama.chat(
                 messages=[{
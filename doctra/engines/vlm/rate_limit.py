@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    each request takes one token and blocks until one is available.
+
+    :param rate: Tokens added per second
+    :param capacity: Maximum number of tokens (burst size, default: ``max(1, rate)``)
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+_buckets: Dict[Tuple[str, float], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, requests_per_minute: Optional[float]) -> Optional[TokenBucket]:
+    """
+    Return the process-wide token bucket for a provider.
+
+    Extractors talking to the same provider with the same limit share one
+    bucket, so the limit holds across parser instances.
+
+    :param provider: VLM provider name
+    :param requests_per_minute: Allowed request rate, or None/0 for no limit
+    :return: Shared TokenBucket, or None when rate limiting is disabled
+    """
+    if not requests_per_minute:
+        return None
+    key = (provider, float(requests_per_minute))
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate=requests_per_minute / 60.0)
+            _buckets[key] = bucket
+        return bucket
+
+
+_RATE_LIMIT_PATTERN = re.compile(r"\b429\b|rate.?limit|too many requests|resource.?exhausted|quota", re.I)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """
+    Heuristically detect a provider "429 Too Many Requests" error.
+
+    Provider SDKs raise different exception types, so this checks the common
+    ``status_code``/``code`` attributes and falls back to the message text.
+
+    :param exc: Exception raised by a provider call
+    :return: True if the error indicates rate limiting
+    """
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if value == 429 or str(value) == "429":
+            return True
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return bool(_RATE_LIMIT_PATTERN.search(str(exc)))
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Return the server-suggested delay from a Retry-After header, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    *,
+    limiter: Optional[TokenBucket] = None,
+    max_retries: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+) -> T:
+    """
+    Call ``fn`` under a rate limiter, retrying with backoff on 429 errors.
+
+    Waits for a token before every attempt. Rate-limit errors are retried up
+    to ``max_retries`` times with exponential backoff and full jitter (or the
+    server's Retry-After delay when provided); any other error is raised
+    immediately.
+
+    :param fn: Zero-argument callable performing the request
+    :param limiter: Optional token bucket to acquire from before each attempt
+    :param max_retries: Maximum number of retries after a rate-limit error (default: 5)
+    :param base_delay: Initial backoff delay in seconds (default: 1.0)
+    :param max_delay: Upper bound for a single backoff delay in seconds (default: 60.0)
+    :return: Whatever ``fn`` returns
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return fn()
+        except Exception as exc:
+            if attempt >= max_retries or not is_rate_limit_error(exc):
+                raise
+            delay = _retry_after(exc)
+            if delay is None:
+                delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            time.sleep(min(max_delay, delay))
+            attempt += 1
@@ -1,10 +1,22 @@
 from __future__ import annotations
 import os
-from outlines.inputs import Image
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple, Union
 
 from ...utils.io_utils import get_image_from_local
 from .outlines_types import Chart, Table, TabularArtifact
-from .provider import make_model
+from .cache import VLMCache, make_cache_key
+from .provider import make_model, resolve_model_name
+from .rate_limit import call_with_retry, get_rate_limiter
+
+# Extraction kinds accepted by extract_many/aextract_many, mapped to method names
+EXTRACT_KINDS = {
+    "chart": "extract_chart",
+    "table": "extract_table",
+    "table_or_chart": "extract_table_or_chart",
+}
 
 
 class VLMStructuredExtractor:
@@ -18,8 +30,15 @@ class VLMStructuredExtractor:
         vlm = VLMStructuredExtractor(vlm_provider="gemini", api_key="YOUR_KEY")
         chart = vlm.extract_chart("/abs/path/chart.jpg")
         table = vlm.extract_table("/abs/path/table.jpg")
+
+        # Many crops at once, up to max_concurrency requests in flight
+        results = vlm.extract_many([("table", "/abs/t1.jpg"), ("chart", "/abs/c1.jpg")])
         
         vlm = VLMStructuredExtractor(vlm_provider="anthropic", api_key="YOUR_KEY")
+
+        # Results are cached on disk; repeated crops skip the provider call
+        print(vlm.cache.stats())  # {'hits': ..., 'misses': ..., ...}
+        vlm = VLMStructuredExtractor(api_key="YOUR_KEY", use_cache=False)
     """
 
     def __init__(
@@ -28,6 +47,11 @@ class VLMStructuredExtractor:
         vlm_model: str | None = None,
         *,
         api_key: str | None = None,
+        max_concurrency: int = 4,
+        requests_per_minute: Optional[float] = None,
+        max_retries: int = 5,
+        use_cache: bool = True,
+        cache_dir: Optional[str] = None,
     ):
         """
         Initialize the VLMStructuredExtractor with provider configuration.
@@ -35,12 +59,33 @@ class VLMStructuredExtractor:
         :param vlm_provider: VLM provider to use ("gemini", "openai", "anthropic", "openrouter", "qianfan", or "ollama", default: "gemini")
         :param vlm_model: Model name to use (defaults to provider-specific defaults)
         :param api_key: API key for the VLM provider (required for all providers)
+        :param max_concurrency: Maximum number of requests in flight for extract_many/aextract_* (default: 4)
+        :param requests_per_minute: Token-bucket rate limit shared by all extractors of this provider
+                                    (default: None, no limit)
+        :param max_retries: Retries with exponential backoff after a 429/rate-limit error (default: 5)
+        :param use_cache: Cache results on disk, keyed by image pixels, prompt, schema,
+                          provider and model (default: True)
+        :param cache_dir: Directory of the result cache (default: ~/.cache/doctra/vlm,
+                          or $DOCTRA_CACHE_DIR/vlm)
         """
+        self.vlm_provider = (vlm_provider or "gemini").lower()
+        self.vlm_model = resolve_model_name(self.vlm_provider, vlm_model)
         self.model = make_model(
             vlm_provider,
             vlm_model,
             api_key=api_key,
         )
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self._limiter = get_rate_limiter(self.vlm_provider, requests_per_minute)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.cache: Optional[VLMCache] = None
+        if use_cache:
+            try:
+                self.cache = VLMCache(cache_dir)
+            except Exception as e:
+                print(f"⚠️ VLM cache disabled, could not open {cache_dir or 'default cache dir'}: {e}")
 
     def _call(self, prompt_text: str, image_path: str, schema):
         """
@@ -48,7 +93,9 @@ class VLMStructuredExtractor:
         
         Internal method that handles the common workflow for VLM processing:
         loading the image, normalizing it, and calling the model with the provided
-        prompt and schema.
+        prompt and schema. Results are looked up in the on-disk cache first;
+        on a miss the request waits on the provider's rate limiter, is retried
+        with backoff when the provider answers 429, and the result is stored.
 
         :param prompt_text: Text prompt to send to the VLM
         :param image_path: Path to the image file to process
@@ -61,9 +108,24 @@ class VLMStructuredExtractor:
             if img.mode != "RGB":
                 img = img.convert("RGB")
 
+            key = None
+            if self.cache is not None:
+                key = make_cache_key(img, prompt_text, schema.__name__, self.vlm_provider, self.vlm_model)
+                cached = self.cache.get(key, schema)
+                if cached is not None:
+                    return cached
+
+            from outlines.inputs import Image  # imported with the provider SDKs, on first use
+
             prompt = [prompt_text, Image(img)]
-            result = self.model(prompt, schema)
-            
+            result = call_with_retry(
+                lambda: self.model(prompt, schema),
+                limiter=self._limiter,
+                max_retries=self.max_retries,
+            )
+
+            if key is not None and self._is_valid_result(result, schema):
+                self.cache.put(key, result)
             return result
         except Exception as e:
             raise
@@ -125,3 +187,139 @@ class VLMStructuredExtractor:
             "Return the data in a structured tabular format."
         )
         return self._call(prompt_text, image_path, TabularArtifact)
+
+    def extract_many(
+        self,
+        requests: Sequence[Tuple[str, str]],
+    ) -> List[Union[Chart, Table, TabularArtifact, Exception]]:
+        """
+        Extract structured data from many images concurrently.
+
+        Requests are fanned out to a pool of ``max_concurrency`` workers
+        (still subject to the provider's rate limit) and the results are
+        returned in request order, so callers can put each one back at its
+        position in the document. A failed request yields its exception in
+        place of a result instead of aborting the others.
+
+        :param requests: Sequence of (kind, image_path) tuples, where kind is
+                         "chart", "table" or "table_or_chart"
+        :return: One result (or Exception) per request, in request order
+        :raises ValueError: If a request has an unknown kind
+        """
+        calls = [self._method_for(kind) for kind, _ in requests]
+        if not requests:
+            return []
+
+        executor = self._get_executor()
+        futures = [executor.submit(call, image_path) for call, (_, image_path) in zip(calls, requests)]
+        return self.gather(futures)
+
+    def submit(self, kind: str, image_path: str) -> Future:
+        """
+        Queue one extraction on the shared pool and return its future.
+
+        Lets callers keep requests in flight across pages: submit crops as
+        they are cut and collect the results later with :meth:`gather`.
+
+        :param kind: "chart", "table" or "table_or_chart"
+        :param image_path: Path to the image file
+        :return: Future resolving to the extracted Chart, Table or TabularArtifact
+        :raises ValueError: If the kind is unknown
+        """
+        return self._get_executor().submit(self._method_for(kind), image_path)
+
+    @staticmethod
+    def gather(futures: Sequence[Future]) -> List[Union[Chart, Table, TabularArtifact, Exception]]:
+        """
+        Wait for futures from :meth:`submit`, in order.
+
+        :param futures: Futures returned by :meth:`submit`
+        :return: One result (or Exception) per future, in order
+        """
+        results: List[Union[Chart, Table, TabularArtifact, Exception]] = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def aextract_chart(self, image_path: str) -> Chart:
+        """
+        Async version of :meth:`extract_chart`.
+
+        :param image_path: Path to the chart image file
+        :return: Chart object containing extracted title, description, headers, and data rows
+        """
+        return await self._run_async(self.extract_chart, image_path)
+
+    async def aextract_table(self, image_path: str) -> Table:
+        """
+        Async version of :meth:`extract_table`.
+
+        :param image_path: Path to the table image file
+        :return: Table object containing extracted title, description, headers, and data rows
+        """
+        return await self._run_async(self.extract_table, image_path)
+
+    async def aextract_table_or_chart(self, image_path: str) -> TabularArtifact:
+        """
+        Async version of :meth:`extract_table_or_chart`.
+
+        :param image_path: Path to the image file to process
+        :return: TabularArtifact object containing the extracted data
+        """
+        return await self._run_async(self.extract_table_or_chart, image_path)
+
+    async def aextract_many(
+        self,
+        requests: Sequence[Tuple[str, str]],
+    ) -> List[Union[Chart, Table, TabularArtifact, Exception]]:
+        """
+        Async version of :meth:`extract_many`.
+
+        :param requests: Sequence of (kind, image_path) tuples
+        :return: One result (or Exception) per request, in request order
+        """
+        calls = [self._method_for(kind) for kind, _ in requests]
+        return list(await asyncio.gather(
+            *(self._run_async(call, image_path) for call, (_, image_path) in zip(calls, requests)),
+            return_exceptions=True,
+        ))
+
+    @staticmethod
+    def _is_valid_result(result, schema) -> bool:
+        """Return True if a model result matches the schema and is worth caching."""
+        if isinstance(result, schema):
+            return True
+        if isinstance(result, str):
+            try:
+                schema.model_validate_json(result)
+                return True
+            except ValueError:
+                return False
+        return False
+
+    def _method_for(self, kind: str):
+        """Return the bound extract_* method for an extraction kind."""
+        try:
+            return getattr(self, EXTRACT_KINDS[kind])
+        except KeyError:
+            raise ValueError(f"Unknown extraction kind: {kind!r}. Use one of {sorted(EXTRACT_KINDS)}.")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the worker pool shared by extract_many and the async API."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency, thread_name_prefix="doctra-vlm"
+                    )
+        return self._executor
+
+    def _run_async(self, fn, *args):
+        """Run a blocking extraction on the worker pool from a coroutine."""
+        # Provider SDK calls made through Outlines are synchronous; the async API
+        # offloads them to the bounded pool so the event loop stays free.
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._get_executor(), fn, *args)
@@ -1,12 +1,29 @@
 """Parsers module for Doctra."""
 
-from .structured_pdf_parser import StructuredPDFParser
-from .enhanced_pdf_parser import EnhancedPDFParser
-from .table_chart_extractor import ChartTablePDFParser
-from .structured_docx_parser import StructuredDOCXParser
-
-try:
-    from .paddleocr_vl_parser import PaddleOCRVLPDFParser
-    __all__ = ['StructuredPDFParser', 'EnhancedPDFParser', 'ChartTablePDFParser', 'StructuredDOCXParser', 'PaddleOCRVLPDFParser']
-except ImportError:
-    __all__ = ['StructuredPDFParser', 'EnhancedPDFParser', 'ChartTablePDFParser', 'StructuredDOCXParser']
\ No newline at end of file
+import importlib
+
+# Parsers are imported on first access (PEP 562); each pulls in its own
+# engines, so importing the package itself stays cheap.
+_LAZY_ATTRS = {
+    'StructuredPDFParser': '.structured_pdf_parser',
+    'EnhancedPDFParser': '.enhanced_pdf_parser',
+    'ChartTablePDFParser': '.table_chart_extractor',
+    'StructuredDOCXParser': '.structured_docx_parser',
+    'BatchRunner': '.batch_runner',
+    'PaddleOCRVLPDFParser': '.paddleocr_vl_parser',
+}
+
+__all__ = ['StructuredPDFParser', 'EnhancedPDFParser', 'ChartTablePDFParser', 'StructuredDOCXParser', 'BatchRunner', 'PaddleOCRVLPDFParser']
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
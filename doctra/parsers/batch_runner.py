@@ -0,0 +1,445 @@
+from __future__ import annotations
+
+import glob
+import json
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+BATCH_MODES = ("parse", "enhance", "charts", "tables", "both")
+MANIFEST_NAME = "manifest.jsonl"
+SUMMARY_NAME = "summary.json"
+
+_POLL_SECONDS = 0.5
+# Workers in a row that exit before reporting "ready" before the batch is aborted
+_MAX_STARTUP_FAILURES = 3
+
+
+@dataclass
+class BatchDocument:
+    """
+    One document of a batch and the outcome of parsing it.
+
+    :param path: Absolute path of the input PDF
+    :param output_dir: Directory the document's outputs are written to
+    :param status: "pending", "ok" or "failed"
+    :param pages: Number of pages in the document (0 if unknown)
+    :param seconds: Wall-clock parse time in seconds
+    :param worker: PID of the worker process that parsed it
+    :param error: Error message if parsing failed
+    """
+    path: str
+    output_dir: str
+    status: str = "pending"
+    pages: int = 0
+    seconds: float = 0.0
+    worker: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchSummary:
+    """
+    Totals and per-document results of a batch run.
+
+    :param output_dir: Root output directory of the batch
+    :param documents: Per-document results, in input order
+    :param seconds: Wall-clock time of the whole batch in seconds
+    :param workers: Number of worker processes
+    :param worker_starts: Number of worker processes started, including restarts
+    """
+    output_dir: str
+    documents: List[BatchDocument] = field(default_factory=list)
+    seconds: float = 0.0
+    workers: int = 1
+    worker_starts: int = 0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(doc.status == "ok" for doc in self.documents)
+
+    @property
+    def failed(self) -> int:
+        return sum(doc.status == "failed" for doc in self.documents)
+
+    @property
+    def pages(self) -> int:
+        return sum(doc.pages for doc in self.documents if doc.status == "ok")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the summary to a JSON-serializable dict.
+
+        :return: Dict with totals and a ``documents`` list
+        """
+        return {
+            "output_dir": self.output_dir,
+            "documents_total": len(self.documents),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "pages": self.pages,
+            "seconds": round(self.seconds, 3),
+            "pages_per_second": round(self.pages / self.seconds, 3) if self.seconds else 0.0,
+            "workers": self.workers,
+            "worker_starts": self.worker_starts,
+            "documents": [asdict(doc) for doc in self.documents],
+        }
+
+
+def resolve_inputs(sources: Union[str, Sequence[str]]) -> List[str]:
+    """
+    Expand directories, glob patterns, manifests and PDF paths into a list of PDFs.
+
+    - A directory contributes every ``*.pdf`` below it (recursively).
+    - A PDF file contributes itself.
+    - Any other existing file is a manifest: one path per line, or JSONL
+      lines with a ``"path"`` key; relative paths are resolved against the
+      manifest's directory, and blank lines and ``#`` comments are skipped.
+    - Anything else is treated as a glob pattern (``**`` is supported).
+
+    :param sources: One source or a sequence of sources
+    :return: Absolute PDF paths, de-duplicated, in first-seen order
+    """
+    if isinstance(sources, str):
+        sources = [sources]
+    found: List[str] = []
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                found.extend(os.path.join(root, f) for f in sorted(files) if f.lower().endswith(".pdf"))
+        elif os.path.isfile(source) and source.lower().endswith(".pdf"):
+            found.append(source)
+        elif os.path.isfile(source):
+            base = os.path.dirname(os.path.abspath(source))
+            with open(source, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    path = json.loads(line)["path"] if line.startswith("{") else line
+                    found.append(path if os.path.isabs(path) else os.path.join(base, path))
+        else:
+            found.extend(sorted(glob.glob(source, recursive=True)))
+
+    seen, pdfs = set(), []
+    for path in found:
+        path = os.path.abspath(path)
+        if path not in seen:
+            seen.add(path)
+            pdfs.append(path)
+    return pdfs
+
+
+def _document_dirs(pdfs: Sequence[str], output_dir: str) -> List[str]:
+    """Mirror the inputs' directory layout under ``output_dir`` (one directory per PDF)."""
+    if not pdfs:
+        return []
+    root = os.path.commonpath([os.path.dirname(p) for p in pdfs])
+    return [os.path.join(output_dir, os.path.splitext(os.path.relpath(p, root))[0]) for p in pdfs]
+
+
+def _build_ocr_engine(ocr_kwargs: Optional[Dict[str, Any]]):
+    """Create the OCR engine described by ``ocr_kwargs`` (``{"engine": ..., **engine kwargs}``)."""
+    from doctra.engines.ocr import PaddleOCREngine, PytesseractOCREngine
+
+    if not ocr_kwargs:
+        return None
+    kwargs = dict(ocr_kwargs)
+    engine = kwargs.pop("engine", "pytesseract")
+    if engine == "paddleocr":
+        return PaddleOCREngine(**kwargs)
+    return PytesseractOCREngine(**kwargs)
+
+
+def build_parser(
+    mode: str,
+    parser_kwargs: Optional[Dict[str, Any]] = None,
+    vlm_kwargs: Optional[Dict[str, Any]] = None,
+    ocr_kwargs: Optional[Dict[str, Any]] = None,
+):
+    """
+    Construct the parser used for one batch mode.
+
+    :param mode: One of ``BATCH_MODES``
+    :param parser_kwargs: Keyword arguments for the parser constructor
+    :param vlm_kwargs: Keyword arguments for VLMStructuredExtractor, or None to disable VLM
+    :param ocr_kwargs: OCR engine description (``{"engine": "pytesseract"|"paddleocr", ...}``), or None for the default
+    :return: StructuredPDFParser, EnhancedPDFParser or ChartTablePDFParser instance
+    """
+    from doctra.engines.vlm.service import VLMStructuredExtractor
+
+    if mode not in BATCH_MODES:
+        raise ValueError(f"Unknown batch mode {mode!r}, expected one of {', '.join(BATCH_MODES)}")
+    kwargs = dict(parser_kwargs or {})
+    kwargs["vlm"] = VLMStructuredExtractor(**vlm_kwargs) if vlm_kwargs else None
+
+    if mode in ("charts", "tables", "both"):
+        from doctra.parsers.table_chart_extractor import ChartTablePDFParser
+        return ChartTablePDFParser(extract_charts=mode != "tables", extract_tables=mode != "charts", **kwargs)
+
+    kwargs["ocr_engine"] = _build_ocr_engine(ocr_kwargs)
+    if mode == "enhance":
+        from doctra.parsers.enhanced_pdf_parser import EnhancedPDFParser
+        return EnhancedPDFParser(**kwargs)
+    from doctra.parsers.structured_pdf_parser import StructuredPDFParser
+    return StructuredPDFParser(**kwargs)
+
+
+def _parse_document(parser, mode: str, pdf_path: str, output_dir: str) -> None:
+    """Parse one PDF into ``output_dir`` with the parser built for ``mode``."""
+    if mode == "enhance":
+        parser.parse(pdf_path, enhanced_output_dir=output_dir)
+    else:
+        parser.parse(pdf_path, output_dir=output_dir)
+
+
+def _worker_main(
+    parser_factory: Callable[[], Any],
+    mode: str,
+    tasks: "mp.Queue",
+    results: "mp.Queue",
+    log_path: str,
+    max_pages: Optional[int],
+) -> None:
+    """
+    Worker process loop: build the parser once, then parse the documents it is sent.
+
+    Messages sent to the parent are tuples starting with ``(kind, pid)``:
+    ``("ready", pid)`` once the parser is built,
+    ``("done", pid, index, pages, seconds, error, retiring)`` after each
+    document (``retiring`` is True once ``max_pages`` pages were parsed, after
+    which the worker exits) and ``("fatal", pid, traceback)`` if the worker
+    cannot be set up. A ``None`` task stops the worker.
+    """
+    pid = os.getpid()
+    try:
+        from doctra.utils.pdf_io import get_pdf_page_count
+
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        log = open(log_path, "a", encoding="utf-8", buffering=1)
+        sys.stdout = sys.stderr = log
+        parser = parser_factory()
+    except Exception:
+        results.put(("fatal", pid, traceback.format_exc()))
+        return
+    results.put(("ready", pid))
+
+    pages_done = 0
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        index, pdf_path, output_dir = task
+        print(f"\n=== {pdf_path} -> {output_dir}")
+        start = time.perf_counter()
+        pages, error = 0, None
+        try:
+            pages = get_pdf_page_count(pdf_path)
+            _parse_document(parser, mode, pdf_path, output_dir)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        pages_done += pages
+        retiring = bool(max_pages) and pages_done >= max_pages
+        results.put(("done", pid, index, pages, time.perf_counter() - start, error, retiring))
+        if retiring:
+            return
+
+
+class _ParserFactory:
+    """Picklable zero-argument callable that builds a parser in the worker process."""
+
+    def __init__(self, mode, parser_kwargs, vlm_kwargs, ocr_kwargs):
+        self.mode = mode
+        self.parser_kwargs = parser_kwargs
+        self.vlm_kwargs = vlm_kwargs
+        self.ocr_kwargs = ocr_kwargs
+
+    def __call__(self):
+        return build_parser(self.mode, self.parser_kwargs, self.vlm_kwargs, self.ocr_kwargs)
+
+
+class BatchRunner:
+    """
+    Parse many PDFs with a pool of long-lived worker processes.
+
+    Each worker builds its parser once, so the layout model, the OCR engine
+    and (in ``"enhance"`` mode) the DocRes weights are loaded once per worker
+    instead of once per document. Documents are handed out one at a time,
+    largest first, to whichever worker is free, so a long document does not
+    hold up a queue of short ones behind it. Workers are restarted after
+    ``max_pages_per_worker_before_restart`` pages to bound memory growth, and
+    a worker that dies mid-document is replaced (the document is recorded
+    as failed). If workers keep exiting before their parser is built, the
+    batch is aborted with a RuntimeError.
+
+    Every document gets its own output directory, mirroring the input
+    directory layout under the batch output directory. ``manifest.jsonl``
+    receives one line per finished document as the batch runs and
+    ``summary.json`` holds the totals. Worker output goes to ``logs/``.
+
+    Example::
+
+        runner = BatchRunner(mode="parse", workers=4, parser_kwargs={"dpi": 200})
+        summary = runner.run(["scans/"], "outputs/batch")
+        print(summary.succeeded, summary.failed)
+
+    :param mode: What to run per document: "parse", "enhance", "charts", "tables" or "both" (default: "parse")
+    :param workers: Number of worker processes (default: 1)
+    :param max_pages_per_worker_before_restart: Restart a worker after it parsed this many pages,
+                                                or None to never restart (default: None)
+    :param parser_kwargs: Keyword arguments for the parser constructor (must be picklable)
+    :param vlm_kwargs: Keyword arguments for VLMStructuredExtractor, or None to disable VLM
+    :param ocr_kwargs: OCR engine description, e.g. ``{"engine": "pytesseract", "lang": "eng"}``
+                       or ``{"engine": "paddleocr", "device": "gpu"}`` (default: parser default)
+    :param parser_factory: Picklable zero-argument callable building the parser in each worker;
+                           overrides ``parser_kwargs``/``vlm_kwargs``/``ocr_kwargs`` (default: None)
+    """
+
+    def __init__(
+        self,
+        mode: str = "parse",
+        *,
+        workers: int = 1,
+        max_pages_per_worker_before_restart: Optional[int] = None,
+        parser_kwargs: Optional[Dict[str, Any]] = None,
+        vlm_kwargs: Optional[Dict[str, Any]] = None,
+        ocr_kwargs: Optional[Dict[str, Any]] = None,
+        parser_factory: Optional[Callable[[], Any]] = None,
+    ):
+        if mode not in BATCH_MODES:
+            raise ValueError(f"Unknown batch mode {mode!r}, expected one of {', '.join(BATCH_MODES)}")
+        self.mode = mode
+        self.workers = max(1, int(workers))
+        self.max_pages = max_pages_per_worker_before_restart or None
+        self.parser_factory = parser_factory or _ParserFactory(mode, parser_kwargs, vlm_kwargs, ocr_kwargs)
+
+    def run(
+        self,
+        sources: Union[str, Sequence[str]],
+        output_dir: str = "outputs/batch",
+        on_document: Optional[Callable[[BatchDocument], None]] = None,
+    ) -> BatchSummary:
+        """
+        Parse every PDF found in ``sources``.
+
+        :param sources: Directories, glob patterns, manifests or PDF paths (see :func:`resolve_inputs`)
+        :param output_dir: Root directory for per-document outputs, the manifest and the summary
+        :param on_document: Optional callback invoked in the parent with each finished document
+        :return: BatchSummary with per-document results
+        """
+        output_dir = os.path.abspath(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+        pdfs = resolve_inputs(sources)
+        documents = [BatchDocument(path=p, output_dir=d) for p, d in zip(pdfs, _document_dirs(pdfs, output_dir))]
+        summary = BatchSummary(output_dir=output_dir, documents=documents, workers=self.workers)
+        start = time.perf_counter()
+        if documents:
+            with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as manifest:
+                self._run_pool(documents, output_dir, summary, manifest, on_document)
+        summary.seconds = time.perf_counter() - start
+        with open(os.path.join(output_dir, SUMMARY_NAME), "w", encoding="utf-8") as f:
+            json.dump(summary.to_dict(), f, indent=2)
+        return summary
+
+    def _run_pool(self, documents, output_dir, summary, manifest, on_document) -> None:
+        """Hand documents to the worker processes one at a time and collect their results."""
+        ctx = mp.get_context("spawn")  # Paddle and CUDA are not fork-safe
+        results = ctx.Queue()
+        # Largest files first, so a long document does not start last
+        backlog = sorted(range(len(documents)), key=lambda i: os.path.getsize(documents[i].path))
+        pending = set(range(len(documents)))
+        workers: Dict[int, Any] = {}      # pid -> (process, task queue)
+        assigned: Dict[int, int] = {}     # pid -> document index
+        ready = set()                     # pids that built their parser
+        startup_failures = 0              # workers in a row that exited before "ready"
+        log_dir = os.path.join(output_dir, "logs")
+
+        def spawn():
+            summary.worker_starts += 1
+            tasks = ctx.Queue()
+            proc = ctx.Process(
+                target=_worker_main,
+                args=(self.parser_factory, self.mode, tasks, results,
+                      os.path.join(log_dir, f"worker-{summary.worker_starts}.log"), self.max_pages),
+                daemon=True,
+            )
+            proc.start()
+            workers[proc.pid] = (proc, tasks)
+
+        def dispatch(pid):
+            _, tasks = workers[pid]
+            if backlog:
+                index = backlog.pop()
+                assigned[pid] = index
+                tasks.put((index, documents[index].path, documents[index].output_dir))
+            else:
+                tasks.put(None)
+
+        def finish(index, pid, pages, seconds, error):
+            doc = documents[index]
+            doc.status = "failed" if error else "ok"
+            doc.pages, doc.seconds, doc.worker, doc.error = pages, round(seconds, 3), pid, error
+            pending.discard(index)
+            manifest.write(json.dumps(asdict(doc), ensure_ascii=False) + "\n")
+            manifest.flush()
+            if on_document is not None:
+                on_document(doc)
+
+        for _ in range(min(self.workers, len(documents))):
+            spawn()
+        try:
+            while pending:
+                try:
+                    message = results.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    for pid, (proc, _) in list(workers.items()):
+                        if proc.is_alive():
+                            continue
+                        # Exited without reporting (crash, OOM kill): fail its document and replace it
+                        del workers[pid]
+                        if pid not in ready:
+                            # Died during startup, e.g. the parser factory could not be unpickled
+                            startup_failures += 1
+                            if startup_failures >= _MAX_STARTUP_FAILURES:
+                                raise RuntimeError(
+                                    f"{startup_failures} batch workers in a row exited with code "
+                                    f"{proc.exitcode} before building their parser; see {log_dir}")
+                        ready.discard(pid)
+                        if pid in assigned:
+                            finish(assigned.pop(pid), pid, 0, 0.0, f"worker exited with code {proc.exitcode}")
+                        if backlog:
+                            spawn()
+                    continue
+
+                kind, pid = message[0], message[1]
+                if kind == "ready":
+                    ready.add(pid)
+                    startup_failures = 0
+                    dispatch(pid)
+                elif kind == "done":
+                    _, _, index, pages, seconds, error, retiring = message
+                    assigned.pop(pid, None)
+                    finish(index, pid, pages, seconds, error)
+                    if not retiring:
+                        dispatch(pid)
+                        continue
+                    proc, _ = workers.pop(pid)
+                    ready.discard(pid)
+                    proc.join()
+                    if backlog:
+                        spawn()
+                elif kind == "fatal":
+                    raise RuntimeError(f"Batch worker could not build its parser:\n{message[2]}")
+        finally:
+            for proc, tasks in workers.values():
+                tasks.put(None)
+            for proc, _ in workers.values():
+                proc.join(timeout=30)
+                if proc.is_alive():
+                    proc.terminate()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+JOURNAL_NAME = ".doctra_journal.jsonl"
+
+# Bumped whenever the record layout changes; older journals are discarded
+_JOURNAL_VERSION = 1
+
+
+class PageJournal:
+    """
+    Append-only, per-page checkpoint journal kept in a parse's output directory.
+
+    The first line is a header holding a fingerprint of the input and the
+    settings that affect page results; every further line is one finished
+    page with its content blocks (text, crop manifest and any structured VLM
+    result). Lines are flushed and fsync'ed as pages finish, so a crash loses
+    at most the page being written.
+
+    When resuming, the journal is trusted only if its fingerprint matches,
+    and only up to the first page that is missing, torn, or refers to a crop
+    that no longer exists on disk. The kept pages are rewritten to a fresh
+    journal before new pages are appended.
+
+    :param out_dir: Output directory of the parse
+    :param fingerprint: JSON-serializable description of the input and settings
+    :param resume: Whether to load completed pages from an existing journal (default: False)
+    """
+
+    def __init__(self, out_dir: str, fingerprint: Dict[str, Any], resume: bool = False):
+        self.path = os.path.join(out_dir, JOURNAL_NAME)
+        self.fingerprint = fingerprint
+        self.pages: Dict[int, List[Dict[str, Any]]] = self._load() if resume else {}
+        self._rewrite()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _load(self) -> Dict[int, List[Dict[str, Any]]]:
+        """Read the completed pages of an existing journal that still apply."""
+        if not os.path.exists(self.path):
+            return {}
+        pages: Dict[int, List[Dict[str, Any]]] = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                header = None
+            if (not isinstance(header, dict) or header.get("version") != _JOURNAL_VERSION
+                    or header.get("fingerprint") != self.fingerprint):
+                print("⚠️ Checkpoint journal does not match this document or these settings, starting over")
+                return {}
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn write from an interrupted run
+                page_num, blocks = record.get("page"), record.get("blocks")
+                if page_num != len(pages) + 1 or not isinstance(blocks, list):
+                    break
+                if any(block.get("path") and not os.path.exists(block["path"]) for block in blocks):
+                    break
+                pages[page_num] = blocks
+        return pages
+
+    def _rewrite(self) -> None:
+        """Atomically replace the journal with the header and the kept pages."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": _JOURNAL_VERSION, "fingerprint": self.fingerprint}) + "\n")
+            for page_num in sorted(self.pages):
+                f.write(json.dumps({"page": page_num, "blocks": self.pages[page_num]}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def record(self, page_num: int, blocks: List[Dict[str, Any]]) -> None:
+        """
+        Durably append one finished page.
+
+        :param page_num: 1-based page number
+        :param blocks: The page's content blocks after OCR and VLM extraction
+        :return: None
+        """
+        self._file.write(json.dumps({"page": page_num, "blocks": blocks}, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def completed(self, page_num: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the blocks of a page loaded for resuming, or None if it still has to be parsed.
+
+        :param page_num: 1-based page number
+        :return: List of content blocks, or None
+        """
+        return self.pages.get(page_num)
+
+    def close(self) -> None:
+        """
+        Close the journal file.
+
+        :return: None
+        """
+        self._file.close()
+
+    def __enter__(self) -> "PageJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -9,28 +9,21 @@ from __future__ import annotations
 import os
 import sys
 import numpy as np
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Iterable, Iterator, Callable
 from doctra.engines.ocr import PytesseractOCREngine, PaddleOCREngine
-from contextlib import ExitStack
 from PIL import Image
 from tqdm import tqdm
 
 from doctra.parsers.structured_pdf_parser import StructuredPDFParser
-from doctra.engines.image_restoration import DocResEngine
 from doctra.engines.vlm.service import VLMStructuredExtractor
-from doctra.utils.pdf_io import render_pdf_to_images
-from doctra.utils.constants import IMAGE_SUBDIRS, EXCLUDE_LABELS
+from doctra.utils.pdf_io import iter_pdf_pages, get_pdf_page_count
+from doctra.utils.constants import IMAGE_SUBDIRS
 from doctra.utils.file_ops import ensure_output_dirs
 from doctra.utils.progress import create_beautiful_progress_bar, create_notebook_friendly_bar
-from doctra.parsers.layout_order import reading_order_key
-from doctra.utils.ocr_utils import ocr_box_text
-from doctra.exporters.image_saver import save_box_image
 from doctra.exporters.markdown_writer import write_markdown
-from doctra.exporters.html_writer import write_html, write_structured_html, render_html_table, write_html_from_lines
+from doctra.exporters.html_writer import write_html, write_structured_html, write_html_from_lines
 from doctra.exporters.excel_writer import write_structured_excel
-from doctra.utils.structured_utils import to_structured_dict
-from doctra.exporters.markdown_table import render_markdown_table
-from doctra.parsers.split_table_detector import SplitTableMatch
+from doctra.parsers.split_table_detector import SplitTableChain
 
 
 class EnhancedPDFParser(StructuredPDFParser):
@@ -47,10 +40,17 @@ class EnhancedPDFParser(StructuredPDFParser):
     :param restoration_task: DocRes task to use ("dewarping", "deshadowing", "appearance", "deblurring", "binarization", "end2end", default: "appearance")
     :param restoration_device: Device for DocRes processing ("cuda", "cpu", or None for auto-detect, default: None)
     :param restoration_dpi: DPI for restoration processing (default: 200)
+    :param restoration_batch_size: Pages restored together in one DocRes forward pass (default: 4)
+    :param restoration_precision: DocRes precision: "auto" (fp16 on CUDA, fp32 on CPU), "fp32", "fp16" or "bf16" (default: "auto")
+    :param restoration_runtime: DocRes model runtime: "eager", "jit" or "compile" (default: "eager")
+    :param restoration_tile_size: Restore pages larger than this in overlapping tiles of this size (default: None, whole pages)
+    :param restoration_tile_overlap: Minimum overlap between restoration tiles (default: None, 64 px or half a smaller tile)
     :param vlm: VLM engine instance (VLMStructuredExtractor). If None, VLM processing is disabled.
     :param layout_model_name: Layout detection model name (default: "PP-DocLayout_plus-L")
     :param dpi: DPI for PDF rendering (default: 200)
     :param min_score: Minimum confidence score for layout detection (default: 0.0)
+    :param use_layout_cache: Cache layout detections on disk, keyed by page content (default: True)
+    :param layout_cache_dir: Directory of the layout cache (default: ~/.cache/doctra/layout)
     :param ocr_engine: OCR engine instance (PytesseractOCREngine or PaddleOCREngine). 
                        If None, creates a default PytesseractOCREngine with lang="eng", psm=4, oem=3.
     :param box_separator: Separator between text boxes in output (default: "\n")
@@ -60,6 +60,9 @@ class EnhancedPDFParser(StructuredPDFParser):
     :param max_gap_ratio: Maximum allowed gap between tables (default: 0.25)
     :param column_alignment_tolerance: Pixel tolerance for column alignment (default: 10.0)
     :param min_merge_confidence: Minimum confidence score for merging (default: 0.65)
+    :param render_window: Number of pages rendered and held in memory at once (default: 4)
+    :param ocr_workers: Concurrent Tesseract workers per page (default: None, i.e. CPU count)
+    :param vlm_workers: Pages in the VLM stage at once (default: None, i.e. the VLM's max_concurrency)
     """
 
     def __init__(
@@ -69,10 +72,17 @@ class EnhancedPDFParser(StructuredPDFParser):
         restoration_task: str = "appearance",
         restoration_device: Optional[str] = None,
         restoration_dpi: int = 200,
+        restoration_batch_size: int = 4,
+        restoration_precision: str = "auto",
+        restoration_runtime: str = "eager",
+        restoration_tile_size: Optional[int] = None,
+        restoration_tile_overlap: Optional[int] = None,
         vlm: Optional[VLMStructuredExtractor] = None,
         layout_model_name: str = "PP-DocLayout_plus-L",
         dpi: int = 200,
         min_score: float = 0.0,
+        use_layout_cache: bool = True,
+        layout_cache_dir: Optional[str] = None,
         ocr_engine: Optional[Union[PytesseractOCREngine, PaddleOCREngine]] = None,
         box_separator: str = "\n",
         merge_split_tables: bool = False,
@@ -81,6 +91,9 @@ class EnhancedPDFParser(StructuredPDFParser):
         max_gap_ratio: float = 0.25,
         column_alignment_tolerance: float = 10.0,
         min_merge_confidence: float = 0.65,
+        render_window: int = 4,
+        ocr_workers: Optional[int] = None,
+        vlm_workers: Optional[int] = None,
     ):
         """
         Initialize the Enhanced PDF Parser with image restoration capabilities.
@@ -90,6 +103,8 @@ class EnhancedPDFParser(StructuredPDFParser):
             layout_model_name=layout_model_name,
             dpi=dpi,
             min_score=min_score,
+            use_layout_cache=use_layout_cache,
+            layout_cache_dir=layout_cache_dir,
             ocr_engine=ocr_engine,
             box_separator=box_separator,
             merge_split_tables=merge_split_tables,
@@ -98,19 +113,34 @@ class EnhancedPDFParser(StructuredPDFParser):
             max_gap_ratio=max_gap_ratio,
             column_alignment_tolerance=column_alignment_tolerance,
             min_merge_confidence=min_merge_confidence,
+            render_window=render_window,
+            ocr_workers=ocr_workers,
+            vlm_workers=vlm_workers,
         )
         
         self.use_image_restoration = use_image_restoration
         self.restoration_task = restoration_task
         self.restoration_device = restoration_device
         self.restoration_dpi = restoration_dpi
+        self.restoration_batch_size = max(1, restoration_batch_size)
+        self.restoration_precision = restoration_precision
+        self.restoration_runtime = restoration_runtime
+        self.restoration_tile_size = restoration_tile_size
         
         self.docres_engine = None
         if self.use_image_restoration:
             try:
+                # Imported only when restoration is enabled: it loads torch and OpenCV
+                from doctra.engines.image_restoration import DocResEngine
+
                 self.docres_engine = DocResEngine(
                     device=restoration_device,
-                    use_half_precision=True
+                    use_half_precision=True,
+                    batch_size=self.restoration_batch_size,
+                    precision=restoration_precision,
+                    runtime=restoration_runtime,
+                    tile_size=restoration_tile_size,
+                    tile_overlap=restoration_tile_overlap
                 )
                 print(f"✅ DocRes engine initialized with task: {restoration_task}")
             except Exception as e:
@@ -119,12 +149,22 @@ class EnhancedPDFParser(StructuredPDFParser):
                 self.use_image_restoration = False
                 self.docres_engine = None
 
-    def parse(self, pdf_path: str, enhanced_output_dir: str = None) -> None:
+    def parse(
+        self,
+        pdf_path: str,
+        enhanced_output_dir: str = None,
+        on_page: Optional[Callable[[int, str, List[Dict[str, Any]]], None]] = None,
+    ) -> None:
         """
         Parse a PDF document with optional image restoration.
+
+        Pages are rendered, restored and parsed ``render_window`` at a time,
+        so peak memory does not grow with the page count.
         
         :param pdf_path: Path to the input PDF file
         :param enhanced_output_dir: Directory for enhanced images (if None, uses default)
+        :param on_page: Optional callback invoked in page order as each page is parsed, with the
+                        page number, the page's markdown and its structured items (default: None)
         :return: None
         """
         pdf_filename = os.path.splitext(os.path.basename(pdf_path))[0]
@@ -139,316 +179,145 @@ class EnhancedPDFParser(StructuredPDFParser):
         
         if self.use_image_restoration and self.docres_engine:
             print(f"🔄 Processing PDF with image restoration: {os.path.basename(pdf_path)}")
-            enhanced_pages = self._process_pages_with_restoration(pdf_path, out_dir)
-            
             enhanced_pdf_path = os.path.join(out_dir, f"{pdf_filename}_enhanced.pdf")
-            try:
-                self._create_enhanced_pdf_from_pages(enhanced_pages, enhanced_pdf_path)
-            except Exception as e:
-                print(f"⚠️ Failed to create enhanced PDF: {e}")
+            page_images = self._iter_pages_with_restoration(pdf_path, out_dir, enhanced_pdf_path)
+            pages_desc = f"Pages (DocRes {self.restoration_task} → layout → OCR)"
         else:
             print(f"🔄 Processing PDF without image restoration: {os.path.basename(pdf_path)}")
-            enhanced_pages = [im for (im, _, _) in render_pdf_to_images(pdf_path, dpi=self.dpi)]
+            page_images = (im for (im, _, _) in iter_pdf_pages(pdf_path, dpi=self.dpi, window=self.render_window))
+            pages_desc = "Pages (layout → OCR)"
         
-        print("🔍 Running layout detection on enhanced pages...")
-        pages = self.layout_engine.predict_pdf(
-            pdf_path, batch_size=1, layout_nms=True, dpi=self.dpi, min_score=self.min_score
-        )
-        
-        pil_pages = enhanced_pages
-        
-        self._process_parsing_logic(pages, pil_pages, out_dir, pdf_filename, pdf_path)
+        self._process_parsing_logic(page_images, out_dir, get_pdf_page_count(pdf_path), pages_desc, on_page)
 
-    def _process_pages_with_restoration(self, pdf_path: str, out_dir: str) -> List[Image.Image]:
+    def _iter_pages_with_restoration(
+        self,
+        pdf_path: str,
+        out_dir: str,
+        enhanced_pdf_path: Optional[str] = None,
+    ) -> Iterator[Image.Image]:
         """
-        Process PDF pages with DocRes image restoration.
+        Render and restore PDF pages with DocRes, ``restoration_batch_size`` pages at a time.
+
+        Each enhanced page is saved to ``enhanced_pages/`` and appended to the
+        enhanced PDF as soon as its batch is restored. If appending a page
+        fails, the PDF is left with the pages before it and no more are added.
         
         :param pdf_path: Path to the input PDF file
         :param out_dir: Output directory for enhanced images
-        :return: List of enhanced PIL images
+        :param enhanced_pdf_path: Path of the enhanced PDF to build (if None, no PDF is written)
+        :return: Iterator of enhanced PIL images in page order
         """
-        original_pages = [im for (im, _, _) in render_pdf_to_images(pdf_path, dpi=self.restoration_dpi)]
-        
-        if not original_pages:
-            print("❌ No pages found in PDF")
-            return []
-        
-        is_notebook = "ipykernel" in sys.modules or "jupyter" in sys.modules
-        if is_notebook:
-            progress_bar = create_notebook_friendly_bar(
-                total=len(original_pages), 
-                desc=f"DocRes {self.restoration_task}"
-            )
-        else:
-            progress_bar = create_beautiful_progress_bar(
-                total=len(original_pages), 
-                desc=f"DocRes {self.restoration_task}",
-                leave=True
-            )
-        
-        enhanced_pages = []
         enhanced_dir = os.path.join(out_dir, "enhanced_pages")
         os.makedirs(enhanced_dir, exist_ok=True)
-        
-        try:
-            with progress_bar:
-                for i, page_img in enumerate(original_pages):
+        pdf_pages_written = 0
+        pdf_failed = False
+        def restore_chunk(start: int, chunk: List[Image.Image]) -> Iterator[Image.Image]:
+            nonlocal pdf_pages_written, pdf_failed
+            results = self.docres_engine.batch_restore(
+                [np.array(page_img) for page_img in chunk],
+                task=self.restoration_task
+            )
+            
+            for i, (page_img, (restored_img, metadata)) in enumerate(zip(chunk, results), start):
+                try:
+                    if restored_img is None:
+                        raise RuntimeError(metadata['error'])
+                    
+                    enhanced_page = Image.fromarray(restored_img)
+                    
+                    enhanced_path = os.path.join(enhanced_dir, f"page_{i+1:03d}_enhanced.jpg")
+                    enhanced_page.save(enhanced_path, "JPEG", quality=95)
+                    
+                except Exception as e:
+                    print(f"  ⚠️ Page {i+1} restoration failed: {e}, using original")
+                    enhanced_page = page_img
+                
+                if enhanced_pdf_path is not None and not pdf_failed:
                     try:
-                        img_array = np.array(page_img)
-                        
-                        restored_img, metadata = self.docres_engine.restore_image(
-                            img_array, 
-                            task=self.restoration_task
+                        enhanced_page.save(
+                            enhanced_pdf_path,
+                            "PDF",
+                            resolution=100.0,
+                            append=pdf_pages_written > 0
                         )
-                        
-                        enhanced_page = Image.fromarray(restored_img)
-                        enhanced_pages.append(enhanced_page)
-                        
-                        enhanced_path = os.path.join(enhanced_dir, f"page_{i+1:03d}_enhanced.jpg")
-                        enhanced_page.save(enhanced_path, "JPEG", quality=95)
-                        
-                        progress_bar.set_description(f"✅ Page {i+1}/{len(original_pages)} enhanced")
-                        progress_bar.update(1)
-                        
+                        pdf_pages_written += 1
                     except Exception as e:
-                        print(f"  ⚠️ Page {i+1} restoration failed: {e}, using original")
-                        enhanced_pages.append(page_img)
-                        progress_bar.set_description(f"⚠️ Page {i+1} failed, using original")
-                        progress_bar.update(1)
+                        # A page missing from the middle would shift every later one,
+                        # so the PDF stops here rather than skipping it
+                        pdf_failed = True
+                        print(f"⚠️ Failed to add page {i+1} to enhanced PDF, stopped writing it: {e}")
+                
+                yield enhanced_page
         
-        finally:
-            if hasattr(progress_bar, 'close'):
-                progress_bar.close()
+        start, chunk = 0, []
+        for i, (page_img, _, _) in enumerate(
+            iter_pdf_pages(pdf_path, dpi=self.restoration_dpi, window=self.render_window)
+        ):
+            chunk.append(page_img)
+            if len(chunk) == self.restoration_batch_size:
+                yield from restore_chunk(start, chunk)
+                start, chunk = i + 1, []
+        if chunk:
+            yield from restore_chunk(start, chunk)
         
-        return enhanced_pages
+        if enhanced_pdf_path is not None and pdf_failed:
+            print(f"⚠️ Enhanced PDF is incomplete, only the first {pdf_pages_written} page(s) "
+                  f"were written: {enhanced_pdf_path}")
+        elif enhanced_pdf_path is not None and pdf_pages_written:
+            print(f"✅ Enhanced PDF saved from processed pages: {enhanced_pdf_path}")
 
-    def _process_parsing_logic(self, pages, pil_pages, out_dir, pdf_filename, pdf_path):
-        """
-        Process the parsing logic with enhanced pages.
-        This is extracted from the parent class to allow customization.
+    def _process_parsing_logic(
+        self,
+        page_images: Iterable[Image.Image],
+        out_dir: str,
+        page_count: int,
+        pages_desc: str = "Pages (layout → OCR)",
+        on_page: Optional[Callable[[int, str, List[Dict[str, Any]]], None]] = None,
+    ) -> None:
         """
-        split_table_matches: List[SplitTableMatch] = []
-        merged_table_segments = []
-        
-        if self.merge_split_tables and self.split_table_detector:
-            try:
-                split_table_matches = self.split_table_detector.detect_split_tables(pages, pil_pages)
-                if split_table_matches:
-                    print(f"🔗 Detected {len(split_table_matches)} split table(s) to merge")
-                for match in split_table_matches:
-                    merged_table_segments.append(match.segment1)
-                    merged_table_segments.append(match.segment2)
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                split_table_matches = []
-        
-        fig_count = sum(sum(1 for b in p.boxes if b.label == "figure") for p in pages)
-        chart_count = sum(sum(1 for b in p.boxes if b.label == "chart") for p in pages)
-        table_count = sum(sum(1 for b in p.boxes if b.label == "table") for p in pages)
+        Run layout detection, OCR and VLM extraction over a stream of pages.
+
+        Each page's markdown file is written to ``pages/`` as soon as the
+        page has been processed.
 
+        :param page_images: Iterable of (enhanced) page images in document order
+        :param out_dir: Output directory
+        :param page_count: Number of pages, used for the progress bar
+        :param pages_desc: Progress bar description
+        :param on_page: Optional callback invoked with (page number, markdown, structured items) per page
+        :return: None
+        """
         md_lines: List[str] = ["# Enhanced Document Content\n"]
         html_lines: List[str] = ["<h1>Enhanced Document Content</h1>"]
         structured_items: List[Dict[str, Any]] = []
-        page_content: Dict[int, List[str]] = {}
+        split_table_chains: List[SplitTableChain] = []
 
-        charts_desc = "Charts (VLM → table)" if self.vlm is not None else "Charts (cropped)"
-        tables_desc = "Tables (VLM → table)" if self.vlm is not None else "Tables (cropped)"
-        figures_desc = "Figures (cropped)"
+        pages_dir = os.path.join(out_dir, "pages")
+        os.makedirs(pages_dir, exist_ok=True)
 
-        with ExitStack() as stack:
-            is_notebook = "ipykernel" in sys.modules or "jupyter" in sys.modules
-            if is_notebook:
-                charts_bar = stack.enter_context(
-                    create_notebook_friendly_bar(total=chart_count, desc=charts_desc)) if chart_count else None
-                tables_bar = stack.enter_context(
-                    create_notebook_friendly_bar(total=table_count, desc=tables_desc)) if table_count else None
-                figures_bar = stack.enter_context(
-                    create_notebook_friendly_bar(total=fig_count, desc=figures_desc)) if fig_count else None
-            else:
-                charts_bar = stack.enter_context(
-                    create_beautiful_progress_bar(total=chart_count, desc=charts_desc, leave=True)) if chart_count else None
-                tables_bar = stack.enter_context(
-                    create_beautiful_progress_bar(total=table_count, desc=tables_desc, leave=True)) if table_count else None
-                figures_bar = stack.enter_context(
-                    create_beautiful_progress_bar(total=fig_count,                     desc=figures_desc, leave=True)) if fig_count else None
+        is_notebook = "ipykernel" in sys.modules or "jupyter" in sys.modules
+        if is_notebook:
+            pages_bar = create_notebook_friendly_bar(total=page_count, desc=pages_desc)
+        else:
+            pages_bar = create_beautiful_progress_bar(total=page_count, desc=pages_desc, leave=True)
 
-            for page_num in range(1, len(pil_pages) + 1):
-                page_content[page_num] = [f"# Page {page_num} Content\n"]
-            
-            for p in pages:
-                page_num = p.page_index
-                page_img: Image.Image = pil_pages[page_num - 1]
+        with pages_bar:
+            for page_num, page_md, page_html, page_items in self._iter_processed_pages(
+                    page_images, out_dir, split_table_chains):
                 md_lines.append(f"\n## Page {page_num}\n")
                 html_lines.append(f"<h2>Page {page_num}</h2>")
+                md_lines.extend(page_md)
+                html_lines.extend(page_html)
+                structured_items.extend(page_items)
 
-                for i, box in enumerate(sorted(p.boxes, key=reading_order_key), start=1):
-                    if box.label in EXCLUDE_LABELS:
-                        img_path = save_box_image(page_img, box, out_dir, page_num, i, IMAGE_SUBDIRS)
-                        abs_img_path = os.path.abspath(img_path)
-                        rel = os.path.relpath(abs_img_path, out_dir)
-
-                        if box.label == "figure":
-                            figure_md = f"![Figure — page {page_num}]({rel})\n"
-                            figure_html = f'<img src="{rel}" alt="Figure — page {page_num}" />'
-                            md_lines.append(figure_md)
-                            html_lines.append(figure_html)
-                            page_content[page_num].append(figure_md)
-                            if figures_bar: figures_bar.update(1)
+                write_markdown([f"# Page {page_num} Content\n"] + page_md, pages_dir, f"page_{page_num:03d}.md")
+                pages_bar.update(1)
+                if on_page is not None:
+                    on_page(page_num, "\n".join(page_md), page_items)
 
-                        elif box.label == "chart":
-                            if self.vlm is not None:
-                                wrote_table = False
-                                try:
-                                    chart = self.vlm.extract_chart(abs_img_path)
-                                    item = to_structured_dict(chart)
-                                    if item:
-                                        item["page"] = page_num
-                                        item["type"] = "Chart"
-                                        structured_items.append(item)
-                                        
-                                        table_md = render_markdown_table(item.get("headers"), item.get("rows"),
-                                                                         title=item.get("title"))
-                                        table_html = render_html_table(item.get("headers"), item.get("rows"),
-                                                                       title=item.get("title"))
-                                        
-                                        md_lines.append(table_md)
-                                        html_lines.append(table_html)
-                                        page_content[page_num].append(table_md)
-                                        wrote_table = True
-                                except Exception as e:
-                                    pass
-                                if not wrote_table:
-                                    chart_md = f"![Chart — page {page_num}]({rel})\n"
-                                    chart_html = f'<img src="{rel}" alt="Chart — page {page_num}" />'
-                                    md_lines.append(chart_md)
-                                    html_lines.append(chart_html)
-                                    page_content[page_num].append(chart_md)
-                            else:
-                                chart_md = f"![Chart — page {page_num}]({rel})\n"
-                                chart_html = f'<img src="{rel}" alt="Chart — page {page_num}" />'
-                                md_lines.append(chart_md)
-                                html_lines.append(chart_html)
-                                page_content[page_num].append(chart_md)
-                            if charts_bar: charts_bar.update(1)
-
-                        elif box.label == "table":
-                            is_merged = any(seg.match_box(box, page_num) for seg in merged_table_segments)
-                            if is_merged:
-                                continue
-                            
-                            if self.vlm is not None:
-                                wrote_table = False
-                                try:
-                                    table = self.vlm.extract_table(abs_img_path)
-                                    item = to_structured_dict(table)
-                                    if item:
-                                        item["page"] = page_num
-                                        item["type"] = "Table"
-                                        structured_items.append(item)
-                                        
-                                        table_md = render_markdown_table(item.get("headers"), item.get("rows"),
-                                                                         title=item.get("title"))
-                                        table_html = render_html_table(item.get("headers"), item.get("rows"),
-                                                                       title=item.get("title"))
-                                        
-                                        md_lines.append(table_md)
-                                        html_lines.append(table_html)
-                                        page_content[page_num].append(table_md)
-                                        wrote_table = True
-                                except Exception as e:
-                                    pass
-                                if not wrote_table:
-                                    table_md = f"![Table — page {page_num}]({rel})\n"
-                                    table_html = f'<img src="{rel}" alt="Table — page {page_num}" />'
-                                    md_lines.append(table_md)
-                                    html_lines.append(table_html)
-                                    page_content[page_num].append(table_md)
-                            else:
-                                table_md = f"![Table — page {page_num}]({rel})\n"
-                                table_html = f'<img src="{rel}" alt="Table — page {page_num}" />'
-                                md_lines.append(table_md)
-                                html_lines.append(table_html)
-                                page_content[page_num].append(table_md)
-                            if tables_bar: tables_bar.update(1)
-                    else:
-                        text = ocr_box_text(self.ocr_engine, page_img, box)
-                        if text:
-                            md_lines.append(text)
-                            md_lines.append(self.box_separator if self.box_separator else "")
-                            html_text = text.replace('\n', '<br>')
-                            html_lines.append(f"<p>{html_text}</p>")
-                            if self.box_separator:
-                                html_lines.append("<br>")
-                            page_content[page_num].append(text)
-                            page_content[page_num].append(self.box_separator if self.box_separator else "")
-
-            if split_table_matches and self.split_table_detector:
-                for match_idx, match in enumerate(split_table_matches):
-                    try:
-                        merged_img = self.split_table_detector.merge_table_images(match)
-                        
-                        tables_dir = os.path.join(out_dir, "tables")
-                        os.makedirs(tables_dir, exist_ok=True)
-                        merged_filename = f"merged_table_{match.segment1.page_index}_{match.segment2.page_index}.png"
-                        merged_path = os.path.join(tables_dir, merged_filename)
-                        merged_img.save(merged_path)
-                        
-                        abs_merged_path = os.path.abspath(merged_path)
-                        rel_merged = os.path.relpath(abs_merged_path, out_dir)
-                        
-                        pages_str = f"pages {match.segment1.page_index}-{match.segment2.page_index}"
-                        
-                        if self.vlm is not None:
-                            wrote_table = False
-                            try:
-                                table = self.vlm.extract_table(abs_merged_path)
-                                item = to_structured_dict(table)
-                                if item:
-                                    item["page"] = f"{match.segment1.page_index}-{match.segment2.page_index}"
-                                    item["type"] = "Table (Merged)"
-                                    item["split_merge"] = True
-                                    item["merge_confidence"] = match.confidence
-                                    structured_items.append(item)
-                                    
-                                    table_md = render_markdown_table(
-                                        item.get("headers"), 
-                                        item.get("rows"),
-                                        title=item.get("title") or f"Merged Table ({pages_str})"
-                                    )
-                                    table_html = render_html_table(
-                                        item.get("headers"), 
-                                        item.get("rows"),
-                                        title=item.get("title") or f"Merged Table ({pages_str})"
-                                    )
-                                    
-                                    md_lines.append(f"\n### Merged Table ({pages_str})\n")
-                                    md_lines.append(table_md)
-                                    html_lines.append(f'<h3>Merged Table ({pages_str})</h3>')
-                                    html_lines.append(table_html)
-                                    wrote_table = True
-                            except Exception as e:
-                                pass
-                            
-                            if not wrote_table:
-                                table_md = f"![Merged Table — {pages_str}]({rel_merged})\n"
-                                table_html = f'<img src="{rel_merged}" alt="Merged Table — {pages_str}" />'
-                                md_lines.append(f"\n### Merged Table ({pages_str})\n")
-                                md_lines.append(table_md)
-                                html_lines.append(f'<h3>Merged Table ({pages_str})</h3>')
-                                html_lines.append(table_html)
-                        else:
-                            table_md = f"![Merged Table — {pages_str}]({rel_merged})\n"
-                            table_html = f'<img src="{rel_merged}" alt="Merged Table — {pages_str}" />'
-                            md_lines.append(f"\n### Merged Table ({pages_str})\n")
-                            md_lines.append(table_md)
-                            html_lines.append(f'<h3>Merged Table ({pages_str})</h3>')
-                            html_lines.append(table_html)
-                        
-                        if tables_bar: tables_bar.update(1)
-                        
-                    except Exception as e:
-                        print(f"⚠️  Warning: Failed to merge table {match_idx + 1}: {e}")
+        if split_table_chains:
+            print(f"🔗 Detected {len(split_table_chains)} split table(s) to merge")
+        self._process_merged_tables(split_table_chains, out_dir, md_lines, html_lines, structured_items)
 
         md_path = write_markdown(md_lines, out_dir)
         
@@ -457,13 +326,6 @@ class EnhancedPDFParser(StructuredPDFParser):
         else:
             html_path = write_html(md_lines, out_dir)
         
-        pages_dir = os.path.join(out_dir, "pages")
-        os.makedirs(pages_dir, exist_ok=True)
-        
-        for page_num, content_lines in page_content.items():
-            page_md_path = os.path.join(pages_dir, f"page_{page_num:03d}.md")
-            write_markdown(content_lines, os.path.dirname(page_md_path), os.path.basename(page_md_path))
-        
         excel_path = None
         html_structured_path = None
         if self.vlm is not None and structured_items:
@@ -524,6 +386,9 @@ class EnhancedPDFParser(StructuredPDFParser):
             'task': self.restoration_task,
             'device': self.restoration_device,
             'dpi': self.restoration_dpi,
+            'precision': self.docres_engine.precision if self.docres_engine else self.restoration_precision,
+            'runtime': self.restoration_runtime,
+            'tile_size': self.restoration_tile_size,
             'engine_available': self.docres_engine is not None,
             'supported_tasks': self.docres_engine.get_supported_tasks() if self.docres_engine else []
         }
@@ -19,10 +19,11 @@ import logging
 import warnings
 
 from doctra.engines.image_restoration import DocResEngine
-from doctra.parsers.split_table_detector import SplitTableDetector, SplitTableMatch, TableSegment
+from doctra.parsers.split_table_detector import SplitTableChain, SplitTableDetector, TableSegment
 from doctra.utils.pdf_io import render_pdf_to_images
 from doctra.utils.constants import IMAGE_SUBDIRS
 from doctra.utils.file_ops import ensure_output_dirs
+from doctra.utils.quiet import silence
 from doctra.utils.progress import create_beautiful_progress_bar, create_notebook_friendly_bar
 from doctra.exporters.image_saver import save_box_image
 from doctra.exporters.markdown_writer import write_markdown
@@ -38,73 +39,6 @@ except ImportError:
     PADDLEOCR_VL_AVAILABLE = False
 
 
-@contextlib.contextmanager
-def silence():
-    """Context manager to suppress stdout, stderr, and logging output."""
-    # Store original logging levels
-    original_levels = {}
-    loggers_to_suppress = [
-        'paddleocr', 'paddle', 'paddlex', 'paddlepaddle', 'ppocr',
-        'transformers', 'huggingface_hub', 'urllib3', 'requests'
-    ]
-    
-    # Suppress logging for various libraries
-    for logger_name in loggers_to_suppress:
-        logger = logging.getLogger(logger_name)
-        original_levels[logger_name] = logger.level
-        logger.setLevel(logging.CRITICAL)
-    
-    # Also suppress root logger
-    root_logger = logging.getLogger()
-    original_root_level = root_logger.level
-    root_logger.setLevel(logging.CRITICAL)
-    
-    # Set environment variables to suppress PaddleOCR output
-    original_env = {}
-    env_vars_to_set = {
-        'DISABLE_AUTO_LOGGING_CONFIG': '1',
-        'PADDLE_LOG_LEVEL': '3',  # Only show fatal errors
-        'GLOG_minloglevel': '3',  # Suppress glog output
-        'TF_CPP_MIN_LOG_LEVEL': '3'  # Suppress TensorFlow output
-    }
-    
-    for key, value in env_vars_to_set.items():
-        original_env[key] = os.environ.get(key)
-        os.environ[key] = value
-    
-    # Temporarily disable all logging handlers
-    original_handlers = {}
-    for logger_name in loggers_to_suppress + ['']:
-        logger = logging.getLogger(logger_name)
-        original_handlers[logger_name] = logger.handlers[:]
-        logger.handlers.clear()
-    
-    try:
-        with open(os.devnull, "w") as devnull, \
-             contextlib.redirect_stdout(devnull), \
-             contextlib.redirect_stderr(devnull), \
-             warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            yield
-    finally:
-        # Restore original logging levels
-        for logger_name, level in original_levels.items():
-            logging.getLogger(logger_name).setLevel(level)
-        root_logger.setLevel(original_root_level)
-        
-        # Restore original handlers
-        for logger_name, handlers in original_handlers.items():
-            logger = logging.getLogger(logger_name)
-            logger.handlers = handlers
-        
-        # Restore original environment variables
-        for key, value in original_env.items():
-            if value is None:
-                os.environ.pop(key, None)
-            else:
-                os.environ[key] = value
-
-
 class PaddleOCRVLPDFParser:
     """
     PDF Parser using PaddleOCRVL for end-to-end document parsing.
@@ -117,6 +51,7 @@ class PaddleOCRVLPDFParser:
     :param restoration_task: DocRes task to use (default: "appearance")
     :param restoration_device: Device for DocRes processing (default: None for auto-detect)
     :param restoration_dpi: DPI for restoration processing (default: 200)
+    :param restoration_batch_size: Pages restored together in one DocRes forward pass (default: 4)
     :param use_chart_recognition: Enable chart recognition in PaddleOCRVL (default: True)
     :param use_doc_orientation_classify: Enable document orientation classification (default: False)
     :param use_doc_unwarping: Enable document unwarping (default: False)
@@ -137,6 +72,7 @@ class PaddleOCRVLPDFParser:
         restoration_task: str = "appearance",
         restoration_device: Optional[str] = None,
         restoration_dpi: int = 200,
+        restoration_batch_size: int = 4,
         use_chart_recognition: bool = True,
         use_doc_orientation_classify: bool = False,
         use_doc_unwarping: bool = False,
@@ -184,7 +120,8 @@ class PaddleOCRVLPDFParser:
             try:
                 self.docres_engine = DocResEngine(
                     device=restoration_device,
-                    use_half_precision=True
+                    use_half_precision=True,
+                    batch_size=restoration_batch_size
                 )
                 print(f"✅ DocRes engine initialized with task: {restoration_task}")
             except Exception as e:
@@ -287,29 +224,28 @@ class PaddleOCRVLPDFParser:
                     print(f"⚠️ Page {page_idx + 1} processing failed: {e}")
                     progress_bar.update(1)
         
-        split_table_matches: List[SplitTableMatch] = []
+        split_table_chains: List[SplitTableChain] = []
         merged_table_segments = []
         
         if self.merge_split_tables and self.split_table_detector:
             print("🔗 Detecting split tables...")
             try:
                 pages_for_detection = self._convert_to_layout_pages(all_results, enhanced_pages)
-                split_table_matches = self.split_table_detector.detect_split_tables(
+                split_table_chains = self.split_table_detector.detect_table_chains(
                     pages_for_detection, enhanced_pages
                 )
-                if split_table_matches:
-                    print(f"🔗 Detected {len(split_table_matches)} split table(s) to merge")
-                for match in split_table_matches:
-                    merged_table_segments.append(match.segment1)
-                    merged_table_segments.append(match.segment2)
+                if split_table_chains:
+                    print(f"🔗 Detected {len(split_table_chains)} split table(s) to merge")
+                for chain in split_table_chains:
+                    merged_table_segments.extend(chain.segments)
             except Exception as e:
                 import traceback
                 traceback.print_exc()
                 print(f"⚠️ Split table detection failed: {e}")
-                split_table_matches = []
+                split_table_chains = []
         
         self._generate_outputs(
-            all_results, enhanced_pages, split_table_matches, merged_table_segments, out_dir
+            all_results, enhanced_pages, split_table_chains, merged_table_segments, out_dir
         )
         
         print(f"✅ Parsing completed successfully!")
@@ -347,28 +283,32 @@ class PaddleOCRVLPDFParser:
         
         try:
             with progress_bar:
-                for i, page_img in enumerate(original_pages):
-                    try:
-                        img_array = np.array(page_img)
-                        
-                        restored_img, metadata = self.docres_engine.restore_image(
-                            img_array,
-                            task=self.restoration_task
-                        )
-                        
-                        enhanced_page = Image.fromarray(restored_img)
-                        enhanced_pages.append(enhanced_page)
-                        
-                        enhanced_path = os.path.join(enhanced_dir, f"page_{i+1:03d}_enhanced.jpg")
-                        enhanced_page.save(enhanced_path, "JPEG", quality=95)
-                        
-                        progress_bar.set_description(f"✅ Page {i+1}/{len(original_pages)} enhanced")
-                        progress_bar.update(1)
-                        
-                    except Exception as e:
-                        print(f"  ⚠️ Page {i+1} restoration failed: {e}, using original")
-                        enhanced_pages.append(page_img)
-                        progress_bar.update(1)
+                batch_size = self.docres_engine.batch_size
+                for start in range(0, len(original_pages), batch_size):
+                    chunk = original_pages[start:start + batch_size]
+                    results = self.docres_engine.batch_restore(
+                        [np.array(page_img) for page_img in chunk],
+                        task=self.restoration_task
+                    )
+                    
+                    for i, (page_img, (restored_img, metadata)) in enumerate(zip(chunk, results), start):
+                        try:
+                            if restored_img is None:
+                                raise RuntimeError(metadata['error'])
+                            
+                            enhanced_page = Image.fromarray(restored_img)
+                            enhanced_pages.append(enhanced_page)
+                            
+                            enhanced_path = os.path.join(enhanced_dir, f"page_{i+1:03d}_enhanced.jpg")
+                            enhanced_page.save(enhanced_path, "JPEG", quality=95)
+                            
+                            progress_bar.set_description(f"✅ Page {i+1}/{len(original_pages)} enhanced")
+                            progress_bar.update(1)
+                            
+                        except Exception as e:
+                            print(f"  ⚠️ Page {i+1} restoration failed: {e}, using original")
+                            enhanced_pages.append(page_img)
+                            progress_bar.update(1)
         
         finally:
             if hasattr(progress_bar, 'close'):
@@ -427,7 +367,7 @@ class PaddleOCRVLPDFParser:
         self,
         results: List[Dict],
         page_images: List[Image.Image],
-        split_table_matches: List[SplitTableMatch],
+        split_table_chains: List[SplitTableChain],
         merged_table_segments: List[TableSegment],
         out_dir: str
     ) -> None:
@@ -520,21 +460,21 @@ class PaddleOCRVLPDFParser:
                     if bbox:
                         self._save_element_image(page_img, bbox, out_dir, page_idx, label, md_lines, html_lines)
         
-        if split_table_matches and self.split_table_detector:
-            for match_idx, match in enumerate(split_table_matches):
+        if split_table_chains and self.split_table_detector:
+            for chain_idx, chain in enumerate(split_table_chains):
                 try:
-                    merged_img = self.split_table_detector.merge_table_images(match)
+                    merged_img = self.split_table_detector.merge_chain_images(chain)
                     
                     tables_dir = os.path.join(out_dir, "tables")
                     os.makedirs(tables_dir, exist_ok=True)
-                    merged_filename = f"merged_table_{match.segment1.page_index}_{match.segment2.page_index}.png"
+                    merged_filename = f"merged_table_{chain.first_page}_{chain.last_page}.png"
                     merged_path = os.path.join(tables_dir, merged_filename)
                     merged_img.save(merged_path)
                     
                     abs_merged_path = os.path.abspath(merged_path)
                     rel_merged = os.path.relpath(abs_merged_path, out_dir)
                     
-                    pages_str = f"pages {match.segment1.page_index}-{match.segment2.page_index}"
+                    pages_str = f"pages {chain.first_page}-{chain.last_page}"
                     
                     with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
                         tmp_path = tmp_file.name
@@ -579,7 +519,7 @@ class PaddleOCRVLPDFParser:
                                             structured_table['page'] = pages_str
                                             structured_table['type'] = 'Table (Merged)'
                                             structured_table['split_merge'] = True
-                                            structured_table['merge_confidence'] = match.confidence
+                                            structured_table['merge_confidence'] = chain.confidence
                                             structured_items.append(structured_table)
                     finally:
                         try:
@@ -588,7 +528,7 @@ class PaddleOCRVLPDFParser:
                             pass
                     
                 except Exception as e:
-                    print(f"⚠️ Warning: Failed to process merged table {match_idx + 1}: {e}")
+                    print(f"⚠️ Warning: Failed to process merged table {chain_idx + 1}: {e}")
         
         md_path = write_markdown(md_lines, out_dir)
         
@@ -10,8 +10,8 @@ Detects and merges tables that are split across multiple pages using:
 from __future__ import annotations
 import cv2
 import numpy as np
-from typing import List, Tuple, Optional, Dict, Any
-from dataclasses import dataclass
+from typing import List, Tuple, Optional, Dict, Any, Iterable, Iterator
+from dataclasses import dataclass, field
 from PIL import Image
 import logging
 
@@ -20,7 +20,13 @@ logger = logging.getLogger(__name__)
 
 @dataclass
 class TableSegment:
-    """Represents a table segment with its bounding box and page information."""
+    """
+    Represents a table segment with its bounding box and page information.
+    
+    The cropped table image is cut from ``page_image`` on first access to
+    :attr:`image`; the page reference is dropped afterwards so that a kept
+    segment only holds its own crop.
+    """
     page_index: int
     box_index: int
     x1: float
@@ -29,8 +35,18 @@ class TableSegment:
     y2: float
     page_width: int
     page_height: int
-    image: Image.Image  # Cropped table image
+    page_image: Optional[Image.Image] = field(default=None, repr=False, compare=False)
     confidence: float = 1.0
+    _image: Optional[Image.Image] = field(default=None, init=False, repr=False, compare=False)
+    _columns: Optional[List[float]] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def image(self) -> Image.Image:
+        """Cropped table image, cut from the page image on first access."""
+        if self._image is None:
+            self._image = self.page_image.crop((self.x1, self.y1, self.x2, self.y2))
+            self.page_image = None
+        return self._image
     
     def match_box(self, box, page_idx: int, tolerance: float = 2.0) -> bool:
         """Check if this segment matches a given box."""
@@ -53,6 +69,34 @@ class SplitTableMatch:
     column_count2: int
 
 
+@dataclass
+class SplitTableChain:
+    """
+    One logical table split over consecutive pages.
+    
+    Segments are in page order and each adjacent pair is linked by the
+    corresponding entry of ``matches``, so a table running over N pages has
+    N segments and N - 1 matches.
+    """
+    segments: List[TableSegment]
+    matches: List[SplitTableMatch]
+    
+    @property
+    def first_page(self) -> int:
+        """Page index of the first segment."""
+        return self.segments[0].page_index
+    
+    @property
+    def last_page(self) -> int:
+        """Page index of the last segment."""
+        return self.segments[-1].page_index
+    
+    @property
+    def confidence(self) -> float:
+        """Confidence of the weakest link in the chain."""
+        return min(match.confidence for match in self.matches)
+
+
 class SplitTableDetector:
     """
     Detects and validates tables that are split across pages.
@@ -90,6 +134,14 @@ class SplitTableDetector:
         self.width_similarity_threshold = width_similarity_threshold
         self.enable_lsd = enable_lsd
         
+    def index(self) -> "SplitTableIndex":
+        """
+        Create an empty incremental index that pages can be fed into one by one.
+        
+        :return: SplitTableIndex bound to this detector
+        """
+        return SplitTableIndex(self)
+    
     def detect_split_tables(
         self,
         pages: List[Any],
@@ -102,45 +154,125 @@ class SplitTableDetector:
         :param page_images: List of PIL Images for each page
         :return: List of SplitTableMatch objects for validated split tables
         """
-        table_segments: List[TableSegment] = []
-        for page in pages:
+        index = self.index()
+        for page in sorted(pages, key=lambda p: p.page_index):
+            page_num = page.page_index
+            if page_num < 1 or page_num > len(page_images):
+                logger.warning(f"Skipping page {page_num}: index out of range (max={len(page_images)})")
+                continue
+            index.add_page(page, page_images[page_num - 1])
+        
+        return index.matches
+    
+    def detect_table_chains(
+        self,
+        pages: List[Any],
+        page_images: List[Image.Image],
+    ) -> List[SplitTableChain]:
+        """
+        Detect tables that are split across pages, grouped into chains.
+        
+        Unlike :meth:`detect_split_tables`, a table that runs over several
+        pages is returned once, as a single chain of all its segments.
+        
+        :param pages: List of LayoutPage objects with detected boxes
+        :param page_images: List of PIL Images for each page
+        :return: List of SplitTableChain objects in order of their first page
+        """
+        index = self.index()
+        for page in sorted(pages, key=lambda p: p.page_index):
             page_num = page.page_index
             if page_num < 1 or page_num > len(page_images):
                 logger.warning(f"Skipping page {page_num}: index out of range (max={len(page_images)})")
                 continue
-            page_img = page_images[page_num - 1]
-            
-            for i, box in enumerate(page.boxes):
-                if box.label == "table":
-                    cropped = page_img.crop((box.x1, box.y1, box.x2, box.y2))
-                    
-                    segment = TableSegment(
-                        page_index=page_num,
-                        box_index=i,
-                        x1=box.x1,
-                        y1=box.y1,
-                        x2=box.x2,
-                        y2=box.y2,
-                        page_width=page.width,
-                        page_height=page.height,
-                        image=cropped,
-                        confidence=box.score,
-                    )
-                    table_segments.append(segment)
-        
-        matches: List[SplitTableMatch] = []
-        
-        for i, seg1 in enumerate(table_segments):
-            for seg2 in table_segments[i+1:]:
-                if seg2.page_index != seg1.page_index + 1:
-                    continue
-                
-                if self._check_proximity(seg1, seg2):
-                    match = self._validate_split_table(seg1, seg2)
-                    if match and match.confidence >= self.min_merge_confidence:
-                        matches.append(match)
-        
-        return matches
+            index.add_page(page, page_images[page_num - 1])
+        
+        return index.chains
+    
+    def detect_between(
+        self,
+        page1: Any,
+        page1_image: Image.Image,
+        page2: Any,
+        page2_image: Image.Image,
+    ) -> List[SplitTableMatch]:
+        """
+        Detect split tables between two consecutive pages.
+        
+        :param page1: LayoutPage of the earlier page
+        :param page1_image: PIL Image of the earlier page
+        :param page2: LayoutPage of the following page
+        :param page2_image: PIL Image of the following page
+        :return: List of SplitTableMatch objects for validated split tables
+        """
+        index = self.index()
+        index.add_page(page1, page1_image)
+        return index.add_page(page2, page2_image)
+    
+    def detect_in_stream(
+        self,
+        layout_stream: Iterable[Tuple[Any, Image.Image]],
+        chains: List[SplitTableChain],
+    ) -> Iterator[Tuple[Any, Image.Image]]:
+        """
+        Detect split tables while pages stream through, one page behind.
+        
+        Each (page, image) pair is yielded only after the following page has
+        been seen, so by the time a page is yielded every chain involving it
+        is already in ``chains``. A chain is appended when its second
+        segment is found and grows in place as later pages continue it.
+        
+        :param layout_stream: Iterable of (LayoutPage, page image) in page order
+        :param chains: List that detected SplitTableChain objects are appended to
+        :return: Iterator of the same (LayoutPage, page image) pairs
+        """
+        index = self.index()
+        previous: Optional[Tuple[Any, Image.Image]] = None
+        for page, page_img in layout_stream:
+            try:
+                known = len(index.chains)
+                index.add_page(page, page_img)
+                chains.extend(index.chains[known:])
+            except Exception:
+                logger.exception(f"Split table detection failed at page {page.page_index}")
+                index.skip_page(page)
+            if previous is not None:
+                yield previous
+            previous = (page, page_img)
+        if previous is not None:
+            yield previous
+    
+    def _segment(self, page: Any, page_img: Image.Image, box_index: int, box: Any) -> TableSegment:
+        """Build a TableSegment for a table box; the crop is made lazily."""
+        return TableSegment(
+            page_index=page.page_index,
+            box_index=box_index,
+            x1=box.x1,
+            y1=box.y1,
+            x2=box.x2,
+            y2=box.y2,
+            page_width=page.width,
+            page_height=page.height,
+            page_image=page_img,
+            confidence=box.score,
+        )
+    
+    def _is_trailing(self, seg: TableSegment) -> bool:
+        """True if the segment ends in the bottom band of its page (may continue on the next page)."""
+        return seg.y2 / seg.page_height >= (1.0 - self.bottom_threshold_ratio)
+    
+    def _is_leading(self, seg: TableSegment) -> bool:
+        """True if the segment starts in the top band of its page (may continue the previous page)."""
+        return seg.y1 / seg.page_height <= self.top_threshold_ratio
+    
+    def _match_pair(self, seg1: TableSegment, seg2: TableSegment) -> Optional[SplitTableMatch]:
+        """Run the proximity check and structure validation for one candidate pair."""
+        if not self._check_proximity(seg1, seg2):
+            return None
+        match = self._validate_split_table(seg1, seg2)
+        if match and match.confidence >= self.min_merge_confidence:
+            return match
+        return None
     
     def _check_proximity(self, seg1: TableSegment, seg2: TableSegment) -> bool:
         """
@@ -199,11 +331,8 @@ class SplitTableDetector:
                 column_count2=0,
             )
         
-        img1 = self._pil_to_cv2(seg1.image)
-        img2 = self._pil_to_cv2(seg2.image)
-        
-        cols1 = self._detect_columns(img1)
-        cols2 = self._detect_columns(img2)
+        cols1 = self._segment_columns(seg1)
+        cols2 = self._segment_columns(seg2)
         
         if len(cols1) > 20 or len(cols2) > 20:
             return SplitTableMatch(
@@ -263,6 +392,12 @@ class SplitTableDetector:
             column_count2=len(cols2),
         )
     
+    def _segment_columns(self, seg: TableSegment) -> List[float]:
+        """Column positions of a segment, detected once and memoized on the segment."""
+        if seg._columns is None:
+            seg._columns = self._detect_columns(self._pil_to_cv2(seg.image))
+        return seg._columns
+    
     def _detect_columns(self, img: np.ndarray) -> List[float]:
         """
         Detect vertical lines (columns) in a table image using LSD (Line Segment Detector).
@@ -293,31 +428,27 @@ class SplitTableDetector:
         if lines is None or len(lines) == 0:
             return []
         
-        x_coords = []
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
-            
-            angle = np.abs(np.arctan2(y2 - y1, x2 - x1) * 180 / np.pi)
-            
-            if 75 <= angle <= 105:
-                x_coords.extend([x1, x2])
+        # (N, 1, 4) or (N, 4) depending on the OpenCV version
+        segments = lines.reshape(-1, 4)
+        x1, y1, x2, y2 = segments[:, 0], segments[:, 1], segments[:, 2], segments[:, 3]
         
-        if not x_coords:
+        # Angles in float64, as the former per-line scalar arithmetic produced
+        angle = np.abs(np.arctan2(y2 - y1, x2 - x1).astype(np.float64) * 180 / np.pi)
+        vertical = (angle >= 75) & (angle <= 105)
+        if not vertical.any():
             return []
         
-        x_coords = sorted(set(x_coords))
+        x_coords = np.unique(np.concatenate([x1[vertical], x2[vertical]]))
         
-        if len(x_coords) > 0:
-            img_width = img.shape[1]
-            clustering_threshold = max(5, img_width * 0.01)
-            clustered = self._cluster_values(x_coords, threshold=clustering_threshold)
-        else:
-            clustered = []
+        img_width = img.shape[1]
+        clustering_threshold = max(5, img_width * 0.01)
+        clustered = self._cluster_values(x_coords, threshold=clustering_threshold)
         
-        if len(clustered) > 0 and len(clustered) > 2:
-            img_width = img.shape[1]
+        if len(clustered) > 2:
             edge_margin = img_width * 0.02
-            clustered = [c for c in clustered if edge_margin <= c <= (img_width - edge_margin)]
+            centers = np.asarray(clustered, dtype=np.float64)
+            keep = (centers >= edge_margin) & (centers <= (img_width - edge_margin))
+            clustered = [c for c, k in zip(clustered, keep) if k]
         
         if len(clustered) > 20:
             return []
@@ -328,23 +459,21 @@ class SplitTableDetector:
         """
         Cluster nearby values together.
         
-        :param values: List of values to cluster
+        Sorted values are split wherever the gap to the previous value
+        exceeds ``threshold``; each run becomes one cluster.
+        
+        :param values: Values to cluster (list or 1-D array)
         :param threshold: Maximum distance for clustering
         :return: List of cluster centers
         """
-        if not values:
+        if len(values) == 0:
             return []
         
-        sorted_vals = sorted(values)
-        clusters = [[sorted_vals[0]]]
-        
-        for val in sorted_vals[1:]:
-            if val - clusters[-1][-1] <= threshold:
-                clusters[-1].append(val)
-            else:
-                clusters.append([val])
+        sorted_vals = np.sort(np.asarray(values))
+        gaps = np.diff(sorted_vals).astype(np.float64)
+        splits = np.flatnonzero(gaps > threshold) + 1
         
-        return [np.mean(cluster) for cluster in clusters]
+        return [np.mean(cluster) for cluster in np.split(sorted_vals, splits)]
     
     def _check_column_alignment(
         self,
@@ -368,35 +497,40 @@ class SplitTableDetector:
         if width1 == 0 or width2 == 0:
             return 0.0
         
-        norm_cols1 = [c / width1 for c in cols1]
-        norm_cols2 = [c / width2 for c in cols2]
-        
-        matches = 0
-        total = max(len(norm_cols1), len(norm_cols2))
+        total = max(len(cols1), len(cols2))
         
         if total == 0:
             return 0.0
         
+        norm_cols1 = np.asarray(cols1, dtype=np.float64) / width1
+        norm_cols2 = np.asarray(cols2, dtype=np.float64) / width2
+        
         tolerance = 0.05
-        used_cols2 = set()
-        
-        for c1 in norm_cols1:
-            best_match = None
-            best_diff = float('inf')
-            
-            for i, c2 in enumerate(norm_cols2):
-                if i in used_cols2:
-                    continue
-                diff = abs(c1 - c2)
-                if diff < tolerance and diff < best_diff:
-                    best_match = i
-                    best_diff = diff
-            
-            if best_match is not None:
-                matches += 1
-                used_cols2.add(best_match)
-        
-        return matches / total if total > 0 else 0.0
+        diffs = np.abs(norm_cols1[:, None] - norm_cols2[None, :])
+        candidates = diffs < tolerance
+        has_candidate = candidates.any(axis=1)
+        if not has_candidate.any():
+            return 0.0
+        
+        # Greedy one-to-one assignment in column order: each column of the first
+        # segment takes the closest still-unused column of the second. When no
+        # two columns compete for the same best partner, every column simply
+        # gets its best one and the assignment needs no sequential pass.
+        best = np.argmin(np.where(candidates, diffs, np.inf), axis=1)[has_candidate]
+        if len(np.unique(best)) == len(best):
+            return len(best) / total
+        
+        available = np.ones(len(norm_cols2), dtype=bool)
+        matches = 0
+        for row, ok in zip(diffs, candidates):
+            ok = ok & available
+            if not ok.any():
+                continue
+            best = int(np.argmin(np.where(ok, row, np.inf)))
+            available[best] = False
+            matches += 1
+        
+        return matches / total
     
     def _calculate_confidence(
         self,
@@ -467,26 +601,141 @@ class SplitTableDetector:
         :param gap_pixels: Number of pixels to add between tables (default: 10)
         :return: Merged PIL Image
         """
-        img1 = match.segment1.image
-        img2 = match.segment2.image
-        
-        max_width = max(img1.width, img2.width)
-        
-        if img1.width != max_width:
-            ratio = max_width / img1.width
-            new_height = int(img1.height * ratio)
-            img1 = img1.resize((max_width, new_height), Image.LANCZOS)
+        return self._stitch_segments([match.segment1, match.segment2], gap_pixels)
+    
+    def merge_chain_images(
+        self,
+        chain: SplitTableChain,
+        gap_pixels: int = 10
+    ) -> Image.Image:
+        """
+        Merge all segments of a multi-page table into one image.
         
-        if img2.width != max_width:
-            ratio = max_width / img2.width
-            new_height = int(img2.height * ratio)
-            img2 = img2.resize((max_width, new_height), Image.LANCZOS)
+        :param chain: SplitTableChain whose segments are stacked top to bottom
+        :param gap_pixels: Number of pixels to add between segments (default: 10)
+        :return: Merged PIL Image
+        """
+        return self._stitch_segments(chain.segments, gap_pixels)
+    
+    def _stitch_segments(self, segments: List[TableSegment], gap_pixels: int) -> Image.Image:
+        """
+        Stack segment crops vertically, scaled to a common width, in one pass.
         
-        total_height = img1.height + gap_pixels + img2.height
+        The output canvas is sized up front from the crop sizes and each
+        strip is resized and pasted on its own, so at most one resized strip
+        exists besides the canvas regardless of how many pages the table spans.
+        """
+        sizes = [seg.image.size for seg in segments]
+        max_width = max(w for w, _ in sizes)
+        heights = [h if w == max_width else int(h * (max_width / w)) for w, h in sizes]
+        total_height = sum(heights) + gap_pixels * (len(segments) - 1)
         merged = Image.new('RGB', (max_width, total_height), color='white')
         
-        merged.paste(img1, (0, 0))
-        merged.paste(img2, (0, img1.height + gap_pixels))
+        y = 0
+        for seg, (w, _), height in zip(segments, sizes, heights):
+            strip = seg.image
+            if w != max_width:
+                strip = strip.resize((max_width, height), Image.LANCZOS)
+            merged.paste(strip, (0, y))
+            y += height + gap_pixels
         
         return merged
 
+
+class SplitTableIndex:
+    """
+    Incremental, page-bucketed index of split-table candidates.
+    
+    Pages are added in order with :meth:`add_page`. Only tables that end in
+    the bottom band of the previous page can continue onto the next one,
+    and only tables that start in the top band of the next page can be a
+    continuation, so the index keeps just the previous page's trailing
+    candidates and pairs them with the new page's leading ones. The work
+    per page is bounded by the tables near the page edges, so detection
+    scales linearly with the document. Crops are cut only for segments that
+    pass the proximity check, and column detection runs at most once per
+    segment even when it takes part in several pairs.
+    
+    Each segment is linked to at most one segment on either side (the most
+    confident pairs win), and linked segments are grouped into
+    :class:`SplitTableChain` objects as pages arrive, so a table spanning
+    many pages forms a single chain.
+    
+    :param detector: SplitTableDetector providing the thresholds and validation
+    """
+    
+    def __init__(self, detector: SplitTableDetector):
+        self.detector = detector
+        self.matches: List[SplitTableMatch] = []
+        self.chains: List[SplitTableChain] = []
+        self._trailing: List[TableSegment] = []
+        self._open_chains: Dict[int, SplitTableChain] = {}
+        self._last_page_index: Optional[int] = None
+    
+    def add_page(self, page: Any, page_image: Image.Image) -> List[SplitTableMatch]:
+        """
+        Add the next page and return the matches it completes.
+        
+        :param page: LayoutPage with detected boxes
+        :param page_image: PIL Image of the page
+        :return: Validated matches between the previous page and this one
+        """
+        detector = self.detector
+        leading: List[TableSegment] = []
+        trailing: List[TableSegment] = []
+        for i, box in enumerate(page.boxes):
+            if box.label != "table":
+                continue
+            seg = detector._segment(page, page_image, i, box)
+            if detector._is_leading(seg):
+                leading.append(seg)
+            if detector._is_trailing(seg):
+                trailing.append(seg)
+        
+        candidates: List[SplitTableMatch] = []
+        if self._trailing and leading and self._last_page_index == page.page_index - 1:
+            for seg1 in self._trailing:
+                for seg2 in leading:
+                    match = detector._match_pair(seg1, seg2)
+                    if match is not None:
+                        candidates.append(match)
+        
+        # Keep a one-to-one linking so segments form chains, best pairs first
+        new_matches: List[SplitTableMatch] = []
+        linked = set()
+        for match in sorted(candidates, key=lambda m: m.confidence, reverse=True):
+            if id(match.segment1) in linked or id(match.segment2) in linked:
+                continue
+            linked.update((id(match.segment1), id(match.segment2)))
+            new_matches.append(match)
+        new_matches.sort(key=lambda m: (m.segment1.box_index, m.segment2.box_index))
+        
+        open_chains: Dict[int, SplitTableChain] = {}
+        for match in new_matches:
+            # Cut the crops now so kept matches no longer reference whole pages
+            match.segment1.image
+            match.segment2.image
+            chain = self._open_chains.get(id(match.segment1))
+            if chain is None:
+                chain = SplitTableChain(segments=[match.segment1], matches=[])
+                self.chains.append(chain)
+            chain.segments.append(match.segment2)
+            chain.matches.append(match)
+            open_chains[id(match.segment2)] = chain
+        
+        self.matches.extend(new_matches)
+        self._trailing = trailing
+        self._open_chains = open_chains
+        self._last_page_index = page.page_index
+        return new_matches
+    
+    def skip_page(self, page: Any) -> None:
+        """
+        Record a page without candidates, e.g. after its detection failed.
+        
+        :param page: LayoutPage being skipped
+        :return: None
+        """
+        self._trailing = []
+        self._open_chains = {}
+        self._last_page_index = page.page_index
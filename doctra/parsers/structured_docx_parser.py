@@ -327,12 +327,16 @@ class StructuredDOCXParser:
         """Process images with VLM to extract structured data."""
         vlm_extracted_data = []
         if images_data:
+            # Submit every image up front; results come back in image order
+            results = self.vlm.extract_many([("table_or_chart", img_data['path']) for img_data in images_data])
             for i, img_data in enumerate(images_data):
                 try:
                     if progress_bar:
                         progress_bar.set_description(f"Processing image {i+1}/{len(images_data)}: {img_data['filename']}")
                     
-                    result = self.vlm.extract_table_or_chart(img_data['path'])
+                    result = results[i]
+                    if isinstance(result, Exception):
+                        raise result
                     
                     if hasattr(result, 'title') and hasattr(result, 'description'):
                         vlm_data = {
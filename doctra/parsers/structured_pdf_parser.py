@@ -3,17 +3,18 @@ import os
 import re
 import sys
 import logging
-from typing import List, Dict, Any, Union, Optional
-from contextlib import ExitStack
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import List, Dict, Any, Union, Optional, Iterable, Iterator, Tuple, Callable
 from PIL import Image, ImageDraw, ImageFont
 from tqdm import tqdm
-from doctra.utils.pdf_io import render_pdf_to_images
+from doctra.utils.pdf_io import render_pdf_to_images, iter_pdf_pages, get_pdf_page_count
 from doctra.engines.layout.paddle_layout import PaddleLayoutEngine
 from doctra.engines.layout.layout_models import LayoutPage
+from doctra.engines.layout.cache import file_digest
 from doctra.engines.ocr import PytesseractOCREngine, PaddleOCREngine
 from doctra.utils.constants import EXCLUDE_LABELS, IMAGE_SUBDIRS
 from doctra.parsers.layout_order import reading_order_key
-from doctra.utils.ocr_utils import ocr_box_text
+from doctra.utils.ocr_utils import ocr_boxes_text
 from doctra.exporters.image_saver import save_box_image
 from doctra.utils.file_ops import ensure_output_dirs
 from doctra.engines.vlm.service import VLMStructuredExtractor
@@ -23,7 +24,9 @@ from doctra.exporters.markdown_table import render_markdown_table
 from doctra.exporters.markdown_writer import write_markdown
 from doctra.exporters.html_writer import write_html, write_structured_html, render_html_table, write_html_from_lines
 from doctra.utils.progress import create_beautiful_progress_bar, create_multi_progress_bars, create_notebook_friendly_bar
-from doctra.parsers.split_table_detector import SplitTableDetector, SplitTableMatch
+from doctra.parsers.split_table_detector import SplitTableChain, SplitTableDetector, TableSegment
+from doctra.utils.pipeline import StagedPipeline, Stage, prefetch
+from doctra.parsers.checkpoint import PageJournal
 
 
 class StructuredPDFParser:
@@ -41,6 +44,8 @@ class StructuredPDFParser:
     :param layout_model_name: Layout detection model name (default: "PP-DocLayout_plus-L")
     :param dpi: DPI for PDF rendering (default: 200)
     :param min_score: Minimum confidence score for layout detection (default: 0.0)
+    :param use_layout_cache: Cache layout detections on disk, keyed by page content (default: True)
+    :param layout_cache_dir: Directory of the layout cache (default: ~/.cache/doctra/layout)
     :param ocr_engine: OCR engine instance (PytesseractOCREngine or PaddleOCREngine). 
                        If None, creates a default PytesseractOCREngine with lang="eng", psm=4, oem=3.
     :param box_separator: Separator between text boxes in output (default: "\n")
@@ -50,6 +55,9 @@ class StructuredPDFParser:
     :param max_gap_ratio: Maximum allowed gap between tables (default: 0.05)
     :param column_alignment_tolerance: Pixel tolerance for column alignment (default: 10.0)
     :param min_merge_confidence: Minimum confidence score for merging (default: 0.7)
+    :param render_window: Number of pages rendered and held in memory at once (default: 4)
+    :param ocr_workers: Concurrent Tesseract workers per page (default: None, i.e. CPU count)
+    :param vlm_workers: Pages in the VLM stage at once (default: None, i.e. the VLM's max_concurrency)
     """
 
     def __init__(
@@ -59,6 +67,8 @@ class StructuredPDFParser:
             layout_model_name: str = "PP-DocLayout_plus-L",
             dpi: int = 200,
             min_score: float = 0.0,
+            use_layout_cache: bool = True,
+            layout_cache_dir: Optional[str] = None,
             ocr_engine: Optional[Union[PytesseractOCREngine, PaddleOCREngine]] = None,
             box_separator: str = "\n",
             merge_split_tables: bool = False,
@@ -67,6 +77,9 @@ class StructuredPDFParser:
             max_gap_ratio: float = 0.25,
             column_alignment_tolerance: float = 10.0,
             min_merge_confidence: float = 0.65,
+            render_window: int = 4,
+            ocr_workers: Optional[int] = None,
+            vlm_workers: Optional[int] = None,
     ):
         """
         Initialize the StructuredPDFParser with processing configuration.
@@ -77,6 +90,8 @@ class StructuredPDFParser:
         :param layout_model_name: Layout detection model name (default: "PP-DocLayout_plus-L")
         :param dpi: DPI for PDF rendering (default: 200)
         :param min_score: Minimum confidence score for layout detection (default: 0.0)
+        :param use_layout_cache: Cache layout detections on disk, keyed by page content (default: True)
+        :param layout_cache_dir: Directory of the layout cache (default: ~/.cache/doctra/layout)
         :param ocr_engine: OCR engine instance (PytesseractOCREngine or PaddleOCREngine).
                            If None, creates a default PytesseractOCREngine with lang="eng", psm=4, oem=3.
         :param box_separator: Separator between text boxes in output (default: "\n")
@@ -86,10 +101,17 @@ class StructuredPDFParser:
         :param max_gap_ratio: Maximum allowed gap between tables (default: 0.25, accounts for headers/footers)
         :param column_alignment_tolerance: Pixel tolerance for column alignment (default: 10.0)
         :param min_merge_confidence: Minimum confidence score for merging (default: 0.65)
+        :param render_window: Number of pages rendered and held in memory at once (default: 4)
+        :param ocr_workers: Number of text boxes OCR'd concurrently per page (default: None, i.e. CPU count).
+                            PaddleOCR is not thread-safe, so it always uses a single worker.
+        :param vlm_workers: Pages in the VLM stage at once (default: None, i.e. the VLM's max_concurrency)
         """
-        self.layout_engine = PaddleLayoutEngine(model_name=layout_model_name)
+        self.layout_engine = PaddleLayoutEngine(
+            model_name=layout_model_name, use_cache=use_layout_cache, cache_dir=layout_cache_dir
+        )
         self.dpi = dpi
         self.min_score = min_score
+        self.render_window = max(1, render_window)
         
         # Initialize OCR engine - use provided instance or create default
         if ocr_engine is None:
@@ -103,6 +125,10 @@ class StructuredPDFParser:
             )
         
         self.box_separator = box_separator
+        if isinstance(self.ocr_engine, PytesseractOCREngine):
+            self.ocr_workers = max(1, ocr_workers or os.cpu_count() or 1)
+        else:
+            self.ocr_workers = 1
         
         # Initialize VLM engine - use provided instance or None
         if vlm is None:
@@ -115,6 +141,10 @@ class StructuredPDFParser:
                 f"got {type(vlm).__name__}"
             )
         
+        # Each page's crops share the VLM's request pool, so keeping as many
+        # pages in the stage as it allows requests lets single-table pages overlap
+        self.vlm_workers = max(1, vlm_workers or (self.vlm.max_concurrency if self.vlm is not None else 1))
+        
         self.merge_split_tables = merge_split_tables
         if self.merge_split_tables:
             self.split_table_detector = SplitTableDetector(
@@ -131,232 +161,85 @@ class StructuredPDFParser:
         logging.getLogger('pytesseract').setLevel(logging.WARNING)
         logging.getLogger('markdown_it').setLevel(logging.WARNING)
 
-    def parse(self, pdf_path: str) -> None:
+    def parse(
+            self,
+            pdf_path: str,
+            resume: bool = False,
+            output_dir: Optional[str] = None,
+            on_page: Optional[Callable[[int, str, List[Dict[str, Any]]], None]] = None,
+    ) -> None:
         """
         Parse a PDF document and extract all content types.
 
+        Pages flow through a staged pipeline (render → layout → crop/OCR →
+        VLM → emit) connected by bounded queues, so stages overlap across
+        pages and peak memory does not grow with the page count. Output is
+        emitted in page order.
+
+        Every finished page is checkpointed to a journal in the output
+        directory. With ``resume=True``, pages already in the journal (for
+        the same PDF and settings) are not OCR'd or sent to the VLM again,
+        and the final outputs are re-emitted from the journal plus the newly
+        parsed pages. When split-table merging is enabled, completed pages are
+        still rendered and run through (cached) layout detection so tables
+        spanning them are merged as before.
+
         :param pdf_path: Path to the input PDF file
+        :param resume: Whether to continue from the checkpoint journal of a previous run (default: False)
+        :param output_dir: Directory for the outputs (default: outputs/<pdf name>/full_parse)
+        :param on_page: Optional callback invoked in page order as each page is emitted, with the
+                        page number, the page's markdown and its structured items (default: None)
         :return: None
         """
         pdf_filename = os.path.splitext(os.path.basename(pdf_path))[0]
-        out_dir = f"outputs/{pdf_filename}/full_parse"
+        out_dir = output_dir or f"outputs/{pdf_filename}/full_parse"
 
         os.makedirs(out_dir, exist_ok=True)
         ensure_output_dirs(out_dir, IMAGE_SUBDIRS)
 
-        pages: List[LayoutPage] = self.layout_engine.predict_pdf(
-            pdf_path, batch_size=1, layout_nms=True, dpi=self.dpi, min_score=self.min_score
-        )
-        pil_pages = [im for (im, _, _) in render_pdf_to_images(pdf_path, dpi=self.dpi)]
-
-        split_table_matches: List[SplitTableMatch] = []
-        merged_table_segments = []
-        
-        if self.merge_split_tables and self.split_table_detector:
-            try:
-                split_table_matches = self.split_table_detector.detect_split_tables(pages, pil_pages)
-                for match in split_table_matches:
-                    merged_table_segments.append(match.segment1)
-                    merged_table_segments.append(match.segment2)
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                split_table_matches = []
-
-        fig_count = sum(sum(1 for b in p.boxes if b.label == "figure") for p in pages)
-        chart_count = sum(sum(1 for b in p.boxes if b.label == "chart") for p in pages)
-        table_count = sum(sum(1 for b in p.boxes if b.label == "table") for p in pages)
+        page_count = get_pdf_page_count(pdf_path)
 
         md_lines: List[str] = ["# Extracted Content\n"]
         html_lines: List[str] = ["<h1>Extracted Content</h1>"]
         structured_items: List[Dict[str, Any]] = []
+        split_table_chains: List[SplitTableChain] = []
 
-        charts_desc = "Charts (VLM → table)" if self.vlm is not None else "Charts (cropped)"
-        tables_desc = "Tables (VLM → table)" if self.vlm is not None else "Tables (cropped)"
-        figures_desc = "Figures (cropped)"
+        with PageJournal(out_dir, self._journal_fingerprint(pdf_path), resume=resume) as journal:
+            if journal.pages:
+                print(f"⏩ Resuming: {len(journal.pages)} of {page_count} pages already parsed")
+
+            pages_desc = "Pages (layout → OCR → VLM)" if self.vlm is not None else "Pages (layout → OCR)"
 
-        with ExitStack() as stack:
             is_notebook = "ipykernel" in sys.modules or "jupyter" in sys.modules
-            is_terminal = hasattr(sys.stdout, 'isatty') and sys.stdout.isatty()
             if is_notebook:
-                charts_bar = stack.enter_context(
-                    create_notebook_friendly_bar(total=chart_count, desc=charts_desc)) if chart_count else None
-                tables_bar = stack.enter_context(
-                    create_notebook_friendly_bar(total=table_count, desc=tables_desc)) if table_count else None
-                figures_bar = stack.enter_context(
-                    create_notebook_friendly_bar(total=fig_count, desc=figures_desc)) if fig_count else None
+                pages_bar = create_notebook_friendly_bar(total=page_count, desc=pages_desc)
             else:
-                charts_bar = stack.enter_context(
-                    create_beautiful_progress_bar(total=chart_count, desc=charts_desc, leave=True)) if chart_count else None
-                tables_bar = stack.enter_context(
-                    create_beautiful_progress_bar(total=table_count, desc=tables_desc, leave=True)) if table_count else None
-                figures_bar = stack.enter_context(
-                    create_beautiful_progress_bar(total=fig_count, desc=figures_desc, leave=True)) if fig_count else None
-
-            for p in pages:
-                page_num = p.page_index
-                page_img: Image.Image = pil_pages[page_num - 1]
+                pages_bar = create_beautiful_progress_bar(total=page_count, desc=pages_desc, leave=True)
+
+            # Journaled pages form a prefix of the document; without split-table
+            # merging nothing before the first unfinished page is rendered.
+            first_page = 1 if self.merge_split_tables else len(journal.pages) + 1
+            page_images = (im for (im, _, _) in iter_pdf_pages(
+                pdf_path, dpi=self.dpi, window=self.render_window, first_page=first_page))
+
+            def emit(page_num, page_md, page_html, page_items):
                 md_lines.append(f"\n## Page {page_num}\n")
                 html_lines.append(f"<h2>Page {page_num}</h2>")
-
-                for i, box in enumerate(sorted(p.boxes, key=reading_order_key), start=1):
-                    if box.label in EXCLUDE_LABELS:
-                        img_path = save_box_image(page_img, box, out_dir, page_num, i, IMAGE_SUBDIRS)
-                        abs_img_path = os.path.abspath(img_path)
-                        rel = os.path.relpath(abs_img_path, out_dir)
-
-                        if box.label == "figure":
-                            figure_md = f"![Figure — page {page_num}]({rel})\n"
-                            figure_html = f'<img src="{rel}" alt="Figure — page {page_num}" />'
-                            md_lines.append(figure_md)
-                            html_lines.append(figure_html)
-                            if figures_bar: figures_bar.update(1)
-
-                        elif box.label == "chart":
-                            if self.vlm is not None:
-                                wrote_table = False
-                                try:
-                                    chart = self.vlm.extract_chart(abs_img_path)
-                                    item = to_structured_dict(chart)
-                                    if item:
-                                        item["page"] = page_num
-                                        item["type"] = "Chart"
-                                        structured_items.append(item)
-                                        
-                                        table_md = render_markdown_table(item.get("headers"), item.get("rows"),
-                                                                         title=item.get("title"))
-                                        table_html = render_html_table(item.get("headers"), item.get("rows"),
-                                                                       title=item.get("title"))
-                                        
-                                        md_lines.append(table_md)
-                                        html_lines.append(table_html)
-                                        wrote_table = True
-                                except Exception as e:
-                                    pass
-                                if not wrote_table:
-                                    chart_md = f"![Chart — page {page_num}]({rel})\n"
-                                    chart_html = f'<img src="{rel}" alt="Chart — page {page_num}" />'
-                                    md_lines.append(chart_md)
-                                    html_lines.append(chart_html)
-                            else:
-                                chart_md = f"![Chart — page {page_num}]({rel})\n"
-                                chart_html = f'<img src="{rel}" alt="Chart — page {page_num}" />'
-                                md_lines.append(chart_md)
-                                html_lines.append(chart_html)
-                            if charts_bar: charts_bar.update(1)
-
-                        elif box.label == "table":
-                            is_merged = any(seg.match_box(box, page_num) for seg in merged_table_segments)
-                            if is_merged:
-                                continue
-                            
-                            if self.vlm is not None:
-                                wrote_table = False
-                                try:
-                                    table = self.vlm.extract_table(abs_img_path)
-                                    item = to_structured_dict(table)
-                                    if item:
-                                        item["page"] = page_num
-                                        item["type"] = "Table"
-                                        structured_items.append(item)
-                                        
-                                        table_md = render_markdown_table(item.get("headers"), item.get("rows"),
-                                                                         title=item.get("title"))
-                                        table_html = render_html_table(item.get("headers"), item.get("rows"),
-                                                                       title=item.get("title"))
-                                        
-                                        md_lines.append(table_md)
-                                        html_lines.append(table_html)
-                                        wrote_table = True
-                                except Exception as e:
-                                    pass
-                                if not wrote_table:
-                                    table_md = f"![Table — page {page_num}]({rel})\n"
-                                    table_html = f'<img src="{rel}" alt="Table — page {page_num}" />'
-                                    md_lines.append(table_md)
-                                    html_lines.append(table_html)
-                            else:
-                                table_md = f"![Table — page {page_num}]({rel})\n"
-                                table_html = f'<img src="{rel}" alt="Table — page {page_num}" />'
-                                md_lines.append(table_md)
-                                html_lines.append(table_html)
-                            if tables_bar: tables_bar.update(1)
-                    else:
-                        text = ocr_box_text(self.ocr_engine, page_img, box)
-                        if text:
-                            md_lines.append(text)
-                            md_lines.append(self.box_separator if self.box_separator else "")
-                            html_text = text.replace('\n', '<br>')
-                            html_lines.append(f"<p>{html_text}</p>")
-                            if self.box_separator:
-                                html_lines.append("<br>")
-
-            if split_table_matches and self.split_table_detector:
-                for match_idx, match in enumerate(split_table_matches):
-                    try:
-                        merged_img = self.split_table_detector.merge_table_images(match)
-                        
-                        tables_dir = os.path.join(out_dir, "tables")
-                        os.makedirs(tables_dir, exist_ok=True)
-                        merged_filename = f"merged_table_{match.segment1.page_index}_{match.segment2.page_index}.png"
-                        merged_path = os.path.join(tables_dir, merged_filename)
-                        merged_img.save(merged_path)
-                        
-                        abs_merged_path = os.path.abspath(merged_path)
-                        rel_merged = os.path.relpath(abs_merged_path, out_dir)
-                        
-                        pages_str = f"pages {match.segment1.page_index}-{match.segment2.page_index}"
-                        
-                        if self.use_vlm and self.vlm:
-                            wrote_table = False
-                            try:
-                                table = self.vlm.extract_table(abs_merged_path)
-                                item = to_structured_dict(table)
-                                if item:
-                                    item["page"] = f"{match.segment1.page_index}-{match.segment2.page_index}"
-                                    item["type"] = "Table (Merged)"
-                                    item["split_merge"] = True
-                                    item["merge_confidence"] = match.confidence
-                                    structured_items.append(item)
-                                    
-                                    table_md = render_markdown_table(
-                                        item.get("headers"), 
-                                        item.get("rows"),
-                                        title=item.get("title") or f"Merged Table ({pages_str})"
-                                    )
-                                    table_html = render_html_table(
-                                        item.get("headers"), 
-                                        item.get("rows"),
-                                        title=item.get("title") or f"Merged Table ({pages_str})"
-                                    )
-                                    
-                                    md_lines.append(f"\n### Merged Table ({pages_str})\n")
-                                    md_lines.append(table_md)
-                                    html_lines.append(f'<h3>Merged Table ({pages_str})</h3>')
-                                    html_lines.append(table_html)
-                                    wrote_table = True
-                            except Exception as e:
-                                pass
-                            
-                            if not wrote_table:
-                                table_md = f"![Merged Table — {pages_str}]({rel_merged})\n"
-                                table_html = f'<img src="{rel_merged}" alt="Merged Table — {pages_str}" />'
-                                md_lines.append(f"\n### Merged Table ({pages_str})\n")
-                                md_lines.append(table_md)
-                                html_lines.append(f'<h3>Merged Table ({pages_str})</h3>')
-                                html_lines.append(table_html)
-                        else:
-                            table_md = f"![Merged Table — {pages_str}]({rel_merged})\n"
-                            table_html = f'<img src="{rel_merged}" alt="Merged Table — {pages_str}" />'
-                            md_lines.append(f"\n### Merged Table ({pages_str})\n")
-                            md_lines.append(table_md)
-                            html_lines.append(f'<h3>Merged Table ({pages_str})</h3>')
-                            html_lines.append(table_html)
-                        
-                        if tables_bar: tables_bar.update(1)
-                        
-                    except Exception as e:
-                        print(f"⚠️  Warning: Failed to merge table {match_idx + 1}: {e}")
+                md_lines.extend(page_md)
+                html_lines.extend(page_html)
+                structured_items.extend(page_items)
+                pages_bar.update(1)
+                if on_page is not None:
+                    on_page(page_num, "\n".join(page_md), page_items)
+
+            with pages_bar:
+                for page_num in range(1, first_page):
+                    emit(page_num, *self._render_page(page_num, journal.completed(page_num)))
+                for page_num, page_md, page_html, page_items in self._iter_processed_pages(
+                        page_images, out_dir, split_table_chains, start_index=first_page, journal=journal):
+                    emit(page_num, page_md, page_html, page_items)
+
+        self._process_merged_tables(split_table_chains, out_dir, md_lines, html_lines, structured_items)
 
         md_path = write_markdown(md_lines, out_dir)
         
@@ -376,6 +259,320 @@ class StructuredPDFParser:
         print(f"✅ Parsing completed successfully!")
         print(f"📁 Output directory: {out_dir}")
 
+    def _journal_fingerprint(self, pdf_path: str) -> Dict[str, Any]:
+        """
+        Describe the input and every setting that changes per-page results.
+
+        A checkpoint journal is only resumed if this matches exactly.
+
+        :param pdf_path: Path to the input PDF file
+        :return: JSON-serializable fingerprint
+        """
+        def settings(obj):
+            return {k: v for k, v in sorted(vars(obj).items())
+                    if not k.startswith("_") and isinstance(v, (str, int, float, bool, type(None)))}
+
+        return {
+            "pdf": file_digest(pdf_path),
+            "dpi": self.dpi,
+            "min_score": self.min_score,
+            "layout_model": self.layout_engine.model_name,
+            "ocr": [type(self.ocr_engine).__name__, settings(self.ocr_engine)],
+            "vlm": [self.vlm.vlm_provider, self.vlm.vlm_model] if self.vlm is not None else None,
+            "split_tables": settings(self.split_table_detector) if self.split_table_detector else None,
+        }
+
+    def _iter_layout_pages(
+            self,
+            page_images: Iterable[Image.Image],
+            split_table_chains: List[SplitTableChain],
+            start_index: int = 1,
+    ) -> Iterator[Tuple[LayoutPage, Image.Image]]:
+        """
+        Stream page images through layout detection and split-table detection.
+
+        When split-table merging is enabled, pages are yielded one page
+        behind so that every chain involving a page is already recorded in
+        ``split_table_chains`` when the page is processed.
+
+        :param page_images: Iterable of page images in document order
+        :param split_table_chains: List that detected split-table chains are appended to
+        :param start_index: 1-based page number of the first image (default: 1)
+        :return: Iterator of (LayoutPage, page image) tuples in page order
+        """
+        stream = self.layout_engine.predict_image_stream(
+            page_images, batch_size=1, layout_nms=True, min_score=self.min_score,
+            window=self.render_window, start_index=start_index,
+        )
+        if self.merge_split_tables and self.split_table_detector:
+            stream = self.split_table_detector.detect_in_stream(stream, split_table_chains)
+        return stream
+
+    @staticmethod
+    def _merged_segments(split_table_chains: List[SplitTableChain]) -> List[TableSegment]:
+        """Return every table segment that belongs to a split-table chain."""
+        segments: List[TableSegment] = []
+        for chain in split_table_chains:
+            segments.extend(chain.segments)
+        return segments
+
+    def _iter_processed_pages(
+            self,
+            page_images: Iterable[Image.Image],
+            out_dir: str,
+            split_table_chains: List[SplitTableChain],
+            start_index: int = 1,
+            journal: Optional[PageJournal] = None,
+    ) -> Iterator[Tuple[int, List[str], List[str], List[Dict[str, Any]]]]:
+        """
+        Run the staged page pipeline: render → layout → crop/OCR → VLM.
+
+        Rendering and layout (including split-table detection, which needs
+        pages in order) each run in their own thread; crop/OCR and VLM
+        extraction are separate stages; each page's text boxes are OCR'd
+        concurrently by ``ocr_workers`` threads and the VLM stage runs
+        ``vlm_workers`` threads. Stages are connected by bounded queues of
+        ``render_window`` items, so page N+1 can be in layout while page N
+        is being OCR'd. Results are yielded in page order for the caller
+        to emit.
+
+        Pages already in ``journal`` skip the OCR and VLM stages and reuse
+        their journaled blocks; every other page is recorded in the journal
+        once it is done.
+
+        :param page_images: Iterable of page images in document order
+        :param out_dir: Output directory for cropped images
+        :param split_table_chains: List that detected split-table chains are appended to
+        :param start_index: 1-based page number of the first image (default: 1)
+        :param journal: Optional checkpoint journal to resume from and record to (default: None)
+        :return: Iterator of (page number, markdown lines, html lines, structured items) in page order
+        """
+        rendered = prefetch(page_images, maxsize=self.render_window)
+        jobs = (
+            (page, page_img, self._merged_segments(split_table_chains))
+            for page, page_img in self._iter_layout_pages(rendered, split_table_chains, start_index)
+        )
+
+        ocr_pool = ThreadPoolExecutor(max_workers=self.ocr_workers, thread_name_prefix="doctra-ocr") \
+            if self.ocr_workers > 1 else None
+
+        def completed(page_num):
+            return journal.completed(page_num) if journal is not None else None
+
+        def ocr_stage(job):
+            page, page_img, merged_table_segments = job
+            if completed(page.page_index) is not None:
+                return page.page_index, None
+            return page.page_index, self._ocr_page(page, page_img, out_dir, merged_table_segments, ocr_pool)
+
+        def vlm_stage(result):
+            page_num, blocks = result
+            if blocks is None:
+                return page_num, None
+            return page_num, self._vlm_page(page_num, blocks)
+
+        pipeline = StagedPipeline(
+            [
+                Stage("ocr", ocr_stage),
+                Stage("vlm", vlm_stage, workers=self.vlm_workers if self.vlm is not None else 1),
+            ],
+            queue_size=self.render_window,
+        )
+        try:
+            for page_num, blocks in pipeline.run(jobs):
+                if blocks is None:
+                    blocks = completed(page_num)
+                elif journal is not None:
+                    journal.record(page_num, blocks)
+                page_md, page_html, page_items = self._render_page(page_num, blocks)
+                yield page_num, page_md, page_html, page_items
+        finally:
+            if ocr_pool is not None:
+                ocr_pool.shutdown(wait=True)
+
+    def _ocr_page(
+            self,
+            page: LayoutPage,
+            page_img: Image.Image,
+            out_dir: str,
+            merged_table_segments: List[TableSegment],
+            executor: Optional[Executor] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Crop visual elements and OCR text boxes of a page, in reading order.
+
+        :param page: Layout detections for the page
+        :param page_img: Rendered page image
+        :param out_dir: Output directory for cropped images
+        :param merged_table_segments: Table segments emitted later as merged tables
+        :param executor: Optional executor used to OCR the page's text boxes concurrently
+        :return: List of content blocks (``{"kind": "text", "text": ...}`` or
+                 ``{"kind": <label>, "path": ..., "rel": ...}``)
+        """
+        page_num = page.page_index
+        blocks: List[Dict[str, Any]] = []
+
+        text_boxes = []
+        for i, box in enumerate(sorted(page.boxes, key=reading_order_key), start=1):
+            if box.label in EXCLUDE_LABELS:
+                img_path = save_box_image(page_img, box, out_dir, page_num, i, IMAGE_SUBDIRS)
+                abs_img_path = os.path.abspath(img_path)
+                rel = os.path.relpath(abs_img_path, out_dir)
+
+                if box.label == "table" and any(seg.match_box(box, page_num) for seg in merged_table_segments):
+                    continue
+
+                blocks.append({"kind": box.label, "path": abs_img_path, "rel": rel})
+            else:
+                text_boxes.append(box)
+                blocks.append({"kind": "text", "text": None})
+
+        # OCR every text box of the page at once; results come back in reading order
+        texts = iter(ocr_boxes_text(self.ocr_engine, page_img, text_boxes, executor=executor))
+        for block in blocks:
+            if block["kind"] == "text":
+                block["text"] = next(texts)
+
+        return [block for block in blocks if block["kind"] != "text" or block["text"]]
+
+    def _vlm_page(self, page_num: int, blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert the page's charts and tables to structured data with the VLM.
+
+        Successful extractions are stored on the block under ``"item"``;
+        failures leave the block untouched so it is emitted as an image.
+
+        :param page_num: 1-based page number
+        :param blocks: Content blocks produced by ``_ocr_page``
+        :return: The same list of blocks
+        """
+        if self.vlm is None:
+            return blocks
+
+        # Submit every chart/table crop of the page at once, then put each
+        # result back on its block.
+        targets = [block for block in blocks if block["kind"] in ("chart", "table")]
+        results = self.vlm.extract_many([(block["kind"], block["path"]) for block in targets])
+        for block, extracted in zip(targets, results):
+            if isinstance(extracted, Exception):
+                continue
+            item = to_structured_dict(extracted)
+            if item:
+                item["page"] = page_num
+                item["type"] = "Chart" if block["kind"] == "chart" else "Table"
+                block["item"] = item
+
+        return blocks
+
+    def _render_page(
+            self,
+            page_num: int,
+            blocks: List[Dict[str, Any]],
+    ) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+        """
+        Render a page's content blocks to markdown and HTML lines.
+
+        :param page_num: 1-based page number
+        :param blocks: Content blocks produced by ``_ocr_page``/``_vlm_page``
+        :return: Tuple of (markdown lines, html lines, structured items) for the page
+        """
+        md_lines: List[str] = []
+        html_lines: List[str] = []
+        structured_items: List[Dict[str, Any]] = []
+
+        for block in blocks:
+            kind = block["kind"]
+            if kind == "text":
+                text = block["text"]
+                md_lines.append(text)
+                md_lines.append(self.box_separator if self.box_separator else "")
+                html_text = text.replace('\n', '<br>')
+                html_lines.append(f"<p>{html_text}</p>")
+                if self.box_separator:
+                    html_lines.append("<br>")
+                continue
+
+            rel = block["rel"]
+            item = block.get("item")
+            if item:
+                structured_items.append(item)
+                md_lines.append(render_markdown_table(item.get("headers"), item.get("rows"),
+                                                      title=item.get("title")))
+                html_lines.append(render_html_table(item.get("headers"), item.get("rows"),
+                                                    title=item.get("title")))
+            else:
+                label = kind.capitalize()
+                md_lines.append(f"![{label} — page {page_num}]({rel})\n")
+                html_lines.append(f'<img src="{rel}" alt="{label} — page {page_num}" />')
+
+        return md_lines, html_lines, structured_items
+
+    def _process_merged_tables(
+            self,
+            split_table_chains: List[SplitTableChain],
+            out_dir: str,
+            md_lines: List[str],
+            html_lines: List[str],
+            structured_items: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Stitch each split table into one image and append it to the outputs.
+
+        A table that runs over several pages is one chain, stitched into a
+        single image and extracted with a single VLM call.
+
+        :param split_table_chains: Detected split-table chains
+        :param out_dir: Output directory for merged table images
+        :param md_lines: Markdown lines to append to
+        :param html_lines: HTML lines to append to
+        :param structured_items: Structured items to append to
+        :return: None
+        """
+        if not split_table_chains or not self.split_table_detector:
+            return
+
+        merged = []
+        for chain_idx, chain in enumerate(split_table_chains):
+            try:
+                merged_img = self.split_table_detector.merge_chain_images(chain)
+                
+                tables_dir = os.path.join(out_dir, "tables")
+                os.makedirs(tables_dir, exist_ok=True)
+                merged_filename = f"merged_table_{chain.first_page}_{chain.last_page}.png"
+                merged_path = os.path.join(tables_dir, merged_filename)
+                merged_img.save(merged_path)
+                
+                abs_merged_path = os.path.abspath(merged_path)
+                merged.append((chain, abs_merged_path, os.path.relpath(abs_merged_path, out_dir)))
+            except Exception as e:
+                print(f"⚠️  Warning: Failed to merge table {chain_idx + 1}: {e}")
+
+        # Send every merged table to the VLM at once; results keep chain order
+        if self.vlm is not None:
+            results = self.vlm.extract_many([("table", abs_merged_path) for _, abs_merged_path, _ in merged])
+        else:
+            results = [None] * len(merged)
+
+        for (chain, abs_merged_path, rel_merged), table in zip(merged, results):
+            pages_str = f"pages {chain.first_page}-{chain.last_page}"
+            md_lines.append(f"\n### Merged Table ({pages_str})\n")
+            html_lines.append(f'<h3>Merged Table ({pages_str})</h3>')
+
+            item = to_structured_dict(table) if table is not None and not isinstance(table, Exception) else None
+            if item:
+                item["page"] = f"{chain.first_page}-{chain.last_page}"
+                item["type"] = "Table (Merged)"
+                item["split_merge"] = True
+                item["merge_confidence"] = chain.confidence
+                structured_items.append(item)
+
+                title = item.get("title") or f"Merged Table ({pages_str})"
+                md_lines.append(render_markdown_table(item.get("headers"), item.get("rows"), title=title))
+                html_lines.append(render_html_table(item.get("headers"), item.get("rows"), title=title))
+            else:
+                md_lines.append(f"![Merged Table — {pages_str}]({rel_merged})\n")
+                html_lines.append(f'<img src="{rel_merged}" alt="Merged Table — {pages_str}" />')
+
     def display_pages_with_boxes(self, pdf_path: str, num_pages: int = 3, cols: int = 2,
                                  page_width: int = 800, spacing: int = 40, save_path: str = None) -> None:
         """
@@ -392,10 +589,13 @@ class StructuredPDFParser:
         :param save_path: Optional path to save the visualization (if None, displays only)
         :return: None
         """
-        pages: List[LayoutPage] = self.layout_engine.predict_pdf(
-            pdf_path, batch_size=1, layout_nms=True, dpi=self.dpi, min_score=self.min_score
+        if num_pages <= 0:
+            print("No pages to display")
+            return
+        pil_pages = [im for (im, _, _) in render_pdf_to_images(pdf_path, dpi=self.dpi, last_page=num_pages)]
+        pages: List[LayoutPage] = self.layout_engine.predict_images(
+            pil_pages, batch_size=1, layout_nms=True, min_score=self.min_score
         )
-        pil_pages = [im for (im, _, _) in render_pdf_to_images(pdf_path, dpi=self.dpi)]
 
         pages_to_show = min(num_pages, len(pages))
 
@@ -3,16 +3,13 @@ from __future__ import annotations
 import os
 import sys
 from typing import List, Dict, Any
-from contextlib import ExitStack
 from pathlib import Path
 
-from PIL import Image
 from tqdm import tqdm
 
-from doctra.utils.pdf_io import render_pdf_to_images
+from doctra.utils.pdf_io import iter_pdf_pages, get_pdf_page_count
 from doctra.utils.progress import create_beautiful_progress_bar, create_multi_progress_bars, create_notebook_friendly_bar
 from doctra.engines.layout.paddle_layout import PaddleLayoutEngine
-from doctra.engines.layout.layout_models import LayoutPage
 
 from doctra.parsers.layout_order import reading_order_key
 from doctra.exporters.image_saver import save_box_image
@@ -25,7 +22,7 @@ from doctra.utils.structured_utils import to_structured_dict
 from doctra.exporters.markdown_table import render_markdown_table
 from doctra.exporters.markdown_writer import write_markdown
 from doctra.exporters.html_writer import write_structured_html, render_html_table
-from doctra.parsers.split_table_detector import SplitTableDetector, SplitTableMatch
+from doctra.parsers.split_table_detector import SplitTableChain, SplitTableDetector
 import json
 
 
@@ -43,12 +40,15 @@ class ChartTablePDFParser:
     :param layout_model_name: Layout detection model name (default: "PP-DocLayout_plus-L")
     :param dpi: DPI for PDF rendering (default: 200)
     :param min_score: Minimum confidence score for layout detection (default: 0.0)
+    :param use_layout_cache: Cache layout detections on disk, keyed by page content (default: True)
+    :param layout_cache_dir: Directory of the layout cache (default: ~/.cache/doctra/layout)
     :param merge_split_tables: Whether to detect and merge split tables (default: False)
     :param bottom_threshold_ratio: Ratio for "too close to bottom" detection (default: 0.20)
     :param top_threshold_ratio: Ratio for "too close to top" detection (default: 0.15)
     :param max_gap_ratio: Maximum allowed gap between tables (default: 0.25, accounts for headers/footers)
     :param column_alignment_tolerance: Pixel tolerance for column alignment (default: 10.0)
     :param min_merge_confidence: Minimum confidence score for merging (default: 0.65)
+    :param render_window: Number of pages rendered and held in memory at once (default: 4)
     """
 
     def __init__(
@@ -60,12 +60,15 @@ class ChartTablePDFParser:
             layout_model_name: str = "PP-DocLayout_plus-L",
             dpi: int = 200,
             min_score: float = 0.0,
+            use_layout_cache: bool = True,
+            layout_cache_dir: Optional[str] = None,
             merge_split_tables: bool = False,
             bottom_threshold_ratio: float = 0.20,
             top_threshold_ratio: float = 0.15,
             max_gap_ratio: float = 0.25,
             column_alignment_tolerance: float = 10.0,
             min_merge_confidence: float = 0.65,
+            render_window: int = 4,
     ):
         """
         Initialize the ChartTablePDFParser with extraction configuration.
@@ -76,21 +79,27 @@ class ChartTablePDFParser:
         :param layout_model_name: Layout detection model name (default: "PP-DocLayout_plus-L")
         :param dpi: DPI for PDF rendering (default: 200)
         :param min_score: Minimum confidence score for layout detection (default: 0.0)
+        :param use_layout_cache: Cache layout detections on disk, keyed by page content (default: True)
+        :param layout_cache_dir: Directory of the layout cache (default: ~/.cache/doctra/layout)
         :param merge_split_tables: Whether to detect and merge split tables (default: False)
         :param bottom_threshold_ratio: Ratio for "too close to bottom" detection (default: 0.20)
         :param top_threshold_ratio: Ratio for "too close to top" detection (default: 0.15)
         :param max_gap_ratio: Maximum allowed gap between tables (default: 0.25, accounts for headers/footers)
         :param column_alignment_tolerance: Pixel tolerance for column alignment (default: 10.0)
         :param min_merge_confidence: Minimum confidence score for merging (default: 0.65)
+        :param render_window: Number of pages rendered and held in memory at once (default: 4)
         """
         if not extract_charts and not extract_tables:
             raise ValueError("At least one of extract_charts or extract_tables must be True")
 
         self.extract_charts = extract_charts
         self.extract_tables = extract_tables
-        self.layout_engine = PaddleLayoutEngine(model_name=layout_model_name)
+        self.layout_engine = PaddleLayoutEngine(
+            model_name=layout_model_name, use_cache=use_layout_cache, cache_dir=layout_cache_dir
+        )
         self.dpi = dpi
         self.min_score = min_score
+        self.render_window = max(1, render_window)
 
         # Initialize VLM engine - use provided instance or None
         if vlm is None:
@@ -116,16 +125,18 @@ class ChartTablePDFParser:
         else:
             self.split_table_detector = None
 
-    def parse(self, pdf_path: str, output_base_dir: str = "outputs") -> None:
+    def parse(self, pdf_path: str, output_base_dir: str = "outputs", output_dir: Optional[str] = None) -> None:
         """
         Parse a PDF document and extract charts and/or tables.
 
         :param pdf_path: Path to the input PDF file
         :param output_base_dir: Base directory for output files (default: "outputs")
+        :param output_dir: Exact directory for the outputs, overriding
+                           ``<output_base_dir>/<pdf name>/structured_parsing`` (default: None)
         :return: None
         """
         pdf_name = Path(pdf_path).stem
-        out_dir = os.path.join(output_base_dir, pdf_name, "structured_parsing")
+        out_dir = output_dir or os.path.join(output_base_dir, pdf_name, "structured_parsing")
         os.makedirs(out_dir, exist_ok=True)
 
         charts_dir = None
@@ -139,28 +150,16 @@ class ChartTablePDFParser:
             tables_dir = os.path.join(out_dir, "tables")
             os.makedirs(tables_dir, exist_ok=True)
 
-        pages: List[LayoutPage] = self.layout_engine.predict_pdf(
-            pdf_path, batch_size=1, layout_nms=True, dpi=self.dpi, min_score=self.min_score
+        page_count = get_pdf_page_count(pdf_path)
+        page_images = (im for (im, _, _) in iter_pdf_pages(pdf_path, dpi=self.dpi, window=self.render_window))
+        layout_stream = self.layout_engine.predict_image_stream(
+            page_images, batch_size=1, layout_nms=True, min_score=self.min_score, window=self.render_window
         )
-        pil_pages = [im for (im, _, _) in render_pdf_to_images(pdf_path, dpi=self.dpi)]
 
-        # Detect split tables if enabled
-        split_table_matches: List[SplitTableMatch] = []
-        merged_table_segments = []
-        
-        if self.merge_split_tables and self.extract_tables:
-            if self.split_table_detector:
-                try:
-                    split_table_matches = self.split_table_detector.detect_split_tables(pages, pil_pages)
-                    if split_table_matches:
-                        print(f"🔗 Detected {len(split_table_matches)} split table(s) to merge")
-                    for match in split_table_matches:
-                        merged_table_segments.append(match.segment1)
-                        merged_table_segments.append(match.segment2)
-                except Exception as e:
-                    import traceback
-                    traceback.print_exc()
-                    split_table_matches = []
+        # Detect split tables as pages stream past (pages are yielded one page behind)
+        split_table_chains: List[SplitTableChain] = []
+        if self.merge_split_tables and self.extract_tables and self.split_table_detector:
+            layout_stream = self.split_table_detector.detect_in_stream(layout_stream, split_table_chains)
 
         target_labels = []
         if self.extract_charts:
@@ -168,44 +167,32 @@ class ChartTablePDFParser:
         if self.extract_tables:
             target_labels.append("table")
 
-        chart_count = sum(sum(1 for b in p.boxes if b.label == "chart") for p in pages) if self.extract_charts else 0
-        table_count = sum(sum(1 for b in p.boxes if b.label == "table") for p in pages) if self.extract_tables else 0
-
         if self.vlm is not None:
             md_lines: List[str] = ["# Extracted Charts and Tables\n"]
             structured_items: List[Dict[str, Any]] = []
             vlm_items: List[Dict[str, Any]] = []
+            vlm_pages = []  # (page number, has targets, crop entries, futures)
 
-        charts_desc = "Charts (VLM → table)" if self.vlm is not None else "Charts (cropped)"
-        tables_desc = "Tables (VLM → table)" if self.vlm is not None else "Tables (cropped)"
+        pages_desc = "Pages (VLM → table)" if self.vlm is not None else "Pages (cropped)"
 
         chart_counter = 1
         table_counter = 1
 
-        with ExitStack() as stack:
-            is_notebook = "ipykernel" in sys.modules or "jupyter" in sys.modules
-            is_terminal = hasattr(sys.stdout, 'isatty') and sys.stdout.isatty()
-            
-            if is_notebook:
-                charts_bar = stack.enter_context(
-                    create_notebook_friendly_bar(total=chart_count, desc=charts_desc)) if chart_count else None
-                tables_bar = stack.enter_context(
-                    create_notebook_friendly_bar(total=table_count, desc=tables_desc)) if table_count else None
-            else:
-                charts_bar = stack.enter_context(
-                    create_beautiful_progress_bar(total=chart_count, desc=charts_desc, leave=True)) if chart_count else None
-                tables_bar = stack.enter_context(
-                    create_beautiful_progress_bar(total=table_count, desc=tables_desc, leave=True)) if table_count else None
-
-            for p in pages:
+        is_notebook = "ipykernel" in sys.modules or "jupyter" in sys.modules
+        if is_notebook:
+            pages_bar = create_notebook_friendly_bar(total=page_count, desc=pages_desc)
+        else:
+            pages_bar = create_beautiful_progress_bar(total=page_count, desc=pages_desc, leave=True)
+
+        with pages_bar:
+            for p, page_img in layout_stream:
                 page_num = p.page_index
-                page_img: Image.Image = pil_pages[page_num - 1]
+                merged_table_segments = [seg for chain in split_table_chains for seg in chain.segments]
 
                 target_items = [box for box in p.boxes if box.label in target_labels]
 
-                if target_items and self.vlm is not None:
-                    md_lines.append(f"\n## Page {page_num}\n")
-
+                # Crop and save every target box first, in reading order
+                entries = []
                 for box in sorted(target_items, key=reading_order_key):
                     if box.label == "chart" and self.extract_charts:
                         chart_filename = f"chart_{chart_counter:03d}.png"
@@ -214,43 +201,8 @@ class ChartTablePDFParser:
                         cropped_img = page_img.crop((box.x1, box.y1, box.x2, box.y2))
                         cropped_img.save(chart_path)
 
-                        if self.vlm is not None:
-                            rel_path = os.path.join("charts", chart_filename)
-                            wrote_table = False
-
-                            try:
-                                extracted_chart = self.vlm.extract_chart(chart_path)
-                                structured_item = to_structured_dict(extracted_chart)
-                                if structured_item:
-                                    structured_item["page"] = page_num
-                                    structured_item["type"] = "Chart"
-                                    structured_items.append(structured_item)
-                                    vlm_items.append({
-                                        "kind": "chart",
-                                        "page": page_num,
-                                        "image_rel_path": rel_path,
-                                        "title": structured_item.get("title"),
-                                        "headers": structured_item.get("headers"),
-                                        "rows": structured_item.get("rows"),
-                                    })
-                                    md_lines.append(
-                                        render_markdown_table(
-                                            structured_item.get("headers"),
-                                            structured_item.get("rows"),
-                                            title=structured_item.get(
-                                                "title") or f"Chart {chart_counter} — page {page_num}"
-                                        )
-                                    )
-                                    wrote_table = True
-                            except Exception:
-                                pass
-
-                            if not wrote_table:
-                                md_lines.append(f"![Chart {chart_counter} — page {page_num}]({rel_path})\n")
-
+                        entries.append(("chart", chart_counter, chart_path, os.path.join("charts", chart_filename)))
                         chart_counter += 1
-                        if charts_bar:
-                            charts_bar.update(1)
 
                     elif box.label == "table" and self.extract_tables:
                         # Skip table segments that are part of merged tables
@@ -264,101 +216,106 @@ class ChartTablePDFParser:
                         cropped_img = page_img.crop((box.x1, box.y1, box.x2, box.y2))
                         cropped_img.save(table_path)
 
-                        if self.vlm is not None:
-                            rel_path = os.path.join("tables", table_filename)
-                            wrote_table = False
-
-                            try:
-                                extracted_table = self.vlm.extract_table(table_path)
-                                structured_item = to_structured_dict(extracted_table)
-                                if structured_item:
-                                    structured_item["page"] = page_num
-                                    structured_item["type"] = "Table"
-                                    structured_items.append(structured_item)
-                                    vlm_items.append({
-                                        "kind": "table",
-                                        "page": page_num,
-                                        "image_rel_path": rel_path,
-                                        "title": structured_item.get("title"),
-                                        "headers": structured_item.get("headers"),
-                                        "rows": structured_item.get("rows"),
-                                    })
-                                    md_lines.append(
-                                        render_markdown_table(
-                                            structured_item.get("headers"),
-                                            structured_item.get("rows"),
-                                            title=structured_item.get(
-                                                "title") or f"Table {table_counter} — page {page_num}"
-                                        )
-                                    )
-                                    wrote_table = True
-                            except Exception:
-                                pass
-
-                            if not wrote_table:
-                                md_lines.append(f"![Table {table_counter} — page {page_num}]({rel_path})\n")
-
+                        entries.append(("table", table_counter, table_path, os.path.join("tables", table_filename)))
                         table_counter += 1
-                        if tables_bar:
-                            tables_bar.update(1)
+
+                if self.vlm is not None:
+                    # Queue the crops without waiting, so requests stay in flight across
+                    # pages; results are collected in page order once every page is cut
+                    futures = [self.vlm.submit(kind, path) for kind, _, path, _ in entries]
+                    vlm_pages.append((page_num, bool(target_items), entries, futures))
+
+                pages_bar.update(1)
+
+        if self.vlm is not None:
+            for page_num, has_targets, entries, futures in vlm_pages:
+                if has_targets:
+                    md_lines.append(f"\n## Page {page_num}\n")
+                for (kind, counter, _, rel_path), extracted in zip(entries, self.vlm.gather(futures)):
+                    label = "Chart" if kind == "chart" else "Table"
+                    structured_item = None
+                    if not isinstance(extracted, Exception):
+                        structured_item = to_structured_dict(extracted)
+                    if structured_item:
+                        structured_item["page"] = page_num
+                        structured_item["type"] = label
+                        structured_items.append(structured_item)
+                        vlm_items.append({
+                            "kind": kind,
+                            "page": page_num,
+                            "image_rel_path": rel_path,
+                            "title": structured_item.get("title"),
+                            "headers": structured_item.get("headers"),
+                            "rows": structured_item.get("rows"),
+                        })
+                        md_lines.append(
+                            render_markdown_table(
+                                structured_item.get("headers"),
+                                structured_item.get("rows"),
+                                title=structured_item.get(
+                                    "title") or f"{label} {counter} — page {page_num}"
+                            )
+                        )
+                    else:
+                        md_lines.append(f"![{label} {counter} — page {page_num}]({rel_path})\n")
+
+        if split_table_chains:
+            print(f"🔗 Detected {len(split_table_chains)} split table(s) to merge")
 
         # Process merged tables if any were detected
-        if split_table_matches and self.split_table_detector and self.extract_tables:
-            for match_idx, match in enumerate(split_table_matches):
+        if split_table_chains and self.split_table_detector and self.extract_tables:
+            merged = []
+            for chain in split_table_chains:
                 try:
-                    merged_img = self.split_table_detector.merge_table_images(match)
+                    merged_img = self.split_table_detector.merge_chain_images(chain)
                     
-                    merged_filename = f"merged_table_{match.segment1.page_index}_{match.segment2.page_index}.png"
+                    merged_filename = f"merged_table_{chain.first_page}_{chain.last_page}.png"
                     merged_path = os.path.join(tables_dir, merged_filename)
                     merged_img.save(merged_path)
                     
                     abs_merged_path = os.path.abspath(merged_path)
-                    rel_merged = os.path.relpath(abs_merged_path, out_dir)
-                    
-                    pages_str = f"pages {match.segment1.page_index}-{match.segment2.page_index}"
-                    
-                    if self.vlm is not None:
-                        wrote_table = False
-                        try:
-                            extracted_table = self.vlm.extract_table(abs_merged_path)
-                            structured_item = to_structured_dict(extracted_table)
-                            if structured_item:
-                                structured_item["page"] = f"{match.segment1.page_index}-{match.segment2.page_index}"
-                                structured_item["type"] = "Table (Merged)"
-                                structured_item["split_merge"] = True
-                                structured_item["merge_confidence"] = match.confidence
-                                structured_items.append(structured_item)
-                                
-                                vlm_items.append({
-                                    "kind": "table",
-                                    "page": pages_str,
-                                    "image_rel_path": rel_merged,
-                                    "title": structured_item.get("title"),
-                                    "headers": structured_item.get("headers"),
-                                    "rows": structured_item.get("rows"),
-                                    "split_merge": True,
-                                    "merge_confidence": match.confidence,
-                                })
-                                
-                                md_lines.append(f"\n### Merged Table ({pages_str})\n")
-                                md_lines.append(
-                                    render_markdown_table(
-                                        structured_item.get("headers"),
-                                        structured_item.get("rows"),
-                                        title=structured_item.get("title") or f"Merged Table ({pages_str})"
-                                    )
-                                )
-                                wrote_table = True
-                        except Exception as e:
-                            pass
-                        
-                        if not wrote_table:
-                            md_lines.append(f"\n### Merged Table ({pages_str})\n")
-                            md_lines.append(f"![Merged Table ({pages_str})]({rel_merged})\n")
+                    merged.append((chain, abs_merged_path, os.path.relpath(abs_merged_path, out_dir)))
                 except Exception as e:
                     import traceback
                     traceback.print_exc()
 
+            if self.vlm is not None and merged:
+                results = self.vlm.extract_many([("table", abs_merged_path) for _, abs_merged_path, _ in merged])
+                for (chain, abs_merged_path, rel_merged), extracted_table in zip(merged, results):
+                    pages_str = f"pages {chain.first_page}-{chain.last_page}"
+                    md_lines.append(f"\n### Merged Table ({pages_str})\n")
+
+                    structured_item = None
+                    if not isinstance(extracted_table, Exception):
+                        structured_item = to_structured_dict(extracted_table)
+                    if structured_item:
+                        structured_item["page"] = f"{chain.first_page}-{chain.last_page}"
+                        structured_item["type"] = "Table (Merged)"
+                        structured_item["split_merge"] = True
+                        structured_item["merge_confidence"] = chain.confidence
+                        structured_items.append(structured_item)
+                        
+                        vlm_items.append({
+                            "kind": "table",
+                            "page": pages_str,
+                            "image_rel_path": rel_merged,
+                            "title": structured_item.get("title"),
+                            "headers": structured_item.get("headers"),
+                            "rows": structured_item.get("rows"),
+                            "split_merge": True,
+                            "merge_confidence": chain.confidence,
+                        })
+                        
+                        md_lines.append(
+                            render_markdown_table(
+                                structured_item.get("headers"),
+                                structured_item.get("rows"),
+                                title=structured_item.get("title") or f"Merged Table ({pages_str})"
+                            )
+                        )
+                    else:
+                        md_lines.append(f"![Merged Table ({pages_str})]({rel_merged})\n")
+
         excel_path = None
 
         if self.vlm is not None:
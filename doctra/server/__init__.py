@@ -0,0 +1,6 @@
+"""Long-running parse server that keeps Doctra's models loaded between documents."""
+
+from .service import ParseJob, ParseService, ServerBusy, SERVE_MODES
+from .httpd import make_server, serve
+
+__all__ = ['ParseJob', 'ParseService', 'ServerBusy', 'SERVE_MODES', 'make_server', 'serve']
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import socketserver
+import tempfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from doctra.server.service import ParseService, ServerBusy
+
+
+class ParseRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP API of ``doctra serve``.
+
+    - ``GET /health`` returns the service state as JSON.
+    - ``POST /parse`` queues a parse and streams its events back as
+      newline-delimited JSON (``application/x-ndjson``), one line per event,
+      ending with a ``"done"`` or ``"error"`` event. The body is either JSON
+      (``{"pdf_path": ..., "output_dir": ..., "resume": false}``) naming a PDF
+      readable by the server, or the PDF itself (``Content-Type:
+      application/pdf``, optional ``?name=file.pdf``).
+
+    A full job queue is answered with ``503`` and a ``Retry-After`` header.
+    """
+
+    server_version = "doctra-serve"
+    service: ParseService = None  # set by make_server
+
+    def do_GET(self) -> None:
+        if urlparse(self.path).path == "/health":
+            self._send_json(200, self.service.stats())
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path != "/parse":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            request = self._read_request(parse_qs(url.query))
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            job = self.service.submit(**request)
+        except ServerBusy as e:
+            if request.get("cleanup_dir"):
+                shutil.rmtree(request["cleanup_dir"], ignore_errors=True)
+            self._send_json(503, {"error": str(e)}, headers={"Retry-After": "5"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        for event in job.events():
+            try:
+                self.wfile.write((json.dumps(event, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                # Client went away; the job still runs to completion and writes its outputs
+                break
+
+    def _read_request(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn a POST body into keyword arguments for :meth:`ParseService.submit`."""
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip()
+
+        if content_type == "application/pdf":
+            if not body.startswith(b"%PDF"):
+                raise ValueError("Body is not a PDF")
+            name = os.path.basename(query.get("name", ["upload.pdf"])[0]) or "upload.pdf"
+            if not name.lower().endswith(".pdf"):
+                name += ".pdf"
+            upload_dir = tempfile.mkdtemp(prefix="doctra-upload-")
+            pdf_path = os.path.join(upload_dir, name)
+            with open(pdf_path, "wb") as f:
+                f.write(body)
+            return {"pdf_path": pdf_path, "output_dir": query.get("output_dir", [None])[0],
+                    "resume": False, "cleanup_dir": upload_dir}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise ValueError("Body must be JSON or a PDF (Content-Type: application/pdf)") from None
+        pdf_path = payload.get("pdf_path") if isinstance(payload, dict) else None
+        if not pdf_path or not os.path.isfile(pdf_path):
+            raise ValueError(f"pdf_path does not exist: {pdf_path!r}")
+        return {"pdf_path": os.path.abspath(pdf_path), "output_dir": payload.get("output_dir"),
+                "resume": bool(payload.get("resume", False))}
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    """HTTP server listening on a Unix domain socket."""
+
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)  # stale socket from a previous run
+        super().server_bind()
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(service: ParseService, host: str = "127.0.0.1", port: int = 8765,
+                socket_path: Optional[str] = None):
+    """
+    Create the HTTP server for a started :class:`ParseService`.
+
+    :param service: Service the requests are handed to
+    :param host: Interface to listen on (default: "127.0.0.1")
+    :param port: TCP port, 0 for any free port (default: 8765)
+    :param socket_path: Listen on this Unix domain socket instead of TCP (default: None)
+    :return: The server; call ``serve_forever()`` to run it
+    """
+    handler = type("BoundParseRequestHandler", (ParseRequestHandler,), {"service": service})
+    if socket_path:
+        return ThreadingUnixHTTPServer(socket_path, handler)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(service: ParseService, host: str = "127.0.0.1", port: int = 8765,
+          socket_path: Optional[str] = None) -> None:
+    """
+    Start ``service``, then serve requests until interrupted.
+
+    :param service: Service to run (started here if it is not running yet)
+    :param host: Interface to listen on (default: "127.0.0.1")
+    :param port: TCP port (default: 8765)
+    :param socket_path: Listen on this Unix domain socket instead of TCP (default: None)
+    :return: None
+    """
+    if service.parser is None:
+        service.start()
+    server = make_server(service, host, port, socket_path)
+    where = socket_path or f"http://{host}:{server.server_address[1]}"
+    print(f"🚀 Doctra {service.mode} server ready on {where}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import os
+import queue
+import shutil
+import threading
+import time
+import traceback
+import uuid
+from typing import Any, Callable, Dict, Iterator, Optional
+
+SERVE_MODES = ("parse", "enhance")
+
+_END = object()
+
+
+class ServerBusy(Exception):
+    """Raised when a job is submitted while the job queue is full."""
+
+
+class ParseJob:
+    """
+    One parse request and the stream of events it produces.
+
+    Events are JSON-serializable dicts with an ``"event"`` key: ``"queued"``,
+    ``"started"``, one ``"page"`` per parsed page (with the page's markdown
+    and structured items), then ``"done"`` or ``"error"``.
+
+    :param pdf_path: Path of the PDF to parse
+    :param output_dir: Directory the parse outputs are written to
+    :param resume: Whether to resume from the output directory's checkpoint journal
+    :param cleanup_dir: Directory removed once the job finishes (used for uploaded PDFs)
+    """
+
+    def __init__(self, pdf_path: str, output_dir: str, resume: bool = False, cleanup_dir: Optional[str] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.pdf_path = pdf_path
+        self.output_dir = output_dir
+        self.resume = resume
+        self.cleanup_dir = cleanup_dir
+        self.status = "queued"
+        self.pages = 0
+        self._events: "queue.Queue" = queue.Queue()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        self._events.put({"event": event, "job": self.id, **fields})
+
+    def finish(self) -> None:
+        self._events.put(_END)
+
+    def events(self, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the job's events as they happen, until it is done or failed.
+
+        :param timeout: Seconds to wait for each event, or None to wait indefinitely
+        :return: Iterator of event dicts
+        """
+        while True:
+            event = self._events.get(timeout=timeout)
+            if event is _END:
+                return
+            yield event
+
+
+class ParseService:
+    """
+    Keeps one parser and its models resident and runs parse jobs from a bounded queue.
+
+    The parser (layout model, OCR engine and, in ``"enhance"`` mode, the
+    DocRes weights) is built and warmed up once by :meth:`start`; jobs are
+    then run one at a time on a single worker thread, since the models are
+    not safe to share between concurrent parses. Submitting while
+    ``max_queue`` jobs are already waiting raises :class:`ServerBusy` so
+    callers can back off instead of piling up work.
+
+    :param mode: "parse" (StructuredPDFParser) or "enhance" (EnhancedPDFParser) (default: "parse")
+    :param parser_kwargs: Keyword arguments for the parser constructor
+    :param vlm_kwargs: Keyword arguments for VLMStructuredExtractor, or None to disable VLM
+    :param ocr_kwargs: OCR engine description, as for :class:`~doctra.parsers.batch_runner.BatchRunner`
+    :param output_root: Directory job outputs go to when a request does not name one (default: "outputs/server")
+    :param max_queue: Maximum number of jobs waiting to run (default: 8)
+    :param parser_factory: Zero-argument callable building the parser; overrides the kwargs (default: None)
+    """
+
+    def __init__(
+        self,
+        mode: str = "parse",
+        *,
+        parser_kwargs: Optional[Dict[str, Any]] = None,
+        vlm_kwargs: Optional[Dict[str, Any]] = None,
+        ocr_kwargs: Optional[Dict[str, Any]] = None,
+        output_root: str = "outputs/server",
+        max_queue: int = 8,
+        parser_factory: Optional[Callable[[], Any]] = None,
+    ):
+        if mode not in SERVE_MODES:
+            raise ValueError(f"Unknown serve mode {mode!r}, expected one of {', '.join(SERVE_MODES)}")
+        if parser_factory is None:
+            from doctra.parsers.batch_runner import _ParserFactory
+            parser_factory = _ParserFactory(mode, parser_kwargs, vlm_kwargs, ocr_kwargs)
+        self.mode = mode
+        self.output_root = os.path.abspath(output_root)
+        self.max_queue = max(1, int(max_queue))
+        self.parser_factory = parser_factory
+        self.parser = None
+        self.current: Optional[ParseJob] = None
+        self.completed = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+        self._jobs: "queue.Queue" = queue.Queue(maxsize=self.max_queue)
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Build and warm up the parser, then start the worker thread.
+
+        :return: None
+        """
+        self.parser = self.parser_factory()
+        layout_engine = getattr(self.parser, "layout_engine", None)
+        if layout_engine is not None and hasattr(layout_engine, "_ensure_model"):
+            layout_engine._ensure_model()  # otherwise loaded lazily on the first uncached page
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._worker, name="doctra-serve", daemon=True)
+        self._thread.start()
+
+    def submit(self, pdf_path: str, output_dir: Optional[str] = None, resume: bool = False,
+               cleanup_dir: Optional[str] = None) -> ParseJob:
+        """
+        Queue a PDF for parsing.
+
+        :param pdf_path: Path of the PDF to parse
+        :param output_dir: Output directory (default: ``<output_root>/<pdf name>-<job id>``)
+        :param resume: Whether to resume from the output directory's checkpoint journal (parse mode only)
+        :param cleanup_dir: Directory to remove once the job finishes
+        :return: The queued ParseJob
+        :raises ServerBusy: If the job queue is full
+        """
+        job = ParseJob(pdf_path, output_dir or "", resume=resume, cleanup_dir=cleanup_dir)
+        if not output_dir:
+            stem = os.path.splitext(os.path.basename(pdf_path))[0]
+            job.output_dir = os.path.join(self.output_root, f"{stem}-{job.id}")
+        # Emitted first so it always precedes the worker's "started" event
+        job.emit("queued", position=self._jobs.qsize() + 1)
+        try:
+            self._jobs.put_nowait(job)
+        except queue.Full:
+            raise ServerBusy(f"Job queue is full ({self.max_queue} waiting)") from None
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report the service state.
+
+        :return: Dict with mode, queue length and capacity, running job and job counters
+        """
+        return {
+            "status": "ok" if self._thread is not None and self._thread.is_alive() else "starting",
+            "mode": self.mode,
+            "queued": self._jobs.qsize(),
+            "max_queue": self.max_queue,
+            "running": self.current.id if self.current is not None else None,
+            "completed": self.completed,
+            "failed": self.failed,
+            "uptime_seconds": round(time.time() - self.started_at, 1) if self.started_at else 0.0,
+        }
+
+    def close(self) -> None:
+        """
+        Stop the worker thread once the current job has finished.
+
+        Jobs still waiting in the queue are not run.
+
+        :return: None
+        """
+        if self._thread is None:
+            return
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.emit("error", error="server shutting down")
+                self._finish(job)
+        self._jobs.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _worker(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            self.current = job
+            try:
+                self._run(job)
+            finally:
+                self.current = None
+                self._finish(job)
+
+    def _run(self, job: ParseJob) -> None:
+        """Parse one job, streaming a ``"page"`` event per page and a final ``"done"``/``"error"`` event."""
+        def on_page(page_num, markdown, items):
+            job.pages += 1
+            job.emit("page", page=page_num, markdown=markdown, items=items)
+
+        job.status = "running"
+        job.emit("started", output_dir=job.output_dir)
+        start = time.perf_counter()
+        try:
+            if self.mode == "enhance":
+                self.parser.parse(job.pdf_path, enhanced_output_dir=job.output_dir, on_page=on_page)
+            else:
+                self.parser.parse(job.pdf_path, output_dir=job.output_dir, resume=job.resume, on_page=on_page)
+        except Exception as e:
+            traceback.print_exc()
+            job.status = "failed"
+            self.failed += 1
+            job.emit("error", error=f"{type(e).__name__}: {e}", pages=job.pages)
+            return
+        job.status = "done"
+        self.completed += 1
+        job.emit("done", output_dir=job.output_dir, pages=job.pages,
+                 seconds=round(time.perf_counter() - start, 3))
+
+    @staticmethod
+    def _finish(job: ParseJob) -> None:
+        if job.cleanup_dir:
+            shutil.rmtree(job.cleanup_dir, ignore_errors=True)
+        job.finish()
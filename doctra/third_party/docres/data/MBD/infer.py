@@ -66,19 +66,26 @@ def net1_net2_infer(model,img_paths,args):
         np.save(img_path.replace('_origin','_grid1'),grid)
 
 
-def net1_net2_infer_single_im(img,model_path):
+def load_seg_model(model_path,device=None):
+    """Build the DeepLab page-mask model and load its weights once, on any device."""
+    if device is None:
+        device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
     seg_model = DeepLab(num_classes=1,
                     backbone='resnet',
                     output_stride=16,
                     sync_bn=None,
                     freeze_bn=False)
-    seg_model = torch.nn.DataParallel(seg_model, device_ids=range(torch.cuda.device_count()))
-    seg_model.cuda()
-    checkpoint = torch.load(model_path)
-    seg_model.load_state_dict(checkpoint['model_state'])
-    ### validate on the real datasets
+    checkpoint = torch.load(model_path, map_location='cpu')
+    # the checkpoint was saved from a DataParallel wrapper: drop the `module.` prefix
+    state = {(k[7:] if k.startswith('module.') else k): v for k, v in checkpoint['model_state'].items()}
+    seg_model.load_state_dict(state)
     seg_model.eval()
-    ### segmentation mask predict
+    return seg_model.to(device)
+
+
+def predict_mask(seg_model,img):
+    """Predict the binary page mask (uint8, 0/255) of a BGR image with a loaded seg model."""
+    device = next(seg_model.parameters()).device
     img_org = img
     h_org,w_org = img_org.shape[:2]
     img = cv2.resize(img_org,(448, 448))       
@@ -90,7 +97,7 @@ def net1_net2_infer_single_im(img,model_path):
         # from torchtoolbox.tools import summary
         # print(summary(seg_model,torch.rand((1, 3, 448, 448)).cuda())) 59.4M 135.6G
 
-        pred = seg_model(img.cuda())
+        pred = seg_model(img.to(device))
         mask_pred = pred[:,0,:,:].unsqueeze(1)
         mask_pred = F.interpolate(mask_pred,(h_org,w_org))
         mask_pred = mask_pred.squeeze(0).squeeze(0).cpu().numpy()
@@ -102,6 +109,14 @@ def net1_net2_infer_single_im(img,model_path):
         mask_pred[mask_pred<100] = 0
         ### tps transform base on the mask
         # dewarp, grid = mask_base_dewarper(img_org,mask_pred)
+    return mask_pred
+
+
+def net1_net2_infer_single_im(img,model_path,seg_model=None):
+    # pass a model from load_seg_model to avoid rebuilding and reloading it for every image
+    if seg_model is None:
+        seg_model = load_seg_model(model_path)
+    mask_pred = predict_mask(seg_model,img)
     # try:
     #     dewarp, grid = mask_base_dewarper(img_org,mask_pred)
     # except:
@@ -41,74 +41,29 @@ def split_img(img, size_x, size_y, strides):
 
 
 def combine_imgs(border_x,border_y,imgs, max_y, max_x,size_x, size_y, strides):
- 
-    # weighted_img
-
-    index = int(size_x / strides) 
-    weight_img = np.ones(shape=(max_y,max_x))
-    weight_img[0:strides] = index
-    weight_img[-strides:] = index
-    weight_img[:,0:strides]=index
-    weight_img[:,-strides:]=index
-
-    # 边上
-    i = 0
-    for j in range(1,index+1):
-        # 左上
-        weight_img[0:strides,i:i+strides] = np.ones(shape=(strides,strides))*j
-        weight_img[i:i+strides,0:strides] = np.ones(shape=(strides,strides))*j
-        # 右上
-        weight_img[i:i+strides,-strides:] = np.ones(shape=(strides,strides))*j
-        if i == 0:
-            weight_img[0:strides,-strides:] = np.ones(shape=(strides,strides))*j
-        else:
-            weight_img[0:strides,-strides-i:-i] = np.ones(shape=(strides,strides))*j
-        # 左下
-        weight_img[-strides:,i:i+strides] = np.ones(shape=(strides,strides))*j
-        if i == 0:
-            weight_img[-strides:,0:strides] = np.ones(shape=(strides,strides))*j
-        else:
-            weight_img[-strides-i:-i:,0:strides] = np.ones(shape=(strides,strides))*j   
-        # 右下
-        if i == 0:
-            weight_img[-strides:,-strides:] = np.ones(shape=(strides,strides))*j
-        else:
-            weight_img[-strides-i:-i,-strides:] = np.ones(shape=(strides,strides))*j
-            weight_img[-strides:,-strides-i:-i] = np.ones(shape=(strides,strides))*j
-
-
-        i += strides
-
-    for i in range(strides,max_y-strides,strides):
-    	for j in range(strides,max_x-strides,strides):
-    		weight_img[i:i+strides,j:j+strides] = np.ones(shape=(strides,strides))*weight_img[i][0]*weight_img[0][j]
-
-
+    # average the overlapping tiles: every pixel is divided by the number of
+    # tiles covering it (also right when an axis holds a single tile)
     if len(imgs[0].shape)==2:
         new_img = np.zeros(shape=(max_y,max_x))
-        weight_img = (1 / weight_img)
     else:
         new_img = np.zeros(shape=(max_y,max_x,imgs[0].shape[-1]))
-        weight_img = (1 / weight_img).reshape((max_y,max_x,1))
-        weight_img = np.tile(weight_img,(1,1,imgs[0].shape[-1]))
+    weight_img = np.zeros(shape=(max_y,max_x))
 
     curr_y = 0
-    x = 0
-    y = 0
     i = 0
-        # TODO: rewrite with generators.
     while (curr_y + size_y) <= max_y:
         curr_x = 0
         while (curr_x + size_x) <= max_x:
-            new_img[curr_y:curr_y + size_y, curr_x:curr_x + size_x] += weight_img[curr_y:curr_y + size_y, curr_x:curr_x + size_x]*imgs[i]
+            new_img[curr_y:curr_y + size_y, curr_x:curr_x + size_x] += imgs[i]
+            weight_img[curr_y:curr_y + size_y, curr_x:curr_x + size_x] += 1
             i += 1
             curr_x += strides
-        y += 1
         curr_y += strides
 
-
+    if new_img.ndim == 3:
+        weight_img = weight_img[:,:,None]
+    new_img /= weight_img
     new_img = new_img[border_y:, border_x:]
-    # print(border_y,border_x)
 
     return new_img
 
@@ -12,12 +12,12 @@ from utils import convert_state_dict
 from models import restormer_arch
 from data.preprocess.crop_merge_image import stride_integral
 
-os.sys.path.append('./data/MBD/')
+os.sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'data','MBD'))
 from data.MBD.infer import net1_net2_infer_single_im
 
 
-def dewarp_prompt(img):
-    mask = net1_net2_infer_single_im(img,'data/MBD/checkpoint/mbd.pkl')
+def dewarp_prompt(img,seg_model=None):
+    mask = net1_net2_infer_single_im(img,'data/MBD/checkpoint/mbd.pkl',seg_model=seg_model)
     base_coord = utils.getBasecoord(256,256)/256
     img[mask==0]=0
     mask = cv2.resize(mask,(256,256))/255
@@ -93,30 +93,34 @@ def binarization_promptv2(img):
     high_frequency = cv2.cvtColor(high_frequency,cv2.COLOR_BGR2GRAY)
     return np.concatenate((np.expand_dims(thresh,-1),np.expand_dims(high_frequency,-1),np.expand_dims(result,-1)),-1)
 
-def dewarping(model,im_path):
-    INPUT_SIZE=256
-    im_org = cv2.imread(im_path)
-    im_masked, prompt_org = dewarp_prompt(im_org.copy())
+# Array-in/array-out task functions. They take the device explicitly, run
+# the model in whatever dtype its parameters already have and never modify
+# it, so one loaded model can serve several threads at once.
+#
+# Each task is split into a prepare step (image -> normalized CxHxW model
+# input plus what the finish step needs) and a finish step (one output of
+# the model -> prompts and restored image), so that run_task_batch can
+# stack the inputs of several pages into a single forward pass.
 
-    h,w = im_masked.shape[:2]
-    im_masked = im_masked.copy()
-    im_masked = cv2.resize(im_masked,(INPUT_SIZE,INPUT_SIZE))
-    im_masked = im_masked / 255.0
-    im_masked = torch.from_numpy(im_masked.transpose(2,0,1)).unsqueeze(0)
-    im_masked = im_masked.float().to(DEVICE)
+MAX_SIZE=1600
+DEWARP_SIZE=256
 
-    prompt = torch.from_numpy(prompt_org.transpose(2,0,1)).unsqueeze(0)
-    prompt = prompt.float().to(DEVICE)
+def _to_model(x,model,device):
+    return x.to(device=device,dtype=next(model.parameters()).dtype)
 
-    in_im = torch.cat((im_masked,prompt),dim=1)
+def _dewarp_prepare(im_org,seg_model=None):
+    im_masked, prompt_org = dewarp_prompt(im_org.copy(),seg_model)
+    im_masked = cv2.resize(im_masked,(DEWARP_SIZE,DEWARP_SIZE))
+    im_masked = im_masked / 255.0
+    in_im = np.concatenate((im_masked,prompt_org),-1)
+    return in_im.transpose(2,0,1), (im_org,prompt_org)
 
-    # inference
-    base_coord = utils.getBasecoord(INPUT_SIZE,INPUT_SIZE)/INPUT_SIZE
-    model = model.float()
-    with torch.no_grad():
-        pred = model(in_im)
-        pred = pred[0][:2].permute(1,2,0).cpu().numpy()
-        pred = pred+base_coord
+def _dewarp_finish(pred,ctx):
+    im_org,prompt_org = ctx
+    h,w = im_org.shape[:2]
+    base_coord = utils.getBasecoord(DEWARP_SIZE,DEWARP_SIZE)/DEWARP_SIZE
+    pred = pred[:2].permute(1,2,0).float().cpu().numpy()
+    pred = pred+base_coord
     ## smooth
     for i in range(15):
         pred = cv2.blur(pred,(3,3),borderType=cv2.BORDER_REPLICATE) 
@@ -129,15 +133,14 @@ def dewarping(model,im_path):
 
     return prompt_org[:,:,0],prompt_org[:,:,1],prompt_org[:,:,2],out_im
 
-def appearance(model,im_path):
-    MAX_SIZE=1600
-    # obtain im and prompt
-    im_org = cv2.imread(im_path)
+def _shadow_prepare(im_org,prompt_fn):
+    # shared by appearance and deshadowing, which differ only in their prompt
     h,w = im_org.shape[:2]
-    prompt = appearance_prompt(im_org)
+    prompt = prompt_fn(im_org)
     in_im = np.concatenate((im_org,prompt),-1)
 
     # constrain the max resolution 
+    padding_h = padding_w = 0
     if max(w,h) < MAX_SIZE:
         in_im,padding_h,padding_w = stride_integral(in_im,8)
     else:
@@ -145,115 +148,270 @@ def appearance(model,im_path):
     
     # normalize
     in_im = in_im / 255.0
-    in_im = torch.from_numpy(in_im.transpose(2,0,1)).unsqueeze(0)
-
-    # inference
-    in_im = in_im.half().to(DEVICE)
-    model = model.half()
-    with torch.no_grad():
-        pred = model(in_im)
-        pred = torch.clamp(pred,0,1)
-        pred = pred[0].permute(1,2,0).cpu().numpy()
-        pred = (pred*255).astype(np.uint8)
-
-        if max(w,h) < MAX_SIZE:
-            out_im = pred[padding_h:,padding_w:]
-        else:
-            pred[pred==0] = 1
-            shadow_map = cv2.resize(im_org,(MAX_SIZE,MAX_SIZE)).astype(float)/pred.astype(float)
-            shadow_map = cv2.resize(shadow_map,(w,h))
-            shadow_map[shadow_map==0]=0.00001
-            out_im = np.clip(im_org.astype(float)/shadow_map,0,255).astype(np.uint8)
+    return in_im.transpose(2,0,1), (im_org,prompt,padding_h,padding_w)
 
-    return prompt[:,:,0],prompt[:,:,1],prompt[:,:,2],out_im
-        
-
-def deshadowing(model,im_path):
-    MAX_SIZE=1600
-    # obtain im and prompt
-    im_org = cv2.imread(im_path)
+def _shadow_finish(pred,ctx):
+    im_org,prompt,padding_h,padding_w = ctx
     h,w = im_org.shape[:2]
-    prompt = deshadow_prompt(im_org)
-    in_im = np.concatenate((im_org,prompt),-1)
+    pred = torch.clamp(pred,0,1)
+    pred = pred.permute(1,2,0).float().cpu().numpy()
+    pred = (pred*255).astype(np.uint8)
 
-    # constrain the max resolution 
     if max(w,h) < MAX_SIZE:
-        in_im,padding_h,padding_w = stride_integral(in_im,8)
+        out_im = pred[padding_h:,padding_w:]
     else:
-        in_im = cv2.resize(in_im,(MAX_SIZE,MAX_SIZE))
-    
-    # normalize
-    in_im = in_im / 255.0
-    in_im = torch.from_numpy(in_im.transpose(2,0,1)).unsqueeze(0)
-
-    # inference
-    in_im = in_im.half().to(DEVICE)
-    model = model.half()
-    with torch.no_grad():
-        pred = model(in_im)
-        pred = torch.clamp(pred,0,1)
-        pred = pred[0].permute(1,2,0).cpu().numpy()
-        pred = (pred*255).astype(np.uint8)
-
-        if max(w,h) < MAX_SIZE:
-            out_im = pred[padding_h:,padding_w:]
-        else:
-            pred[pred==0]=1
-            shadow_map = cv2.resize(im_org,(MAX_SIZE,MAX_SIZE)).astype(float)/pred.astype(float)
-            shadow_map = cv2.resize(shadow_map,(w,h))
-            shadow_map[shadow_map==0]=0.00001
-            out_im = np.clip(im_org.astype(float)/shadow_map,0,255).astype(np.uint8)
+        pred[pred==0] = 1
+        shadow_map = cv2.resize(im_org,(MAX_SIZE,MAX_SIZE)).astype(float)/pred.astype(float)
+        shadow_map = cv2.resize(shadow_map,(w,h))
+        shadow_map[shadow_map==0]=0.00001
+        out_im = np.clip(im_org.astype(float)/shadow_map,0,255).astype(np.uint8)
 
     return prompt[:,:,0],prompt[:,:,1],prompt[:,:,2],out_im
 
+def _appearance_prepare(im_org):
+    return _shadow_prepare(im_org,appearance_prompt)
 
-def deblurring(model,im_path):
+def _deshadow_prepare(im_org):
+    return _shadow_prepare(im_org,deshadow_prompt)
+
+def _deblur_prepare(im_org):
     # setup image
-    im_org = cv2.imread(im_path)
     in_im,padding_h,padding_w = stride_integral(im_org,8)
     prompt = deblur_prompt(in_im)
     in_im = np.concatenate((in_im,prompt),-1)
     in_im = in_im / 255.0
-    in_im = torch.from_numpy(in_im.transpose(2,0,1)).unsqueeze(0)
-    in_im = in_im.half().to(DEVICE)  
-    # inference
-    model.to(DEVICE)
-    model.eval()
-    model = model.half()
-    with torch.no_grad():
-        pred = model(in_im)
-        pred = torch.clamp(pred,0,1)
-        pred = pred[0].permute(1,2,0).cpu().numpy()
-        pred = (pred*255).astype(np.uint8)
-        out_im = pred[padding_h:,padding_w:]
-    
+    return in_im.transpose(2,0,1), (prompt,padding_h,padding_w)
+
+def _deblur_finish(pred,ctx):
+    prompt,padding_h,padding_w = ctx
+    pred = torch.clamp(pred,0,1)
+    pred = pred.permute(1,2,0).float().cpu().numpy()
+    pred = (pred*255).astype(np.uint8)
+    out_im = pred[padding_h:,padding_w:]
     return prompt[:,:,0],prompt[:,:,1],prompt[:,:,2],out_im
 
-
-
-def binarization(model,im_path):
-    im_org = cv2.imread(im_path)
+def _binarize_prepare(im_org):
     im,padding_h,padding_w = stride_integral(im_org,8)
     prompt = binarization_promptv2(im)
-    h,w = im.shape[:2]
     in_im = np.concatenate((im,prompt),-1)
-
     in_im = in_im / 255.0
-    in_im = torch.from_numpy(in_im.transpose(2,0,1)).unsqueeze(0)
-    in_im = in_im.to(DEVICE)
-    model = model.half()
-    in_im = in_im.half()
-    with torch.no_grad():
-        pred = model(in_im)
-        pred = pred[:,:2,:,:]
-        pred = torch.max(torch.softmax(pred,1),1)[1]
-        pred = pred[0].cpu().numpy()
-        pred = (pred*255).astype(np.uint8)
-        pred = cv2.resize(pred,(w,h))
-        out_im = pred[padding_h:,padding_w:]
-    
+    return in_im.transpose(2,0,1), (prompt,padding_h,padding_w)
+
+def _binarize_finish(pred,ctx):
+    prompt,padding_h,padding_w = ctx
+    h,w = prompt.shape[:2]
+    pred = pred[:2,:,:]
+    pred = torch.max(torch.softmax(pred,0),0)[1]
+    pred = pred.cpu().numpy()
+    pred = (pred*255).astype(np.uint8)
+    pred = cv2.resize(pred,(w,h))
+    out_im = pred[padding_h:,padding_w:]
     return prompt[:,:,0],prompt[:,:,1],prompt[:,:,2],out_im
 
+TASK_STEPS = {
+    'dewarping': (_dewarp_prepare, _dewarp_finish),
+    'deshadowing': (_deshadow_prepare, _shadow_finish),
+    'appearance': (_appearance_prepare, _shadow_finish),
+    'deblurring': (_deblur_prepare, _deblur_finish),
+    'binarization': (_binarize_prepare, _binarize_finish),
+}
+
+def _forward(model,batch,device,autocast_dtype=None):
+    # on out-of-memory, retry the two halves of the batch separately
+    device_type = torch.device(device).type
+    try:
+        with torch.no_grad(), torch.autocast(device_type,dtype=autocast_dtype,enabled=autocast_dtype is not None):
+            return model(_to_model(torch.from_numpy(batch),model,device))
+    except RuntimeError as e:
+        if len(batch) == 1 or 'out of memory' not in str(e):
+            raise
+        if device_type == 'cuda':
+            torch.cuda.empty_cache()
+        half = len(batch) // 2
+        return torch.cat((_forward(model,batch[:half],device,autocast_dtype),
+                          _forward(model,batch[half:],device,autocast_dtype)))
+
+def run_task_batch(model,images,task,device,seg_model=None,batch_size=4,max_batch_pixels=None,autocast_dtype=None):
+    """
+    Run one task over several images with batched forward passes.
+
+    Images are grouped by the exact shape of their model input (pages of
+    one PDF usually share it); padding them to a common size instead would
+    change the output, because Restormer attention spans the whole image.
+    A bucket is run as soon as it holds batch_size images, or as many as fit
+    under max_batch_pixels input pixels (at least one), so only a few
+    prepared inputs are held at a time.
+
+    With autocast_dtype (e.g. torch.bfloat16 on CPU) the fp32 model runs
+    under torch.autocast in that dtype.
+
+    Returns one (prompt1, prompt2, prompt3, restored) tuple per image, in order.
+    """
+    prepare,finish = TASK_STEPS[task]
+    results = [None]*len(images)
+    buckets = {}
+
+    def run(key):
+        indices,inputs,ctxs = buckets.pop(key)
+        preds = _forward(model,np.stack(inputs),device,autocast_dtype)
+        for i,pred,ctx in zip(indices,preds,ctxs):
+            results[i] = finish(pred,ctx)
+
+    for i,im in enumerate(images):
+        in_im,ctx = prepare(im,seg_model) if task == 'dewarping' else prepare(im)
+        key = in_im.shape
+        indices,inputs,ctxs = buckets.setdefault(key,([],[],[]))
+        indices.append(i)
+        # float32 halves the memory of waiting inputs; the model casts on the way in
+        inputs.append(in_im.astype(np.float32))
+        ctxs.append(ctx)
+        pixels = key[1]*key[2]
+        if len(inputs) >= batch_size or (max_batch_pixels is not None and (len(inputs)+1)*pixels > max_batch_pixels):
+            run(key)
+    for key in list(buckets):
+        run(key)
+    return results
+
+# Tiled inference for pages too large to restore in one pass: the prompt
+# is computed on the whole page, the 6-channel input is cut into
+# overlapping tiles that run through the model in batches, and each batch
+# of outputs is added straight into a float32 sum that is divided by the
+# tile coverage at the end. Model memory depends on the tile size only and
+# host memory on the page size only. Dewarping works on a fixed 256x256
+# input and is never tiled.
+
+DEFAULT_TILE_OVERLAP = 64
+
+def _tile_rgb(pred):
+    return torch.clamp(pred,0,1).permute(1,2,0).float().cpu().numpy()
+
+def _tile_foreground(pred):
+    # blend probabilities rather than hard labels; thresholded after combining
+    return torch.softmax(pred[:2].float(),0)[1].cpu().numpy()
+
+TILED_TASKS = {
+    'deshadowing': (deshadow_prompt, _tile_rgb),
+    'appearance': (appearance_prompt, _tile_rgb),
+    'deblurring': (deblur_prompt, _tile_rgb),
+    'binarization': (binarization_promptv2, _tile_foreground),
+}
+
+def tile_stride(tile_size,overlap):
+    """Return the step between tiles, checking the tiling is usable."""
+    stride = tile_size - overlap
+    if tile_size <= 0 or tile_size % 8 or overlap < 0 or stride <= 0:
+        raise ValueError(
+            f'Invalid tiling {tile_size}/{overlap}: the tile size must be a multiple of 8 '
+            'and the overlap smaller than the tile size')
+    return stride
+
+def _tile_starts(length,tile_size,stride):
+    """Return the tile offsets along one axis and the padded length they cover exactly."""
+    count = max(0,-(-(length-tile_size)//stride)) + 1
+    return [i*stride for i in range(count)],tile_size + (count-1)*stride
+
+def run_task_tiled(model,im_org,task,device,tile_size=512,overlap=DEFAULT_TILE_OVERLAP,batch_size=4,autocast_dtype=None):
+    """
+    Run one task on one image tile by tile.
+
+    Tiles are tile_size x tile_size and overlap by at least `overlap`
+    pixels; the page is padded on the top and left by repeating its edge
+    to tile_size + k*(tile_size - overlap) so that they cover it exactly.
+    batch_size tiles go through the model per forward pass.
+
+    Returns (prompt1, prompt2, prompt3, restored) like run_task_batch.
+    """
+    stride = tile_stride(tile_size,overlap)
+    prompt_fn,tile_output = TILED_TASKS[task]
+    prompt = prompt_fn(im_org)
+    h,w = im_org.shape[:2]
+    ys,padded_h = _tile_starts(h,tile_size,stride)
+    xs,padded_w = _tile_starts(w,tile_size,stride)
+    border_y,border_x = padded_h-h,padded_w-w
+    in_im = np.pad(np.concatenate((im_org,prompt),-1),((border_y,0),(border_x,0),(0,0)),mode='edge')
+
+    # coverage is separable: tiles over (y, x) = tiles over row y x tiles over column x
+    cover_y = np.zeros(padded_h,np.float32)
+    for y in ys:
+        cover_y[y:y+tile_size] += 1
+    cover_x = np.zeros(padded_w,np.float32)
+    for x in xs:
+        cover_x[x:x+tile_size] += 1
+
+    boxes = [(y,x) for y in ys for x in xs]
+    total = None
+    for start in range(0,len(boxes),batch_size):
+        chunk = boxes[start:start+batch_size]
+        batch = np.stack([in_im[y:y+tile_size,x:x+tile_size] for y,x in chunk])
+        batch = batch.transpose(0,3,1,2).astype(np.float32) / 255.0
+        preds = _forward(model,batch,device,autocast_dtype)
+        for (y,x),pred in zip(chunk,preds):
+            tile = tile_output(pred)
+            if total is None:
+                total = np.zeros((padded_h,padded_w)+tile.shape[2:],np.float32)
+            total[y:y+tile_size,x:x+tile_size] += tile
+    del in_im
+
+    out = total[border_y:,border_x:]
+    extra = (None,)*(out.ndim-2)
+    out /= cover_y[border_y:][(slice(None),None)+extra]
+    out /= cover_x[border_x:][(None,slice(None))+extra]
+
+    if task == 'binarization':
+        out_im = (out > 0.5).astype(np.uint8)*np.uint8(255)
+    else:
+        out *= 255
+        out_im = out.astype(np.uint8)
+    return prompt[:,:,0],prompt[:,:,1],prompt[:,:,2],out_im
+
+def dewarping_image(model,im_org,device,seg_model=None):
+    return run_task_batch(model,[im_org],'dewarping',device,seg_model=seg_model)[0]
+
+def appearance_image(model,im_org,device):
+    return run_task_batch(model,[im_org],'appearance',device)[0]
+
+def deshadowing_image(model,im_org,device):
+    return run_task_batch(model,[im_org],'deshadowing',device)[0]
+
+def deblurring_image(model,im_org,device):
+    return run_task_batch(model,[im_org],'deblurring',device)[0]
+
+def binarization_image(model,im_org,device):
+    return run_task_batch(model,[im_org],'binarization',device)[0]
+
+TASK_FUNCTIONS = {
+    'dewarping': dewarping_image,
+    'deshadowing': deshadowing_image,
+    'appearance': appearance_image,
+    'deblurring': deblurring_image,
+    'binarization': binarization_image,
+}
+
+# Path-based entry points of the original script: read the image, switch
+# the model to the precision each task was trained for, use global DEVICE.
+# fp16 is only used on CUDA; on CPU it is slow or unsupported, so the
+# tasks run in fp32 there.
+
+def _half_on_cuda(model):
+    return model.half() if DEVICE.type == 'cuda' else model.float()
+
+def dewarping(model,im_path,seg_model=None):
+    return dewarping_image(model.float(),cv2.imread(im_path),DEVICE,seg_model)
+
+def appearance(model,im_path):
+    return appearance_image(_half_on_cuda(model),cv2.imread(im_path),DEVICE)
+
+def deshadowing(model,im_path):
+    return deshadowing_image(_half_on_cuda(model),cv2.imread(im_path),DEVICE)
+
+def deblurring(model,im_path):
+    model.to(DEVICE)
+    model.eval()
+    return deblurring_image(_half_on_cuda(model),cv2.imread(im_path),DEVICE)
+
+def binarization(model,im_path):
+    return binarization_image(_half_on_cuda(model),cv2.imread(im_path),DEVICE)
+
 def get_args():
     parser = argparse.ArgumentParser(description='Params')
     parser.add_argument('--model_path', nargs='?', type=str, default='./checkpoints/docres.pkl',help='Path of the saved checkpoint')
@@ -295,9 +453,10 @@ def model_init(args):
     model = model.to(DEVICE)
     return model
 
-def inference_one_im(model,im_path,task):
+def inference_one_im(model,im_path,task,seg_model=None):
+    # seg_model: MBD mask model from data.MBD.infer.load_seg_model; loaded per image if None
     if task=='dewarping':
-        prompt1,prompt2,prompt3,restorted = dewarping(model,im_path)
+        prompt1,prompt2,prompt3,restorted = dewarping(model,im_path,seg_model)
     elif task=='deshadowing':
         prompt1,prompt2,prompt3,restorted = deshadowing(model,im_path)
     elif task=='appearance':
@@ -307,7 +466,7 @@ def inference_one_im(model,im_path,task):
     elif task=='binarization':
         prompt1,prompt2,prompt3,restorted = binarization(model,im_path)
     elif task=='end2end':
-        prompt1,prompt2,prompt3,restorted = dewarping(model,im_path)
+        prompt1,prompt2,prompt3,restorted = dewarping(model,im_path,seg_model)
         cv2.imwrite('restorted/step1.jpg',restorted)
         prompt1,prompt2,prompt3,restorted = deshadowing(model,'restorted/step1.jpg')
         cv2.imwrite('restorted/step2.jpg',restorted)
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    source TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_created ON entries (created);
+CREATE INDEX IF NOT EXISTS entries_namespace ON entries (namespace);
+CREATE INDEX IF NOT EXISTS entries_source ON entries (source);
+
+-- Running total of stored value sizes, kept by triggers so every process
+-- sharing the file sees it without summing the whole table
+CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL);
+INSERT OR IGNORE INTO totals (id, size) SELECT 0, COALESCE(SUM(size), 0) FROM entries;
+CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries
+BEGIN UPDATE totals SET size = size + NEW.size WHERE id = 0; END;
+CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries
+BEGIN UPDATE totals SET size = size - OLD.size WHERE id = 0; END;
+CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries
+BEGIN UPDATE totals SET size = size - OLD.size + NEW.size WHERE id = 0; END;
+"""
+
+# Seconds between sweeps for expired entries; get() already treats them as misses
+_EXPIRE_INTERVAL = 3600
+
+
+def cache_root() -> str:
+    """
+    Return the root directory for Doctra's on-disk caches.
+
+    Uses ``$DOCTRA_CACHE_DIR`` when set, otherwise ``~/.cache/doctra``
+    (honouring ``$XDG_CACHE_HOME``). Each cache lives in its own subdirectory.
+
+    :return: Absolute path of the cache root
+    """
+    root = os.environ.get("DOCTRA_CACHE_DIR")
+    if not root:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        root = os.path.join(base, "doctra")
+    return os.path.abspath(root)
+
+
+class DiskCache:
+    """
+    Size-capped, LRU-evicting key/value store in a single SQLite file.
+
+    Values are opaque bytes. Each entry also records a ``namespace`` (e.g. the
+    model that produced it) and a ``source`` (e.g. a document hash) so groups
+    of entries can be invalidated explicitly. Entries older than ``ttl_days``
+    read as misses and are dropped, and writes sweep them out at most once an
+    hour; once the stored values exceed ``max_size_mb`` the least recently
+    used entries are evicted. The total size is kept up to date by triggers,
+    so a write does not rescan the table to check the cap. The database
+    runs in WAL mode, so several processes can share one file, and the store
+    is safe to use from multiple threads.
+
+    :param path: Path of the SQLite database file (parent directories are created)
+    :param max_size_mb: Size cap for stored values in megabytes (default: 512)
+    :param ttl_days: Time-to-live of an entry in days, or None to never expire (default: None)
+    """
+
+    def __init__(self, path: str, *, max_size_mb: float = 512, ttl_days: Optional[float] = None):
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.ttl_seconds = ttl_days * 86400 if ttl_days else None
+        self.hits = 0
+        self.misses = 0
+        self._next_expiry = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(f"BEGIN IMMEDIATE; {_SCHEMA} COMMIT;")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a value and count the hit or miss.
+
+        :param key: Entry key
+        :return: The stored bytes, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return bytes(row[0])
+
+    def put(self, key: str, value: bytes, *, namespace: str = "", source: str = "") -> None:
+        """
+        Store a value, evicting least recently used entries over the size cap.
+
+        :param key: Entry key
+        :param value: Bytes to store
+        :param namespace: Group label used by :meth:`invalidate` (default: "")
+        :param source: Second group label used by :meth:`invalidate` (default: "")
+        :return: None
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO entries (key, namespace, source, value, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "namespace = excluded.namespace, source = excluded.source, value = excluded.value, "
+                "size = excluded.size, created = excluded.created, accessed = excluded.accessed",
+                (key, namespace, source, sqlite3.Binary(value), len(value), now, now),
+            )
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        """
+        Remove one entry if present.
+
+        :param key: Entry key
+        :return: None
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def reject(self, key: str) -> None:
+        """
+        Delete an entry the caller found unusable after :meth:`get` returned it.
+
+        The lookup is re-counted as a miss.
+
+        :param key: Entry key
+        :return: None
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.hits -= 1
+            self.misses += 1
+
+    def invalidate(self, *, namespace: Optional[str] = None, source: Optional[str] = None) -> int:
+        """
+        Remove every entry matching the given namespace and/or source.
+
+        With neither given, the whole store is cleared.
+
+        :param namespace: Only remove entries with this namespace (default: any)
+        :param source: Only remove entries with this source (default: any)
+        :return: Number of entries removed
+        """
+        clauses, params = [], []
+        if namespace is not None:
+            clauses.append("namespace = ?")
+            params.append(namespace)
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._conn.execute(f"DELETE FROM entries{where}", params).rowcount
+
+    def _evict(self) -> None:
+        """Drop expired entries now and then, and the least recently used ones while over the size cap."""
+        now = time.time()
+        if self.ttl_seconds is not None and now >= self._next_expiry:
+            self._conn.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl_seconds,))
+            self._next_expiry = now + min(_EXPIRE_INTERVAL, self.ttl_seconds)
+        total = self._conn.execute("SELECT size FROM totals").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this instance and the size of the store.
+
+        :return: Dict with ``hits``, ``misses``, ``hit_rate``, ``entries``, ``size_bytes`` and ``path``
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            size = self._conn.execute("SELECT size FROM totals").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "size_bytes": size,
+                "path": self.path,
+            }
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection.
+
+        :return: None
+        """
+        with self._lock:
+            self._conn.close()
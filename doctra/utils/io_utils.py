@@ -2,9 +2,25 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+import numpy as np
 from PIL import Image  # <-- import Image explicitly
 import PIL
 
 
 def get_image_from_local(file_path):
-    return PIL.Image.open(file_path)
\ No newline at end of file
+    return PIL.Image.open(file_path)
+
+
+def pil_to_bgr(im: Image.Image) -> np.ndarray:
+    """
+    Convert a PIL image to the array layout Paddle predictors expect.
+
+    Paddle's image readers work in OpenCV's BGR channel order, so RGB images
+    are flipped before being handed to ``predict``.
+
+    :param im: PIL image (any mode)
+    :return: Contiguous HxWx3 uint8 BGR array
+    """
+    if im.mode != "RGB":
+        im = im.convert("RGB")
+    return np.ascontiguousarray(np.asarray(im)[:, :, ::-1])
@@ -1,12 +1,28 @@
 from __future__ import annotations
 
 import re
-from typing import Union
+from concurrent.futures import Executor
+from typing import List, Optional, Sequence, Union
 from PIL import Image
 from doctra.engines.ocr import PytesseractOCREngine, PaddleOCREngine
 from doctra.engines.layout.layout_models import LayoutBox
 from doctra.utils.bbox import clip_bbox_to_image
 
+
+def _crop_box(page_img: Image.Image, box: LayoutBox) -> Image.Image:
+    """Crop a layout box out of a page image, clipped to the page bounds."""
+    w, h = page_img.size
+    l, t, r, b = clip_bbox_to_image(box.x1, box.y1, box.x2, box.y2, w, h)
+    return page_img.crop((l, t, r, b))
+
+
+def _normalize_text(text: str) -> str:
+    """Strip trailing spaces on lines and collapse runs of blank lines."""
+    text = re.sub(r"[ \t]+\n", "\n", text)
+    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+    return text
+
+
 def ocr_box_text(
     ocr_engine: Union[PytesseractOCREngine, PaddleOCREngine], 
     page_img: Image.Image, 
@@ -18,10 +34,33 @@ def ocr_box_text(
     
     Supports both PytesseractOCREngine and PaddleOCREngine.
     """
-    w, h = page_img.size
-    l, t, r, b = clip_bbox_to_image(box.x1, box.y1, box.x2, box.y2, w, h)
-    crop = page_img.crop((l, t, r, b))
-    text = ocr_engine.recognize(crop)
-    text = re.sub(r"[ \t]+\n", "\n", text)
-    text = re.sub(r"\n{3,}", "\n\n", text).strip()
-    return text
\ No newline at end of file
+    crop = _crop_box(page_img, box)
+    return _normalize_text(ocr_engine.recognize(crop))
+
+
+def ocr_boxes_text(
+    ocr_engine: Union[PytesseractOCREngine, PaddleOCREngine],
+    page_img: Image.Image,
+    boxes: Sequence[LayoutBox],
+    executor: Optional[Executor] = None,
+) -> List[str]:
+    """
+    OCR several layout boxes from a page image and return normalized texts.
+
+    All crops are submitted to the engine's ``recognize_batch`` at once:
+    PaddleOCR batches them through its predictor, Tesseract fans them out
+    to ``executor`` (serially without one). Results come back in the order
+    of ``boxes``, i.e. reading order if the boxes were sorted.
+
+    :param ocr_engine: OCR engine instance
+    :param page_img: Rendered page image
+    :param boxes: Layout boxes to recognize
+    :param executor: Optional executor for concurrent Tesseract recognitions (ignored by PaddleOCR)
+    :return: One normalized text per box, in the same order as ``boxes``
+    """
+    crops = [_crop_box(page_img, box) for box in boxes]
+    if isinstance(ocr_engine, PytesseractOCREngine):
+        texts = ocr_engine.recognize_batch(crops, executor=executor)
+    else:
+        texts = ocr_engine.recognize_batch(crops)
+    return [_normalize_text(text) for text in texts]
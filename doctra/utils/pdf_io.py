@@ -1,19 +1,80 @@
-from typing import List, Tuple
-from pdf2image import convert_from_path  # requires Poppler installed locally
+from typing import Iterator, List, Tuple, Optional
+from pdf2image import convert_from_path, pdfinfo_from_path  # requires Poppler installed locally
 from PIL import Image
 
-def render_pdf_to_images(pdf_path: str, dpi: int = 200, fmt: str = "RGB") -> List[Tuple[Image.Image, int, int]]:
+def render_pdf_to_images(
+    pdf_path: str,
+    dpi: int = 200,
+    fmt: str = "RGB",
+    first_page: Optional[int] = None,
+    last_page: Optional[int] = None,
+) -> List[Tuple[Image.Image, int, int]]:
     """
     Render a PDF into PIL images.
 
+    Args:
+        pdf_path: Path to the input PDF file.
+        dpi: Rendering resolution.
+        fmt: PIL mode to convert pages to (falsy to keep Poppler's mode).
+        first_page: Optional 1-based first page to render (inclusive).
+        last_page: Optional 1-based last page to render (inclusive).
+
     Returns:
         List of tuples (pil_image, width, height) in page order (1-based).
     """
-    pil_pages = convert_from_path(pdf_path, dpi=dpi)  # may raise if Poppler missing
+    pil_pages = convert_from_path(
+        pdf_path, dpi=dpi, first_page=first_page, last_page=last_page
+    )  # may raise if Poppler missing
     images: List[Tuple[Image.Image, int, int]] = []
     for im in pil_pages:
         if fmt and im.mode != fmt:
             im = im.convert(fmt)
         w, h = im.size
         images.append((im, w, h))
-    return images
\ No newline at end of file
+    return images
+
+
+def get_pdf_page_count(pdf_path: str) -> int:
+    """
+    Return the number of pages in a PDF without rendering it.
+
+    Args:
+        pdf_path: Path to the input PDF file.
+
+    Returns:
+        Page count reported by Poppler's ``pdfinfo``.
+    """
+    return int(pdfinfo_from_path(pdf_path)["Pages"])
+
+
+def iter_pdf_pages(
+    pdf_path: str,
+    dpi: int = 200,
+    fmt: str = "RGB",
+    window: int = 4,
+    first_page: int = 1,
+) -> Iterator[Tuple[Image.Image, int, int]]:
+    """
+    Lazily render a PDF, ``window`` pages at a time.
+
+    Only one window of decoded pages is held by this generator, so peak
+    memory depends on the window size rather than on the page count.
+    Consumers should drop their references to a page once it is processed.
+
+    Args:
+        pdf_path: Path to the input PDF file.
+        dpi: Rendering resolution.
+        fmt: PIL mode to convert pages to (falsy to keep Poppler's mode).
+        window: Number of pages rendered per Poppler call (look-ahead).
+        first_page: 1-based page to start from (earlier pages are not rendered).
+
+    Yields:
+        Tuples (pil_image, width, height) in page order.
+    """
+    window = max(1, int(window))
+    page_count = get_pdf_page_count(pdf_path)
+    for first in range(max(1, first_page), page_count + 1, window):
+        last = min(first + window - 1, page_count)
+        chunk = render_pdf_to_images(pdf_path, dpi=dpi, fmt=fmt, first_page=first, last_page=last)
+        while chunk:
+            yield chunk.pop(0)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import heapq
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+_END = object()
+_POLL_SECONDS = 0.1
+
+
+@dataclass
+class Stage:
+    """
+    One step of a :class:`StagedPipeline`.
+
+    :param name: Stage name, used for thread names and error messages
+    :param fn: Function applied to every item passing through the stage
+    :param workers: Number of threads running ``fn`` concurrently (default: 1)
+    """
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+
+
+class _Abort(Exception):
+    """Raised inside worker threads when the pipeline is being torn down."""
+
+
+class StagedPipeline:
+    """
+    Bounded-queue producer/consumer pipeline with ordered output.
+
+    Items pulled from the source iterable (in a dedicated thread) flow
+    through each stage in turn; stages are connected by bounded queues, so
+    a slow stage applies back-pressure instead of letting work pile up in
+    memory. Each stage runs ``workers`` threads, which lets page N+1 be in
+    one stage while page N is in the next. Results are re-sequenced before
+    they are yielded, so output order always matches source order no matter
+    how many workers a stage has.
+
+    The first exception raised by the source or by any stage stops the
+    pipeline and is re-raised to the consumer.
+
+    :param stages: Stages applied in order to every item
+    :param queue_size: Capacity of each inter-stage queue (default: 4)
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 4):
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+
+    def run(self, source: Iterable[Any]) -> Iterator[Any]:
+        """
+        Run the pipeline over ``source`` and yield results in source order.
+
+        :param source: Iterable of input items (consumed in a background thread)
+        :return: Iterator of final-stage outputs, in the same order as ``source``
+        """
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads: List[threading.Thread] = []
+
+        def fail(exc: BaseException) -> None:
+            if not errors:
+                errors.append(exc)
+            stop.set()
+
+        def put(q: queue.Queue, item: Any) -> None:
+            while True:
+                if stop.is_set():
+                    raise _Abort()
+                try:
+                    q.put(item, timeout=_POLL_SECONDS)
+                    return
+                except queue.Full:
+                    continue
+
+        def get(q: queue.Queue) -> Any:
+            while True:
+                if stop.is_set():
+                    raise _Abort()
+                try:
+                    return q.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    continue
+
+        def feed() -> None:
+            try:
+                for seq, item in enumerate(source):
+                    put(queues[0], (seq, item))
+                put(queues[0], _END)
+            except _Abort:
+                pass
+            except BaseException as exc:
+                fail(exc)
+
+        def work(stage: Stage, q_in: queue.Queue, q_out: queue.Queue, remaining: List[int],
+                 lock: threading.Lock) -> None:
+            try:
+                while True:
+                    entry = get(q_in)
+                    if entry is _END:
+                        # Let sibling workers see the end marker too; the last
+                        # one to finish forwards it downstream.
+                        put(q_in, _END)
+                        with lock:
+                            remaining[0] -= 1
+                            last = remaining[0] == 0
+                        if last:
+                            put(q_out, _END)
+                        return
+                    seq, item = entry
+                    try:
+                        result = stage.fn(item)
+                    except Exception as exc:
+                        raise RuntimeError(f"Pipeline stage '{stage.name}' failed: {exc}") from exc
+                    put(q_out, (seq, result))
+            except _Abort:
+                pass
+            except BaseException as exc:
+                fail(exc)
+
+        threads.append(threading.Thread(target=feed, name="doctra-pipeline-source", daemon=True))
+        for idx, stage in enumerate(self.stages):
+            workers = max(1, stage.workers)
+            remaining = [workers]
+            lock = threading.Lock()
+            for w in range(workers):
+                threads.append(threading.Thread(
+                    target=work,
+                    args=(stage, queues[idx], queues[idx + 1], remaining, lock),
+                    name=f"doctra-pipeline-{stage.name}-{w}",
+                    daemon=True,
+                ))
+
+        for t in threads:
+            t.start()
+
+        pending: List[Tuple[int, int, Any]] = []
+        next_seq = 0
+        tie = 0
+        try:
+            while True:
+                try:
+                    entry = get(queues[-1])
+                except _Abort:
+                    break
+                if entry is _END:
+                    break
+                seq, result = entry
+                heapq.heappush(pending, (seq, tie, result))
+                tie += 1
+                while pending and pending[0][0] == next_seq:
+                    yield heapq.heappop(pending)[2]
+                    next_seq += 1
+        finally:
+            stop.set()
+            for t in threads:
+                t.join()
+
+        if errors:
+            raise errors[0]
+        while pending:
+            yield heapq.heappop(pending)[2]
+
+
+def prefetch(iterable: Iterable[Any], maxsize: int = 4) -> Iterator[Any]:
+    """
+    Run ``iterable`` in a background thread, buffering up to ``maxsize`` items.
+
+    Useful to overlap a producer (e.g. PDF rendering) with whatever consumes
+    it. Exceptions raised by the producer are re-raised in the consumer.
+
+    :param iterable: Source iterable
+    :param maxsize: Maximum number of buffered items (default: 4)
+    :return: Iterator over the same items, in the same order
+    """
+    return StagedPipeline([], queue_size=maxsize).run(iterable)
@@ -1,6 +1,35 @@
 from __future__ import annotations
 import os
+import sys
+import logging
+import warnings
+import threading
 import contextlib
+from typing import Iterator
+
+# Third-party loggers that spam INFO/DEBUG output during model loading and inference
+NOISY_LOGGERS = (
+    'paddleocr', 'paddle', 'paddlex', 'paddlepaddle', 'ppocr',
+    'transformers', 'huggingface_hub', 'urllib3', 'requests',
+)
+
+# Environment variables read by Paddle / glog / TensorFlow to lower native log levels
+_QUIET_ENV = {
+    'DISABLE_AUTO_LOGGING_CONFIG': '1',
+    'PADDLE_LOG_LEVEL': '3',  # Only show fatal errors
+    'GLOG_minloglevel': '3',  # Suppress glog output
+    'TF_CPP_MIN_LOG_LEVEL': '3',  # Suppress TensorFlow output
+}
+
+_configure_lock = threading.Lock()
+_configured = False
+
+_redirect_lock = threading.Lock()
+_redirect_depth = 0
+_saved_streams = None
+_saved_fds = None
+_devnull = None
+
 
 @contextlib.contextmanager
 def suppress_output():
@@ -11,3 +40,81 @@ def suppress_output():
             yield
     finally:
         devnull.close()
+
+
+def configure_library_logging() -> None:
+    """
+    Quiet noisy third-party libraries once for the whole process.
+
+    Raises the level of the loggers in ``NOISY_LOGGERS`` to ERROR, sets the
+    Paddle/glog environment knobs (without overriding values the user set
+    explicitly) and ignores warnings raised from Paddle modules. Engines call
+    this at construction time; it is idempotent and thread-safe, so the hot
+    inference path needs no per-call logging surgery.
+
+    :return: None
+    """
+    global _configured
+    if _configured:
+        return
+    with _configure_lock:
+        if _configured:
+            return
+        for logger_name in NOISY_LOGGERS:
+            logging.getLogger(logger_name).setLevel(logging.ERROR)
+        for key, value in _QUIET_ENV.items():
+            os.environ.setdefault(key, value)
+        warnings.filterwarnings("ignore", module=r"(paddle|paddlex|paddleocr)(\.|$)")
+        _configured = True
+
+
+@contextlib.contextmanager
+def silence(fd_level: bool = True) -> Iterator[None]:
+    """
+    Redirect stdout/stderr to /dev/null, safely across threads.
+
+    Intended for the few places where native code prints directly (model
+    construction and downloads), not for per-call inference. Redirection is
+    reference-counted: the first caller installs it, the last one to leave
+    restores the original streams, so overlapping use from worker threads
+    never leaves the process with its output swapped out. Output written by
+    other threads while a redirect is active is silenced too.
+
+    :param fd_level: Also redirect file descriptors 1 and 2, which catches
+                     output from C/C++ extensions (default: True)
+    :return: Context manager yielding None
+    """
+    global _redirect_depth, _saved_streams, _saved_fds, _devnull
+    configure_library_logging()
+
+    with _redirect_lock:
+        if _redirect_depth == 0:
+            _devnull = open(os.devnull, "w")
+            _saved_streams = (sys.stdout, sys.stderr)
+            _saved_fds = None
+            if fd_level:
+                try:
+                    for stream in _saved_streams:
+                        stream.flush()
+                    _saved_fds = (os.dup(1), os.dup(2))
+                    os.dup2(_devnull.fileno(), 1)
+                    os.dup2(_devnull.fileno(), 2)
+                except (OSError, ValueError, AttributeError):
+                    _saved_fds = None
+            sys.stdout = sys.stderr = _devnull
+        _redirect_depth += 1
+
+    try:
+        yield
+    finally:
+        with _redirect_lock:
+            _redirect_depth -= 1
+            if _redirect_depth == 0:
+                sys.stdout, sys.stderr = _saved_streams
+                if _saved_fds is not None:
+                    os.dup2(_saved_fds[0], 1)
+                    os.dup2(_saved_fds[1], 2)
+                    os.close(_saved_fds[0])
+                    os.close(_saved_fds[1])
+                _devnull.close()
+                _saved_streams = _saved_fds = _devnull = None
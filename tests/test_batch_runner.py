@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+from PIL import Image
+
+from doctra.parsers.batch_runner import BatchRunner, MANIFEST_NAME, SUMMARY_NAME, resolve_inputs
+
+
+class _FakeParser:
+    """Writes a marker file instead of parsing; fails for files named ``bad*.pdf``."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+
+    def parse(self, pdf_path, output_dir=None):
+        if os.path.basename(pdf_path).startswith("bad"):
+            raise ValueError("cannot parse")
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, "result.txt"), "w") as f:
+            f.write(f"{pdf_path} {self.pid}")
+
+
+def _fake_factory():
+    return _FakeParser()
+
+
+def _failing_factory():
+    raise RuntimeError("no models here")
+
+
+def _explode():
+    raise RuntimeError("cannot unpickle")
+
+
+class _UnpicklableFactory:
+    """Pickles fine in the parent, but fails to load in the worker before it can report."""
+
+    def __reduce__(self):
+        return (_explode, ())
+
+    def __call__(self):
+        return _FakeParser()
+
+
+def _pdf(path, pages=1):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    images = [Image.new("RGB", (50, 60), "white") for _ in range(pages)]
+    images[0].save(path, "PDF", save_all=True, append_images=images[1:])
+    return path
+
+
+class TestResolveInputs:
+    def test_directories_globs_and_manifests(self, tmp_path):
+        """Test every kind of source expands to absolute, de-duplicated PDF paths."""
+        a = _pdf(str(tmp_path / "in" / "a.pdf"))
+        b = _pdf(str(tmp_path / "in" / "sub" / "b.pdf"))
+        (tmp_path / "in" / "notes.txt").write_text("not a pdf")
+        manifest = tmp_path / "list.txt"
+        manifest.write_text("# comment\nin/a.pdf\n\n" + json.dumps({"path": b}) + "\n")
+
+        assert resolve_inputs(str(tmp_path / "in")) == [a, b]
+        assert resolve_inputs(str(tmp_path / "in" / "**" / "b.pdf")) == [b]
+        assert resolve_inputs([str(manifest), a]) == [a, b]
+
+
+class TestBatchRunner:
+    def test_outputs_manifest_and_failures(self, tmp_path):
+        """Test each document gets its own output dir and failures are recorded, not raised."""
+        _pdf(str(tmp_path / "in" / "a.pdf"), pages=2)
+        _pdf(str(tmp_path / "in" / "sub" / "a.pdf"))
+        _pdf(str(tmp_path / "in" / "bad.pdf"))
+        out = tmp_path / "out"
+
+        seen = []
+        summary = BatchRunner(workers=2, parser_factory=_fake_factory).run(
+            str(tmp_path / "in"), str(out), on_document=seen.append)
+
+        assert (summary.succeeded, summary.failed) == (2, 1)
+        assert (out / "a" / "result.txt").exists() and (out / "sub" / "a" / "result.txt").exists()
+        assert len(seen) == 3
+        records = [json.loads(line) for line in (out / MANIFEST_NAME).read_text().splitlines()]
+        assert sorted(r["status"] for r in records) == ["failed", "ok", "ok"]
+        assert "cannot parse" in next(r["error"] for r in records if r["status"] == "failed")
+        totals = json.loads((out / SUMMARY_NAME).read_text())
+        assert (totals["documents_total"], totals["succeeded"], totals["pages"]) == (3, 2, 3)
+
+    def test_workers_restart_after_page_budget(self, tmp_path):
+        """Test a worker is replaced once it has parsed its page budget."""
+        for name in ("a", "b", "c"):
+            _pdf(str(tmp_path / "in" / f"{name}.pdf"))
+        summary = BatchRunner(workers=1, max_pages_per_worker_before_restart=1,
+                              parser_factory=_fake_factory).run(str(tmp_path / "in"), str(tmp_path / "out"))
+        assert summary.succeeded == 3
+        assert summary.worker_starts == 3
+        assert len({doc.worker for doc in summary.documents}) == 3
+
+    @pytest.mark.parametrize("factory", [_failing_factory, _UnpicklableFactory()])
+    def test_workers_failing_at_startup_abort_the_batch(self, tmp_path, factory):
+        """Test workers that cannot start are not respawned forever."""
+        for name in ("a", "b"):
+            _pdf(str(tmp_path / "in" / f"{name}.pdf"))
+        runner = BatchRunner(workers=2, parser_factory=factory)
+        with pytest.raises(RuntimeError):
+            runner.run(str(tmp_path / "in"), str(tmp_path / "out"))
+
+    def test_unknown_mode_is_rejected(self):
+        """Test an unsupported mode fails fast."""
+        with pytest.raises(ValueError):
+            BatchRunner(mode="summarize")
@@ -0,0 +1,54 @@
+from doctra.parsers.checkpoint import JOURNAL_NAME, PageJournal
+
+FINGERPRINT = {"pdf": "abc", "dpi": 200}
+
+
+def _blocks(tmp_path, page_num):
+    crop = tmp_path / f"page_{page_num}_table.png"
+    crop.write_bytes(b"png")
+    return [{"kind": "text", "text": f"page {page_num}"},
+            {"kind": "table", "path": str(crop), "rel": crop.name, "item": {"title": "t", "page": page_num}}]
+
+
+class TestPageJournal:
+    def test_resume_loads_recorded_pages(self, tmp_path):
+        """Test pages recorded by one run are returned to a resumed run."""
+        with PageJournal(str(tmp_path), FINGERPRINT) as journal:
+            assert journal.pages == {}
+            journal.record(1, _blocks(tmp_path, 1))
+            journal.record(2, _blocks(tmp_path, 2))
+
+        with PageJournal(str(tmp_path), FINGERPRINT, resume=True) as journal:
+            assert sorted(journal.pages) == [1, 2]
+            assert journal.completed(2)[1]["item"]["page"] == 2
+            assert journal.completed(3) is None
+            journal.record(3, _blocks(tmp_path, 3))
+
+        with PageJournal(str(tmp_path), FINGERPRINT, resume=True) as journal:
+            assert sorted(journal.pages) == [1, 2, 3]
+
+    def test_fresh_run_and_changed_settings_start_over(self, tmp_path):
+        """Test a non-resumed run or a different fingerprint discards the journal."""
+        with PageJournal(str(tmp_path), FINGERPRINT) as journal:
+            journal.record(1, _blocks(tmp_path, 1))
+        with PageJournal(str(tmp_path), dict(FINGERPRINT, dpi=300), resume=True) as journal:
+            assert journal.pages == {}
+
+        with PageJournal(str(tmp_path), FINGERPRINT) as journal:
+            journal.record(1, _blocks(tmp_path, 1))
+        with PageJournal(str(tmp_path), FINGERPRINT) as journal:
+            assert journal.pages == {}
+
+    def test_stops_at_torn_line_or_missing_crop(self, tmp_path):
+        """Test only the intact prefix of pages with their crops on disk is trusted."""
+        with PageJournal(str(tmp_path), FINGERPRINT) as journal:
+            for page_num in (1, 2, 3):
+                journal.record(page_num, _blocks(tmp_path, page_num))
+        (tmp_path / "page_3_table.png").unlink()
+        with PageJournal(str(tmp_path), FINGERPRINT, resume=True) as journal:
+            assert sorted(journal.pages) == [1, 2]
+
+        with open(tmp_path / JOURNAL_NAME, "a", encoding="utf-8") as f:
+            f.write('{"page": 3, "blocks": [{"kind": "te')
+        with PageJournal(str(tmp_path), FINGERPRINT, resume=True) as journal:
+            assert sorted(journal.pages) == [1, 2]
@@ -0,0 +1,51 @@
+import sqlite3
+
+from doctra.utils.disk_cache import DiskCache
+
+
+def _summed_size(cache: DiskCache) -> int:
+    return cache._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+
+class TestDiskCache:
+    def test_running_size_total_tracks_every_write(self, tmp_path):
+        """Test the size total matches the stored values after replaces, deletes and invalidation."""
+        cache = DiskCache(str(tmp_path / "cache.sqlite3"))
+        cache.put("a", b"x" * 10, namespace="m1")
+        cache.put("b", b"x" * 20, namespace="m2")
+        cache.put("a", b"x" * 5, namespace="m1")
+        assert cache.stats()["size_bytes"] == _summed_size(cache) == 25
+
+        cache.delete("b")
+        cache.put("c", b"x" * 7, namespace="m2")
+        cache.invalidate(namespace="m1")
+        assert cache.stats()["size_bytes"] == _summed_size(cache) == 7
+
+    def test_existing_store_gets_its_total_on_open(self, tmp_path):
+        """Test a store written before the running total existed is counted when reopened."""
+        path = str(tmp_path / "cache.sqlite3")
+        cache = DiskCache(path)
+        cache.put("a", b"x" * 30)
+        cache.close()
+        conn = sqlite3.connect(path)
+        conn.executescript("DROP TABLE totals; DROP TRIGGER entries_size_insert; "
+                           "DROP TRIGGER entries_size_delete; DROP TRIGGER entries_size_update;")
+        conn.close()
+
+        cache = DiskCache(path)
+        cache.put("b", b"x" * 12)
+        assert cache.stats()["size_bytes"] == _summed_size(cache) == 42
+
+    def test_expired_entries_swept_periodically(self, tmp_path):
+        """Test puts sweep expired entries only once per interval."""
+        cache = DiskCache(str(tmp_path / "cache.sqlite3"), ttl_days=1)
+        cache.put("old", b"x")
+        cache._conn.execute("UPDATE entries SET created = created - 2 * 86400")
+
+        cache.put("new", b"x")
+        assert cache.stats()["entries"] == 2
+
+        cache._next_expiry = 0.0
+        cache.put("newer", b"x")
+        assert cache.stats()["entries"] == 2
+        assert cache.get("old") is None
@@ -0,0 +1,166 @@
+import threading
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+cv2 = pytest.importorskip("cv2")
+pytest.importorskip("skimage")
+
+from doctra.engines.image_restoration import docres_engine  # noqa: E402
+
+if not docres_engine.DOCRES_AVAILABLE:
+    pytest.skip("DocRes modules not importable", allow_module_level=True)
+
+import inference  # noqa: E402  (top-level DocRes module, put on sys.path by docres_engine)
+
+
+def _page(seed, size=(60, 90)):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(*size, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def model():
+    torch.manual_seed(0)
+    return torch.nn.Conv2d(6, 3, 1).eval()
+
+
+class TestDocResTaskFunctions:
+    @pytest.mark.parametrize("task", ["appearance", "deshadowing", "deblurring", "binarization"])
+    def test_array_in_array_out(self, model, task):
+        """Test tasks take and return arrays without touching the input or the model."""
+        page = _page(0)
+        original = page.copy()
+        weight = model.weight.detach().clone()
+        *prompts, restored = inference.TASK_FUNCTIONS[task](model, page, torch.device("cpu"))
+
+        assert restored.shape[:2] == page.shape[:2] and restored.dtype == np.uint8
+        assert len(prompts) == 3 and all(p.ndim == 2 for p in prompts)
+        np.testing.assert_array_equal(page, original)
+        assert model.weight.dtype == torch.float32 and torch.equal(model.weight, weight)
+
+    def test_concurrent_calls_match_sequential(self, model):
+        """Test several threads can share one model."""
+        pages = [_page(seed) for seed in range(6)]
+        expected = [inference.appearance_image(model, p, torch.device("cpu"))[3] for p in pages]
+        results = [None] * len(pages)
+
+        def run(i):
+            results[i] = inference.appearance_image(model, pages[i], torch.device("cpu"))[3]
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(pages))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for got, want in zip(results, expected):
+            np.testing.assert_array_equal(got, want)
+
+
+class TestDocResBatching:
+    @pytest.mark.parametrize("task", ["appearance", "deblurring"])
+    @pytest.mark.parametrize("batch_size,max_batch_pixels", [(2, None), (4, None), (4, 64 * 96 * 2)])
+    def test_batched_matches_single(self, model, task, batch_size, max_batch_pixels):
+        """Test batching pages of mixed sizes returns the single-page results in input order."""
+        sizes = [(60, 90), (40, 50), (60, 90), (60, 90), (40, 50), (60, 90), (33, 47)]
+        pages = [_page(seed, size) for seed, size in enumerate(sizes)]
+        expected = [inference.TASK_FUNCTIONS[task](model, p, torch.device("cpu"))[3] for p in pages]
+
+        results = inference.run_task_batch(model, pages, task, torch.device("cpu"),
+                                           batch_size=batch_size, max_batch_pixels=max_batch_pixels)
+
+        assert len(results) == len(pages)
+        for (*_, got), want in zip(results, expected):
+            assert got.shape == want.shape
+            np.testing.assert_allclose(got.astype(int), want.astype(int), atol=1)
+
+    def test_batches_respect_size_and_pixel_cap(self, model):
+        """Test forward passes never exceed batch_size pages or the pixel cap."""
+        pages = [_page(seed) for seed in range(7)]
+        seen = []
+        hook = model.register_forward_hook(lambda module, inputs, output: seen.append(inputs[0].shape[0]))
+        try:
+            inference.run_task_batch(model, pages, "appearance", torch.device("cpu"), batch_size=3)
+            assert seen == [3, 3, 1]
+            seen.clear()
+            inference.run_task_batch(model, pages, "appearance", torch.device("cpu"),
+                                     batch_size=8, max_batch_pixels=64 * 96 * 2)
+            assert seen == [2, 2, 2, 1]
+        finally:
+            hook.remove()
+
+
+class TestDocResPrecision:
+    def test_auto_precision_follows_device(self):
+        """Test auto picks fp16 only on CUDA and explicit precisions are kept."""
+        cpu, cuda = torch.device("cpu"), torch.device("cuda")
+        assert docres_engine.resolve_precision("auto", cpu) == "fp32"
+        assert docres_engine.resolve_precision("auto", cuda) == "fp16"
+        assert docres_engine.resolve_precision("auto", cuda, use_half_precision=False) == "fp32"
+        assert docres_engine.resolve_precision("bf16", cpu) == "bf16"
+        with pytest.raises(ValueError):
+            docres_engine.resolve_precision("int8", cpu)
+
+    def test_bf16_autocast_close_to_fp32(self, model):
+        """Test bf16 autocast on CPU keeps the fp32 model and stays close to its output."""
+        pages = [_page(0), _page(1)]
+        fp32 = inference.run_task_batch(model, pages, "appearance", torch.device("cpu"))
+        bf16 = inference.run_task_batch(model, pages, "appearance", torch.device("cpu"),
+                                        autocast_dtype=torch.bfloat16)
+
+        assert model.weight.dtype == torch.float32
+        for (*_, got), (*_, want) in zip(bf16, fp32):
+            assert got.dtype == np.uint8 and got.shape == want.shape
+            assert np.abs(got.astype(int) - want.astype(int)).max() <= 4
+
+    def test_traced_model_matches_eager(self, model):
+        """Test the jit runtime gives the eager results and keeps one trace per shape."""
+        traced = docres_engine._apply_runtime(model, "jit")
+        pages = [_page(0), _page(1, (40, 50)), _page(2)]
+        want = inference.run_task_batch(model, pages, "deblurring", torch.device("cpu"), batch_size=1)
+        got = inference.run_task_batch(traced, pages, "deblurring", torch.device("cpu"), batch_size=1)
+
+        for (*_, g), (*_, w) in zip(got, want):
+            np.testing.assert_allclose(g.astype(int), w.astype(int), atol=1)
+        assert len(traced._traces) == 2
+
+
+class TestDocResTiling:
+    def test_combine_inverts_split(self):
+        """Test overlapping tiles are blended back to the original, including single-tile axes."""
+        from data.preprocess.crop_merge_image import combine_imgs, split_img
+
+        rng = np.random.default_rng(0)
+        for h, w, tile, stride in [(100, 130, 64, 32), (1000, 300, 512, 256), (300, 200, 512, 256)]:
+            image = rng.random((h, w, 3))
+            tiles, border_x, border_y, max_x, max_y = split_img(image, tile, tile, stride)
+            combined = combine_imgs(border_x, border_y, tiles, max_y, max_x, tile, tile, stride)
+            np.testing.assert_allclose(combined, image)
+
+    @pytest.mark.parametrize("overlap", [32, 24, 7, 0])
+    def test_tiled_matches_whole_page_for_pointwise_model(self, model, overlap):
+        """Test tiles cover the page exactly for any overlap: a 1x1 conv gives the whole-page result."""
+        page = _page(0, (150, 200))
+        *_, want = inference.appearance_image(model, page, torch.device("cpu"))
+        *prompts, got = inference.run_task_tiled(model, page, "appearance", torch.device("cpu"),
+                                                 tile_size=64, overlap=overlap, batch_size=3)
+
+        assert got.shape == want.shape and got.dtype == np.uint8
+        assert all(p.shape == page.shape[:2] for p in prompts)
+        np.testing.assert_allclose(got.astype(int), want.astype(int), atol=1)
+
+    def test_binarization_tiles_are_binary(self, model):
+        """Test tiled binarization thresholds the blended foreground probability."""
+        page = _page(1, (100, 90))
+        *_, out = inference.run_task_tiled(model, page, "binarization", torch.device("cpu"),
+                                           tile_size=64, overlap=32)
+
+        assert out.shape == page.shape[:2]
+        assert set(np.unique(out)) <= {0, 255}
+
+    @pytest.mark.parametrize("tile_size,overlap", [(60, 30), (64, 64), (64, 80), (64, -1)])
+    def test_invalid_tiling_rejected(self, tile_size, overlap):
+        """Test tilings that are not a multiple of 8 or overlap by a whole tile are refused."""
+        with pytest.raises(ValueError):
+            inference.tile_stride(tile_size, overlap)
@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import doctra
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules that take from hundreds of milliseconds to seconds to import and
+# must only be loaded by the code paths that use them
+HEAVY_MODULES = (
+    "torch", "cv2", "gradio", "paddle", "paddleocr", "pandas", "openpyxl",
+    "outlines", "openai", "anthropic", "google.genai", "ollama",
+)
+
+# Generous wall-clock budget for a cold import in a fresh interpreter
+IMPORT_BUDGET_SECONDS = 2.0
+
+
+def _probe(module: str) -> dict:
+    """Import ``module`` in a fresh interpreter; report the time taken and heavy modules loaded."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "seconds = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'seconds': seconds, 'heavy': heavy}))\n"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (REPO_ROOT, env.get("PYTHONPATH")) if p)
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env,
+                         capture_output=True, text=True, timeout=120, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+class TestStartupImports:
+    @pytest.mark.parametrize("module", ["doctra", "doctra.parsers", "doctra.cli.main"])
+    def test_import_is_fast_and_loads_no_heavy_dependency(self, module):
+        """Test importing the package, the parsers package and the CLI stays light."""
+        result = _probe(module)
+        assert result["heavy"] == []
+        assert result["seconds"] < IMPORT_BUDGET_SECONDS
+
+    def test_public_names_resolve_lazily(self):
+        """Test lazily exported names resolve on access and unknown names still raise."""
+        from doctra.parsers.batch_runner import BatchRunner
+
+        assert doctra.BatchRunner is BatchRunner
+        assert {"StructuredPDFParser", "DocResEngine", "launch_ui"} <= set(dir(doctra))
+        with pytest.raises(AttributeError):
+            doctra.NotAParser
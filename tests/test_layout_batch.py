@@ -0,0 +1,96 @@
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from doctra.engines.layout.cache import build_page
+from doctra.engines.layout.layout_batch import BOX_DTYPE, LayoutBatch
+from doctra.engines.layout.layout_models import LayoutBox
+from doctra.engines.layout.paddle_layout import PaddleLayoutEngine
+
+# Scores and coordinates exactly representable in float32, so views compare equal to LayoutBox
+RECORDS = [
+    (1, 600, 800, [("table", 0.75, [10.0, 20.0, 300.0, 400.0]), ("text", 0.25, [5.0, 5.0, 50.0, 15.0])]),
+    (2, 600, 800, []),
+    (3, 400, 500, [("text", 0.875, [0.0, 0.0, 100.0, 50.0]), ("figure", 0.5, [50.0, 60.0, 200.0, 300.0])]),
+]
+
+
+class _Model:
+    def predict(self, arrays, batch_size=1, layout_nms=True):
+        return [{"boxes": [{"label": l, "score": s, "coordinate": c} for l, s, c in RECORDS[0][3]]} for _ in arrays]
+
+
+class TestLayoutBatch:
+    def test_views_match_layout_pages(self):
+        """Test page and box views behave like the LayoutPage/LayoutBox built from the same records."""
+        batch = LayoutBatch.from_records(RECORDS, min_score=0.3)
+        expected = [build_page(i, w, h, dets, min_score=0.3) for i, w, h, dets in RECORDS]
+
+        assert batch.boxes.dtype == BOX_DTYPE
+        assert (len(batch), batch.num_pages) == (3, 3)
+        assert [p.to_dict() for p in batch] == [p.to_dict() for p in expected]
+        assert batch.to_pages() == expected
+        view = batch.page_views()[2].boxes[1]
+        assert view == expected[2].boxes[1] and view.label == "figure"
+        assert view.ny2 == 300.0 / 500
+        assert isinstance(view.to_box(), LayoutBox)
+        assert batch[-1] == view
+        with pytest.raises(IndexError):
+            batch[3]
+
+    def test_filters_and_columns(self):
+        """Test vectorized filtering by label and score, normalization and label statistics."""
+        batch = LayoutBatch.from_records(RECORDS)
+        assert batch.filter(labels=["text"]).label_names().tolist() == ["text", "text"]
+        assert batch.filter(exclude=["text", "unknown"]).label_names().tolist() == ["table", "figure"]
+        assert batch.filter(min_score=0.5).page_indices().tolist() == [1, 3, 3]
+        assert len(batch.filter(labels=["missing"])) == 0
+        assert batch.filter(labels=["figure"]).num_pages == 3
+        np.testing.assert_allclose(batch.normalized()[2], [0.0, 0.0, 0.25, 0.1])
+        assert batch.areas()[0] == 290.0 * 380.0
+        assert batch.label_counts() == {"table": 1, "text": 2, "figure": 1}
+
+    def test_nms_keeps_pages_and_labels_apart(self):
+        """Test NMS suppresses overlaps only within the same page and label unless class-agnostic."""
+        box = [0.0, 0.0, 100.0, 100.0]
+        shifted = [5.0, 0.0, 105.0, 100.0]
+        batch = LayoutBatch.from_records([
+            (1, 200, 200, [("text", 0.5, box), ("text", 0.75, shifted), ("table", 0.25, box)]),
+            (2, 200, 200, [("text", 0.5, box)]),
+        ])
+        kept = batch.nms(iou_threshold=0.5)
+        assert list(zip(kept.page_indices().tolist(), kept.label_names().tolist(), kept.boxes["score"].tolist())) == [
+            (1, "text", 0.75), (1, "table", 0.25), (2, "text", 0.5)]
+        assert len(batch.nms(iou_threshold=0.5, class_agnostic=True)) == 2
+
+    def test_concatenate_remaps_labels(self):
+        """Test batches with different label codes stack into one batch."""
+        a = LayoutBatch.from_records(RECORDS[:1])
+        b = LayoutBatch.from_records(RECORDS[2:])
+        both = LayoutBatch.concatenate([a, b])
+        assert both.labels == ("table", "text", "figure")
+        assert both.label_names().tolist() == ["table", "text", "text", "figure"]
+        assert [p.page_index for p in both] == [1, 3]
+        assert both.page_views()[1].boxes[0] == b.page_views()[0].boxes[0]
+
+    def test_save_jsonl_matches_layout_page_export(self, tmp_path):
+        """Test the columnar export writes the same JSONL as exporting LayoutPages."""
+        engine = PaddleLayoutEngine()
+        pages = [build_page(i, w, h, dets) for i, w, h, dets in RECORDS]
+        engine.save_jsonl(pages, str(tmp_path / "pages.jsonl"))
+        engine.save_jsonl(LayoutBatch.from_pages(pages), str(tmp_path / "batch.jsonl"))
+        assert (tmp_path / "batch.jsonl").read_text() == (tmp_path / "pages.jsonl").read_text()
+        assert len([json.loads(line) for line in (tmp_path / "batch.jsonl").read_text().splitlines()]) == 3
+
+
+class TestPaddleLayoutEngineBatch:
+    def test_predict_images_batch(self):
+        """Test the engine emits a LayoutBatch equal to its LayoutPage output."""
+        engine = PaddleLayoutEngine()
+        engine.model = _Model()
+        images = [Image.new("RGB", (600, 800), "white")] * 2
+        batch = engine.predict_images_batch(images, min_score=0.5, start_index=4)
+        assert batch.to_pages() == engine.predict_images(images, min_score=0.5, start_index=4)
+        assert engine.predict_images_batch([]).num_pages == 0
@@ -0,0 +1,97 @@
+from PIL import Image
+from doctra.engines.layout.cache import LayoutCache, build_page, document_key, file_digest, image_key
+from doctra.engines.layout.paddle_layout import PaddleLayoutEngine
+
+DETECTIONS = [("table", 0.93, [10.0, 20.0, 300.0, 400.0]), ("text", 0.31, [5.0, 5.0, 50.0, 15.0])]
+
+
+class _CountingModel:
+    """Stands in for LayoutDetection and counts the pages it is asked to detect."""
+
+    def __init__(self):
+        self.pages = 0
+
+    def predict(self, arrays, batch_size=1, layout_nms=True):
+        self.pages += len(arrays)
+        return [{"boxes": [{"label": l, "score": s, "coordinate": c} for l, s, c in DETECTIONS]} for _ in arrays]
+
+
+class TestLayoutCache:
+    def test_roundtrip_keeps_unfiltered_detections(self, tmp_path):
+        """Test detections come back unfiltered and min_score is applied when building pages."""
+        cache = LayoutCache(str(tmp_path))
+        cache.put("k", 600, 800, DETECTIONS, model_name="m")
+        width, height, detections = cache.get("k")
+        assert (width, height) == (600, 800)
+        assert [tuple(d[2]) for d in detections] == [tuple(d[2]) for d in DETECTIONS]
+
+        page = build_page(3, width, height, detections, min_score=0.5)
+        assert page.page_index == 3
+        assert [b.label for b in page.boxes] == ["table"]
+        assert page.boxes[0].nx2 == 300.0 / 600
+        assert cache.get("missing") is None
+        assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+    def test_keys_depend_on_content_and_settings(self, tmp_path):
+        """Test keys change with pixels, model, NMS, DPI, page and PDF bytes."""
+        img = Image.new("RGB", (8, 8), "white")
+        base = image_key(img, "m", True)
+        assert base == image_key(img.copy(), "m", True)
+        assert len({base, image_key(Image.new("RGB", (8, 8), "black"), "m", True),
+                    image_key(img, "n", True), image_key(img, "m", False)}) == 4
+
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"%PDF-1.4 a")
+        digest = file_digest(str(pdf))
+        assert len({document_key(digest, 1, 200, "m", True), document_key(digest, 2, 200, "m", True),
+                    document_key(digest, 1, 300, "m", True), document_key("other", 1, 200, "m", True)}) == 4
+
+    def test_invalidate_by_model_and_pdf(self, tmp_path):
+        """Test entries can be dropped per model and per PDF."""
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"%PDF-1.4 a")
+        cache = LayoutCache(str(tmp_path / "cache"))
+        cache.put("raster", 10, 10, DETECTIONS, model_name="m")
+        cache.put("doc", 10, 10, DETECTIONS, model_name="m", pdf_digest=file_digest(str(pdf)))
+        cache.put("other", 10, 10, DETECTIONS, model_name="n")
+
+        assert cache.invalidate(pdf_path=str(pdf)) == 1
+        assert cache.get("doc") is None and cache.get("raster") is not None
+        assert cache.invalidate(model_name="m") == 1
+        assert cache.get("raster") is None and cache.get("other") is not None
+
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        """Test the store stays under its size cap."""
+        cache = LayoutCache(str(tmp_path), max_size_mb=4096 / (1024 * 1024))
+        for i in range(200):
+            cache.put(f"k{i}", 10, 10, [("text", 0.5, [i, i, i + 1.5, i + 2.5])] * 5, model_name="m")
+        stats = cache.stats()
+        assert stats["size_bytes"] <= 4096
+        assert 0 < stats["entries"] < 200
+        assert cache.get("k199") is not None
+
+
+class TestPaddleLayoutEngineCache:
+    def test_cached_pages_skip_the_model(self, tmp_path):
+        """Test repeated pages are served from disk without loading the model."""
+        pages = [Image.new("RGB", (60, 80), c) for c in ("white", "gray")]
+        engine = PaddleLayoutEngine(cache_dir=str(tmp_path))
+        engine.model = _CountingModel()
+        first = engine.predict_images(pages, min_score=0.5)
+        assert engine.model.pages == 2
+
+        fresh = PaddleLayoutEngine(cache_dir=str(tmp_path))
+        fresh._ensure_model = lambda: (_ for _ in ()).throw(AssertionError("model loaded"))
+        again = fresh.predict_images(pages, min_score=0.5, start_index=4)
+        assert [p.page_index for p in again] == [4, 5]
+        assert again[0].boxes == first[0].boxes
+        assert [len(p.boxes) for p in fresh.predict_images(pages)] == [2, 2]
+
+    def test_disabled_cache_always_runs_the_model(self, tmp_path):
+        """Test use_cache=False detects every call."""
+        engine = PaddleLayoutEngine(use_cache=False)
+        engine.model = _CountingModel()
+        page = Image.new("RGB", (60, 80), "white")
+        engine.predict_images([page])
+        engine.predict_images([page])
+        assert engine.cache is None and engine.model.pages == 2
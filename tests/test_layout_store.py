@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from doctra.cli.main import cli
+from doctra.engines.layout.cache import build_page
+from doctra.engines.layout.layout_batch import LayoutBatch
+from doctra.engines.layout.layout_store import BOXES_FILE, LayoutStore, LayoutStoreWriter, is_layout_store
+from doctra.engines.layout.paddle_layout import PaddleLayoutEngine
+
+DOC_A = [
+    (1, 600, 800, [("table", 0.75, [10.0, 20.0, 300.0, 400.0]), ("text", 0.25, [5.0, 5.0, 50.0, 15.0])]),
+    (2, 600, 800, []),
+]
+DOC_B = [
+    (1, 400, 500, [("figure", 0.5, [50.0, 60.0, 200.0, 300.0]), ("text", 0.875, [0.0, 0.0, 100.0, 50.0]),
+                   ("text", 0.625, [0.0, 60.0, 100.0, 90.0])]),
+]
+
+
+def _pages(records):
+    return [build_page(i, w, h, dets) for i, w, h, dets in records]
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    path = str(tmp_path / "corpus.layout")
+    with LayoutStoreWriter(path) as writer:
+        writer.add(LayoutBatch.from_records(DOC_A), "a.pdf")
+        writer.add(_pages(DOC_B), "b.pdf")
+    return path
+
+
+class TestLayoutStore:
+    def test_random_access_roundtrip(self, store_dir):
+        """Test pages and documents read back from the memory map equal what was written."""
+        store = LayoutStore(store_dir)
+        assert is_layout_store(store_dir)
+        assert (store.num_documents, store.num_pages, store.num_boxes) == (2, 3, 5)
+        assert isinstance(store.boxes, np.memmap)
+        assert store.labels == ("table", "text", "figure")
+
+        assert store.read_document("b.pdf").to_pages() == _pages(DOC_B)
+        assert store.read_document(0).to_pages() == _pages(DOC_A)
+        assert store.page(2).to_page() == _pages(DOC_B)[0]
+        assert len(store.page_boxes(1)) == 0
+        assert store.page_boxes(2)["score"].tolist() == [0.5, 0.875, 0.625]
+        assert [b.num_pages for b in store.iter_batches(pages_per_batch=2)] == [2, 1]
+        with pytest.raises(IndexError):
+            store.page(3)
+
+    def test_stats_in_chunks(self, store_dir):
+        """Test corpus statistics do not depend on the chunk size and honour min_score."""
+        store = LayoutStore(store_dir)
+        stats = store.stats(chunk_size=2)
+        assert stats["label_counts"] == {"table": 1, "text": 3, "figure": 1}
+        assert stats["boxes_per_page"].tolist() == [2, 0, 3]
+        filtered = store.stats(min_score=0.6, chunk_size=1)
+        assert filtered["boxes"] == 3 and filtered["label_counts"] == {"table": 1, "text": 2}
+
+    def test_append_and_unflushed_rows(self, store_dir):
+        """Test appending keeps earlier documents and rows past the last flush are dropped."""
+        with open(f"{store_dir}/{BOXES_FILE}", "ab") as f:
+            f.write(b"\0" * 100)  # leftovers of an interrupted write
+        assert LayoutStore(store_dir).num_boxes == 5
+
+        doc_id = PaddleLayoutEngine().save_store(_pages(DOC_A), store_dir, document="c.pdf")
+        store = LayoutStore(store_dir)
+        assert doc_id == 2 and store.documents == ["a.pdf", "b.pdf", "c.pdf"]
+        assert store.read_document("c.pdf").to_pages() == _pages(DOC_A)
+        assert store.document_rows("c.pdf") == (3, 5)
+
+        PaddleLayoutEngine().save_store(_pages(DOC_B), store_dir, document="new.pdf", append=False)
+        assert LayoutStore(store_dir).documents == ["new.pdf"]
+
+    def test_cli_analyze_store(self, store_dir):
+        """Test 'doctra analyze' reports corpus statistics for a layout store."""
+        result = CliRunner().invoke(cli, ["analyze", store_dir, "--verbose"])
+        assert result.exit_code == 0, result.output
+        assert "Documents: 2" in result.output and "Total elements: 5" in result.output
+        assert "Most elements: b.pdf page 1 (3 elements)" in result.output
+        assert "a.pdf: 2 pages, 2 elements" in result.output
@@ -0,0 +1,34 @@
+import random
+import time
+
+import pytest
+from doctra.utils.pipeline import StagedPipeline, Stage, prefetch
+
+
+class TestStagedPipeline:
+    def test_output_order_matches_input(self):
+        """Test results come out in source order with multi-worker stages."""
+        def jitter(x):
+            time.sleep(random.random() * 0.005)
+            return x * 2
+
+        pipeline = StagedPipeline(
+            [Stage("double", jitter, workers=4), Stage("inc", lambda x: x + 1, workers=3)],
+            queue_size=2,
+        )
+        assert list(pipeline.run(range(100))) == [x * 2 + 1 for x in range(100)]
+
+    def test_stage_error_is_raised(self):
+        """Test a failing stage stops the pipeline and surfaces the error."""
+        def boom(x):
+            if x == 5:
+                raise ValueError("bad page")
+            return x
+
+        pipeline = StagedPipeline([Stage("boom", boom, workers=2)])
+        with pytest.raises(RuntimeError, match="boom"):
+            list(pipeline.run(range(50)))
+
+    def test_prefetch_preserves_items(self):
+        """Test prefetch yields the same items in the same order."""
+        assert list(prefetch(iter(range(10)), maxsize=2)) == list(range(10))
@@ -0,0 +1,25 @@
+import sys
+import threading
+
+from doctra.utils.quiet import silence
+
+
+class TestSilence:
+    def test_streams_restored_after_concurrent_use(self):
+        """Test overlapping silence() calls from threads restore stdout/stderr."""
+        original = (sys.stdout, sys.stderr)
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            for _ in range(50):
+                with silence(fd_level=False):
+                    print("hidden")
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert (sys.stdout, sys.stderr) == original
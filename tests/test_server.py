@@ -0,0 +1,157 @@
+import http.client
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from doctra.server import ParseService, ServerBusy, make_server
+
+
+class _FakeParser:
+    """Emits two pages per document; optionally blocks until released."""
+
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.calls = []
+
+    def parse(self, pdf_path, output_dir=None, resume=False, on_page=None):
+        if self.gate is not None:
+            self.gate.wait(10)
+        if os.path.basename(pdf_path).startswith("bad"):
+            raise ValueError("cannot parse")
+        self.calls.append((pdf_path, output_dir, resume))
+        for page in (1, 2):
+            on_page(page, f"text of page {page}", [{"type": "Table", "page": page}])
+
+
+def _serve(service, **kwargs):
+    server = make_server(service, port=0, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _post(server, body, content_type="application/json", path="/parse"):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+    conn.request("POST", path, body=body, headers={"Content-Type": content_type})
+    response = conn.getresponse()
+    return response.status, response.read().decode("utf-8")
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(b"%PDF-1.4 fake")
+    return path
+
+
+class TestParseService:
+    def test_events_stream_pages_then_done(self, tmp_path, pdf):
+        """Test a job reports queued, started, one event per page and done, in that order."""
+        parser = _FakeParser()
+        service = ParseService(parser_factory=lambda: parser, output_root=str(tmp_path / "out"))
+        service.start()
+        job = service.submit(str(pdf), resume=True)
+        events = list(job.events(timeout=10))
+        service.close()
+
+        assert [e["event"] for e in events] == ["queued", "started", "page", "page", "done"]
+        assert [e["page"] for e in events if e["event"] == "page"] == [1, 2]
+        assert events[-1]["pages"] == 2
+        assert parser.calls == [(str(pdf), job.output_dir, True)]
+        assert job.output_dir.startswith(str(tmp_path / "out" / "doc-"))
+        assert service.stats()["completed"] == 1
+
+    def test_failures_are_reported_and_the_service_keeps_running(self, tmp_path, pdf):
+        """Test a failing document yields an error event and later jobs still run."""
+        bad = tmp_path / "bad.pdf"
+        bad.write_bytes(b"%PDF-1.4 fake")
+        service = ParseService(parser_factory=_FakeParser, output_root=str(tmp_path))
+        service.start()
+        failed = list(service.submit(str(bad)).events(timeout=10))
+        ok = list(service.submit(str(pdf)).events(timeout=10))
+        service.close()
+
+        assert failed[-1]["event"] == "error" and "cannot parse" in failed[-1]["error"]
+        assert ok[-1]["event"] == "done"
+        assert (service.stats()["completed"], service.stats()["failed"]) == (1, 1)
+
+    def test_queue_is_bounded(self, tmp_path, pdf):
+        """Test submissions beyond max_queue waiting jobs are refused."""
+        gate = threading.Event()
+        service = ParseService(parser_factory=lambda: _FakeParser(gate), output_root=str(tmp_path), max_queue=1)
+        service.start()
+        running = service.submit(str(pdf))
+        next(running.events(timeout=10))  # queued
+        assert next(running.events(timeout=10))["event"] == "started"
+        waiting = service.submit(str(pdf))
+        with pytest.raises(ServerBusy):
+            service.submit(str(pdf))
+        gate.set()
+        assert list(waiting.events(timeout=10))[-1]["event"] == "done"
+        service.close()
+
+
+class TestHTTPServer:
+    def test_parse_by_path_and_by_upload(self, tmp_path, pdf):
+        """Test both request forms stream NDJSON events ending with done."""
+        service = ParseService(parser_factory=_FakeParser, output_root=str(tmp_path / "out"))
+        service.start()
+        server = _serve(service)
+        try:
+            status, body = _post(server, json.dumps({"pdf_path": str(pdf), "output_dir": str(tmp_path / "a")}))
+            events = [json.loads(line) for line in body.splitlines()]
+            assert status == 200
+            assert events[1] == {"event": "started", "job": events[0]["job"], "output_dir": str(tmp_path / "a")}
+            assert events[2]["markdown"] == "text of page 1" and events[-1]["event"] == "done"
+
+            status, body = _post(server, pdf.read_bytes(), "application/pdf", "/parse?name=scan.pdf")
+            events = [json.loads(line) for line in body.splitlines()]
+            assert status == 200 and events[-1]["event"] == "done"
+            assert os.path.basename(events[-1]["output_dir"]).startswith("scan-")
+
+            conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+            conn.request("GET", "/health")
+            assert json.loads(conn.getresponse().read())["completed"] == 2
+        finally:
+            server.shutdown()
+            service.close()
+
+    def test_bad_requests(self, tmp_path):
+        """Test missing files, non-PDF uploads and unknown paths are rejected."""
+        service = ParseService(parser_factory=_FakeParser, output_root=str(tmp_path))
+        service.start()
+        server = _serve(service)
+        try:
+            assert _post(server, json.dumps({"pdf_path": str(tmp_path / "missing.pdf")}))[0] == 400
+            assert _post(server, b"hello", "application/pdf")[0] == 400
+            assert _post(server, b"{}", path="/nope")[0] == 404
+        finally:
+            server.shutdown()
+            service.close()
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets not available")
+    def test_unix_socket(self, tmp_path, pdf):
+        """Test the server answers on a Unix domain socket."""
+        service = ParseService(parser_factory=_FakeParser, output_root=str(tmp_path))
+        service.start()
+        sock_path = str(tmp_path / "doctra.sock")
+        server = make_server(service, socket_path=sock_path)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            body = json.dumps({"pdf_path": str(pdf)}).encode()
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(sock_path)
+                client.sendall(b"POST /parse HTTP/1.0\r\nContent-Type: application/json\r\n"
+                               b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+                response = b""
+                while chunk := client.recv(65536):
+                    response += chunk
+            head, _, payload = response.partition(b"\r\n\r\n")
+            assert head.startswith(b"HTTP/1.0 200")
+            assert json.loads(payload.splitlines()[-1])["event"] == "done"
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.close()
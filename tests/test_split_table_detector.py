@@ -0,0 +1,126 @@
+import numpy as np
+from PIL import Image, ImageDraw
+from doctra.engines.layout.layout_models import LayoutBox, LayoutPage
+from doctra.parsers.split_table_detector import SplitTableDetector
+
+W, H = 1000, 1400
+
+
+def _page(index, *tables):
+    boxes = [LayoutBox.from_absolute("table", 0.9, list(coord), W, H) for coord in tables]
+    return LayoutPage(page_index=index, width=W, height=H, boxes=boxes)
+
+
+def _image():
+    return Image.new("RGB", (W, H), "white")
+
+
+def _loop_cluster(values, threshold):
+    """Reference: the former pure-Python clustering loop."""
+    clusters = [[values[0]]]
+    for val in values[1:]:
+        if val - clusters[-1][-1] <= threshold:
+            clusters[-1].append(val)
+        else:
+            clusters.append([val])
+    return [np.mean(cluster) for cluster in clusters]
+
+
+def _loop_alignment(norm_cols1, norm_cols2):
+    """Reference: the former greedy alignment loop, returning the match count."""
+    matches, used = 0, set()
+    for c1 in norm_cols1:
+        best_match, best_diff = None, float("inf")
+        for i, c2 in enumerate(norm_cols2):
+            diff = abs(c1 - c2)
+            if i not in used and diff < 0.05 and diff < best_diff:
+                best_match, best_diff = i, diff
+        if best_match is not None:
+            matches += 1
+            used.add(best_match)
+    return matches
+
+
+class TestSplitTableDetector:
+    def test_matches_consecutive_pages_only(self):
+        """Test a table ending near the bottom pairs with one starting near the top of the next page."""
+        detector = SplitTableDetector(enable_lsd=False)
+        pages = [
+            _page(1, (100, 900, 900, 1350)),
+            _page(2, (100, 60, 900, 600), (100, 1000, 900, 1380)),
+            _page(4, (100, 60, 900, 600)),
+        ]
+        matches = detector.detect_split_tables(pages, [_image() for _ in range(4)])
+        assert [(m.segment1.page_index, m.segment2.page_index) for m in matches] == [(1, 2)]
+        assert matches[0].segment1.image.size == (800, 450)
+        assert matches[0].segment1.page_image is None
+
+    def test_incremental_index_and_memoized_columns(self):
+        """Test pages can be fed one by one and a segment's columns are detected once."""
+        detector = SplitTableDetector()
+        calls = []
+        detector._detect_columns = lambda img: calls.append(img.shape) or [100.0, 400.0, 700.0]
+
+        index = detector.index()
+        assert index.add_page(_page(1, (100, 900, 900, 1350)), _image()) == []
+        # A full-page table continues page 1 and is continued on page 3
+        assert len(index.add_page(_page(2, (100, 60, 900, 1380)), _image())) == 1
+        assert len(index.add_page(_page(3, (100, 60, 900, 500)), _image())) == 1
+        assert len(index.matches) == 2
+        assert len(calls) == 3
+
+    def test_middle_of_page_tables_are_not_cropped(self):
+        """Test tables away from the page edges never become candidates."""
+        detector = SplitTableDetector(enable_lsd=False)
+        index = detector.index()
+        index.add_page(_page(1, (100, 500, 900, 800)), _image())
+        assert index._trailing == []
+
+    def test_multi_page_table_is_one_chain(self):
+        """Test a table spanning several pages becomes one chain stitched into one image."""
+        detector = SplitTableDetector(enable_lsd=False)
+        pages = [
+            _page(1, (100, 900, 900, 1350)),
+            _page(2, (100, 60, 900, 1380)),
+            _page(3, (100, 60, 900, 1380)),
+            _page(4, (100, 60, 900, 500)),
+            _page(5, (100, 200, 900, 500)),
+        ]
+        chains = detector.detect_table_chains(pages, [_image() for _ in range(5)])
+        assert len(chains) == 1
+        chain = chains[0]
+        assert [seg.page_index for seg in chain.segments] == [1, 2, 3, 4]
+        assert (chain.first_page, chain.last_page, len(chain.matches)) == (1, 4, 3)
+
+        merged = detector.merge_chain_images(chain, gap_pixels=10)
+        assert merged.size == (800, 450 + 1320 + 1320 + 440 + 3 * 10)
+
+    def test_vectorized_steps_match_loops(self):
+        """Test clustering and alignment give the same results as the former loops."""
+        detector = SplitTableDetector()
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            values = np.sort(rng.uniform(0, 1000, size=int(rng.integers(1, 400)))).astype(np.float32)
+            expected = _loop_cluster(list(values), 6.0)
+            assert [float(c) for c in detector._cluster_values(values, 6.0)] == [float(c) for c in expected]
+
+            cols1 = sorted(rng.uniform(0, 800, size=int(rng.integers(0, 15))).tolist())
+            cols2 = sorted((np.asarray(cols1) + rng.normal(0, 25, size=len(cols1))).tolist()[:int(rng.integers(0, 15))])
+            seg = _page(1, (100, 60, 900, 600))
+            seg1 = detector._segment(seg, None, 0, seg.boxes[0])
+            seg2 = detector._segment(seg, None, 0, seg.boxes[0])
+            total = max(len(cols1), len(cols2))
+            expected = _loop_alignment([c / 800 for c in cols1], [c / 800 for c in cols2]) / total if total else 0.0
+            assert detector._check_column_alignment(cols1, cols2, seg1, seg2) == expected
+
+    def test_detect_columns_on_ruled_table(self):
+        """Test inner column rules of a synthetic ruled table are found."""
+        im = Image.new("RGB", (800, 400), "white")
+        draw = ImageDraw.Draw(im)
+        for y in range(10, 390, 30):
+            draw.line((10, y, 790, y), fill="black")
+        for x in (10, 200, 400, 600, 790):
+            draw.line((x, 10, x, 390), fill="black", width=2)
+        detector = SplitTableDetector()
+        cols = detector._detect_columns(detector._pil_to_cv2(im))
+        assert [round(float(c) / 10) * 10 for c in cols] == [200, 400, 600]
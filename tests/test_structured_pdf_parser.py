@@ -1,8 +1,16 @@
 import pytest
 import os
+from doctra.engines.vlm.service import VLMStructuredExtractor
 from doctra.parsers.structured_pdf_parser import StructuredPDFParser
 
 
+class _OfflineVLM(VLMStructuredExtractor):
+    """Extractor that only carries its concurrency; no provider is created."""
+
+    def __init__(self, max_concurrency=4):
+        self.max_concurrency = max_concurrency
+
+
 class TestStructuredPDFParser:
     def setup_method(self):
         """Setup test fixtures before each test method."""
@@ -22,6 +30,12 @@ class TestStructuredPDFParser:
         )
         assert parser is not None
 
+    def test_vlm_stage_sized_from_vlm_concurrency(self):
+        """Test the VLM stage keeps as many pages in flight as the VLM allows requests."""
+        assert StructuredPDFParser(vlm=_OfflineVLM(max_concurrency=6)).vlm_workers == 6
+        assert StructuredPDFParser(vlm=_OfflineVLM(max_concurrency=6), vlm_workers=2).vlm_workers == 2
+        assert self.parser.vlm_workers == 1
+
     # Add more tests based on your parser's functionality
     @pytest.mark.skipif(not os.path.exists("test_document.pdf"),
                         reason="Test PDF not available")
@@ -0,0 +1,58 @@
+from PIL import Image
+from doctra.engines.vlm.cache import VLMCache, make_cache_key
+from doctra.engines.vlm.outlines_types import Table
+
+
+def _table(title: str) -> Table:
+    return Table(title=title, description="d", headers=["a", "b"], rows=[["1", "2"]])
+
+
+class TestVLMCache:
+    def test_roundtrip_and_counters(self, tmp_path):
+        """Test results come back in the stored form and hits/misses are counted."""
+        cache = VLMCache(str(tmp_path))
+        img = Image.new("RGB", (8, 8), "white")
+        key = make_cache_key(img, "prompt", "Table", "gemini", "gemini-2.5-pro")
+
+        assert cache.get(key, Table) is None
+        cache.put(key, _table("t").model_dump_json())
+        assert cache.get(key, Table) == _table("t").model_dump_json()
+
+        model_key = make_cache_key(img, "prompt", "Table", "ollama", "llava:latest")
+        cache.put(model_key, _table("m"))
+        assert cache.get(model_key, Table) == _table("m")
+        assert (cache.stats()["hits"], cache.stats()["misses"]) == (2, 1)
+
+    def test_key_depends_on_pixels_and_request(self):
+        """Test the key changes with pixels, prompt, schema, provider and model."""
+        img = Image.new("RGB", (8, 8), "white")
+        other = Image.new("RGB", (8, 8), "black")
+        base = make_cache_key(img, "p", "Table", "gemini", "m")
+        assert base == make_cache_key(img.copy(), "p", "Table", "gemini", "m")
+        assert len({
+            base,
+            make_cache_key(other, "p", "Table", "gemini", "m"),
+            make_cache_key(img, "q", "Table", "gemini", "m"),
+            make_cache_key(img, "p", "Chart", "gemini", "m"),
+            make_cache_key(img, "p", "Table", "openai", "m"),
+            make_cache_key(img, "p", "Table", "gemini", "n"),
+        }) == 6
+
+    def test_lru_eviction_over_size_cap(self, tmp_path):
+        """Test the least recently used entries are evicted past the size cap."""
+        entry_size = len(_table("k0").model_dump_json())
+        cache = VLMCache(str(tmp_path), max_size_mb=(2.5 * entry_size) / (1024 * 1024))
+        cache.put("k0", _table("k0"))
+        cache.put("k1", _table("k1"))
+        assert cache.get("k0", Table) is not None  # k1 becomes least recently used
+        cache.put("k2", _table("k2"))
+        assert cache.get("k1", Table) is None
+        assert cache.get("k0", Table) is not None
+        assert cache.get("k2", Table) is not None
+
+    def test_expired_entries_miss(self, tmp_path):
+        """Test entries older than the TTL are reported as misses."""
+        cache = VLMCache(str(tmp_path), ttl_days=1)
+        cache.put("k", _table("k"))
+        cache._store._conn.execute("UPDATE entries SET created = created - 2 * 86400")
+        assert cache.get("k", Table) is None
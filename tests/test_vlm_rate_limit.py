@@ -0,0 +1,40 @@
+import pytest
+from doctra.engines.vlm.rate_limit import TokenBucket, call_with_retry, is_rate_limit_error
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class TestRateLimit:
+    def test_retries_on_429_then_succeeds(self):
+        """Test 429 errors are retried and the eventual result is returned."""
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise RateLimited("Too Many Requests")
+            return "ok"
+
+        assert call_with_retry(flaky, max_retries=5, base_delay=0.0) == "ok"
+        assert len(calls) == 3
+
+    def test_other_errors_are_not_retried(self):
+        """Test non rate-limit errors are raised immediately."""
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise ValueError("bad schema")
+
+        with pytest.raises(ValueError):
+            call_with_retry(broken, max_retries=5, base_delay=0.0)
+        assert len(calls) == 1
+        assert not is_rate_limit_error(ValueError("bad schema"))
+
+    def test_token_bucket_allows_burst(self):
+        """Test a bucket hands out its initial capacity without waiting."""
+        bucket = TokenBucket(rate=1.0, capacity=3)
+        assert [bucket._reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket._reserve() > 0
@@ -0,0 +1,40 @@
+import threading
+import time
+
+from doctra.engines.vlm.service import VLMStructuredExtractor
+
+
+class _SlowVLM(VLMStructuredExtractor):
+    """Extractor without a provider: each table takes a while and concurrency is recorded."""
+
+    def __init__(self, max_concurrency=4):
+        self.max_concurrency = max_concurrency
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.in_flight = self.peak = 0
+
+    def extract_table(self, image_path):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.05)
+        with self._lock:
+            self.in_flight -= 1
+        if image_path == "bad":
+            raise ValueError("bad crop")
+        return image_path
+
+
+class TestVLMSubmit:
+    def test_requests_submitted_separately_run_concurrently(self):
+        """Test crops submitted one at a time (e.g. one per page) share the request pool."""
+        vlm = _SlowVLM(max_concurrency=4)
+        futures = [vlm.submit("table", f"page-{i}") for i in range(8)]
+        futures.append(vlm.submit("table", "bad"))
+
+        results = vlm.gather(futures)
+
+        assert results[:8] == [f"page-{i}" for i in range(8)]
+        assert isinstance(results[8], ValueError)
+        assert vlm.peak == 4